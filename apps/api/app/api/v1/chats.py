@@ -1,10 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import ValidationError
+from contextlib import aclosing
+from typing import Optional
+import asyncio
+import hashlib
+import json
+import math
+import time
 
-from ...schemas.chat import ChatCreateRequest, ChatResponse
-from ...services.chat import ChatService
-from ...core.database import get_db
+from ...schemas.chat import (
+    CHAT_RESPONSE_FIELDS,
+    ChatBatchCreateRequest,
+    ChatBatchCreateResponse,
+    ChatBatchItemResult,
+    ChatCreateRequest,
+    ChatListItem,
+    ChatListResponse,
+    ChatMessageItem,
+    ChatMessageListResponse,
+    ChatResponse,
+    ChatSearchItem,
+    ChatSearchResponse,
+    ChatStatusResponse,
+    MessageCreateRequest,
+    PartialChatResponse,
+    TranscriptSearchHit,
+    TranscriptSearchResponse,
+)
+from ...services.answer_cache import CachedAnswerClient
+from ...services.chat import AsyncChatService
+from ...services.chat_message import (
+    AsyncChatMessageService,
+    Reply,
+    get_message_metrics,
+    record_reply,
+    stream_reply,
+)
+from ...services.llm import get_llm_client
+from ...services.search import AsyncKeywordSearchService
+from ...core.config import (
+    CHAT_LIST_DEFAULT_PAGE_SIZE,
+    CHAT_LIST_MAX_PAGE_SIZE,
+    CHAT_SEARCH_DEFAULT_PAGE_SIZE,
+    CHAT_SEARCH_MAX_PAGE_SIZE,
+    SEARCH_MAX_RESULTS,
+    SSE_KEEPALIVE_SECONDS,
+)
+from ...core.database import get_async_db
+from ...core.events import TERMINAL_EVENTS, ChatEvent, get_event_broker
 from ...core.exceptions import InvalidURLException
 from ...core.logging import setup_logging
 
@@ -14,10 +60,9 @@ router = APIRouter()
 
 
 @router.post("/chats", status_code=status.HTTP_202_ACCEPTED)
-def create_chat(
+async def create_chat(
     chat_request: ChatCreateRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Create a new chat for processing a YouTube video.
@@ -30,14 +75,12 @@ def create_chat(
         },
     )
     try:
-        chat_service = ChatService(db)
-        chat_id = chat_service.start_new_chat(
+        chat_service = AsyncChatService(db)
+        chat_id = await chat_service.start_new_chat(
             str(chat_request.source_url), chat_request.source_type
         )
-        # Add the video processing as a background task
-        background_tasks.add_task(
-            chat_service.process_video_async, chat_id, str(chat_request.source_url)
-        )
+        # Hand the video to the durable job queue; a worker processes it
+        await chat_service.enqueue_processing(chat_id, str(chat_request.source_url))
         logger.info("Chat creation initiated successfully", extra={"chat_id": chat_id})
         return {"chat_id": chat_id}
     except InvalidURLException as e:
@@ -67,14 +110,598 @@ def create_chat(
         )
 
 
+def _validate_batch_item(item) -> ChatCreateRequest:
+    if isinstance(item, str):
+        item = {"source_url": item}
+    return ChatCreateRequest.model_validate(item)
+
+
+@router.post(
+    "/chats:batch",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ChatBatchCreateResponse,
+)
+async def create_chats(
+    batch_request: ChatBatchCreateRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Create chats for many YouTube videos in one request. Each item is validated
+    like the body of POST /chats; the chats of the valid ones are created and
+    their processing enqueued in one transaction. Results are given per item,
+    in order, with the chat ID or the error of the item.
+    """
+    results = []
+    valid = []
+    for index, item in enumerate(batch_request.chats):
+        try:
+            chat_request = _validate_batch_item(item)
+        except ValidationError as e:
+            message = "; ".join(error["msg"] for error in e.errors())
+            results.append(
+                ChatBatchItemResult(
+                    index=index,
+                    error={"error_code": "VALIDATION_ERROR", "message": message},
+                )
+            )
+            continue
+        results.append(ChatBatchItemResult(index=index))
+        valid.append(chat_request)
+    logger.info(
+        "Creating chats in bulk",
+        extra={"items": len(results), "valid": len(valid)},
+    )
+
+    if valid:
+        try:
+            chat_ids = await AsyncChatService(db).start_new_chats(
+                [(str(r.source_url), r.source_type) for r in valid]
+            )
+        except Exception as e:
+            logger.error(
+                "Unexpected error during bulk chat creation",
+                extra={"error": str(e)},
+                exc_info=True,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail={
+                    "error_code": "INTERNAL_ERROR",
+                    "message": "An unexpected error occurred",
+                },
+            )
+        created = iter(chat_ids)
+        for result in results:
+            if result.error is None:
+                result.chat_id = next(created)
+
+    return ChatBatchCreateResponse(
+        created=len(valid), failed=len(results) - len(valid), results=results
+    )
+
+
+# Declared before /chats/{chat_id} so that "search" isn't taken for a chat ID
+@router.get("/chats/search", response_model=ChatSearchResponse)
+async def search_chats(
+    q: str = Query(
+        ..., description="Words to find in titles, channels and transcripts"
+    ),
+    limit: int = Query(
+        CHAT_SEARCH_DEFAULT_PAGE_SIZE,
+        ge=1,
+        description=f"Page size, at most {CHAT_SEARCH_MAX_PAGE_SIZE}",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="The next_cursor of the previous page"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Full-text search across processed chats, best match first, one page at a
+    time.
+    """
+    if not q.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error_code": "INVALID_QUERY", "message": "Query is empty"},
+        )
+    try:
+        chats, next_cursor = await AsyncChatService(db).search_chats(
+            q, min(limit, CHAT_SEARCH_MAX_PAGE_SIZE), cursor
+        )
+        return ChatSearchResponse(
+            chats=[
+                ChatSearchItem(
+                    id=str(chat.id),
+                    video_id=chat.video_id,
+                    status=chat.status,
+                    title=chat.title,
+                    channel_name=chat.channel_name,
+                    view_count=chat.view_count,
+                    thumbnail_url=chat.thumbnail_url,
+                    created_at=chat.created_at,
+                    score=chat.score,
+                )
+                for chat in chats
+            ],
+            next_cursor=next_cursor,
+        )
+    except ValueError as e:
+        if "Invalid cursor" in str(e):
+            logger.error("Invalid cursor", extra={"cursor": cursor})
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={"error_code": "INVALID_CURSOR", "message": "Invalid cursor"},
+            )
+        raise _chat_list_error(e)
+    except Exception as e:
+        raise _chat_list_error(e)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[list]:
+    """Parse the comma separated `fields` query parameter of chat reads."""
+    if fields is None:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in CHAT_RESPONSE_FIELDS]
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error_code": "INVALID_FIELDS",
+                "message": (
+                    f"Unknown fields: {', '.join(unknown)}"
+                    if unknown
+                    else "No fields requested"
+                ),
+            },
+        )
+    # The id is always returned so clients can match responses to chats
+    return ["id"] + [field for field in requested if field != "id"]
+
+
+def _chat_etag(chat_id, version: int, variant: str) -> str:
+    """
+    Strong ETag of a chat representation. Every write to a chat bumps its
+    version, and the variant tells apart the representations of one chat.
+    """
+    key = f"{chat_id}:{version}:{variant}"
+    return '"' + hashlib.sha256(key.encode()).hexdigest()[:32] + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
+
+
+def _set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Clients may cache the chat but must revalidate it on every use
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def _chat_lookup_error(chat_id: str, e: Exception) -> HTTPException:
+    """Map an error raised while looking up a chat to its HTTP response."""
+    if isinstance(e, ValueError) and "Invalid chat ID format" in str(e):
+        logger.error("Invalid chat ID format", extra={"chat_id": chat_id})
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error_code": "INVALID_CHAT_ID",
+                "message": "Invalid chat ID format",
+            },
+        )
+    if isinstance(e, ValueError) and "Chat not found" in str(e):
+        logger.error("Chat not found", extra={"chat_id": chat_id})
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error_code": "CHAT_NOT_FOUND", "message": "Chat not found"},
+        )
+    logger.error(
+        "Unexpected error during chat retrieval",
+        extra={"chat_id": chat_id, "error": str(e)},
+        exc_info=True,
+    )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail={
+            "error_code": "INTERNAL_ERROR",
+            "message": "An unexpected error occurred",
+        },
+    )
+
+
+@router.get("/chats/{chat_id}/status", response_model=ChatStatusResponse)
+async def read_chat_status(
+    chat_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Retrieve only the processing status of a chat, for cheap polling.
+    Honors If-None-Match with 304 Not Modified.
+    """
+    try:
+        chat_status = await AsyncChatService(db).get_chat_status(chat_id)
+        etag = _chat_etag(chat_status.id, chat_status.version, "status")
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        _set_etag(response, etag)
+        return ChatStatusResponse(
+            id=str(chat_status.id),
+            status=chat_status.status,
+            updated_at=chat_status.updated_at,
+        )
+    except Exception as e:
+        raise _chat_lookup_error(chat_id, e)
+
+
+@router.get("/chats/{chat_id}/events")
+async def stream_chat_events(chat_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Stream the processing progress of a chat as Server-Sent Events.
+    The first event is a "status" snapshot; the stream ends after the
+    "processed" or "error" event.
+    """
+    # Subscribe before reading the status so no event is missed in between
+    subscription = get_event_broker().subscribe(chat_id)
+    try:
+        chat_status = await AsyncChatService(db).get_chat_status(chat_id)
+    except Exception as e:
+        subscription.close()
+        raise _chat_lookup_error(chat_id, e)
+    finally:
+        # Don't hold a pooled connection for as long as the stream is open
+        await db.close()
+
+    async def event_stream():
+        with subscription:
+            yield ChatEvent(
+                chat_id=str(chat_status.id),
+                type="status",
+                data={"status": chat_status.status},
+            ).to_sse()
+            if chat_status.status != "processing":
+                return
+            while True:
+                event = await subscription.get(timeout=SSE_KEEPALIVE_SECONDS)
+                if event is None:
+                    # Comment line that keeps proxies from closing an idle stream
+                    yield ": keep-alive\n\n"
+                    continue
+                yield event.to_sse()
+                if event.type in TERMINAL_EVENTS:
+                    return
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/chats/{chat_id}/transcript")
+async def read_chat_transcript(
+    chat_id: str,
+    start: float = Query(0.0, description="Start of the time range, in seconds"),
+    end: float = Query(math.inf, description="End of the time range, in seconds"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Stream the transcript segments overlapping [start, end) as NDJSON, one
+    {"start", "duration", "text"} object per line.
+    """
+    if start < 0 or not end > start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error_code": "INVALID_TIME_RANGE",
+                "message": "start must be non-negative and before end",
+            },
+        )
+    try:
+        segments = await AsyncChatService(db).get_transcript_segments(chat_id)
+    except ValueError as e:
+        if "Transcript segments not found" in str(e):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={
+                    "error_code": "TRANSCRIPT_SEGMENTS_NOT_FOUND",
+                    "message": "The chat has no timed transcript",
+                },
+            )
+        raise _chat_lookup_error(chat_id, e)
+    except Exception as e:
+        raise _chat_lookup_error(chat_id, e)
+    finally:
+        # The segments are in memory; don't hold a connection while streaming
+        await db.close()
+
+    def lines():
+        for segment in segments.iter_window(start, end):
+            yield json.dumps(segment) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/chats/{chat_id}/search", response_model=TranscriptSearchResponse)
+async def search_chat_transcript(
+    chat_id: str,
+    q: str = Query(..., description="Keywords to look for in the transcript"),
+    limit: int = Query(
+        10, ge=1, description=f"Number of results, at most {SEARCH_MAX_RESULTS}"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Find where keywords are mentioned in a chat's transcript, best BM25
+    matches first. Offsets are character positions in the chat's transcript.
+    """
+    if not q.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error_code": "INVALID_QUERY", "message": "Query is empty"},
+        )
+    try:
+        chat_status = await AsyncChatService(db).get_chat_status(chat_id)
+        hits = await AsyncKeywordSearchService(db).search(
+            chat_id, q, min(limit, SEARCH_MAX_RESULTS)
+        )
+    except ValueError as e:
+        if "Search index not found" in str(e):
+            logger.warning(
+                "Search index not found",
+                extra={"chat_id": chat_id, "status": chat_status.status},
+            )
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={
+                    "error_code": "SEARCH_INDEX_NOT_FOUND",
+                    "message": "The chat's transcript isn't indexed yet",
+                },
+            )
+        raise _chat_lookup_error(chat_id, e)
+    except Exception as e:
+        raise _chat_lookup_error(chat_id, e)
+    return TranscriptSearchResponse(
+        query=q,
+        results=[
+            TranscriptSearchHit(
+                score=hit.score,
+                start_seconds=hit.start_seconds,
+                end_seconds=hit.end_seconds,
+                text=hit.text,
+                offset=hit.offset,
+                length=hit.length,
+                matches=[list(match) for match in hit.matches],
+            )
+            for hit in hits
+        ],
+    )
+
+
+def _message_item(message) -> ChatMessageItem:
+    return ChatMessageItem(
+        id=str(message.id),
+        role=message.role,
+        content=message.content,
+        status=message.status,
+        time_to_first_token_ms=message.time_to_first_token_ms,
+        tokens_per_second=message.tokens_per_second,
+        output_tokens=message.output_tokens,
+        created_at=message.created_at,
+    )
+
+
+@router.post("/chats/{chat_id}/messages")
+async def create_message(
+    chat_id: str,
+    message_request: MessageCreateRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Ask a question about a chat's video and stream the answer as Server-Sent
+    Events: a "message" event with the IDs of the question and answer, a
+    "token" event per piece of text, then "completed", "stopped" or "error"
+    with the answer's timings. Disconnecting stops the generation.
+    """
+    # Time to first token is measured from here, as the client sees it
+    started_at = time.perf_counter()
+    try:
+        # Before the question is saved, so that a model that can't be reached
+        # (e.g. without an API key) leaves no answer stuck in "streaming"
+        model = get_llm_client()
+    except Exception as e:
+        logger.error(
+            "Chat model unavailable",
+            extra={"chat_id": chat_id, "error": str(e)},
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "error_code": "LLM_UNAVAILABLE",
+                "message": "The chat model is unavailable",
+            },
+        )
+    try:
+        exchange = await AsyncChatMessageService(db).start_exchange(
+            chat_id, message_request.message
+        )
+        # Repeated questions are answered from the cache, without the model
+        llm = (
+            CachedAnswerClient(exchange.cached_answer)
+            if exchange.cached_answer is not None
+            else model
+        )
+    except ValueError as e:
+        if "Chat not ready" in str(e):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "error_code": "CHAT_NOT_READY",
+                    "message": "The chat's video is still being processed",
+                },
+            )
+        raise _chat_lookup_error(chat_id, e)
+    except Exception as e:
+        raise _chat_lookup_error(chat_id, e)
+    finally:
+        # Don't hold a pooled connection for as long as the answer streams
+        await db.close()
+
+    question, answer, prompt = exchange.question, exchange.answer, exchange.prompt
+    reply = Reply(
+        chat_id=chat_id,
+        message_id=str(answer.id),
+        started_at=started_at,
+        cache_key=exchange.cache_key,
+        cached=exchange.cached_answer is not None,
+    )
+    stream_started = False
+
+    async def message_stream():
+        nonlocal stream_started
+        stream_started = True
+        get_message_metrics().observe_start()
+        try:
+            # Stop requests may reach another process; they arrive as chat events
+            with get_event_broker().subscribe(chat_id) as subscription:
+                yield ChatEvent(
+                    chat_id=chat_id,
+                    type="message",
+                    data={
+                        "question_id": str(question.id),
+                        "message_id": reply.message_id,
+                    },
+                ).to_sse()
+                async with aclosing(
+                    stream_reply(llm, prompt, reply, subscription)
+                ) as texts:
+                    async for text in texts:
+                        if text is None:
+                            # Comment line that keeps proxies from closing the stream
+                            yield ": keep-alive\n\n"
+                            continue
+                        yield ChatEvent(
+                            chat_id=chat_id,
+                            type="token",
+                            data={"message_id": reply.message_id, "text": text},
+                        ).to_sse()
+                yield ChatEvent(
+                    chat_id=chat_id, type=reply.status, data=reply.summary()
+                ).to_sse()
+        finally:
+            # Saved by a task of its own, which outlives a cancelled request
+            await asyncio.shield(record_reply(reply))
+
+    async def record_unstarted_reply():
+        # A client that disconnects before the first chunk never starts the
+        # stream, so its cleanup above doesn't run
+        if not stream_started:
+            get_message_metrics().observe_start()
+            await record_reply(reply)
+
+    return StreamingResponse(
+        message_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(record_unstarted_reply),
+    )
+
+
+@router.get("/chats/{chat_id}/messages", response_model=ChatMessageListResponse)
+async def read_messages(chat_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retrieve the conversation of a chat, oldest message first.
+    """
+    try:
+        messages = await AsyncChatMessageService(db).list_messages(chat_id)
+    except Exception as e:
+        raise _chat_lookup_error(chat_id, e)
+    return ChatMessageListResponse(messages=[_message_item(m) for m in messages])
+
+
+@router.post(
+    "/chats/{chat_id}/messages/{message_id}/stop",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def stop_message(
+    chat_id: str, message_id: str, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Stop generating an answer. The stream of the answer ends with a "stopped"
+    event and the partial answer is kept. Stopping a finished answer does
+    nothing.
+    """
+    try:
+        message = await AsyncChatMessageService(db).request_stop(chat_id, message_id)
+    except ValueError as e:
+        if "Invalid message ID format" in str(e) or "Message not found" in str(e):
+            logger.error(str(e), extra={"chat_id": chat_id, "message_id": message_id})
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={
+                    "error_code": "MESSAGE_NOT_FOUND",
+                    "message": "Message not found",
+                },
+            )
+        raise _chat_lookup_error(chat_id, e)
+    except Exception as e:
+        raise _chat_lookup_error(chat_id, e)
+    return {"message_id": message_id, "status": message.status}
+
+
 @router.get("/chats/{chat_id}")
-def read_chat(chat_id: str, db: Session = Depends(get_db)):
+async def read_chat(
+    chat_id: str,
+    response: Response,
+    fields: Optional[str] = Query(
+        None, description="Comma separated chat fields to return, e.g. id,status"
+    ),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
     Retrieve chat details by ID.
+    With `fields`, only the requested fields are loaded and returned.
+    Honors If-None-Match with 304 Not Modified, checked before the full
+    chat (and its transcript) is loaded.
     """
+    requested_fields = _parse_fields(fields)
+    variant = ",".join(requested_fields) if requested_fields else "full"
     try:
-        chat_service = ChatService(db)
-        chat = chat_service.get_chat_by_id(chat_id)
+        chat_service = AsyncChatService(db)
+        if if_none_match:
+            # Compare against the cheap status read first
+            chat_status = await chat_service.get_chat_status(chat_id)
+            etag = _chat_etag(chat_status.id, chat_status.version, variant)
+            if _etag_matches(if_none_match, etag):
+                return _not_modified(etag)
+
+        chat = await chat_service.get_chat_by_id(chat_id, requested_fields)
+        _set_etag(response, _chat_etag(chat.id, chat.version, variant))
+
+        if requested_fields is not None:
+            values = {field: getattr(chat, field) for field in requested_fields}
+            values["id"] = str(chat.id)
+            return PartialChatResponse(**values).model_dump(
+                mode="json", exclude_unset=True
+            )
 
         # Convert to Pydantic model
         chat_response = ChatResponse(
@@ -97,50 +724,67 @@ def read_chat(chat_id: str, db: Session = Depends(get_db)):
         )
 
         return chat_response
+    except Exception as e:
+        raise _chat_lookup_error(chat_id, e)
+
+
+@router.get("/chats", response_model=ChatListResponse)
+async def read_chats(
+    limit: int = Query(
+        CHAT_LIST_DEFAULT_PAGE_SIZE,
+        ge=1,
+        description=f"Page size, at most {CHAT_LIST_MAX_PAGE_SIZE}",
+    ),
+    cursor: Optional[str] = Query(
+        None, description="The next_cursor of the previous page"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    List chats newest first, one page at a time.
+    """
+    try:
+        chats, next_cursor = await AsyncChatService(db).list_chats(
+            min(limit, CHAT_LIST_MAX_PAGE_SIZE), cursor
+        )
+        return ChatListResponse(
+            chats=[
+                ChatListItem(
+                    id=str(chat.id),
+                    video_id=chat.video_id,
+                    status=chat.status,
+                    title=chat.title,
+                    channel_name=chat.channel_name,
+                    view_count=chat.view_count,
+                    thumbnail_url=chat.thumbnail_url,
+                    created_at=chat.created_at,
+                )
+                for chat in chats
+            ],
+            next_cursor=next_cursor,
+        )
     except ValueError as e:
-        if "Invalid chat ID format" in str(e):
-            logger.error("Invalid chat ID format", extra={"chat_id": chat_id})
+        if "Invalid cursor" in str(e):
+            logger.error("Invalid cursor", extra={"cursor": cursor})
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail={
-                    "error_code": "INVALID_CHAT_ID",
-                    "message": "Invalid chat ID format",
-                },
-            )
-        elif "Chat not found" in str(e):
-            logger.error("Chat not found", extra={"chat_id": chat_id})
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail={"error_code": "CHAT_NOT_FOUND", "message": "Chat not found"},
-            )
-        else:
-            logger.error(
-                "Unexpected error during chat retrieval",
-                extra={"chat_id": chat_id, "error": str(e)},
-                exc_info=True,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail={
-                    "error_code": "INTERNAL_ERROR",
-                    "message": "An unexpected error occurred",
-                },
+                detail={"error_code": "INVALID_CURSOR", "message": "Invalid cursor"},
             )
+        raise _chat_list_error(e)
     except Exception as e:
-        logger.error(
-            "Unexpected error during chat retrieval",
-            extra={"chat_id": chat_id, "error": str(e)},
-            exc_info=True,
-        )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail={
-                "error_code": "INTERNAL_ERROR",
-                "message": "An unexpected error occurred",
-            },
-        )
+        raise _chat_list_error(e)
 
 
-@router.get("/chats")
-def read_chats():
-    return {"chats": []}
+def _chat_list_error(e: Exception) -> HTTPException:
+    logger.error(
+        "Unexpected error during chat listing",
+        extra={"error": str(e)},
+        exc_info=True,
+    )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail={
+            "error_code": "INTERNAL_ERROR",
+            "message": "An unexpected error occurred",
+        },
+    )
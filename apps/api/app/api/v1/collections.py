@@ -0,0 +1,115 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...schemas.chat import ChatListItem
+from ...schemas.collection import CollectionCreateRequest, CollectionResponse
+from ...services.collection import AsyncCollectionService
+from ...core.database import get_async_db
+from ...core.exceptions import VideoProcessingError
+from ...core.logging import setup_logging
+
+logger = setup_logging()
+
+router = APIRouter()
+
+
+@router.post("/collections", status_code=status.HTTP_202_ACCEPTED)
+async def create_collection(
+    collection_request: CollectionCreateRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Create chats for every video of a YouTube playlist or channel. The videos
+    are listed by a worker, which then creates a chat per video; their
+    processing runs in parallel, a few videos of the collection at a time.
+    """
+    source_url = str(collection_request.source_url)
+    logger.info("Creating new collection", extra={"source_url": source_url})
+    try:
+        collection_id = await AsyncCollectionService(db).start_collection(source_url)
+        return {"collection_id": collection_id}
+    except VideoProcessingError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error_code": "INVALID_URL", "message": e.message},
+        )
+    except Exception as e:
+        logger.error(
+            "Unexpected error during collection creation",
+            extra={"error": str(e)},
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error_code": "INTERNAL_ERROR",
+                "message": "An unexpected error occurred",
+            },
+        )
+
+
+@router.get("/collections/{collection_id}", response_model=CollectionResponse)
+async def read_collection(collection_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retrieve a collection with its chats in playlist order and its status,
+    rolled up from the statuses of the chats.
+    """
+    try:
+        result = await AsyncCollectionService(db).get_collection(collection_id)
+    except ValueError as e:
+        if "Invalid collection ID format" in str(e):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "error_code": "INVALID_COLLECTION_ID",
+                    "message": "Invalid collection ID format",
+                },
+            )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error_code": "COLLECTION_NOT_FOUND",
+                "message": "Collection not found",
+            },
+        )
+    except Exception as e:
+        logger.error(
+            "Unexpected error during collection retrieval",
+            extra={"collection_id": collection_id, "error": str(e)},
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error_code": "INTERNAL_ERROR",
+                "message": "An unexpected error occurred",
+            },
+        )
+
+    collection = result["collection"]
+    return CollectionResponse(
+        id=str(collection.id),
+        source_url=collection.source_url,
+        source_type=collection.source_type,
+        status=result["status"],
+        title=collection.title,
+        channel_name=collection.channel_name,
+        video_count=collection.video_count,
+        error=collection.error,
+        chat_counts=result["counts"],
+        chats=[
+            ChatListItem(
+                id=str(chat.id),
+                video_id=chat.video_id,
+                status=chat.status,
+                title=chat.title,
+                channel_name=chat.channel_name,
+                view_count=chat.view_count,
+                thumbnail_url=chat.thumbnail_url,
+                created_at=chat.created_at,
+            )
+            for chat in result["chats"]
+        ],
+        created_at=collection.created_at,
+        updated_at=collection.updated_at,
+    )
@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+
+from ...core.database import get_pool_stats
+from ...core.events import get_event_stats
+from ...core.rate_limit import get_rate_limit_stats
+from ...core.retry import get_circuit_breaker_stats
+from ...services.answer_cache import get_answer_cache
+from ...services.chat_message import get_message_metrics
+from ...services.processing import get_processing_pool
+from ...services.video_cache import get_video_lru
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+def read_metrics():
+    """
+    Report runtime metrics of this API process.
+    """
+    return {
+        "database_pools": get_pool_stats(),
+        "processing_pool": get_processing_pool().stats(),
+        "video_cache": get_video_lru().stats(),
+        "chat_events": get_event_stats(),
+        "chat_messages": get_message_metrics().snapshot(),
+        "answer_cache": get_answer_cache().stats(),
+        "rate_limits": get_rate_limit_stats(),
+        "circuit_breakers": get_circuit_breaker_stats(),
+    }
@@ -0,0 +1,6 @@
+from datetime import datetime, timezone
+
+
+def utcnow() -> datetime:
+    """Return the current UTC time as a naive datetime, matching our DateTime columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
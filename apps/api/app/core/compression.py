@@ -0,0 +1,63 @@
+"""
+Compression of large text values such as transcripts.
+
+zstd comes from the standard library on Python 3.14+ and from the optional
+backports.zstd package before that; without either, zlib is used. The codec
+is stored next to each compressed value, so values written with one codec stay
+readable after the default changes.
+"""
+
+import zlib
+from typing import Optional, Tuple
+from .config import TRANSCRIPT_CODEC
+
+try:
+    from compression import zstd
+except ImportError:
+    try:
+        from backports import zstd
+    except ImportError:
+        zstd = None
+
+ZSTD = "zstd"
+ZLIB = "zlib"
+
+
+def default_codec() -> str:
+    """Return the configured codec, or zlib if zstd is not available."""
+    if TRANSCRIPT_CODEC == ZSTD and zstd is not None:
+        return ZSTD
+    return ZLIB
+
+
+def compress_bytes(data: bytes, codec: Optional[str] = None) -> Tuple[str, bytes]:
+    """Compress data, returning (codec, compressed data)."""
+    codec = codec or default_codec()
+    if codec == ZSTD:
+        return codec, zstd.compress(data, level=3)
+    if codec == ZLIB:
+        return codec, zlib.compress(data, 6)
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+def decompress_bytes(codec: str, data: bytes) -> bytes:
+    """Decompress data written by compress_bytes with the given codec."""
+    if codec == ZSTD:
+        if zstd is None:
+            raise RuntimeError(
+                "zstd compressed data needs Python 3.14+ or backports.zstd"
+            )
+        return zstd.decompress(data)
+    if codec == ZLIB:
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+def compress_text(text: str, codec: Optional[str] = None) -> Tuple[str, bytes]:
+    """Compress text, returning (codec, compressed data)."""
+    return compress_bytes(text.encode("utf-8"), codec)
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    """Decompress text written by compress_text with the given codec."""
+    return decompress_bytes(codec, data).decode("utf-8")
@@ -0,0 +1,157 @@
+import os
+
+# Application settings are read from environment variables, with defaults that
+# suit local development. See .env.example for the full list.
+
+# Video cache
+VIDEO_CACHE_MAX_ENTRIES = int(os.getenv("VIDEO_CACHE_MAX_ENTRIES", "1024"))
+VIDEO_CACHE_METADATA_TTL_SECONDS = int(
+    os.getenv("VIDEO_CACHE_METADATA_TTL_SECONDS", str(6 * 60 * 60))
+)
+
+# Single-flight video fetching: how long a follower waits for the leader
+VIDEO_LOCK_TIMEOUT_SECONDS = float(os.getenv("VIDEO_LOCK_TIMEOUT_SECONDS", "120"))
+
+# Video processing pool: "thread" or "process" executor, worker count and the
+# number of jobs allowed to wait for a free worker
+PROCESSING_POOL_KIND = os.getenv("PROCESSING_POOL_KIND", "thread")
+PROCESSING_POOL_MAX_WORKERS = int(os.getenv("PROCESSING_POOL_MAX_WORKERS", "4"))
+PROCESSING_POOL_MAX_QUEUE = int(os.getenv("PROCESSING_POOL_MAX_QUEUE", "100"))
+
+# Threads used to fetch the transcript and metadata of videos concurrently
+FETCH_POOL_MAX_WORKERS = int(os.getenv("FETCH_POOL_MAX_WORKERS", "8"))
+
+# Outbound rate limits per upstream: requests per second (0 disables the limit)
+# and bursts. Buckets are shared by the jobs of a process ("memory") or by every
+# process through the database ("database")
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_TRANSCRIPT_PER_SECOND = float(
+    os.getenv("RATE_LIMIT_TRANSCRIPT_PER_SECOND", "2")
+)
+RATE_LIMIT_TRANSCRIPT_BURST = int(os.getenv("RATE_LIMIT_TRANSCRIPT_BURST", "5"))
+RATE_LIMIT_YT_DLP_PER_SECOND = float(os.getenv("RATE_LIMIT_YT_DLP_PER_SECOND", "1"))
+RATE_LIMIT_YT_DLP_BURST = int(os.getenv("RATE_LIMIT_YT_DLP_BURST", "3"))
+RATE_LIMIT_LLM_PER_SECOND = float(os.getenv("RATE_LIMIT_LLM_PER_SECOND", "5"))
+RATE_LIMIT_LLM_BURST = int(os.getenv("RATE_LIMIT_LLM_BURST", "10"))
+
+# Retries of transient upstream errors: attempts per call and the bounds of the
+# jittered exponential backoff between them. After CIRCUIT_FAILURE_THRESHOLD
+# consecutive transient failures, calls to the upstream fail fast for
+# CIRCUIT_RESET_SECONDS
+UPSTREAM_RETRY_ATTEMPTS = int(os.getenv("UPSTREAM_RETRY_ATTEMPTS", "3"))
+UPSTREAM_RETRY_BASE_DELAY_SECONDS = float(
+    os.getenv("UPSTREAM_RETRY_BASE_DELAY_SECONDS", "0.5")
+)
+UPSTREAM_RETRY_MAX_DELAY_SECONDS = float(
+    os.getenv("UPSTREAM_RETRY_MAX_DELAY_SECONDS", "8")
+)
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+# Durable job queue and workers
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "60"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_DELAY_SECONDS = int(os.getenv("JOB_RETRY_DELAY_SECONDS", "30"))
+WORKER_POLL_INTERVAL_SECONDS = float(os.getenv("WORKER_POLL_INTERVAL_SECONDS", "1"))
+# Run a worker inside the API process; disable when running `python -m app.worker`
+EMBEDDED_WORKER_ENABLED = os.getenv("EMBEDDED_WORKER_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Database connection pool (ignored for SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+DB_POOL_RECYCLE_SECONDS = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Chat progress events (Server-Sent Events)
+# Postgres NOTIFY channel that carries events between API and worker processes
+EVENTS_CHANNEL = os.getenv("EVENTS_CHANNEL", "chat_events")
+# Events buffered per subscriber before the oldest ones are dropped
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+
+# Chats created by one POST /chats:batch request
+CHAT_BATCH_MAX_ITEMS = int(os.getenv("CHAT_BATCH_MAX_ITEMS", "1000"))
+
+# Playlists and channels: videos made into chats per collection, and videos of
+# one collection processed at once across all workers
+COLLECTION_MAX_VIDEOS = int(os.getenv("COLLECTION_MAX_VIDEOS", "500"))
+COLLECTION_CONCURRENCY = int(os.getenv("COLLECTION_CONCURRENCY", "4"))
+
+# Chat history listing
+CHAT_LIST_DEFAULT_PAGE_SIZE = int(os.getenv("CHAT_LIST_DEFAULT_PAGE_SIZE", "20"))
+CHAT_LIST_MAX_PAGE_SIZE = int(os.getenv("CHAT_LIST_MAX_PAGE_SIZE", "100"))
+
+# Transcript storage: "zstd" (falls back to zlib when unavailable) or "zlib"
+TRANSCRIPT_CODEC = os.getenv("TRANSCRIPT_CODEC", "zstd")
+
+# Transcript retrieval: chunks of about RETRIEVAL_CHUNK_CHARS characters, each
+# repeating the last RETRIEVAL_CHUNK_OVERLAP_CHARS of the previous one
+RETRIEVAL_CHUNK_CHARS = int(os.getenv("RETRIEVAL_CHUNK_CHARS", "1200"))
+RETRIEVAL_CHUNK_OVERLAP_CHARS = int(os.getenv("RETRIEVAL_CHUNK_OVERLAP_CHARS", "200"))
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "5"))
+# Loaded chat indexes kept in memory for searches
+RETRIEVAL_INDEX_CACHE_ENTRIES = int(os.getenv("RETRIEVAL_INDEX_CACHE_ENTRIES", "64"))
+# Embedder: "hashing" (offline, deterministic) or "google" (Gemini embeddings)
+EMBEDDER = os.getenv("EMBEDDER", "hashing")
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "512"))
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+GOOGLE_EMBEDDING_MODEL = os.getenv("GOOGLE_EMBEDDING_MODEL", "models/embedding-001")
+
+# Loaded keyword search indexes kept in memory
+SEARCH_INDEX_CACHE_ENTRIES = int(os.getenv("SEARCH_INDEX_CACHE_ENTRIES", "64"))
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "50"))
+
+# Full-text search across chats
+CHAT_SEARCH_DEFAULT_PAGE_SIZE = int(os.getenv("CHAT_SEARCH_DEFAULT_PAGE_SIZE", "20"))
+CHAT_SEARCH_MAX_PAGE_SIZE = int(os.getenv("CHAT_SEARCH_MAX_PAGE_SIZE", "100"))
+# Transcript characters indexed per chat on Postgres (tsvectors are capped at 1MB)
+SEARCH_TRANSCRIPT_MAX_CHARS = int(os.getenv("SEARCH_TRANSCRIPT_MAX_CHARS", "500000"))
+
+# Chat messages
+# LLM answering questions: "google" (Gemini) or "fake" (scripted, offline)
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "google")
+GOOGLE_CHAT_MODEL = os.getenv("GOOGLE_CHAT_MODEL", "gemini-1.5-flash")
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.2"))
+MESSAGE_MAX_CHARS = int(os.getenv("MESSAGE_MAX_CHARS", "4000"))
+# Earlier messages of the conversation sent along with a question
+MESSAGE_HISTORY_MESSAGES = int(os.getenv("MESSAGE_HISTORY_MESSAGES", "10"))
+# Tokens of a prompt answering a question, and how they are counted
+# ("heuristic": about four characters per token)
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "8000"))
+PROMPT_TOKENIZER = os.getenv("PROMPT_TOKENIZER", "heuristic")
+# Recent answers whose timings are kept for the percentiles in /metrics
+MESSAGE_METRICS_SAMPLES = int(os.getenv("MESSAGE_METRICS_SAMPLES", "1000"))
+
+# Answers cached per video and question, so repeated questions skip the model
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "4096"))
+ANSWER_CACHE_TTL_SECONDS = int(os.getenv("ANSWER_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+# Minimum cosine similarity for a differently worded question to reuse an
+# answer (0 disables the similarity tier), and questions compared per video
+ANSWER_CACHE_SIMILARITY_THRESHOLD = float(
+    os.getenv("ANSWER_CACHE_SIMILARITY_THRESHOLD", "0")
+)
+ANSWER_CACHE_SIMILAR_QUESTIONS = int(os.getenv("ANSWER_CACHE_SIMILAR_QUESTIONS", "64"))
+
+# Summaries of processed chats: the transcript is cut into chunks of about
+# SUMMARY_CHUNK_CHARS characters that are summarized SUMMARY_CONCURRENCY at a
+# time, then their summaries are combined, in rounds if they don't fit in
+# SUMMARY_REDUCE_MAX_CHARS
+SUMMARY_CHUNK_CHARS = int(os.getenv("SUMMARY_CHUNK_CHARS", "16000"))
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "4"))
+SUMMARY_REDUCE_MAX_CHARS = int(os.getenv("SUMMARY_REDUCE_MAX_CHARS", "32000"))
+# Actionable items and suggested questions asked for
+SUMMARY_MAX_ITEMS = int(os.getenv("SUMMARY_MAX_ITEMS", "5"))
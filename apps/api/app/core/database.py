@@ -1,7 +1,22 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
+from .config import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE_SECONDS,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+)
+from .db_metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    get_pool_metrics,
+    instrument_engine,
+)
 
 # Use DATABASE_URL from environment variables
 SQLALCHEMY_DATABASE_URL = os.getenv(
@@ -11,15 +26,61 @@ SQLALCHEMY_DATABASE_URL = os.getenv(
 # Only create the engine when actually needed to avoid connection issues during import
 engine = None
 SessionLocal = None
+async_engine = None
+AsyncSessionLocal = None
 Base = declarative_base()
 
+# Async drivers used for each database backend
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def get_async_database_url(url: str = SQLALCHEMY_DATABASE_URL) -> str:
+    """Return the database URL with the async driver of its backend."""
+    database_url = make_url(url)
+    driver = ASYNC_DRIVERS.get(database_url.get_backend_name())
+    if driver is None:
+        return url
+    return database_url.set(
+        drivername=f"{database_url.get_backend_name()}+{driver}"
+    ).render_as_string(hide_password=False)
+
+
+def get_pool_options(url: str, poolclass, name: str) -> dict:
+    """
+    Return connection pool settings for create_engine, driven by the DB_POOL_*
+    settings. SQLite keeps SQLAlchemy's default pool.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_logging_name": name,
+    }
+
+
+def get_pool_stats() -> dict:
+    """Return the metrics of the connection pools created so far."""
+    stats = {}
+    if engine is not None:
+        stats["sync"] = get_pool_metrics("sync").snapshot(engine.pool)
+    if async_engine is not None:
+        stats["async"] = get_pool_metrics("async").snapshot(async_engine.pool)
+    return stats
+
 
 def get_engine():
     global engine
     if engine is None:
-        engine = create_engine(SQLALCHEMY_DATABASE_URL)
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
+        engine = create_engine(
+            SQLALCHEMY_DATABASE_URL,
+            **get_pool_options(SQLALCHEMY_DATABASE_URL, InstrumentedQueuePool, "sync"),
+        )
+        instrument_engine(engine, "sync")
     return engine
 
 
@@ -39,3 +100,91 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_async_engine():
+    global async_engine
+    if async_engine is None:
+        async_database_url = get_async_database_url()
+        async_engine = create_async_engine(
+            async_database_url,
+            **get_pool_options(
+                async_database_url, InstrumentedAsyncAdaptedQueuePool, "async"
+            ),
+        )
+        instrument_engine(async_engine.sync_engine, "async")
+    return async_engine
+
+
+def get_async_session_local():
+    global AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        AsyncSessionLocal = async_sessionmaker(
+            autoflush=False, expire_on_commit=False, bind=get_async_engine()
+        )
+    return AsyncSessionLocal
+
+
+async def get_async_db():
+    AsyncSessionLocal = get_async_session_local()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def init_db(bind=None) -> None:
+    """
+    Create missing tables, run pending migrations and open the pool's
+    connections up front.
+    Called once at startup so the first request doesn't pay for either.
+    """
+    # Import the models so that their tables are registered on Base.metadata
+    from ..models import (  # noqa: F401
+        chat,
+        chat_message,
+        chat_search,
+        chat_transcript,
+        collection,
+        job,
+        rate_limit,
+        transcript_index,
+        video_cache,
+    )
+    from ..migrations import run_migrations
+
+    bind = bind if bind is not None else get_engine()
+    Base.metadata.create_all(bind=bind)
+    # create_all skips existing tables, so add indexes declared since they were made
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+    run_migrations(bind)
+    warm_pool(bind)
+
+
+def warm_pool(bind) -> None:
+    """Check out as many connections as the pool keeps open, then return them."""
+    size = bind.pool.size() if hasattr(bind.pool, "size") else 1
+    connections = []
+    try:
+        for _ in range(size):
+            connection = bind.connect()
+            connections.append(connection)
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+async def warm_async_pool() -> None:
+    """Open the async pool's connections up front."""
+    bind = get_async_engine()
+    size = bind.pool.size() if hasattr(bind.pool, "size") else 1
+    connections = []
+    try:
+        for _ in range(size):
+            connection = await bind.connect()
+            connections.append(connection)
+            await connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            await connection.close()
@@ -0,0 +1,114 @@
+import threading
+import time
+from typing import Dict
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolMetrics:
+    """Counters for one connection pool, updated from pool events."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self.timeouts = 0
+        self.checkout_wait_count = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+
+    def observe_checkout_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkout_wait_count += 1
+            self.checkout_wait_total += seconds
+            self.checkout_wait_max = max(self.checkout_wait_max, seconds)
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool: Pool) -> dict:
+        """Return the counters together with the live state of pool."""
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "soft_invalidations": self.soft_invalidations,
+                "timeouts": self.timeouts,
+                "checkout_wait_seconds_avg": (
+                    self.checkout_wait_total / self.checkout_wait_count
+                    if self.checkout_wait_count
+                    else 0.0
+                ),
+                "checkout_wait_seconds_max": self.checkout_wait_max,
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                pool_size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(0, pool.overflow()),
+            )
+        return stats
+
+
+_pool_metrics: Dict[str, PoolMetrics] = {}
+_pool_metrics_lock = threading.Lock()
+
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    """Return the metrics of the pool registered under name."""
+    with _pool_metrics_lock:
+        if name not in _pool_metrics:
+            _pool_metrics[name] = PoolMetrics(name)
+        return _pool_metrics[name]
+
+
+class _CheckoutTimingMixin:
+    """Times how long callers wait for a connection from the pool."""
+
+    def _do_get(self):
+        metrics = get_pool_metrics(self._orig_logging_name or "default")
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            metrics.increment("timeouts")
+            raise
+        finally:
+            metrics.observe_checkout_wait(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool that records checkout wait times and timeouts."""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait times and timeouts."""
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    """Count connection pool events of engine under name."""
+    metrics = get_pool_metrics(name)
+
+    for event_name, counter in (
+        ("checkout", "checkouts"),
+        ("checkin", "checkins"),
+        ("connect", "connects"),
+        ("invalidate", "invalidations"),
+        ("soft_invalidate", "soft_invalidations"),
+    ):
+        event.listen(
+            engine,
+            event_name,
+            lambda *args, counter=counter: metrics.increment(counter),
+        )
+    return metrics
@@ -0,0 +1,327 @@
+"""
+Chat progress events.
+
+Video processing publishes events such as "transcript_fetched" through an
+event backend, which carries them to every API process. There, an EventBroker
+fans them out to the asyncio queues of the clients subscribed to the chat.
+
+Postgres deployments use LISTEN/NOTIFY so that events published by standalone
+workers reach the API processes. Other databases, such as the SQLite used in
+tests, fall back to an in-memory backend that only reaches this process.
+"""
+
+import asyncio
+import json
+import select
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from .clock import utcnow
+from .config import EVENTS_CHANNEL, EVENTS_QUEUE_SIZE
+from .database import get_engine
+from .logging import setup_logging
+
+logger = setup_logging()
+
+# Event types published while a chat is processed
+TRANSCRIPT_FETCHED = "transcript_fetched"
+METADATA_FETCHED = "metadata_fetched"
+PROCESSED = "processed"
+ERROR = "error"
+# Events after which nothing more is published for a chat
+TERMINAL_EVENTS = (PROCESSED, ERROR)
+
+
+@dataclass
+class ChatEvent:
+    chat_id: str
+    type: str
+    data: dict = field(default_factory=dict)
+    timestamp: str = field(default_factory=lambda: utcnow().isoformat())
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "chat_id": self.chat_id,
+                "type": self.type,
+                "data": self.data,
+                "timestamp": self.timestamp,
+            },
+            default=str,
+        )
+
+    @classmethod
+    def from_json(cls, payload: str) -> "ChatEvent":
+        return cls(**json.loads(payload))
+
+    def to_sse(self) -> str:
+        """Format the event as a Server-Sent Events message."""
+        return f"event: {self.type}\ndata: {self.to_json()}\n\n"
+
+
+class MemoryEventBackend:
+    """Delivers events to the listeners of this process only."""
+
+    def __init__(self):
+        self._listeners: List[Callable[[ChatEvent], None]] = []
+        self._lock = threading.Lock()
+
+    def publish(self, event: ChatEvent) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(event)
+
+    def listen(self, callback: Callable[[ChatEvent], None]) -> None:
+        with self._lock:
+            self._listeners.append(callback)
+
+    def unlisten(self, callback: Callable[[ChatEvent], None]) -> None:
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+
+class PostgresEventBackend:
+    """
+    Carries events between processes with Postgres NOTIFY. Each listening
+    process keeps one dedicated connection, outside the pool, in a thread.
+    """
+
+    def __init__(self, engine: Engine, channel: str = EVENTS_CHANNEL):
+        self.engine = engine
+        self.channel = channel
+        self._listeners: List[Callable[[ChatEvent], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, event: ChatEvent) -> None:
+        with self.engine.begin() as connection:
+            connection.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self.channel, "payload": event.to_json()},
+            )
+
+    def listen(self, callback: Callable[[ChatEvent], None]) -> None:
+        with self._lock:
+            self._listeners.append(callback)
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._listen_forever, name="chat-events", daemon=True
+                )
+                self._thread.start()
+
+    def unlisten(self, callback: Callable[[ChatEvent], None]) -> None:
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+            if self._listeners or self._thread is None:
+                return
+            thread, self._thread = self._thread, None
+        self._stop.set()
+        thread.join(timeout=5)
+
+    def _deliver(self, payload: str) -> None:
+        try:
+            event = ChatEvent.from_json(payload)
+        except (TypeError, ValueError):
+            logger.warning("Ignoring malformed chat event", extra={"payload": payload})
+            return
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(event)
+
+    def _listen_forever(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception as e:
+                logger.error(
+                    "Chat event listener failed, reconnecting",
+                    extra={"channel": self.channel, "error": str(e)},
+                    exc_info=True,
+                )
+                self._stop.wait(1)
+
+    def _listen(self) -> None:
+        connection = self.engine.raw_connection()
+        # The listening connection lives as long as the thread, keep it out of the pool
+        connection.detach()
+        try:
+            driver_connection = connection.driver_connection
+            driver_connection.autocommit = True
+            with driver_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            logger.info("Listening for chat events", extra={"channel": self.channel})
+            while not self._stop.is_set():
+                # Wake up regularly to check whether the listener was stopped
+                if select.select([driver_connection], [], [], 1.0) == ([], [], []):
+                    continue
+                driver_connection.poll()
+                while driver_connection.notifies:
+                    self._deliver(driver_connection.notifies.pop(0).payload)
+        finally:
+            connection.close()
+
+
+_memory_backend = MemoryEventBackend()
+_postgres_backends: Dict[Engine, PostgresEventBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_event_backend(engine: Engine):
+    """
+    Return the event backend for the database of engine.
+    Postgres uses LISTEN/NOTIFY; other databases such as the SQLite used in
+    tests fall back to the in-memory backend of this process.
+    """
+    if getattr(getattr(engine, "dialect", None), "name", None) != "postgresql":
+        return _memory_backend
+    with _backends_lock:
+        if engine not in _postgres_backends:
+            _postgres_backends[engine] = PostgresEventBackend(engine)
+        return _postgres_backends[engine]
+
+
+def publish_chat_event(backend, chat_id, event_type: str, **data) -> None:
+    """
+    Publish an event for a chat. Failures are logged, never raised, so that
+    progress reporting cannot fail the processing it reports on.
+    """
+    event = ChatEvent(chat_id=str(chat_id), type=event_type, data=data)
+    try:
+        backend.publish(event)
+    except Exception as e:
+        logger.warning(
+            "Failed to publish chat event",
+            extra={"chat_id": str(chat_id), "type": event_type, "error": str(e)},
+        )
+
+
+class Subscription:
+    """Events of one chat for one client, buffered in an asyncio queue."""
+
+    def __init__(self, broker: "EventBroker", chat_id: str, queue_size: int):
+        self.broker = broker
+        self.chat_id = chat_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    def _put(self, event: ChatEvent) -> None:
+        # Runs on the subscriber's event loop
+        if self.queue.full():
+            # Slow client: drop the oldest event rather than block the broker
+            self.queue.get_nowait()
+            self.broker._dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[ChatEvent]:
+        """Wait for the next event; return None if none arrives within timeout."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker._unsubscribe(self)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class EventBroker:
+    """Fans out the events received from a backend to the subscribed clients."""
+
+    def __init__(self, backend, queue_size: int = EVENTS_QUEUE_SIZE):
+        self.backend = backend
+        self.queue_size = queue_size
+        self._subscriptions: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._listening = False
+        self._delivered = 0
+        self._dropped = 0
+
+    def subscribe(self, chat_id: str) -> Subscription:
+        """Subscribe the running event loop to the events of a chat."""
+        subscription = Subscription(self, str(chat_id), self.queue_size)
+        with self._lock:
+            self._subscriptions[subscription.chat_id].add(subscription)
+            start_listening = not self._listening
+            self._listening = True
+        if start_listening:
+            self.backend.listen(self._dispatch)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.chat_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.chat_id]
+
+    def _dispatch(self, event: ChatEvent) -> None:
+        # Called from whichever thread the backend delivers events on
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(event.chat_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._put, event)
+                self._delivered += 1
+            except RuntimeError:
+                # The subscriber's event loop is closed
+                self._unsubscribe(subscription)
+
+    def close(self) -> None:
+        """Stop receiving events from the backend."""
+        with self._lock:
+            listening, self._listening = self._listening, False
+            self._subscriptions.clear()
+        if listening:
+            self.backend.unlisten(self._dispatch)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "chats": len(self._subscriptions),
+                "subscribers": sum(len(s) for s in self._subscriptions.values()),
+                "delivered": self._delivered,
+                "dropped": self._dropped,
+            }
+
+
+_event_broker: Optional[EventBroker] = None
+_event_broker_lock = threading.Lock()
+
+
+def get_event_broker() -> EventBroker:
+    """Return the process-wide broker that feeds chat event streams."""
+    global _event_broker
+    with _event_broker_lock:
+        if _event_broker is None:
+            _event_broker = EventBroker(get_event_backend(get_engine()))
+        return _event_broker
+
+
+def get_event_stats() -> dict:
+    """Return the stats of the process-wide broker, if one was created."""
+    broker = _event_broker
+    return broker.stats() if broker is not None else {}
+
+
+def shutdown_event_broker() -> None:
+    """Close the process-wide broker, if one was created."""
+    global _event_broker
+    with _event_broker_lock:
+        broker, _event_broker = _event_broker, None
+    if broker is not None:
+        broker.close()
@@ -18,3 +18,17 @@ class VideoProcessingError(ChatWithVidException):
     def __init__(self, message: str = "Error processing video"):
         self.message = message
         super().__init__(self.message)
+
+
+class TransientVideoError(VideoProcessingError):
+    """Exception raised for video processing errors that may pass on a retry."""
+
+    pass
+
+
+class ProcessingQueueFullError(ChatWithVidException):
+    """Exception raised when the video processing pool cannot accept more jobs."""
+
+    def __init__(self, message: str = "Video processing queue is full"):
+        self.message = message
+        super().__init__(self.message)
@@ -0,0 +1,190 @@
+"""
+Inverted index of one chat's transcript for BM25 keyword search.
+
+Documents are the transcript's segments (or lines, without timings). For each
+term the index keeps the documents it occurs in and how often, as flat arrays:
+the postings of term t are docs[term_starts[t]:term_starts[t + 1]] with the
+matching tfs. A query only touches the postings of its own terms, and scores
+them with vectorized NumPy operations, so its cost doesn't grow with the length
+of the transcript.
+"""
+
+import re
+import struct
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# BM25 term frequency saturation and document length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+# Format version, document count and vocabulary size of serialized indexes
+_HEADER = struct.Struct("<4sII")
+_MAGIC = b"KWI1"
+
+
+def tokenize(text: str) -> List[str]:
+    return [token.casefold() for token in _TOKEN_PATTERN.findall(text)]
+
+
+def _pack(*arrays: Tuple[str, Iterable]) -> bytes:
+    return b"".join(
+        np.ascontiguousarray(values, dtype=dtype).tobytes() for dtype, values in arrays
+    )
+
+
+class KeywordIndex:
+    def __init__(
+        self,
+        vocabulary: Dict[str, int],
+        term_starts: np.ndarray,
+        docs: np.ndarray,
+        tfs: np.ndarray,
+        doc_lengths: np.ndarray,
+        doc_offsets: np.ndarray,
+        doc_times: np.ndarray,
+    ):
+        self.vocabulary = vocabulary
+        self.term_starts = term_starts
+        self.docs = docs
+        self.tfs = tfs
+        self.doc_lengths = doc_lengths
+        # Character range of document i in the transcript text:
+        # doc_offsets[i] to doc_offsets[i + 1] - 1 (the texts are newline-joined)
+        self.doc_offsets = doc_offsets
+        # (start, end) seconds of each document, NaN without timings
+        self.doc_times = doc_times
+        average_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+        # BM25 length normalization of each document, computed once
+        self._norms = BM25_K1 * (
+            1 - BM25_B + BM25_B * doc_lengths / max(average_length, 1.0)
+        )
+
+    @classmethod
+    def build(
+        cls, documents: Iterable[Tuple[str, Optional[float], Optional[float]]]
+    ) -> "KeywordIndex":
+        """
+        Index (text, start_seconds, end_seconds) documents. Their texts joined
+        with newlines are the transcript that search offsets point into.
+        """
+        postings: Dict[str, Dict[int, int]] = {}
+        doc_lengths, doc_offsets, doc_times = array("I"), array("I", [0]), []
+        for doc, (text, start, end) in enumerate(documents):
+            tokens = tokenize(text)
+            for token in tokens:
+                term_docs = postings.setdefault(token, {})
+                term_docs[doc] = term_docs.get(doc, 0) + 1
+            doc_lengths.append(len(tokens))
+            doc_offsets.append(doc_offsets[-1] + len(text) + 1)
+            doc_times.append(
+                (
+                    np.nan if start is None else start,
+                    np.nan if end is None else end,
+                )
+            )
+
+        terms = sorted(postings)
+        term_starts, docs, tfs = [0], [], []
+        for term in terms:
+            for doc, tf in postings[term].items():
+                docs.append(doc)
+                tfs.append(min(tf, 0xFFFF))
+            term_starts.append(len(docs))
+        return cls(
+            {term: index for index, term in enumerate(terms)},
+            np.asarray(term_starts, dtype=np.uint32),
+            np.asarray(docs, dtype=np.uint32),
+            np.asarray(tfs, dtype=np.uint16),
+            np.asarray(doc_lengths, dtype=np.uint32),
+            np.asarray(doc_offsets, dtype=np.uint32),
+            np.asarray(doc_times, dtype=np.float64).reshape(-1, 2),
+        )
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def search(self, query: str, k: int) -> List[Tuple[int, float]]:
+        """Return the (document, score) of the k best BM25 matches, best first."""
+        terms = {self.vocabulary.get(token) for token in tokenize(query)} - {None}
+        if not terms or k <= 0:
+            return []
+        candidates, scores = [], []
+        for term in terms:
+            start, stop = self.term_starts[term], self.term_starts[term + 1]
+            docs = self.docs[start:stop]
+            tfs = self.tfs[start:stop].astype(np.float64)
+            idf = np.log1p((len(self) - len(docs) + 0.5) / (len(docs) + 0.5))
+            candidates.append(docs)
+            scores.append(idf * tfs * (BM25_K1 + 1) / (tfs + self._norms[docs]))
+        # Sum the scores of documents matching several terms
+        docs, inverse = np.unique(np.concatenate(candidates), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate(scores))
+        if k < len(docs):
+            top = np.argpartition(totals, -k)[-k:]
+        else:
+            top = np.arange(len(docs))
+        top = top[np.argsort(-totals[top], kind="stable")]
+        return [(int(docs[i]), float(totals[i])) for i in top]
+
+    def document_span(self, doc: int) -> Tuple[int, int]:
+        """Return the character range of a document in the transcript text."""
+        return int(self.doc_offsets[doc]), int(self.doc_offsets[doc + 1]) - 1
+
+    def document_times(self, doc: int) -> Tuple[Optional[float], Optional[float]]:
+        start, end = self.doc_times[doc]
+        return (
+            None if np.isnan(start) else float(start),
+            None if np.isnan(end) else float(end),
+        )
+
+    def to_bytes(self) -> bytes:
+        vocabulary = "\n".join(sorted(self.vocabulary, key=self.vocabulary.get))
+        return b"".join(
+            (
+                _HEADER.pack(_MAGIC, len(self), len(self.vocabulary)),
+                _pack(
+                    ("<u4", self.term_starts),
+                    ("<u4", self.doc_lengths),
+                    ("<u4", self.doc_offsets),
+                    ("<f8", self.doc_times.ravel()),
+                    ("<u4", self.docs),
+                    ("<u2", self.tfs),
+                ),
+                vocabulary.encode("utf-8"),
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "KeywordIndex":
+        magic, doc_count, term_count = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a serialized keyword index")
+        position = _HEADER.size
+
+        def read(dtype: str, count: int) -> np.ndarray:
+            nonlocal position
+            values = np.frombuffer(data, dtype=dtype, count=count, offset=position)
+            position += values.nbytes
+            return values
+
+        term_starts = read("<u4", term_count + 1)
+        doc_lengths = read("<u4", doc_count)
+        doc_offsets = read("<u4", doc_count + 1)
+        doc_times = read("<f8", 2 * doc_count).reshape(-1, 2)
+        postings = int(term_starts[-1])
+        docs = read("<u4", postings)
+        tfs = read("<u2", postings)
+        terms = data[position:].decode("utf-8").split("\n") if term_count else []
+        return cls(
+            {term: index for index, term in enumerate(terms)},
+            term_starts,
+            docs,
+            tfs,
+            doc_lengths,
+            doc_offsets,
+            doc_times,
+        )
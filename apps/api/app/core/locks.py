@@ -0,0 +1,120 @@
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterator, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from .logging import setup_logging
+
+logger = setup_logging()
+
+
+def advisory_key(name: str) -> int:
+    """Map a string key to a stable signed 64-bit Postgres advisory lock key."""
+    digest = hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class KeyedLock:
+    """In-process mutual exclusion per key, for threads of a single process."""
+
+    def __init__(self):
+        self._locks: Dict[Hashable, list] = {}
+        self._guard = threading.Lock()
+
+    @contextmanager
+    def hold(self, key: Hashable, timeout: Optional[float] = None) -> Iterator[bool]:
+        """
+        Hold the lock for key while the block runs.
+        Yields False if the lock could not be acquired within timeout.
+        """
+        with self._guard:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        lock = entry[0]
+        acquired = lock.acquire(timeout=-1 if timeout is None else timeout)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                lock.release()
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+
+class AdvisoryLock:
+    """
+    Cross-process lock per key backed by Postgres session advisory locks.
+
+    Waiters in the same process queue on a KeyedLock first so that only one
+    pooled connection per key is held while waiting.
+    """
+
+    def __init__(self, engine: Engine, local: KeyedLock, namespace: str):
+        self.engine = engine
+        self.local = local
+        self.namespace = namespace
+
+    @contextmanager
+    def hold(self, key: str, timeout: Optional[float] = None) -> Iterator[bool]:
+        """
+        Hold the lock for key while the block runs.
+        Yields False if the lock could not be acquired within timeout.
+        """
+        name = f"{self.namespace}:{key}"
+        with self.local.hold(name, timeout) as acquired:
+            if not acquired:
+                yield False
+                return
+            lock_key = advisory_key(name)
+            with self.engine.connect() as conn:
+                try:
+                    if timeout is not None:
+                        conn.exec_driver_sql(
+                            f"SET LOCAL lock_timeout = '{int(timeout * 1000)}ms'"
+                        )
+                    conn.execute(
+                        text("SELECT pg_advisory_lock(:key)"), {"key": lock_key}
+                    )
+                except OperationalError as e:
+                    logger.warning(
+                        "Timed out waiting for advisory lock",
+                        extra={"lock_key": key, "error": str(e)},
+                    )
+                    conn.rollback()
+                    yield False
+                    return
+                try:
+                    yield True
+                finally:
+                    conn.execute(
+                        text("SELECT pg_advisory_unlock(:key)"), {"key": lock_key}
+                    )
+                    conn.rollback()
+
+
+class _NamespacedKeyedLock:
+    def __init__(self, local: KeyedLock, namespace: str):
+        self.local = local
+        self.namespace = namespace
+
+    def hold(self, key: str, timeout: Optional[float] = None):
+        return self.local.hold(f"{self.namespace}:{key}", timeout)
+
+
+# Shared by every lock in the process so threads coordinate with each other
+_local_locks = KeyedLock()
+
+
+def get_keyed_lock(engine: Engine, namespace: str):
+    """
+    Return a lock that serializes work per key across API and worker processes.
+    Postgres uses advisory locks; other databases such as the SQLite used in tests
+    fall back to an in-process lock.
+    """
+    if getattr(getattr(engine, "dialect", None), "name", None) == "postgresql":
+        return AdvisoryLock(engine, _local_locks, namespace)
+    return _NamespacedKeyedLock(_local_locks, namespace)
@@ -0,0 +1,43 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, item_id) -> str:
+    """Encode the (created_at, id) position of a list item as an opaque cursor."""
+    payload = json.dumps([created_at.isoformat(), str(item_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor made by encode_cursor into (created_at, id).
+    Raises ValueError for cursors that were not made by encode_cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), UUID(item_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_score_cursor(score: float, item_id) -> str:
+    """Encode the (score, id) position of a ranked result as an opaque cursor."""
+    # repr round-trips floats exactly, so the next page resumes at the same score
+    payload = json.dumps([repr(float(score)), str(item_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_score_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor made by encode_score_cursor into (score, id).
+    Raises ValueError for cursors that were not made by encode_score_cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, item_id = json.loads(base64.urlsafe_b64decode(padded))
+        return float(score), UUID(item_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
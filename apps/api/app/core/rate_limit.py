@@ -0,0 +1,206 @@
+"""
+Outbound rate limits per upstream.
+
+Each upstream (the YouTube transcript API, yt-dlp and the chat model) has a
+token bucket refilled at a steady rate up to a burst. Callers take a token and
+wait until it is theirs instead of failing, so bulk imports keep a sustained
+pace below the rate at which the upstream starts throttling.
+
+A caller that finds the bucket empty reserves the next token to be refilled,
+taking the bucket below zero, and sleeps until then. Waiters are thus served in
+order, without polling the bucket.
+
+Buckets are shared by every thread of a process. With RATE_LIMIT_BACKEND set to
+"database" they live in the rate_limit_buckets table instead, and are shared by
+every API and worker process.
+"""
+
+import asyncio
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict
+from sqlalchemy.exc import SQLAlchemyError
+from .config import (
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_LLM_BURST,
+    RATE_LIMIT_LLM_PER_SECOND,
+    RATE_LIMIT_TRANSCRIPT_BURST,
+    RATE_LIMIT_TRANSCRIPT_PER_SECOND,
+    RATE_LIMIT_YT_DLP_BURST,
+    RATE_LIMIT_YT_DLP_PER_SECOND,
+)
+from .logging import setup_logging
+
+logger = setup_logging()
+
+# Rate limited upstreams
+YOUTUBE_TRANSCRIPT = "youtube_transcript"
+YT_DLP = "yt_dlp"
+LLM = "llm"
+
+_LIMITS = {
+    YOUTUBE_TRANSCRIPT: (RATE_LIMIT_TRANSCRIPT_PER_SECOND, RATE_LIMIT_TRANSCRIPT_BURST),
+    YT_DLP: (RATE_LIMIT_YT_DLP_PER_SECOND, RATE_LIMIT_YT_DLP_BURST),
+    LLM: (RATE_LIMIT_LLM_PER_SECOND, RATE_LIMIT_LLM_BURST),
+}
+
+
+class RateLimiter(ABC):
+    """
+    Token bucket of rate tokens per second, holding at most burst tokens.
+    A rate of 0 disables the limit. Subclasses implement reserve.
+    """
+
+    # Whether reserve does I/O, and must not run on the event loop
+    blocking = False
+
+    def __init__(self, name: str, rate: float, burst: int):
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waits = 0
+        self.waited_seconds = 0.0
+
+    @abstractmethod
+    def reserve(self, tokens: float) -> float:
+        """Take tokens, returning the seconds to wait until they are available."""
+
+    def _reserve(self, tokens: float) -> float:
+        wait = self.reserve(tokens) if self.rate > 0 else 0.0
+        with self._lock:
+            self.acquired += 1
+            if wait > 0:
+                self.waits += 1
+                self.waited_seconds += wait
+        return wait
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Wait until tokens are available; return the seconds waited."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """acquire for coroutines, waiting without blocking the event loop."""
+        if self.blocking and self.rate > 0:
+            wait = await asyncio.to_thread(self._reserve, tokens)
+        else:
+            wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "acquired": self.acquired,
+                "waits": self.waits,
+                "waited_seconds": round(self.waited_seconds, 3),
+            }
+
+
+class TokenBucket(RateLimiter):
+    """Bucket shared by the threads of this process."""
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(name, rate, burst)
+        self._clock = clock
+        self._bucket_lock = threading.Lock()
+        self._tokens = float(burst)
+        self._refilled_at = clock()
+
+    def reserve(self, tokens: float) -> float:
+        with self._bucket_lock:
+            now = self._clock()
+            available = min(
+                self.burst, self._tokens + (now - self._refilled_at) * self.rate
+            )
+            self._tokens = available - tokens
+            self._refilled_at = now
+        return max(tokens - available, 0) / self.rate
+
+
+class DatabaseTokenBucket(RateLimiter):
+    """
+    Bucket stored in the rate_limit_buckets table, shared by every process
+    using the database. Timestamps are Unix times, so hosts need synchronized
+    clocks.
+    """
+
+    blocking = True
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int,
+        session_factory: Callable,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(name, rate, burst)
+        self.session_factory = session_factory
+        self._clock = clock
+
+    def reserve(self, tokens: float) -> float:
+        from ..repository.rate_limit import RateLimitRepository
+
+        try:
+            with self.session_factory() as db:
+                return RateLimitRepository(db).reserve(
+                    self.name, self.rate, self.burst, tokens, self._clock()
+                )
+        except SQLAlchemyError as e:
+            # An unavailable bucket must not fail the call it limits
+            logger.warning(
+                "Rate limit bucket unavailable, continuing without it",
+                extra={"upstream": self.name, "error": str(e)},
+            )
+            return 0.0
+
+
+def create_rate_limiter(upstream: str) -> RateLimiter:
+    """Create the limiter of an upstream with the backend of RATE_LIMIT_BACKEND."""
+    try:
+        rate, burst = _LIMITS[upstream]
+    except KeyError:
+        raise ValueError(f"Unknown upstream: {upstream}")
+    if RATE_LIMIT_BACKEND == "memory":
+        return TokenBucket(upstream, rate, burst)
+    if RATE_LIMIT_BACKEND == "database":
+        from .database import get_session_local
+
+        return DatabaseTokenBucket(upstream, rate, burst, get_session_local())
+    raise ValueError(f"Unknown rate limit backend: {RATE_LIMIT_BACKEND}")
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(upstream: str) -> RateLimiter:
+    """Return the limiter of an upstream shared by every job of the process."""
+    with _rate_limiters_lock:
+        if upstream not in _rate_limiters:
+            _rate_limiters[upstream] = create_rate_limiter(upstream)
+        return _rate_limiters[upstream]
+
+
+def get_rate_limit_stats() -> dict:
+    """Return the metrics of the limiters used so far."""
+    with _rate_limiters_lock:
+        limiters = list(_rate_limiters.values())
+    return {limiter.name: limiter.stats() for limiter in limiters}
@@ -0,0 +1,192 @@
+"""
+Retries and circuit breakers for calls to upstream services.
+
+Transient errors (network failures, throttling) are retried a few times, after
+exponentially growing delays with full jitter: each delay is drawn uniformly
+between 0 and the exponential bound, so jobs that failed together don't retry
+together. Permanent errors (a video without transcripts) are raised at once.
+
+Each upstream also has a circuit breaker. After CIRCUIT_FAILURE_THRESHOLD
+consecutive transient failures it opens, and calls fail fast with
+CircuitOpenError instead of adding load to an upstream that is down. After
+CIRCUIT_RESET_SECONDS one trial call is let through: its success closes the
+circuit again, its failure keeps it open for another period.
+"""
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from .config import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+    UPSTREAM_RETRY_ATTEMPTS,
+    UPSTREAM_RETRY_BASE_DELAY_SECONDS,
+    UPSTREAM_RETRY_MAX_DELAY_SECONDS,
+)
+from .exceptions import ChatWithVidException
+from .logging import setup_logging
+
+logger = setup_logging()
+
+# States of circuit breakers
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ChatWithVidException):
+    """Exception raised for calls to an upstream whose circuit is open."""
+
+    def __init__(self, upstream: str, retry_after: float):
+        self.upstream = upstream
+        self.retry_after = retry_after
+        self.message = f"{upstream} is unavailable, retry in {retry_after:.0f}s"
+        super().__init__(self.message)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = UPSTREAM_RETRY_ATTEMPTS
+    base_delay: float = UPSTREAM_RETRY_BASE_DELAY_SECONDS
+    max_delay: float = UPSTREAM_RETRY_MAX_DELAY_SECONDS
+
+    def delay(self, retry: int, rng: random.Random) -> float:
+        """Seconds to wait before retry number retry (from 0), with full jitter."""
+        return rng.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker of an upstream."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_seconds: float = CIRCUIT_RESET_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self.opened = 0
+        self.rejected = 0
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if the call must not go to the upstream."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            retry_after = self._opened_at + self.reset_seconds - self._clock()
+            if self.state == OPEN and retry_after <= 0:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+            self.rejected += 1
+            raise CircuitOpenError(self.name, max(retry_after, 0))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.opened += 1
+                    logger.warning(
+                        "Circuit opened",
+                        extra={"upstream": self.name, "failures": self.failures},
+                    )
+                self.state = OPEN
+                self._opened_at = self._clock()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "opened": self.opened,
+                "rejected": self.rejected,
+            }
+
+
+def call_with_retry(
+    fn: Callable,
+    is_retryable: Callable[[Exception], bool],
+    policy: Optional[RetryPolicy] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    sleep: Optional[Callable[[float], None]] = None,
+    rng: Optional[random.Random] = None,
+):
+    """
+    Call fn until it succeeds, retrying the errors is_retryable accepts up to
+    the attempts of policy. Errors that aren't retried are raised as is, and
+    CircuitOpenError once breaker opens.
+    """
+    policy = policy if policy is not None else RetryPolicy()
+    sleep = sleep if sleep is not None else time.sleep
+    rng = rng if rng is not None else random
+    for attempt in range(policy.attempts):
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = fn()
+        except Exception as e:
+            retryable = is_retryable(e)
+            if breaker is not None:
+                # Permanent errors are answers from an upstream that is up
+                if retryable:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            if not retryable or attempt == policy.attempts - 1:
+                raise
+            delay = policy.delay(attempt, rng)
+            logger.warning(
+                "Transient upstream error, retrying",
+                extra={
+                    "upstream": breaker.name if breaker is not None else None,
+                    "attempt": attempt + 1,
+                    "delay": f"{delay:.2f}s",
+                    "error": str(e),
+                },
+            )
+            sleep(delay)
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(upstream: str) -> CircuitBreaker:
+    """Return the circuit breaker of an upstream shared by the whole process."""
+    with _circuit_breakers_lock:
+        if upstream not in _circuit_breakers:
+            _circuit_breakers[upstream] = CircuitBreaker(upstream)
+        return _circuit_breakers[upstream]
+
+
+def get_circuit_breaker_stats() -> dict:
+    """Return the state of the circuit breakers used so far."""
+    with _circuit_breakers_lock:
+        breakers = list(_circuit_breakers.values())
+    return {breaker.name: breaker.stats() for breaker in breakers}
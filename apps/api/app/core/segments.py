@@ -0,0 +1,134 @@
+"""
+Timed transcript segments in a compact columnar form.
+
+Segment i starts at starts[i] seconds, lasts durations[i] seconds and its text
+is text[offsets[i]:offsets[i + 1] - 1]: the texts are joined with newlines into
+one string, which is also the plain transcript. The timings (starts, durations
+and offsets) serialize to a few bytes per segment, apart from the text.
+"""
+
+import struct
+import sys
+from functools import cached_property
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, Tuple
+
+# Format version and segment count of serialized timings
+_HEADER = struct.Struct("<4sI")
+_MAGIC = b"TSG1"
+
+
+def _to_little_endian(values: array) -> bytes:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+class TranscriptSegments:
+    def __init__(self, starts: array, durations: array, text: str, offsets: array):
+        self.starts = starts
+        self.durations = durations
+        self.text = text
+        self.offsets = offsets
+
+    @classmethod
+    def from_snippets(
+        cls, snippets: Iterable[Tuple[str, float, float]]
+    ) -> "TranscriptSegments":
+        """Build segments from (text, start, duration) tuples ordered by start."""
+        starts, durations, offsets, texts = array("d"), array("d"), array("I"), []
+        offset = 0
+        for text, start, duration in snippets:
+            starts.append(start)
+            durations.append(duration)
+            offsets.append(offset)
+            texts.append(text)
+            offset += len(text) + 1
+        offsets.append(offset)
+        return cls(starts, durations, "\n".join(texts), offsets)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TranscriptSegments):
+            return NotImplemented
+        return (
+            self.starts == other.starts
+            and self.durations == other.durations
+            and self.offsets == other.offsets
+            and self.text == other.text
+        )
+
+    def __repr__(self) -> str:
+        return f"TranscriptSegments({len(self)} segments, {len(self.text)} chars)"
+
+    def segment(self, index: int) -> dict:
+        return {
+            "start": self.starts[index],
+            "duration": self.durations[index],
+            "text": self.text[self.offsets[index] : self.offsets[index + 1] - 1],
+        }
+
+    @cached_property
+    def _max_ends(self) -> array:
+        """Running maximum of the segment ends; non-decreasing, so bisectable."""
+        max_ends, max_end = array("d"), float("-inf")
+        for start, duration in zip(self.starts, self.durations):
+            max_end = max(max_end, start + duration)
+            max_ends.append(max_end)
+        return max_ends
+
+    def window(self, start: float, end: float) -> list:
+        """Return the indexes of the segments overlapping [start, end)."""
+        stop = bisect_left(self.starts, end)
+        # No segment before the first running end past start can still be running
+        first = bisect_right(self._max_ends, start, hi=stop)
+        return [
+            index
+            for index in range(first, stop)
+            if self.starts[index] + self.durations[index] > start
+            or self.starts[index] >= start
+        ]
+
+    def iter_window(self, start: float, end: float) -> Iterator[dict]:
+        """Yield the segments overlapping [start, end) as dicts."""
+        for index in self.window(start, end):
+            yield self.segment(index)
+
+    def timings_to_bytes(self) -> bytes:
+        """Serialize the starts, durations and offsets; the text is kept apart."""
+        return b"".join(
+            (
+                _HEADER.pack(_MAGIC, len(self)),
+                _to_little_endian(self.starts),
+                _to_little_endian(self.durations),
+                _to_little_endian(self.offsets),
+            )
+        )
+
+    @classmethod
+    def from_bytes(cls, timings: bytes, text: str) -> "TranscriptSegments":
+        """Rebuild segments from timings_to_bytes() output and their text."""
+        magic, count = _HEADER.unpack_from(timings)
+        if magic != _MAGIC:
+            raise ValueError("Not serialized transcript segment timings")
+        position = _HEADER.size
+        starts = _from_little_endian("d", timings[position : position + 8 * count])
+        position += 8 * count
+        durations = _from_little_endian("d", timings[position : position + 8 * count])
+        position += 8 * count
+        offsets = _from_little_endian("I", timings[position:])
+        if len(offsets) != count + 1:
+            raise ValueError("Truncated transcript segment timings")
+        return cls(starts, durations, text, offsets)
@@ -0,0 +1,43 @@
+"""
+In-memory vector index of one chat's transcript chunks.
+
+Vectors are the rows of a float32 matrix, normalized to unit length, so one
+matrix-vector product scores every chunk against a query by cosine similarity.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+
+class VectorIndex:
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+    @property
+    def dimensions(self) -> int:
+        return self.vectors.shape[1]
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """Return the (row, score) of the k rows most similar to query, best first."""
+        if k <= 0 or len(self) == 0:
+            return []
+        scores = self.vectors @ np.asarray(query, dtype=np.float32)
+        if k < len(self):
+            # Select the top k in linear time, then sort only those
+            top = np.argpartition(scores, -k)[-k:]
+        else:
+            top = np.arange(len(self))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(row), float(scores[row])) for row in top]
+
+    def to_bytes(self) -> bytes:
+        return self.vectors.astype("<f4", copy=False).tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, dimensions: int) -> "VectorIndex":
+        vectors = np.frombuffer(data, dtype="<f4").reshape(-1, dimensions)
+        return cls(vectors.astype(np.float32, copy=False))
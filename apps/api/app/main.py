@@ -1,15 +1,52 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from .api.v1 import chats as chats_router
+from .api.v1 import collections as collections_router
+from .api.v1 import metrics as metrics_router
 from .core.logging import setup_logging
+from .core.config import EMBEDDED_WORKER_ENABLED
+from .core.database import init_db, warm_async_pool
+from .core.events import shutdown_event_broker
+from .services.processing import get_processing_pool, shutdown_processing_pool
+from .worker import Worker
+import asyncio
 import time
 
 # Set up logging
 logger = setup_logging()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Check the schema and open database connections before taking traffic
+    start_time = time.perf_counter()
+    await asyncio.to_thread(init_db)
+    await warm_async_pool()
+    logger.info(
+        "Database initialized",
+        extra={"startup_time": f"{time.perf_counter() - start_time:.4f}s"},
+    )
+
+    worker = None
+    if EMBEDDED_WORKER_ENABLED:
+        # Process jobs in the API process too, for single-container deployments
+        worker = Worker(pool=get_processing_pool())
+        worker.start()
+    yield
+    # Let running video processing jobs finish before the process exits
+    if worker is not None:
+        logger.info("Stopping embedded worker")
+        worker.stop()
+    shutdown_processing_pool(wait=True)
+    shutdown_event_broker()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Include API routers
 app.include_router(chats_router.router, prefix="/api/v1", tags=["chats"])
+app.include_router(collections_router.router, prefix="/api/v1", tags=["collections"])
+app.include_router(metrics_router.router, prefix="/api/v1", tags=["metrics"])
 
 
 # Middleware for request logging
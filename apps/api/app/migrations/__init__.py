@@ -0,0 +1,68 @@
+"""
+Data migrations for existing databases.
+
+Tables and indexes are created by init_db; migrations only cover changes that
+create_all can't make, like moving data between tables. Each one runs once,
+in its own transaction, and is recorded in the schema_migrations table.
+Run them with `python -m app.migrations`; API and worker processes also run
+them at startup.
+"""
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import func
+from ..core.locks import advisory_key
+from ..core.logging import setup_logging
+from . import (
+    chat_search,
+    chat_versions,
+    job_concurrency_keys,
+    transcript_timings,
+    transcripts_side_table,
+)
+
+logger = setup_logging()
+
+# Applied in order; never reorder or remove entries
+MIGRATIONS = [
+    transcripts_side_table,
+    transcript_timings,
+    chat_search,
+    job_concurrency_keys,
+    chat_versions,
+]
+
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String(255), primary_key=True),
+    Column("applied_at", DateTime, server_default=func.now(), nullable=False),
+)
+
+
+def run_migrations(bind: Engine) -> list:
+    """Apply the migrations that have not run yet; return their versions."""
+    schema_migrations.create(bind=bind, checkfirst=True)
+    applied = []
+    for migration in MIGRATIONS:
+        with bind.begin() as connection:
+            if connection.dialect.name == "postgresql":
+                # Processes starting together must not run a migration twice
+                connection.execute(
+                    text("SELECT pg_advisory_xact_lock(:key)"),
+                    {"key": advisory_key("schema_migrations")},
+                )
+            done = connection.execute(
+                select(schema_migrations.c.version).where(
+                    schema_migrations.c.version == migration.VERSION
+                )
+            ).first()
+            if done:
+                continue
+            logger.info("Running migration", extra={"version": migration.VERSION})
+            migration.upgrade(connection)
+            connection.execute(
+                schema_migrations.insert().values(version=migration.VERSION)
+            )
+        applied.append(migration.VERSION)
+    return applied
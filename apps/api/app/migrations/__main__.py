@@ -0,0 +1,4 @@
+from ..core.database import init_db
+
+# init_db creates missing tables and indexes, then runs pending migrations
+init_db()
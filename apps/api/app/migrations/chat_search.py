@@ -0,0 +1,54 @@
+"""
+Index the chats processed before full-text search existed. The search schema
+itself is created by init_db (see app/models/chat_search.py).
+"""
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only, selectinload
+from ..models.chat import Chat
+from ..repository.chat_search import get_chat_search_index
+
+VERSION = "0003_chat_search"
+
+# Chats indexed per batch, so that transcripts aren't all loaded at once
+BATCH_SIZE = 200
+
+
+def upgrade(connection) -> None:
+    search_index = get_chat_search_index(connection)
+    db = Session(bind=connection)
+    try:
+        _index_processed_chats(db, search_index)
+    finally:
+        db.close()
+
+
+def _index_processed_chats(db, search_index) -> None:
+    after = None
+    while True:
+        query = (
+            select(Chat)
+            # Only columns that existed then; later migrations add others
+            .options(
+                load_only(Chat.id, Chat.title, Chat.channel_name),
+                selectinload(Chat.transcript_record),
+            )
+            .where(Chat.status == "processed")
+            .order_by(Chat.id)
+            .limit(BATCH_SIZE)
+        )
+        if after is not None:
+            query = query.where(Chat.id > after)
+        chats = db.execute(query).scalars().all()
+        if not chats:
+            break
+        for chat in chats:
+            search_index.update(
+                db,
+                chat.id,
+                title=chat.title,
+                channel_name=chat.channel_name,
+                transcript=chat.transcript,
+            )
+        after = chats[-1].id
+        db.expunge_all()
@@ -0,0 +1,20 @@
+"""
+Add the version column that chat ETags are derived from to chats tables
+created before it existed.
+"""
+
+from sqlalchemy import Integer, inspect, text
+
+VERSION = "0005_chat_versions"
+
+
+def upgrade(connection) -> None:
+    existing = {c["name"] for c in inspect(connection).get_columns("chats")}
+    if "version" not in existing:
+        column_type = Integer().compile(dialect=connection.dialect)
+        connection.execute(
+            text(
+                f"ALTER TABLE chats ADD COLUMN version {column_type} "
+                "NOT NULL DEFAULT 1"
+            )
+        )
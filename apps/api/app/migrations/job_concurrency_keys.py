@@ -0,0 +1,17 @@
+"""
+Add the column limiting how many jobs of a playlist or channel run at once to
+jobs tables created before it existed.
+"""
+
+from sqlalchemy import String, inspect, text
+
+VERSION = "0004_job_concurrency_keys"
+
+
+def upgrade(connection) -> None:
+    existing = {c["name"] for c in inspect(connection).get_columns("jobs")}
+    if "concurrency_key" not in existing:
+        column_type = String(255).compile(dialect=connection.dialect)
+        connection.execute(
+            text(f"ALTER TABLE jobs ADD COLUMN concurrency_key {column_type}")
+        )
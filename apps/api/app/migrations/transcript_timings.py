@@ -0,0 +1,25 @@
+"""
+Add the columns holding transcript segment timings to tables created before
+timings were stored.
+"""
+
+from sqlalchemy import LargeBinary, inspect, text
+
+VERSION = "0002_transcript_timings"
+
+# (table, column) pairs to add
+COLUMNS = [
+    ("chat_transcripts", "timings"),
+    ("video_cache", "transcript_timings"),
+]
+
+
+def upgrade(connection) -> None:
+    inspector = inspect(connection)
+    column_type = LargeBinary().compile(dialect=connection.dialect)
+    for table, column in COLUMNS:
+        existing = {c["name"] for c in inspector.get_columns(table)}
+        if column not in existing:
+            connection.execute(
+                text(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+            )
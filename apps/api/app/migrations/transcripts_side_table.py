@@ -0,0 +1,69 @@
+"""
+Move transcripts from chats.transcript into the compressed chat_transcripts
+table, then drop the column.
+"""
+
+from sqlalchemy import Column, MetaData, Table, Text, inspect, select, text
+from sqlalchemy.dialects.postgresql import UUID
+from ..core.compression import compress_text
+from ..models.chat_transcript import ChatTranscript
+
+VERSION = "0001_transcripts_side_table"
+
+# Rows read and compressed at a time
+BATCH_SIZE = 500
+
+# The chats table as it was before this migration
+legacy_chats = Table(
+    "chats",
+    MetaData(),
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("transcript", Text),
+)
+
+
+def upgrade(connection) -> None:
+    columns = {column["name"] for column in inspect(connection).get_columns("chats")}
+    if "transcript" not in columns:
+        # Created after transcripts moved, nothing to migrate
+        return
+
+    transcripts = ChatTranscript.__table__
+    transcripts.create(bind=connection, checkfirst=True)
+    last_id = None
+    while True:
+        query = select(legacy_chats.c.id, legacy_chats.c.transcript).where(
+            legacy_chats.c.transcript.isnot(None)
+        )
+        if last_id is not None:
+            query = query.where(legacy_chats.c.id > last_id)
+        rows = connection.execute(
+            query.order_by(legacy_chats.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        existing = set(
+            connection.execute(
+                select(transcripts.c.chat_id).where(
+                    transcripts.c.chat_id.in_([row.id for row in rows])
+                )
+            ).scalars()
+        )
+        values = []
+        for row in rows:
+            if row.id in existing:
+                continue
+            codec, data = compress_text(row.transcript)
+            values.append(
+                {
+                    "chat_id": row.id,
+                    "codec": codec,
+                    "data": data,
+                    "size": len(row.transcript.encode("utf-8")),
+                }
+            )
+        if values:
+            connection.execute(transcripts.insert(), values)
+
+    connection.execute(text("ALTER TABLE chats DROP COLUMN transcript"))
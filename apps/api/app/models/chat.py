@@ -1,8 +1,12 @@
-from sqlalchemy import Column, String, Text, DateTime, Integer, JSON
+from sqlalchemy import Column, String, Text, DateTime, Integer, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func, literal_column
+from typing import Optional
 import uuid
 from ..core.database import Base
+from ..core.segments import TranscriptSegments
+from .chat_transcript import ChatTranscript
 
 
 class Chat(Base):
@@ -18,7 +22,6 @@ class Chat(Base):
     publication_date = Column(DateTime)
     view_count = Column(Integer)
     thumbnail_url = Column(Text)
-    transcript = Column(Text)
     generated_summary = Column(Text)
     actionable_items = Column(JSON)  # JSONB in PostgreSQL
     suggested_questions = Column(JSON)  # JSONB in PostgreSQL
@@ -26,3 +29,48 @@ class Chat(Base):
     updated_at = Column(
         DateTime, server_default=func.now(), nullable=False, onupdate=func.now()
     )
+    # Bumped by every update, unlike updated_at whose resolution may be a second
+    version = Column(
+        Integer,
+        default=1,
+        server_default="1",
+        nullable=False,
+        onupdate=literal_column("version + 1"),
+    )
+
+    # Compressed transcript, loaded only when the transcript is read
+    transcript_record = relationship(
+        ChatTranscript,
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    # Keyset pagination of the chat history, newest first
+    __table_args__ = (Index("ix_chats_created_at_id", "created_at", "id"),)
+
+    @property
+    def transcript(self) -> Optional[str]:
+        record = self.transcript_record
+        return record.text if record is not None else None
+
+    @transcript.setter
+    def transcript(self, value: Optional[str]) -> None:
+        if value is None:
+            self.transcript_record = None
+        elif self.transcript_record is None:
+            self.transcript_record = ChatTranscript(text=value)
+        else:
+            self.transcript_record.text = value
+
+    @property
+    def transcript_segments(self) -> Optional[TranscriptSegments]:
+        record = self.transcript_record
+        return record.segments if record is not None else None
+
+    @transcript_segments.setter
+    def transcript_segments(self, value: TranscriptSegments) -> None:
+        if self.transcript_record is None:
+            self.transcript_record = ChatTranscript(segments=value)
+        else:
+            self.transcript_record.segments = value
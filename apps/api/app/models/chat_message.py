@@ -0,0 +1,38 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+from ..core.database import Base
+
+
+class ChatMessage(Base):
+    """
+    Question asked in a chat ("user") or the answer generated for it ("ai").
+    Answers are saved when they are created, as "streaming", and again once
+    generation completes, is stopped or fails, with its timings.
+    """
+
+    __tablename__ = "chat_messages"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    chat_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("chats.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    role = Column(String(50), nullable=False)
+    content = Column(Text, nullable=False, default="")
+    status = Column(String(50), nullable=False, default="completed")
+    # Generation metrics of answers; None for questions and failed answers
+    time_to_first_token_ms = Column(Float)
+    tokens_per_second = Column(Float)
+    output_tokens = Column(Integer)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime, server_default=func.now(), nullable=False, onupdate=func.now()
+    )
+
+    # Conversation of a chat in the order it happened
+    __table_args__ = (
+        Index("ix_chat_messages_chat_id_created_at", "chat_id", "created_at"),
+    )
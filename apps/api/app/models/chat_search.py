@@ -0,0 +1,87 @@
+"""
+Full-text search documents of chats, one per chat.
+
+The schema is dialect specific, so it is declared as DDL run after
+Base.metadata.create_all instead of as a mapped table:
+
+- Postgres keeps a weighted tsvector per searchable field in
+  chat_search_documents, with a GIN index on their concatenation. Updating one
+  field only recomputes its own tsvector.
+- SQLite keeps the fields in chat_search_documents and an FTS5 index over them
+  (chat_search_fts), kept in sync by triggers.
+
+Every statement is idempotent, so existing databases pick up the schema on
+the next startup; the 0003_chat_search migration then indexes existing chats.
+"""
+
+from sqlalchemy import DDL, event
+from ..core.database import Base
+
+POSTGRES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS chat_search_documents (
+        chat_id UUID PRIMARY KEY REFERENCES chats (id) ON DELETE CASCADE,
+        title_document TSVECTOR NOT NULL DEFAULT ''::tsvector,
+        channel_document TSVECTOR NOT NULL DEFAULT ''::tsvector,
+        transcript_document TSVECTOR NOT NULL DEFAULT ''::tsvector
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS ix_chat_search_documents_document
+    ON chat_search_documents
+    USING GIN ((title_document || channel_document || transcript_document))
+    """,
+]
+
+SQLITE_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS chat_search_documents (
+        id INTEGER PRIMARY KEY,
+        chat_id CHAR(32) NOT NULL UNIQUE,
+        title TEXT NOT NULL DEFAULT '',
+        channel_name TEXT NOT NULL DEFAULT '',
+        transcript TEXT NOT NULL DEFAULT ''
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS chat_search_fts USING fts5(
+        title, channel_name, transcript,
+        content='chat_search_documents', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS chat_search_documents_ai
+    AFTER INSERT ON chat_search_documents BEGIN
+        INSERT INTO chat_search_fts (rowid, title, channel_name, transcript)
+        VALUES (new.id, new.title, new.channel_name, new.transcript);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS chat_search_documents_ad
+    AFTER DELETE ON chat_search_documents BEGIN
+        INSERT INTO chat_search_fts
+            (chat_search_fts, rowid, title, channel_name, transcript)
+        VALUES ('delete', old.id, old.title, old.channel_name, old.transcript);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS chat_search_documents_au
+    AFTER UPDATE ON chat_search_documents BEGIN
+        INSERT INTO chat_search_fts
+            (chat_search_fts, rowid, title, channel_name, transcript)
+        VALUES ('delete', old.id, old.title, old.channel_name, old.transcript);
+        INSERT INTO chat_search_fts (rowid, title, channel_name, transcript)
+        VALUES (new.id, new.title, new.channel_name, new.transcript);
+    END
+    """,
+]
+
+for statement in POSTGRES_DDL:
+    event.listen(
+        Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql")
+    )
+for statement in SQLITE_DDL:
+    event.listen(
+        Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
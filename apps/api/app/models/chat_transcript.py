@@ -0,0 +1,61 @@
+from sqlalchemy import Column, String, DateTime, Integer, LargeBinary, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from typing import Optional
+from ..core.compression import (
+    compress_bytes,
+    compress_text,
+    decompress_bytes,
+    decompress_text,
+)
+from ..core.segments import TranscriptSegments
+from ..core.database import Base
+
+
+class ChatTranscript(Base):
+    """
+    Compressed transcript of a chat. Kept out of the chats table so that reads,
+    updates, vacuums and backups of the hot chat rows don't carry it along.
+    """
+
+    __tablename__ = "chat_transcripts"
+
+    chat_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("chats.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    codec = Column(String(16), nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    # Length of the uncompressed transcript in bytes
+    size = Column(Integer, nullable=False)
+    # Compressed TranscriptSegments timings, with the same codec as data;
+    # None for transcripts stored without timings
+    timings = Column(LargeBinary)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime, server_default=func.now(), nullable=False, onupdate=func.now()
+    )
+
+    @property
+    def text(self) -> str:
+        return decompress_text(self.codec, self.data)
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self.codec, self.data = compress_text(value)
+        self.size = len(value.encode("utf-8"))
+        self.timings = None
+
+    @property
+    def segments(self) -> Optional[TranscriptSegments]:
+        if self.timings is None:
+            return None
+        return TranscriptSegments.from_bytes(
+            decompress_bytes(self.codec, self.timings), self.text
+        )
+
+    @segments.setter
+    def segments(self, value: TranscriptSegments) -> None:
+        self.text = value.text
+        _, self.timings = compress_bytes(value.timings_to_bytes(), self.codec)
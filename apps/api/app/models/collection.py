@@ -0,0 +1,51 @@
+from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+from ..core.database import Base
+
+
+class ChatCollection(Base):
+    """
+    A YouTube playlist or channel, expanded into one chat per video.
+
+    Its status only tracks the expansion ("expanding", "expanded" or "error");
+    the progress of the videos is rolled up from their chats when read.
+    """
+
+    __tablename__ = "chat_collections"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    source_url = Column(Text, nullable=False)
+    source_type = Column(String(50), nullable=False)
+    status = Column(String(50), nullable=False, default="expanding")
+    title = Column(Text)
+    channel_name = Column(String(255))
+    video_count = Column(Integer)
+    error = Column(Text)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime, server_default=func.now(), nullable=False, onupdate=func.now()
+    )
+
+
+class ChatCollectionItem(Base):
+    """
+    Chat of a video of a collection. Kept out of the chats table so that
+    chats don't carry a column most of them leave empty.
+    """
+
+    __tablename__ = "chat_collection_items"
+
+    collection_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("chat_collections.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Order of the video in the playlist or channel
+    position = Column(Integer, primary_key=True)
+    chat_id = Column(
+        UUID(as_uuid=True), ForeignKey("chats.id", ondelete="CASCADE"), nullable=False
+    )
+
+    __table_args__ = (Index("ix_chat_collection_items_chat_id", "chat_id"),)
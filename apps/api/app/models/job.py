@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, Text, DateTime, Integer, JSON, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+import uuid
+from ..core.database import Base
+
+
+class Job(Base):
+    """A durable unit of background work, leased by workers."""
+
+    __tablename__ = "jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    kind = Column(String(50), nullable=False)
+    chat_id = Column(UUID(as_uuid=True), index=True)
+    payload = Column(JSON, nullable=False)
+    # Jobs sharing a key are leased a limited number at a time, see JobRepository
+    concurrency_key = Column(String(255))
+    status = Column(String(20), nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    lease_owner = Column(String(255))
+    lease_expires_at = Column(DateTime)
+    run_after = Column(DateTime, server_default=func.now(), nullable=False)
+    last_error = Column(Text)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime, server_default=func.now(), nullable=False, onupdate=func.now()
+    )
+
+    __table_args__ = (Index("ix_jobs_status_run_after", "status", "run_after"),)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Float, String
+from ..core.database import Base
+
+
+class RateLimitBucket(Base):
+    """Token bucket of an upstream, shared by every process rate limiting it."""
+
+    __tablename__ = "rate_limit_buckets"
+
+    name = Column(String(64), primary_key=True)
+    # Tokens left when the bucket was last refilled; negative while callers
+    # wait for tokens they have reserved
+    tokens = Column(Float, nullable=False)
+    # Unix time of the last refill
+    refilled_at = Column(Float, nullable=False)
@@ -0,0 +1,74 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class TranscriptChunk(Base):
+    """
+    Overlapping passage of a chat's transcript, the unit of retrieval.
+    Times are None for transcripts stored without segment timings.
+    """
+
+    __tablename__ = "transcript_chunks"
+
+    chat_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("chats.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # Position of the chunk in the transcript, and its row in the vector index
+    position = Column(Integer, primary_key=True)
+    start_seconds = Column(Float)
+    end_seconds = Column(Float)
+    text = Column(Text, nullable=False)
+
+
+class ChatVectorIndex(Base):
+    """Embeddings of a chat's transcript chunks, one float32 row per chunk."""
+
+    __tablename__ = "chat_vector_indexes"
+
+    chat_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("chats.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    embedder = Column(String(255), nullable=False)
+    dimensions = Column(Integer, nullable=False)
+    chunk_count = Column(Integer, nullable=False)
+    # Little-endian float32 matrix of chunk_count rows by dimensions columns
+    vectors = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime, server_default=func.now(), nullable=False, onupdate=func.now()
+    )
+
+
+class ChatKeywordIndex(Base):
+    """Compressed inverted index of a chat's transcript, for keyword search."""
+
+    __tablename__ = "chat_keyword_indexes"
+
+    chat_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("chats.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    codec = Column(String(16), nullable=False)
+    # Serialized KeywordIndex, compressed with codec
+    data = Column(LargeBinary, nullable=False)
+    document_count = Column(Integer, nullable=False)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime, server_default=func.now(), nullable=False, onupdate=func.now()
+    )
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Text, DateTime, Integer, LargeBinary
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+class VideoCache(Base):
+    """Transcript and metadata fetched for a video, shared by every chat of it."""
+
+    __tablename__ = "video_cache"
+
+    video_id = Column(String(255), primary_key=True)
+    transcript = Column(Text)
+    # Uncompressed TranscriptSegments timings of the transcript
+    transcript_timings = Column(LargeBinary)
+    transcript_fetched_at = Column(DateTime)
+    title = Column(Text)
+    channel_name = Column(String(255))
+    publication_date = Column(DateTime)
+    view_count = Column(Integer)
+    thumbnail_url = Column(Text)
+    metadata_fetched_at = Column(DateTime)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(
+        DateTime, server_default=func.now(), nullable=False, onupdate=func.now()
+    )
@@ -1,13 +1,80 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only, selectinload
+from sqlalchemy.sql import func
 from uuid import uuid4, UUID
+from ..core.segments import TranscriptSegments
 from ..models.chat import Chat
-from typing import Optional
+from ..models.chat_transcript import ChatTranscript
+from .chat_search import get_chat_search_index
+from typing import Iterable, List, Optional
 from datetime import datetime
 
 
+def _as_uuid(value) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+def _load_only(fields: Iterable[str]):
+    """
+    Loader option for reading only the given columns (plus id, updated_at and
+    version); the other columns stay unloaded on the instance.
+    """
+    columns = {"id", "updated_at", "version", *fields} - {"transcript"}
+    return load_only(*(getattr(Chat, column) for column in sorted(columns)))
+
+
+def _chat_options(fields: Optional[Iterable[str]]) -> list:
+    """
+    Loader options for reading a chat with the given fields (all if None).
+    The transcript lives in its own table and is only loaded when requested.
+    """
+    options = []
+    if fields is not None:
+        fields = list(fields)
+        options.append(_load_only(fields))
+    if fields is None or "transcript" in fields:
+        options.append(selectinload(Chat.transcript_record))
+    return options
+
+
+# Columns shown in the chat history; never the transcript
+CHAT_LIST_COLUMNS = (
+    Chat.id,
+    Chat.video_id,
+    Chat.status,
+    Chat.title,
+    Chat.channel_name,
+    Chat.view_count,
+    Chat.thumbnail_url,
+    Chat.created_at,
+)
+
+
+def _chat_rows(sources: List[tuple]) -> List[dict]:
+    return [
+        {
+            "id": uuid4(),
+            "source_url": source_url,
+            "source_type": source_type,
+            "video_id": video_id,
+            "status": "processing",
+        }
+        for source_url, source_type, video_id in sources
+    ]
+
+
+def _select_chat_status(chat_id):
+    return select(Chat.id, Chat.status, Chat.updated_at, Chat.version).where(
+        Chat.id == _as_uuid(chat_id)
+    )
+
+
 class ChatRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.search_index = get_chat_search_index(db.get_bind())
 
     def create_chat(
         self, source_url: str, source_type: str = "YOUTUBE", video_id: str = "unknown"
@@ -25,21 +92,45 @@ class ChatRepository:
         self.db.refresh(db_chat)
         return db_chat
 
-    def get_chat_by_id(self, chat_id: str) -> Chat:
-        """Retrieve a chat by its ID."""
-        return self.db.query(Chat).filter(Chat.id == chat_id).first()
+    def add_chats(self, sources: List[tuple]) -> List[UUID]:
+        """
+        Insert a chat with processing status for each (source_url, source_type,
+        video_id) of sources in one bulk statement, without committing.
+        Returns the IDs of the chats, in order.
+        """
+        rows = _chat_rows(sources)
+        if rows:
+            self.db.execute(insert(Chat), rows)
+        return [row["id"] for row in rows]
+
+    def get_chat_by_id(
+        self, chat_id: str, fields: Optional[Iterable[str]] = None
+    ) -> Optional[Chat]:
+        """Retrieve a chat by its ID, optionally loading only some columns."""
+        query = self.db.query(Chat)
+        if fields is not None:
+            query = query.options(*_chat_options(fields))
+        return query.filter(Chat.id == _as_uuid(chat_id)).first()
+
+    def get_chat_status(self, chat_id: str) -> Optional[Row]:
+        """Retrieve only the id, status, updated_at and version columns of a chat."""
+        return self.db.execute(_select_chat_status(chat_id)).first()
 
     def update_chat(
         self,
         chat_id: UUID,
         status: Optional[str] = None,
         transcript: Optional[str] = None,
+        transcript_segments: Optional[TranscriptSegments] = None,
         title: Optional[str] = None,
         channel_name: Optional[str] = None,
         publication_date: Optional[datetime] = None,
         view_count: Optional[int] = None,
         thumbnail_url: Optional[str] = None,
         video_id: Optional[str] = None,
+        generated_summary: Optional[str] = None,
+        actionable_items: Optional[List[str]] = None,
+        suggested_questions: Optional[List[str]] = None,
     ) -> Chat:
         """Update a chat record with processing results."""
         db_chat = self.get_chat_by_id(chat_id)
@@ -48,6 +139,12 @@ class ChatRepository:
                 db_chat.status = status
             if transcript is not None:
                 db_chat.transcript = transcript
+            if transcript_segments is not None:
+                # Sets the transcript too, its text is the joined segments
+                db_chat.transcript_segments = transcript_segments
+            if transcript is not None or transcript_segments is not None:
+                # Only chat_transcripts changes; bump the chat so its version changes
+                db_chat.updated_at = func.now()
             if title is not None:
                 db_chat.title = title
             if channel_name is not None:
@@ -60,6 +157,114 @@ class ChatRepository:
                 db_chat.thumbnail_url = thumbnail_url
             if video_id is not None:
                 db_chat.video_id = video_id
+            if generated_summary is not None:
+                db_chat.generated_summary = generated_summary
+            if actionable_items is not None:
+                db_chat.actionable_items = actionable_items
+            if suggested_questions is not None:
+                db_chat.suggested_questions = suggested_questions
+            self._update_search_document(
+                db_chat, title, channel_name, transcript, transcript_segments
+            )
             self.db.commit()
             self.db.refresh(db_chat)
         return db_chat
+
+    def _update_search_document(
+        self, db_chat: Chat, title, channel_name, transcript, transcript_segments
+    ) -> None:
+        """Reindex the searchable fields that changed, in the same transaction."""
+        fields = {}
+        if title is not None:
+            fields["title"] = title
+        if channel_name is not None:
+            fields["channel_name"] = channel_name
+        if transcript_segments is not None:
+            fields["transcript"] = transcript_segments.text
+        elif transcript is not None:
+            fields["transcript"] = transcript
+        if fields:
+            self.search_index.update(self.db, db_chat.id, **fields)
+
+
+class AsyncChatRepository:
+    """Async variant of ChatRepository for request handlers on the event loop."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.search_index = get_chat_search_index(db.get_bind())
+
+    async def create_chat(
+        self, source_url: str, source_type: str = "YOUTUBE", video_id: str = "unknown"
+    ) -> Chat:
+        """Create a new chat record with processing status."""
+        db_chat = Chat(
+            id=uuid4(),
+            source_url=source_url,
+            source_type=source_type,
+            video_id=video_id,
+            status="processing",
+        )
+        self.db.add(db_chat)
+        await self.db.commit()
+        await self.db.refresh(db_chat)
+        return db_chat
+
+    async def add_chats(self, sources: List[tuple]) -> List[UUID]:
+        """
+        Insert a chat with processing status for each (source_url, source_type,
+        video_id) of sources in one bulk statement, without committing.
+        Returns the IDs of the chats, in order.
+        """
+        rows = _chat_rows(sources)
+        if rows:
+            await self.db.execute(insert(Chat), rows)
+        return [row["id"] for row in rows]
+
+    async def get_chat_by_id(
+        self, chat_id: str, fields: Optional[Iterable[str]] = None
+    ) -> Optional[Chat]:
+        """Retrieve a chat by its ID, optionally loading only some columns."""
+        query = select(Chat).where(Chat.id == _as_uuid(chat_id))
+        query = query.options(*_chat_options(fields))
+        return (await self.db.execute(query)).scalars().first()
+
+    async def get_chat_status(self, chat_id: str) -> Optional[Row]:
+        """Retrieve only the id, status, updated_at and version columns of a chat."""
+        return (await self.db.execute(_select_chat_status(chat_id))).first()
+
+    async def get_transcript(self, chat_id: str) -> Optional[ChatTranscript]:
+        """Retrieve the stored transcript of a chat without loading the chat."""
+        query = select(ChatTranscript).where(
+            ChatTranscript.chat_id == _as_uuid(chat_id)
+        )
+        return (await self.db.execute(query)).scalars().first()
+
+    async def list_chats(self, limit: int, after: Optional[tuple] = None) -> List[Row]:
+        """
+        List chats newest first, with only the history columns.
+        after is the (created_at, id) of the last chat of the previous page;
+        seeking past it on the (created_at, id) index keeps deep pages as fast
+        as the first one.
+        """
+        query = select(*CHAT_LIST_COLUMNS)
+        if after is not None:
+            created_at, chat_id = after
+            query = query.where(
+                tuple_(Chat.created_at, Chat.id) < tuple_(created_at, _as_uuid(chat_id))
+            )
+        query = query.order_by(Chat.created_at.desc(), Chat.id.desc()).limit(limit)
+        return list((await self.db.execute(query)).all())
+
+    async def search_chats(
+        self, query: str, limit: int, after: Optional[tuple] = None
+    ) -> List[Row]:
+        """
+        Full-text search over the titles, channel names and transcripts of
+        processed chats, best match first, with the chat list columns and a
+        score. after is the (score, id) of the last chat of the previous page.
+        """
+        statement = self.search_index.search_statement(query, limit, after)
+        if statement is None:
+            return []
+        return list((await self.db.execute(statement)).all())
@@ -0,0 +1,82 @@
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import uuid4, UUID
+from ..core.clock import utcnow
+from ..models.chat_message import ChatMessage
+from typing import List, Optional, Tuple
+
+
+def _as_uuid(value) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+# A question and its answer are created at the same instant; "user" sorts after
+# "ai", so descending role puts the question first
+_OLDEST_FIRST = (ChatMessage.created_at.asc(), ChatMessage.role.desc())
+_NEWEST_FIRST = (ChatMessage.created_at.desc(), ChatMessage.role.asc())
+
+
+class AsyncChatMessageRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_exchange(
+        self, chat_id: str, question: str
+    ) -> Tuple[ChatMessage, ChatMessage]:
+        """
+        Save a question and the empty, "streaming" answer that generation will
+        fill in, in one transaction.
+        """
+        now = utcnow()
+        db_question = ChatMessage(
+            id=uuid4(),
+            chat_id=_as_uuid(chat_id),
+            role="user",
+            content=question,
+            status="completed",
+            created_at=now,
+            updated_at=now,
+        )
+        db_answer = ChatMessage(
+            id=uuid4(),
+            chat_id=_as_uuid(chat_id),
+            role="ai",
+            content="",
+            status="streaming",
+            created_at=now,
+            updated_at=now,
+        )
+        self.db.add_all([db_question, db_answer])
+        await self.db.commit()
+        return db_question, db_answer
+
+    async def get_message(self, chat_id: str, message_id: str) -> Optional[ChatMessage]:
+        query = select(ChatMessage).where(
+            ChatMessage.chat_id == _as_uuid(chat_id),
+            ChatMessage.id == _as_uuid(message_id),
+        )
+        return (await self.db.execute(query)).scalars().first()
+
+    async def list_messages(
+        self, chat_id: str, limit: Optional[int] = None
+    ) -> List[ChatMessage]:
+        """
+        List the messages of a chat in conversation order. With a limit, only
+        the most recent ones are returned, still oldest first.
+        """
+        query = select(ChatMessage).where(ChatMessage.chat_id == _as_uuid(chat_id))
+        if limit is None:
+            query = query.order_by(*_OLDEST_FIRST)
+            return list((await self.db.execute(query)).scalars().all())
+        query = query.order_by(*_NEWEST_FIRST)
+        messages = list((await self.db.execute(query.limit(limit))).scalars().all())
+        return messages[::-1]
+
+    async def update_message(self, message_id: str, **fields) -> None:
+        """Update the given columns of a message."""
+        await self.db.execute(
+            update(ChatMessage)
+            .where(ChatMessage.id == _as_uuid(message_id))
+            .values(updated_at=utcnow(), **fields)
+        )
+        await self.db.commit()
@@ -0,0 +1,196 @@
+"""
+Full-text search over the titles, channel names and transcripts of chats.
+
+get_chat_search_index(bind) returns the implementation for the database's
+dialect; see app/models/chat_search.py for the schema of each one. Searches
+only return processed chats, best match first, and page with a keyset on
+(score, chat id).
+"""
+
+import re
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import Float, bindparam, column, text
+from sqlalchemy.sql.elements import TextClause
+from ..core.config import SEARCH_TRANSCRIPT_MAX_CHARS
+from ..models.chat import Chat
+
+# Fields of a chat that are searchable
+SEARCH_FIELDS = ("title", "channel_name", "transcript")
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# Binds chat IDs the way the chats table stores them on each dialect
+_CHAT_ID_TYPE = Chat.__table__.c.id.type
+
+# Columns of search results: the chat list columns and the match score
+SEARCH_RESULT_COLUMNS = (
+    Chat.__table__.c.id,
+    Chat.__table__.c.video_id,
+    Chat.__table__.c.status,
+    Chat.__table__.c.title,
+    Chat.__table__.c.channel_name,
+    Chat.__table__.c.view_count,
+    Chat.__table__.c.thumbnail_url,
+    Chat.__table__.c.created_at,
+    column("score", Float),
+)
+
+_RESULT_SELECT = """
+    SELECT c.id, c.video_id, c.status, c.title, c.channel_name, c.view_count,
+           c.thumbnail_url, c.created_at, m.score
+    FROM ({matches}) AS m
+    JOIN chats AS c ON c.id = m.chat_id
+    WHERE c.status = 'processed' {after}
+    ORDER BY m.score DESC, m.chat_id DESC
+    LIMIT :limit
+"""
+_AFTER = (
+    "AND (m.score < :after_score "
+    "OR (m.score = :after_score AND m.chat_id < :after_id))"
+)
+
+
+def _as_uuid(value) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+class ChatSearchIndex:
+    """Search index for databases without full-text search: stores nothing."""
+
+    def update(self, db, chat_id: UUID, **fields) -> None:
+        """
+        Update the given searchable fields of a chat's search document, in the
+        session's current transaction.
+        """
+
+    def search_statement(
+        self, query: str, limit: int, after: Optional[tuple] = None
+    ) -> Optional[TextClause]:
+        """
+        Return the statement finding the chats matching query, or None if the
+        query has nothing to search for. after is the (score, chat_id) of the
+        last result of the previous page.
+        """
+        return None
+
+    def _statement(
+        self, matches: str, params: dict, limit: int, after: Optional[tuple]
+    ) -> TextClause:
+        binds = [bindparam("limit", limit)]
+        binds += [bindparam(name, value) for name, value in params.items()]
+        if after is not None:
+            binds += [
+                bindparam("after_score", float(after[0])),
+                bindparam("after_id", _as_uuid(after[1]), type_=_CHAT_ID_TYPE),
+            ]
+        statement = text(
+            _RESULT_SELECT.format(matches=matches, after=_AFTER if after else "")
+        )
+        return statement.bindparams(*binds).columns(*SEARCH_RESULT_COLUMNS)
+
+    def _upsert(self, db, sql: str, chat_id, fields: dict) -> None:
+        db.execute(
+            text(sql).bindparams(
+                bindparam("chat_id", _as_uuid(chat_id), type_=_CHAT_ID_TYPE),
+                *(bindparam(name, value) for name, value in fields.items()),
+            )
+        )
+
+
+class PostgresChatSearchIndex(ChatSearchIndex):
+    """tsvector documents with a GIN index; queries use websearch syntax."""
+
+    # Text search configuration, and the weight of each field in the ranking
+    CONFIG = "english"
+    WEIGHTS = {"title": "A", "channel_name": "B", "transcript": "C"}
+    COLUMNS = {
+        "title": "title_document",
+        "channel_name": "channel_document",
+        "transcript": "transcript_document",
+    }
+    DOCUMENT = "d.title_document || d.channel_document || d.transcript_document"
+
+    def update(self, db, chat_id: UUID, **fields) -> None:
+        if not fields:
+            return
+        if fields.get("transcript"):
+            # A tsvector is limited to 1MB; the start of very long transcripts
+            # is enough to find the video
+            fields["transcript"] = fields["transcript"][:SEARCH_TRANSCRIPT_MAX_CHARS]
+        columns = [self.COLUMNS[field] for field in fields]
+        values = [
+            f"setweight(to_tsvector('{self.CONFIG}', coalesce(:{field}, '')), "
+            f"'{self.WEIGHTS[field]}')"
+            for field in fields
+        ]
+        self._upsert(
+            db,
+            f"INSERT INTO chat_search_documents (chat_id, {', '.join(columns)}) "
+            f"VALUES (:chat_id, {', '.join(values)}) "
+            "ON CONFLICT (chat_id) DO UPDATE SET "
+            + ", ".join(f"{c} = EXCLUDED.{c}" for c in columns),
+            chat_id,
+            fields,
+        )
+
+    def search_statement(
+        self, query: str, limit: int, after: Optional[tuple] = None
+    ) -> Optional[TextClause]:
+        if not _TOKEN_PATTERN.search(query):
+            return None
+        matches = (
+            f"SELECT d.chat_id, ts_rank_cd({self.DOCUMENT}, q)::float8 AS score "
+            f"FROM chat_search_documents AS d, "
+            f"websearch_to_tsquery('{self.CONFIG}', :query) AS q "
+            f"WHERE ({self.DOCUMENT}) @@ q"
+        )
+        return self._statement(matches, {"query": query}, limit, after)
+
+
+class SqliteChatSearchIndex(ChatSearchIndex):
+    """FTS5 index; every word of the query must match (prefixes aren't)."""
+
+    # bm25 weight of each column of chat_search_fts, in column order
+    WEIGHTS = (10.0, 5.0, 1.0)
+
+    def update(self, db, chat_id: UUID, **fields) -> None:
+        if not fields:
+            return
+        fields = {field: value or "" for field, value in fields.items()}
+        self._upsert(
+            db,
+            f"INSERT INTO chat_search_documents (chat_id, {', '.join(fields)}) "
+            f"VALUES (:chat_id, {', '.join(':' + f for f in fields)}) "
+            "ON CONFLICT (chat_id) DO UPDATE SET "
+            + ", ".join(f"{f} = excluded.{f}" for f in fields),
+            chat_id,
+            fields,
+        )
+
+    def search_statement(
+        self, query: str, limit: int, after: Optional[tuple] = None
+    ) -> Optional[TextClause]:
+        tokens = _TOKEN_PATTERN.findall(query)
+        if not tokens:
+            return None
+        # Quote every word so FTS5 query syntax in user input is taken literally
+        match = " ".join(f'"{token}"' for token in tokens)
+        weights = ", ".join(map(str, self.WEIGHTS))
+        matches = (
+            f"SELECT d.chat_id, -bm25(chat_search_fts, {weights}) AS score "
+            "FROM chat_search_fts "
+            "JOIN chat_search_documents AS d ON d.id = chat_search_fts.rowid "
+            "WHERE chat_search_fts MATCH :query"
+        )
+        return self._statement(matches, {"query": match}, limit, after)
+
+
+def get_chat_search_index(bind) -> ChatSearchIndex:
+    """Return the search index implementation for the database behind bind."""
+    dialect = getattr(getattr(bind, "dialect", None), "name", None)
+    if dialect == "postgresql":
+        return PostgresChatSearchIndex()
+    if dialect == "sqlite":
+        return SqliteChatSearchIndex()
+    return ChatSearchIndex()
@@ -0,0 +1,106 @@
+from sqlalchemy import insert, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from uuid import uuid4, UUID
+from ..models.chat import Chat
+from ..models.collection import ChatCollection, ChatCollectionItem
+from .chat import CHAT_LIST_COLUMNS
+from typing import Dict, List, Optional
+
+
+def _as_uuid(value) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+class CollectionRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_collection_for_update(self, collection_id) -> Optional[ChatCollection]:
+        """
+        Retrieve a collection, locking its row on Postgres until the end of
+        the transaction so that it is expanded by one worker at a time.
+        """
+        return (
+            self.db.query(ChatCollection)
+            .filter(ChatCollection.id == _as_uuid(collection_id))
+            .with_for_update()
+            .first()
+        )
+
+    def fail_expansion(self, collection_id, error: str) -> bool:
+        """
+        Mark a collection that is still expanding as failed. Returns False if
+        it was already expanded or failed.
+        """
+        result = self.db.execute(
+            update(ChatCollection)
+            .where(
+                ChatCollection.id == _as_uuid(collection_id),
+                ChatCollection.status == "expanding",
+            )
+            .values(status="error", error=error)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+    def add_items(self, collection_id, chat_ids: List[UUID]) -> None:
+        """Add chats to a collection in order, without committing."""
+        rows = [
+            {
+                "collection_id": _as_uuid(collection_id),
+                "position": position,
+                "chat_id": chat_id,
+            }
+            for position, chat_id in enumerate(chat_ids)
+        ]
+        if rows:
+            self.db.execute(insert(ChatCollectionItem), rows)
+
+
+class AsyncCollectionRepository:
+    """Async variant of CollectionRepository for request handlers."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def add_collection(self, source_url: str, source_type: str) -> ChatCollection:
+        """Add a collection being expanded to the session, without committing."""
+        db_collection = ChatCollection(
+            id=uuid4(),
+            source_url=source_url,
+            source_type=source_type,
+            status="expanding",
+        )
+        self.db.add(db_collection)
+        return db_collection
+
+    async def get_collection_by_id(self, collection_id) -> Optional[ChatCollection]:
+        """Retrieve a collection by its ID."""
+        query = select(ChatCollection).where(
+            ChatCollection.id == _as_uuid(collection_id)
+        )
+        return (await self.db.execute(query)).scalars().first()
+
+    async def count_chats_by_status(self, collection_id) -> Dict[str, int]:
+        """Count the chats of a collection per status, in one grouped query."""
+        query = (
+            select(Chat.status, func.count())
+            .join(ChatCollectionItem, ChatCollectionItem.chat_id == Chat.id)
+            .where(ChatCollectionItem.collection_id == _as_uuid(collection_id))
+            .group_by(Chat.status)
+        )
+        return dict((await self.db.execute(query)).all())
+
+    async def list_chats(self, collection_id) -> List[Row]:
+        """List the chats of a collection in order, with the chat list columns."""
+        query = (
+            select(*CHAT_LIST_COLUMNS)
+            .join(ChatCollectionItem, ChatCollectionItem.chat_id == Chat.id)
+            .where(ChatCollectionItem.collection_id == _as_uuid(collection_id))
+            .order_by(ChatCollectionItem.position)
+        )
+        return list((await self.db.execute(query)).all())
@@ -0,0 +1,324 @@
+from sqlalchemy import and_, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from uuid import uuid4, UUID
+from ..core.clock import utcnow
+from ..models.job import Job
+from collections import Counter
+from typing import List, Optional
+from datetime import timedelta
+
+
+def _as_uuid(value) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+def _job_values(
+    kind: str,
+    payload: dict,
+    chat_id,
+    max_attempts: int,
+    concurrency_key: Optional[str] = None,
+    now=None,
+) -> dict:
+    now = now or utcnow()
+    return {
+        "id": uuid4(),
+        "kind": kind,
+        "chat_id": _as_uuid(chat_id) if chat_id is not None else None,
+        "payload": payload,
+        "concurrency_key": concurrency_key,
+        "status": "queued",
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "run_after": now,
+    }
+
+
+def _bulk_job_values(
+    kind: str, jobs: List[tuple], max_attempts: int, concurrency_key=None
+) -> List[dict]:
+    # All jobs of a bulk insert would share one server-side created_at. Step
+    # it by a microsecond per job so that they are leased in the given order.
+    now = utcnow()
+    rows = []
+    for position, (payload, chat_id) in enumerate(jobs):
+        row = _job_values(kind, payload, chat_id, max_attempts, concurrency_key, now)
+        row["created_at"] = now + timedelta(microseconds=position)
+        rows.append(row)
+    return rows
+
+
+def _new_job(kind: str, payload: dict, chat_id, max_attempts: int) -> Job:
+    return Job(**_job_values(kind, payload, chat_id, max_attempts))
+
+
+class JobRepository:
+    """
+    Durable job queue on the jobs table.
+
+    Jobs move from "queued" to "leased" when a worker claims them and then to
+    "completed" or "failed". A leased job whose lease expires (its worker
+    crashed or stopped heartbeating) can be leased again by another worker.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: dict,
+        chat_id: Optional[UUID] = None,
+        max_attempts: int = 3,
+    ) -> Job:
+        """Add a job to the queue."""
+        db_job = _new_job(kind, payload, chat_id, max_attempts)
+        self.db.add(db_job)
+        self.db.commit()
+        self.db.refresh(db_job)
+        return db_job
+
+    def add_jobs(
+        self,
+        kind: str,
+        jobs: List[tuple],
+        max_attempts: int = 3,
+        concurrency_key: Optional[str] = None,
+    ) -> List[UUID]:
+        """
+        Queue a job for each (payload, chat_id) of jobs in one bulk statement,
+        without committing. Returns the IDs of the jobs, in order.
+        """
+        rows = _bulk_job_values(kind, jobs, max_attempts, concurrency_key)
+        if rows:
+            self.db.execute(insert(Job), rows)
+        return [row["id"] for row in rows]
+
+    def get_job_by_id(self, job_id) -> Optional[Job]:
+        """Retrieve a job by its ID."""
+        return self.db.query(Job).filter(Job.id == _as_uuid(job_id)).first()
+
+    def lease(
+        self,
+        worker_id: str,
+        limit: int,
+        lease_seconds: int,
+        key_limit: Optional[int] = None,
+    ) -> List[Job]:
+        """
+        Claim up to limit runnable jobs for worker_id.
+
+        Candidates are selected with FOR UPDATE SKIP LOCKED on Postgres so that
+        concurrent workers do not block on each other, and each claim is a
+        guarded UPDATE so a job is never leased twice even on databases that
+        ignore row locks, such as SQLite.
+
+        With key_limit, jobs with a concurrency key are skipped while key_limit
+        jobs with the same key hold a lease, so that one large playlist can't
+        take every worker. Workers leasing at the same moment may go past the
+        limit by a few jobs; it paces the work rather than guarding a resource.
+
+        The leased jobs are returned in queue order.
+        """
+        if limit <= 0:
+            return []
+        now = utcnow()
+        runnable = or_(
+            and_(Job.status == "queued", Job.run_after <= now),
+            and_(
+                Job.status == "leased",
+                Job.lease_expires_at < now,
+                Job.attempts < Job.max_attempts,
+            ),
+        )
+        running = self._running_keys(now) if key_limit is not None else Counter()
+        candidate_ids = []
+        while len(candidate_ids) < limit:
+            wanted = limit - len(candidate_ids)
+            candidates = (
+                self._candidates(runnable, running, key_limit, candidate_ids)
+                .limit(wanted)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            skipped = False
+            for job_id, key in candidates:
+                if key_limit is not None and key is not None:
+                    # Candidates of one key may be more than its free slots
+                    if running[key] >= key_limit:
+                        skipped = True
+                        continue
+                    running[key] += 1
+                candidate_ids.append(job_id)
+            # Keys that filled up are excluded from the next round, so that a
+            # large key can't crowd other runnable jobs out of the batch
+            if not skipped or len(candidates) < wanted:
+                break
+        leased_ids = []
+        for job_id in candidate_ids:
+            result = self.db.execute(
+                update(Job)
+                .where(Job.id == job_id, runnable)
+                .values(
+                    status="leased",
+                    lease_owner=worker_id,
+                    lease_expires_at=now + timedelta(seconds=lease_seconds),
+                    attempts=Job.attempts + 1,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                leased_ids.append(job_id)
+        self.db.commit()
+        if not leased_ids:
+            return []
+        db_jobs = self.db.query(Job).filter(Job.id.in_(leased_ids)).all()
+        position = {job_id: index for index, job_id in enumerate(leased_ids)}
+        return sorted(db_jobs, key=lambda db_job: position[db_job.id])
+
+    def _candidates(self, runnable, running: Counter, key_limit, exclude_ids):
+        """Query runnable jobs in queue order, skipping full keys and exclude_ids."""
+        query = self.db.query(Job.id, Job.concurrency_key).filter(runnable)
+        if key_limit is not None:
+            full_keys = [key for key, count in running.items() if count >= key_limit]
+            if full_keys:
+                query = query.filter(
+                    or_(
+                        Job.concurrency_key.is_(None),
+                        Job.concurrency_key.not_in(full_keys),
+                    )
+                )
+        if exclude_ids:
+            query = query.filter(Job.id.not_in(exclude_ids))
+        return query.order_by(Job.run_after, Job.created_at, Job.id)
+
+    def _running_keys(self, now) -> Counter:
+        """Count the jobs holding a live lease per concurrency key."""
+        rows = self.db.execute(
+            select(Job.concurrency_key, func.count())
+            .where(
+                Job.concurrency_key.is_not(None),
+                Job.status == "leased",
+                Job.lease_expires_at >= now,
+            )
+            .group_by(Job.concurrency_key)
+        )
+        return Counter(dict(rows.all()))
+
+    def heartbeat(self, job_ids: List, worker_id: str, lease_seconds: int) -> int:
+        """Extend the leases worker_id holds on job_ids. Returns how many were extended."""
+        if not job_ids:
+            return 0
+        result = self.db.execute(
+            update(Job)
+            .where(
+                Job.id.in_([_as_uuid(job_id) for job_id in job_ids]),
+                Job.status == "leased",
+                Job.lease_owner == worker_id,
+            )
+            .values(lease_expires_at=utcnow() + timedelta(seconds=lease_seconds))
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def complete(self, job_id, worker_id: str) -> bool:
+        """Mark a leased job as completed. Returns False if the lease was lost."""
+        return self._finish(job_id, worker_id, status="completed", last_error=None)
+
+    def fail(
+        self, job_id, worker_id: str, error: str, retry_delay_seconds: int = 30
+    ) -> Optional[Job]:
+        """
+        Record a failed attempt. The job is queued again after the retry delay
+        until it runs out of attempts, and is then marked as failed.
+        """
+        db_job = self.get_job_by_id(job_id)
+        if (
+            db_job is None
+            or db_job.status != "leased"
+            or db_job.lease_owner != worker_id
+        ):
+            return None
+        if db_job.attempts < db_job.max_attempts:
+            db_job.status = "queued"
+            db_job.run_after = utcnow() + timedelta(seconds=retry_delay_seconds)
+        else:
+            db_job.status = "failed"
+        db_job.lease_owner = None
+        db_job.lease_expires_at = None
+        db_job.last_error = error
+        self.db.commit()
+        self.db.refresh(db_job)
+        return db_job
+
+    def reap_expired(self) -> List[Job]:
+        """
+        Mark jobs whose lease expired on their last attempt as failed.
+        Returns the reaped jobs.
+        """
+        db_jobs = (
+            self.db.query(Job)
+            .filter(
+                Job.status == "leased",
+                Job.lease_expires_at < utcnow(),
+                Job.attempts >= Job.max_attempts,
+            )
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        for db_job in db_jobs:
+            db_job.status = "failed"
+            db_job.lease_owner = None
+            db_job.lease_expires_at = None
+            db_job.last_error = "Lease expired on final attempt"
+        self.db.commit()
+        return db_jobs
+
+    def _finish(self, job_id, worker_id: str, **values) -> bool:
+        result = self.db.execute(
+            update(Job)
+            .where(
+                Job.id == _as_uuid(job_id),
+                Job.status == "leased",
+                Job.lease_owner == worker_id,
+            )
+            .values(lease_owner=None, lease_expires_at=None, **values)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount == 1
+
+
+class AsyncJobRepository:
+    """Async variant of the enqueue side of JobRepository for request handlers."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: dict,
+        chat_id: Optional[UUID] = None,
+        max_attempts: int = 3,
+    ) -> Job:
+        """Add a job to the queue."""
+        db_job = _new_job(kind, payload, chat_id, max_attempts)
+        self.db.add(db_job)
+        await self.db.commit()
+        await self.db.refresh(db_job)
+        return db_job
+
+    async def add_jobs(
+        self, kind: str, jobs: List[tuple], max_attempts: int = 3
+    ) -> List[UUID]:
+        """
+        Queue a job for each (payload, chat_id) of jobs in one bulk statement,
+        without committing. Returns the IDs of the jobs, in order.
+        """
+        rows = _bulk_job_values(kind, jobs, max_attempts)
+        if rows:
+            await self.db.execute(insert(Job), rows)
+        return [row["id"] for row in rows]
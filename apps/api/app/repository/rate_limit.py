@@ -0,0 +1,39 @@
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..models.rate_limit import RateLimitBucket
+
+
+class RateLimitRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def reserve(
+        self, name: str, rate: float, burst: int, tokens: float, now: float
+    ) -> float:
+        """
+        Take tokens from the bucket called name, refilled at rate tokens per
+        second up to burst, and return the seconds to wait until they are
+        available (0 if they are). The row is locked for the update, so
+        processes reserving concurrently queue behind each other.
+        """
+        query = (
+            select(RateLimitBucket)
+            .where(RateLimitBucket.name == name)
+            .with_for_update()
+        )
+        bucket = self.db.execute(query).scalars().first()
+        if bucket is None:
+            bucket = RateLimitBucket(name=name, tokens=burst, refilled_at=now)
+            self.db.add(bucket)
+            try:
+                self.db.flush()
+            except IntegrityError:
+                # Another process created the bucket concurrently
+                self.db.rollback()
+                bucket = self.db.execute(query).scalars().one()
+        available = min(burst, bucket.tokens + max(now - bucket.refilled_at, 0) * rate)
+        bucket.tokens = available - tokens
+        bucket.refilled_at = max(now, bucket.refilled_at)
+        self.db.commit()
+        return max(tokens - available, 0) / rate
@@ -0,0 +1,115 @@
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from uuid import UUID
+from ..models.transcript_index import ChatKeywordIndex, ChatVectorIndex, TranscriptChunk
+from typing import Iterable, List, Optional
+from datetime import datetime
+
+
+def _as_uuid(value) -> UUID:
+    return value if isinstance(value, UUID) else UUID(str(value))
+
+
+def _select_chunks(chat_id, positions: Optional[Iterable[int]]):
+    query = select(TranscriptChunk).where(TranscriptChunk.chat_id == _as_uuid(chat_id))
+    if positions is not None:
+        query = query.where(TranscriptChunk.position.in_(list(positions)))
+    return query.order_by(TranscriptChunk.position)
+
+
+class TranscriptIndexRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def replace_index(
+        self,
+        chat_id: str,
+        chunks: List[tuple],
+        vectors: bytes,
+        embedder: str,
+        dimensions: int,
+    ) -> ChatVectorIndex:
+        """
+        Replace the chunks and vector index of a chat in one transaction.
+        chunks are (text, start_seconds, end_seconds) tuples in transcript order.
+        """
+        chat_id = _as_uuid(chat_id)
+        self.db.execute(
+            delete(TranscriptChunk).where(TranscriptChunk.chat_id == chat_id)
+        )
+        self.db.add_all(
+            TranscriptChunk(
+                chat_id=chat_id,
+                position=position,
+                text=text,
+                start_seconds=start,
+                end_seconds=end,
+            )
+            for position, (text, start, end) in enumerate(chunks)
+        )
+        db_index = self.db.get(ChatVectorIndex, chat_id)
+        if db_index is None:
+            db_index = ChatVectorIndex(chat_id=chat_id)
+            self.db.add(db_index)
+        db_index.embedder = embedder
+        db_index.dimensions = dimensions
+        db_index.chunk_count = len(chunks)
+        db_index.vectors = vectors
+        self.db.commit()
+        return db_index
+
+    def get_index(self, chat_id: str) -> Optional[ChatVectorIndex]:
+        """Retrieve the vector index of a chat."""
+        return self.db.get(ChatVectorIndex, _as_uuid(chat_id))
+
+    def replace_keyword_index(
+        self, chat_id: str, codec: str, data: bytes, document_count: int
+    ) -> ChatKeywordIndex:
+        """Store the compressed keyword index of a chat, replacing any previous one."""
+        chat_id = _as_uuid(chat_id)
+        db_index = self.db.get(ChatKeywordIndex, chat_id)
+        if db_index is None:
+            db_index = ChatKeywordIndex(chat_id=chat_id)
+            self.db.add(db_index)
+        db_index.codec = codec
+        db_index.data = data
+        db_index.document_count = document_count
+        self.db.commit()
+        return db_index
+
+    def get_chunks(
+        self, chat_id: str, positions: Optional[Iterable[int]] = None
+    ) -> List[TranscriptChunk]:
+        """Retrieve the chunks of a chat (only the given positions, if any)."""
+        return list(self.db.execute(_select_chunks(chat_id, positions)).scalars())
+
+
+class AsyncTranscriptIndexRepository:
+    """Async variant of the read side of TranscriptIndexRepository."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_index(self, chat_id: str) -> Optional[ChatVectorIndex]:
+        """Retrieve the vector index of a chat."""
+        return await self.db.get(ChatVectorIndex, _as_uuid(chat_id))
+
+    async def get_keyword_index_version(self, chat_id: str) -> Optional[datetime]:
+        """Return when the keyword index of a chat was written, without loading it."""
+        query = select(ChatKeywordIndex.updated_at).where(
+            ChatKeywordIndex.chat_id == _as_uuid(chat_id)
+        )
+        return (await self.db.execute(query)).scalar()
+
+    async def get_keyword_index(self, chat_id: str) -> Optional[ChatKeywordIndex]:
+        """Retrieve the compressed keyword index of a chat."""
+        return await self.db.get(ChatKeywordIndex, _as_uuid(chat_id))
+
+    async def get_chunks(
+        self, chat_id: str, positions: Optional[Iterable[int]] = None
+    ) -> List[TranscriptChunk]:
+        """Retrieve the chunks of a chat (only the given positions, if any)."""
+        return list(
+            (await self.db.execute(_select_chunks(chat_id, positions))).scalars()
+        )
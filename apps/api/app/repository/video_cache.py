@@ -0,0 +1,64 @@
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from ..models.video_cache import VideoCache
+from typing import Optional
+from datetime import datetime
+
+
+class VideoCacheRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_video_id(self, video_id: str) -> Optional[VideoCache]:
+        """Retrieve the cache entry for a video."""
+        return self.db.query(VideoCache).filter(VideoCache.video_id == video_id).first()
+
+    def upsert_transcript(
+        self,
+        video_id: str,
+        transcript: str,
+        fetched_at: datetime,
+        timings: Optional[bytes] = None,
+    ) -> VideoCache:
+        """Store the transcript of a video, creating the entry if needed."""
+        return self._upsert(
+            video_id,
+            transcript=transcript,
+            transcript_timings=timings,
+            transcript_fetched_at=fetched_at,
+        )
+
+    def upsert_metadata(
+        self, video_id: str, metadata: dict, fetched_at: datetime
+    ) -> VideoCache:
+        """Store the metadata of a video, creating the entry if needed."""
+        return self._upsert(
+            video_id,
+            title=metadata.get("title"),
+            channel_name=metadata.get("channel_name"),
+            publication_date=metadata.get("publication_date"),
+            view_count=metadata.get("view_count"),
+            thumbnail_url=metadata.get("thumbnail_url"),
+            metadata_fetched_at=fetched_at,
+        )
+
+    def _upsert(self, video_id: str, **values) -> VideoCache:
+        db_entry = self.get_by_video_id(video_id)
+        if db_entry is None:
+            db_entry = VideoCache(video_id=video_id, **values)
+            self.db.add(db_entry)
+            try:
+                self.db.commit()
+            except IntegrityError:
+                # Another worker inserted the same video concurrently
+                self.db.rollback()
+                db_entry = self.get_by_video_id(video_id)
+                for key, value in values.items():
+                    setattr(db_entry, key, value)
+                self.db.commit()
+        else:
+            for key, value in values.items():
+                setattr(db_entry, key, value)
+            self.db.commit()
+        self.db.refresh(db_entry)
+        return db_entry
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, HttpUrl, field_validator
+from pydantic import BaseModel, Field, HttpUrl, create_model, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
 import re
+from ..core.config import CHAT_BATCH_MAX_ITEMS, MESSAGE_MAX_CHARS
 
 
 class ChatCreateRequest(BaseModel):
@@ -26,6 +27,25 @@ class ChatCreateRequest(BaseModel):
         return v
 
 
+class ChatBatchCreateRequest(BaseModel):
+    # ChatCreateRequest bodies, or source URLs alone. They are validated one by
+    # one, so that an invalid item only fails itself
+    chats: List[Any] = Field(..., min_length=1, max_length=CHAT_BATCH_MAX_ITEMS)
+
+
+class ChatBatchItemResult(BaseModel):
+    index: int
+    chat_id: Optional[str] = None
+    # {"error_code", "message"} if no chat was created for the item
+    error: Optional[dict] = None
+
+
+class ChatBatchCreateResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[ChatBatchItemResult]
+
+
 class ChatResponse(BaseModel):
     id: str
     source_url: HttpUrl
@@ -43,3 +63,94 @@ class ChatResponse(BaseModel):
     suggested_questions: Optional[list] = None
     created_at: datetime
     updated_at: datetime
+
+
+# Chat fields that can be requested with the `fields` query parameter
+CHAT_RESPONSE_FIELDS = tuple(ChatResponse.model_fields)
+
+# ChatResponse with every field optional, for sparse field selection
+PartialChatResponse = create_model(
+    "PartialChatResponse",
+    **{
+        name: (Optional[field.annotation], None)
+        for name, field in ChatResponse.model_fields.items()
+    },
+)
+
+
+class ChatStatusResponse(BaseModel):
+    id: str
+    status: str
+    updated_at: datetime
+
+
+class ChatListItem(BaseModel):
+    id: str
+    video_id: str
+    status: str
+    title: Optional[str] = None
+    channel_name: Optional[str] = None
+    view_count: Optional[int] = None
+    thumbnail_url: Optional[str] = None
+    created_at: datetime
+
+
+class ChatListResponse(BaseModel):
+    chats: List[ChatListItem]
+    # Pass as `cursor` to get the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class ChatSearchItem(ChatListItem):
+    # Relevance to the query; only comparable within one search
+    score: float
+
+
+class ChatSearchResponse(BaseModel):
+    chats: List[ChatSearchItem]
+    # Pass as `cursor` to get the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+class TranscriptSearchHit(BaseModel):
+    score: float
+    start_seconds: Optional[float] = None
+    end_seconds: Optional[float] = None
+    text: str
+    # Character range of the hit in the chat's transcript
+    offset: int
+    length: int
+    # [start, end) character ranges of the matched terms in the transcript
+    matches: List[List[int]]
+
+
+class TranscriptSearchResponse(BaseModel):
+    query: str
+    results: List[TranscriptSearchHit]
+
+
+class MessageCreateRequest(BaseModel):
+    message: str = Field(..., max_length=MESSAGE_MAX_CHARS)
+
+    @field_validator("message")
+    @classmethod
+    def validate_message(cls, v):
+        """Reject questions with nothing but whitespace."""
+        if not v.strip():
+            raise ValueError("Message is empty")
+        return v.strip()
+
+
+class ChatMessageItem(BaseModel):
+    id: str
+    role: str
+    content: str
+    status: str
+    time_to_first_token_ms: Optional[float] = None
+    tokens_per_second: Optional[float] = None
+    output_tokens: Optional[int] = None
+    created_at: datetime
+
+
+class ChatMessageListResponse(BaseModel):
+    messages: List[ChatMessageItem]
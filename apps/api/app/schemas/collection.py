@@ -0,0 +1,38 @@
+from pydantic import BaseModel, HttpUrl, field_validator
+from datetime import datetime
+from typing import Dict, List, Optional
+from ..core.exceptions import VideoProcessingError
+from ..services.video import collection_source_type
+from .chat import ChatListItem
+
+
+class CollectionCreateRequest(BaseModel):
+    source_url: HttpUrl
+
+    @field_validator("source_url")
+    @classmethod
+    def validate_collection_url(cls, v):
+        """Validate that the URL is a YouTube playlist or channel URL."""
+        try:
+            collection_source_type(str(v))
+        except VideoProcessingError as e:
+            raise ValueError(e.message)
+        return v
+
+
+class CollectionResponse(BaseModel):
+    id: str
+    source_url: str
+    source_type: str
+    # expanding, processing, processed, partial (some videos failed) or error
+    status: str
+    title: Optional[str] = None
+    channel_name: Optional[str] = None
+    video_count: Optional[int] = None
+    # Why the videos couldn't be listed, if status is error before any chat
+    error: Optional[str] = None
+    # Chats of the collection per status
+    chat_counts: Dict[str, int]
+    chats: List[ChatListItem]
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,194 @@
+"""
+Cache of generated answers, shared by every chat of the same video.
+
+Answers are keyed by (video ID, normalized question, prompt version), so that
+"What is X?" and "what is x" asked about the same video share one answer, and
+changing the prompt leaves old answers behind. Two tiers:
+
+- exact: an LRU of answers with a time-to-live;
+- similar (optional): per video, the embeddings of the recently answered
+  questions. A question whose cosine similarity to one of them reaches
+  ANSWER_CACHE_SIMILARITY_THRESHOLD gets that question's answer, as long as it
+  is still in the exact tier.
+"""
+
+import asyncio
+import re
+import threading
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional, Tuple
+
+from ..core.cache import LRUCache
+from ..core.config import (
+    ANSWER_CACHE_MAX_ENTRIES,
+    ANSWER_CACHE_SIMILAR_QUESTIONS,
+    ANSWER_CACHE_SIMILARITY_THRESHOLD,
+    ANSWER_CACHE_TTL_SECONDS,
+)
+from .llm import LLMChunk, LLMClient, Prompt
+
+# (video_id, normalized question, prompt version)
+AnswerKey = Tuple[str, str, str]
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def normalize_question(question: str) -> str:
+    """Reduce a question to its lowercased words, ignoring spacing and punctuation."""
+    return " ".join(_WORD_PATTERN.findall(question.casefold()))
+
+
+def answer_key(video_id: str, question: str, prompt_version: str) -> AnswerKey:
+    return (video_id, normalize_question(question), prompt_version)
+
+
+@dataclass(frozen=True)
+class CachedAnswer:
+    text: str
+    output_tokens: int
+
+
+class CachedAnswerClient(LLMClient):
+    """Streams a cached answer in place of the chat model."""
+
+    name = "answer-cache"
+
+    def __init__(self, answer: CachedAnswer):
+        self.answer = answer
+
+    async def stream(self, prompt: Prompt) -> AsyncIterator[LLMChunk]:
+        yield LLMChunk(text=self.answer.text, output_tokens=self.answer.output_tokens)
+
+
+class _SimilarQuestions:
+    """Embeddings of the recently answered questions about one video."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.keys: list = []
+        self.vectors = None
+
+    def add(self, key: AnswerKey, vector) -> None:
+        import numpy as np
+
+        if key in self.keys:
+            return
+        self.keys.append(key)
+        row = vector[np.newaxis, :]
+        self.vectors = row if self.vectors is None else np.vstack([self.vectors, row])
+        if len(self.keys) > self.capacity:
+            # Drop the oldest question
+            self.keys.pop(0)
+            self.vectors = self.vectors[1:]
+
+    def nearest(self, vector) -> Tuple[Optional[AnswerKey], float]:
+        if self.vectors is None:
+            return None, 0.0
+        scores = self.vectors @ vector
+        best = int(scores.argmax())
+        return self.keys[best], float(scores[best])
+
+
+class AnswerCache:
+    def __init__(
+        self,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        ttl: Optional[float] = ANSWER_CACHE_TTL_SECONDS,
+        similarity_threshold: float = ANSWER_CACHE_SIMILARITY_THRESHOLD,
+        similar_questions: int = ANSWER_CACHE_SIMILAR_QUESTIONS,
+        embedder=None,
+    ):
+        self.answers = LRUCache(max_entries=max_entries, ttl=ttl)
+        self.similarity_threshold = similarity_threshold
+        self.similar_questions = similar_questions
+        # Similar questions per (video_id, prompt version), for as many videos
+        # as there can be answers
+        self._questions = LRUCache(max_entries=max_entries)
+        self._embedder = embedder
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    @property
+    def similarity_enabled(self) -> bool:
+        return self.similarity_threshold > 0
+
+    def _embed(self, key: AnswerKey):
+        if self._embedder is None:
+            from .embeddings import get_embedder
+
+            self._embedder = get_embedder()
+        return self._embedder.embed_query(key[1])
+
+    def _find_similar(self, key: AnswerKey) -> Optional[CachedAnswer]:
+        questions = self._questions.get((key[0], key[2]))
+        if questions is None:
+            return None
+        vector = self._embed(key)
+        with self._lock:
+            similar_key, score = questions.nearest(vector)
+        if similar_key is None or score < self.similarity_threshold:
+            return None
+        return self.answers.get(similar_key)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    async def get(self, key: AnswerKey) -> Optional[CachedAnswer]:
+        """Return the cached answer to the question of key, if any."""
+        answer = self.answers.get(key)
+        if answer is not None:
+            self._count("exact_hits")
+            return answer
+        if self.similarity_enabled:
+            # Embedding is CPU-bound, or a remote call for remote embedders
+            answer = await asyncio.to_thread(self._find_similar, key)
+            if answer is not None:
+                self._count("similar_hits")
+                return answer
+        self._count("misses")
+        return None
+
+    def _remember_question(self, key: AnswerKey) -> None:
+        vector = self._embed(key)
+        with self._lock:
+            questions = self._questions.get((key[0], key[2]))
+            if questions is None:
+                questions = _SimilarQuestions(self.similar_questions)
+                self._questions.set((key[0], key[2]), questions)
+            questions.add(key, vector)
+
+    async def set(self, key: AnswerKey, answer: CachedAnswer) -> None:
+        """Cache the answer to the question of key."""
+        self.answers.set(key, answer)
+        if self.similarity_enabled:
+            await asyncio.to_thread(self._remember_question, key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.exact_hits + self.similar_hits + self.misses
+            hits = self.exact_hits + self.similar_hits
+            stats = {
+                "exact_hits": self.exact_hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+        answers = self.answers.stats()
+        stats.update(
+            size=answers["size"],
+            max_entries=answers["max_entries"],
+            evictions=answers["evictions"],
+            expirations=answers["expirations"],
+        )
+        return stats
+
+
+_answer_cache = AnswerCache()
+
+
+def get_answer_cache() -> AnswerCache:
+    """Return the process-wide answer cache."""
+    return _answer_cache
@@ -1,16 +1,96 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from ..core.logging import setup_logging
-from ..repository.chat import ChatRepository
-from .video import extract_video_id, get_youtube_transcript, get_youtube_metadata
-from ..core.exceptions import VideoProcessingError
+from ..repository.chat import AsyncChatRepository, ChatRepository
+from ..repository.job import AsyncJobRepository, JobRepository
+from .video import (
+    extract_video_id,
+    get_youtube_metadata,
+    get_youtube_transcript_segments,
+)
+from .video_cache import VideoCacheService
+from .job_queue import (
+    INDEX_TRANSCRIPT_JOB,
+    PROCESS_VIDEO_JOB,
+    SUMMARIZE_CHAT_JOB,
+    notify_new_jobs,
+)
+from ..core.config import (
+    FETCH_POOL_MAX_WORKERS,
+    JOB_MAX_ATTEMPTS,
+    VIDEO_LOCK_TIMEOUT_SECONDS,
+)
+from ..core.events import (
+    ERROR,
+    METADATA_FETCHED,
+    PROCESSED,
+    TRANSCRIPT_FETCHED,
+    get_event_backend,
+    publish_chat_event,
+)
+from ..core.exceptions import TransientVideoError, VideoProcessingError
+from ..core.pagination import (
+    decode_cursor,
+    decode_score_cursor,
+    encode_cursor,
+    encode_score_cursor,
+)
+from ..core.segments import TranscriptSegments
+from ..core.locks import get_keyed_lock
 from uuid import UUID
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterator, List, Optional, Tuple
+import asyncio
+import threading
 
 logger = setup_logging()
 
+_fetch_executor: Optional[ThreadPoolExecutor] = None
+_fetch_executor_lock = threading.Lock()
+
+
+def get_fetch_executor() -> ThreadPoolExecutor:
+    """Return the process-wide executor for concurrent upstream fetches."""
+    global _fetch_executor
+    with _fetch_executor_lock:
+        if _fetch_executor is None:
+            _fetch_executor = ThreadPoolExecutor(
+                max_workers=FETCH_POOL_MAX_WORKERS, thread_name_prefix="video-fetch"
+            )
+        return _fetch_executor
+
+
+def _run_stage(fetcher: Callable, video_id: str) -> tuple:
+    """Run a fetch stage, returning (result, error) instead of raising."""
+    try:
+        return fetcher(video_id), None
+    except Exception as e:
+        return None, e
+
+
+def _video_id_or_unknown(source_url: str) -> str:
+    try:
+        return extract_video_id(source_url)
+    except VideoProcessingError:
+        return "unknown"
+
+
+def _validate_chat_id(chat_id: str) -> None:
+    try:
+        # Validate UUID format
+        UUID(chat_id)
+    except ValueError:
+        logger.error("Invalid chat ID format", extra={"chat_id": chat_id})
+        raise ValueError("Invalid chat ID format")
+
 
 class ChatService:
     def __init__(self, db: Session):
         self.chat_repository = ChatRepository(db)
+        self.job_repository = JobRepository(db)
+        self.video_cache = VideoCacheService(db)
+        self.video_lock = get_keyed_lock(db.get_bind(), "video")
+        self.events = get_event_backend(db.get_bind())
 
     def start_new_chat(self, source_url: str, source_type: str = "YOUTUBE") -> str:
         """
@@ -22,10 +102,7 @@ class ChatService:
             extra={"source_url": source_url, "source_type": source_type},
         )
         # Extract video ID for storage
-        try:
-            video_id = extract_video_id(source_url)
-        except VideoProcessingError:
-            video_id = "unknown"
+        video_id = _video_id_or_unknown(source_url)
 
         # Create chat with video_id
         chat = self.chat_repository.create_chat(source_url, source_type, video_id)
@@ -35,17 +112,31 @@ class ChatService:
         )
         return chat_id
 
+    def enqueue_processing(self, chat_id: str, source_url: str) -> str:
+        """
+        Add a durable job to process the video of a chat.
+        Returns the job ID as a string.
+        """
+        job = self.job_repository.enqueue(
+            PROCESS_VIDEO_JOB,
+            {"chat_id": chat_id, "source_url": source_url},
+            chat_id=chat_id,
+            max_attempts=JOB_MAX_ATTEMPTS,
+        )
+        notify_new_jobs()
+        job_id = str(job.id)
+        logger.info(
+            "Video processing job enqueued",
+            extra={"chat_id": chat_id, "job_id": job_id},
+        )
+        return job_id
+
     def get_chat_by_id(self, chat_id: str):
         """
         Retrieve a chat by its ID.
         """
         logger.info("Retrieving chat", extra={"chat_id": chat_id})
-        try:
-            # Validate UUID format
-            UUID(chat_id)
-        except ValueError:
-            logger.error("Invalid chat ID format", extra={"chat_id": chat_id})
-            raise ValueError("Invalid chat ID format")
+        _validate_chat_id(chat_id)
 
         chat = self.chat_repository.get_chat_by_id(chat_id)
 
@@ -56,12 +147,121 @@ class ChatService:
         logger.info("Chat retrieved successfully", extra={"chat_id": chat_id})
         return chat
 
+    def _iter_video_content(self, chat_id: str, video_id: str) -> Iterator[tuple]:
+        """
+        Yield (stage, result, error) for the "transcript" and "metadata" stages
+        as each one becomes available, fetching only what is not cached.
+
+        Missing stages are fetched concurrently on the fetch executor; the
+        results are cached and yielded from the calling thread so the database
+        session is never shared between threads. Concurrent jobs for the same
+        video are coalesced: the first one fetches while the others wait on the
+        video lock and then read its result from the cache.
+        """
+        cached = self.video_cache.get(video_id)
+        if cached and cached.transcript is not None and cached.metadata is not None:
+            logger.debug(
+                "Using cached YouTube transcript and metadata",
+                extra={"chat_id": chat_id, "video_id": video_id},
+            )
+            yield "transcript", cached.transcript, None
+            yield "metadata", cached.metadata, None
+            return
+
+        with self.video_lock.hold(video_id, VIDEO_LOCK_TIMEOUT_SECONDS) as acquired:
+            if not acquired:
+                logger.warning(
+                    "Timed out waiting for video lock, fetching without it",
+                    extra={"chat_id": chat_id, "video_id": video_id},
+                )
+            # Another job may have fetched the video while we were waiting
+            cached = self.video_cache.get(video_id, refresh=True) or cached
+
+            fetchers = {}
+            for stage, fetcher in (
+                ("transcript", get_youtube_transcript_segments),
+                ("metadata", get_youtube_metadata),
+            ):
+                result = getattr(cached, stage) if cached else None
+                if result is None:
+                    fetchers[stage] = fetcher
+                else:
+                    logger.debug(
+                        f"Using cached YouTube {stage}",
+                        extra={"chat_id": chat_id, "video_id": video_id},
+                    )
+                    yield stage, result, None
+
+            if len(fetchers) == 1:
+                # Nothing to overlap with, fetch on the current thread
+                stage, fetcher = fetchers.popitem()
+                completed = [(stage, _run_stage(fetcher, video_id))]
+            else:
+                futures = {
+                    get_fetch_executor().submit(_run_stage, fetcher, video_id): stage
+                    for stage, fetcher in fetchers.items()
+                }
+                completed = (
+                    (futures[future], future.result())
+                    for future in as_completed(futures)
+                )
+
+            for stage, (result, error) in completed:
+                if error is None:
+                    logger.debug(
+                        f"Retrieved YouTube {stage}",
+                        extra={"chat_id": chat_id, "video_id": video_id},
+                    )
+                    if stage == "transcript":
+                        self.video_cache.store_transcript(video_id, result)
+                    else:
+                        self.video_cache.store_metadata(video_id, result)
+                yield stage, result, error
+
     async def process_video_async(self, chat_id: str, source_url: str):
         """
         Asynchronously process the video to retrieve transcript and metadata.
+        The blocking work runs in a worker thread so the event loop stays free.
+        """
+        await asyncio.to_thread(self.process_video, chat_id, source_url)
+
+    def _enqueue_follow_up_jobs(self, chat_id: str) -> None:
+        """
+        Add the jobs that index and summarize a processed chat.
+        The jobs aren't tied to the chat so that failing to index or summarize
+        never turns a processed chat into an errored one.
+        """
+        for kind in (INDEX_TRANSCRIPT_JOB, SUMMARIZE_CHAT_JOB):
+            try:
+                self.job_repository.enqueue(
+                    kind, {"chat_id": chat_id}, max_attempts=JOB_MAX_ATTEMPTS
+                )
+            except Exception as e:
+                logger.error(
+                    "Failed to enqueue follow-up job",
+                    extra={"chat_id": chat_id, "kind": kind, "error": str(e)},
+                    exc_info=True,
+                )
+        notify_new_jobs()
+
+    def process_video(self, chat_id: str, source_url: str):
+        """
+        Process the video to retrieve transcript and metadata.
+        Progress is published as chat events as each stage completes.
+        Cached transcripts and fresh metadata are reused instead of refetched.
+        The transcript is stored with the timings of its segments, and once the
+        chat is processed jobs are enqueued to index and summarize it.
+        This blocks on network and database I/O; run it on the processing pool.
+
+        The transcript and metadata stages run concurrently and each one is
+        written to the chat as soon as it is available. A failed transcript
+        fails the chat (any metadata already fetched is kept); failed metadata
+        only leaves the metadata fields empty and the chat is still processed.
+        Transcript errors that are still transient after the fetcher's own
+        retries are raised, so that the job queue retries the job later.
         """
         logger.info(
-            "Starting asynchronous video processing",
+            "Starting video processing",
             extra={"chat_id": chat_id, "source_url": source_url},
         )
         try:
@@ -69,32 +269,58 @@ class ChatService:
             logger.debug(
                 "Extracted video ID", extra={"chat_id": chat_id, "video_id": video_id}
             )
-            transcript = get_youtube_transcript(video_id)
-            logger.debug(
-                "Retrieved YouTube transcript",
-                extra={"chat_id": chat_id, "transcript_length": len(transcript)},
-            )
-            metadata = get_youtube_metadata(video_id)
-            logger.debug(
-                "Retrieved YouTube metadata",
-                extra={"chat_id": chat_id, "metadata_keys": list(metadata.keys())},
-            )
+            transcript_error = None
+            for stage, result, error in self._iter_video_content(chat_id, video_id):
+                if stage == "transcript":
+                    if error is not None:
+                        transcript_error = error
+                        continue
+                    self.chat_repository.update_chat(
+                        chat_id=chat_id, transcript_segments=result
+                    )
+                    publish_chat_event(
+                        self.events,
+                        chat_id,
+                        TRANSCRIPT_FETCHED,
+                        transcript_length=len(result.text),
+                    )
+                elif error is not None:
+                    logger.warning(
+                        "Metadata unavailable, continuing without it",
+                        extra={"chat_id": chat_id, "error": str(error)},
+                    )
+                else:
+                    self.chat_repository.update_chat(
+                        chat_id=chat_id,
+                        title=result["title"],
+                        channel_name=result["channel_name"],
+                        publication_date=result["publication_date"],
+                        view_count=result["view_count"],
+                        thumbnail_url=result["thumbnail_url"],
+                    )
+                    publish_chat_event(
+                        self.events, chat_id, METADATA_FETCHED, title=result["title"]
+                    )
 
-            # Update chat record with results
-            self.chat_repository.update_chat(
-                chat_id=chat_id,
-                status="processed",
-                transcript=transcript,
-                title=metadata["title"],
-                channel_name=metadata["channel_name"],
-                publication_date=metadata["publication_date"],
-                view_count=metadata["view_count"],
-                thumbnail_url=metadata["thumbnail_url"],
-            )
+            # The transcript is required to chat with the video, metadata is not
+            if transcript_error is not None:
+                raise transcript_error
+
+            self.chat_repository.update_chat(chat_id=chat_id, status="processed")
+            publish_chat_event(self.events, chat_id, PROCESSED, status="processed")
             logger.info(
                 "Chat record updated successfully",
                 extra={"chat_id": chat_id, "status": "processed"},
             )
+            self._enqueue_follow_up_jobs(chat_id)
+        except TransientVideoError as e:
+            # Failing the job retries it later; the worker fails the chat if
+            # its last attempt fails too
+            logger.warning(
+                "Transient video processing error, the job will be retried",
+                extra={"chat_id": chat_id, "error": str(e)},
+            )
+            raise
         except VideoProcessingError as e:
             logger.error(
                 "Video processing error",
@@ -107,6 +333,13 @@ class ChatService:
                 status="error",
                 transcript=f"Error processing video: {str(e)}",
             )
+            publish_chat_event(
+                self.events,
+                chat_id,
+                ERROR,
+                status="error",
+                message=f"Error processing video: {str(e)}",
+            )
         except Exception as e:
             logger.error(
                 "Unexpected error during video processing",
@@ -119,3 +352,180 @@ class ChatService:
                 status="error",
                 transcript=f"Unexpected error: {str(e)}",
             )
+            publish_chat_event(
+                self.events,
+                chat_id,
+                ERROR,
+                status="error",
+                message=f"Unexpected error: {str(e)}",
+            )
+
+
+class AsyncChatService:
+    """
+    Async variant of the request-facing parts of ChatService.
+    Video processing itself stays on the synchronous ChatService in workers.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.chat_repository = AsyncChatRepository(db)
+        self.job_repository = AsyncJobRepository(db)
+
+    async def start_new_chat(
+        self, source_url: str, source_type: str = "YOUTUBE"
+    ) -> str:
+        """
+        Start a new chat by creating a chat record.
+        Returns the chat ID as a string.
+        """
+        logger.info(
+            "Starting new chat",
+            extra={"source_url": source_url, "source_type": source_type},
+        )
+        video_id = _video_id_or_unknown(source_url)
+        chat = await self.chat_repository.create_chat(source_url, source_type, video_id)
+        chat_id = str(chat.id)
+        logger.info(
+            "Chat record created", extra={"chat_id": chat_id, "video_id": video_id}
+        )
+        return chat_id
+
+    async def enqueue_processing(self, chat_id: str, source_url: str) -> str:
+        """
+        Add a durable job to process the video of a chat.
+        Returns the job ID as a string.
+        """
+        job = await self.job_repository.enqueue(
+            PROCESS_VIDEO_JOB,
+            {"chat_id": chat_id, "source_url": source_url},
+            chat_id=chat_id,
+            max_attempts=JOB_MAX_ATTEMPTS,
+        )
+        notify_new_jobs()
+        job_id = str(job.id)
+        logger.info(
+            "Video processing job enqueued",
+            extra={"chat_id": chat_id, "job_id": job_id},
+        )
+        return job_id
+
+    async def start_new_chats(self, sources: List[Tuple[str, str]]) -> List[str]:
+        """
+        Create a chat for each (source_url, source_type) of sources and enqueue
+        the processing of its video, with one bulk insert of the chats and one
+        of the jobs in a single transaction.
+        Returns the chat IDs as strings, in order.
+        """
+        chat_ids = await self.chat_repository.add_chats(
+            [
+                (source_url, source_type, _video_id_or_unknown(source_url))
+                for source_url, source_type in sources
+            ]
+        )
+        try:
+            await self.job_repository.add_jobs(
+                PROCESS_VIDEO_JOB,
+                [
+                    ({"chat_id": str(chat_id), "source_url": source_url}, chat_id)
+                    for chat_id, (source_url, _) in zip(chat_ids, sources)
+                ],
+                max_attempts=JOB_MAX_ATTEMPTS,
+            )
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        notify_new_jobs()
+        logger.info("Chats created in bulk", extra={"count": len(chat_ids)})
+        return [str(chat_id) for chat_id in chat_ids]
+
+    async def get_chat_by_id(self, chat_id: str, fields: Optional[list] = None):
+        """
+        Retrieve a chat by its ID.
+        If fields are given, only those columns are loaded.
+        """
+        logger.info("Retrieving chat", extra={"chat_id": chat_id, "fields": fields})
+        _validate_chat_id(chat_id)
+
+        chat = await self.chat_repository.get_chat_by_id(chat_id, fields)
+
+        if not chat:
+            logger.error("Chat not found", extra={"chat_id": chat_id})
+            raise ValueError("Chat not found")
+
+        logger.info("Chat retrieved successfully", extra={"chat_id": chat_id})
+        return chat
+
+    async def get_chat_status(self, chat_id: str):
+        """
+        Retrieve the id, status, updated_at and version of a chat without
+        loading the rest of the row.
+        """
+        _validate_chat_id(chat_id)
+
+        chat_status = await self.chat_repository.get_chat_status(chat_id)
+
+        if not chat_status:
+            logger.error("Chat not found", extra={"chat_id": chat_id})
+            raise ValueError("Chat not found")
+
+        return chat_status
+
+    async def get_transcript_segments(self, chat_id: str) -> TranscriptSegments:
+        """
+        Retrieve the timed transcript segments of a chat.
+        Raises ValueError if the chat doesn't exist or has no segments, e.g. it
+        is still processing or was stored before timings were kept.
+        """
+        _validate_chat_id(chat_id)
+
+        record = await self.chat_repository.get_transcript(chat_id)
+        segments = record.segments if record is not None else None
+        if segments is None:
+            if not await self.chat_repository.get_chat_status(chat_id):
+                logger.error("Chat not found", extra={"chat_id": chat_id})
+                raise ValueError("Chat not found")
+            logger.error("Transcript segments not found", extra={"chat_id": chat_id})
+            raise ValueError("Transcript segments not found")
+
+        return segments
+
+    async def list_chats(self, limit: int, cursor: Optional[str] = None) -> tuple:
+        """
+        List one page of chats, newest first.
+        Returns (chats, next_cursor); next_cursor is None on the last page.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        # Fetch one extra row to know whether there is a next page
+        chats = await self.chat_repository.list_chats(limit + 1, after)
+        next_cursor = None
+        if len(chats) > limit:
+            chats = chats[:limit]
+            next_cursor = encode_cursor(chats[-1].created_at, chats[-1].id)
+        logger.info(
+            "Chats listed",
+            extra={"count": len(chats), "has_next_page": next_cursor is not None},
+        )
+        return chats, next_cursor
+
+    async def search_chats(
+        self, query: str, limit: int, cursor: Optional[str] = None
+    ) -> tuple:
+        """
+        Search processed chats by title, channel name and transcript, one page
+        at a time, best match first.
+        Returns (chats, next_cursor); next_cursor is None on the last page.
+        """
+        after = decode_score_cursor(cursor) if cursor else None
+        # Fetch one extra row to know whether there is a next page
+        chats = await self.chat_repository.search_chats(query, limit + 1, after)
+        next_cursor = None
+        if len(chats) > limit:
+            chats = chats[:limit]
+            next_cursor = encode_score_cursor(chats[-1].score, chats[-1].id)
+        logger.info(
+            "Chats searched",
+            extra={"count": len(chats), "has_next_page": next_cursor is not None},
+        )
+        return chats, next_cursor
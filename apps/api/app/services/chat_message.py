@@ -0,0 +1,476 @@
+"""
+Questions and streamed answers in a chat.
+
+A question is answered from the passages of the chat's transcript most similar
+to it (or the start of the transcript, if the chat isn't indexed yet), the
+summary of the video and the recent conversation, packed into the prompt's
+token budget by PromptBuilder. The answer is streamed from the chat model as it is
+generated; a client disconnect or a stop request cancels the generation
+upstream, and the partial answer is kept as "stopped".
+
+Stop requests are published as chat events, so they reach the API process
+streaming the answer whichever process receives them.
+"""
+
+import asyncio
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..core.config import (
+    ANSWER_CACHE_ENABLED,
+    MESSAGE_HISTORY_MESSAGES,
+    MESSAGE_METRICS_SAMPLES,
+    SSE_KEEPALIVE_SECONDS,
+)
+from ..core.database import get_async_session_local
+from ..core.events import Subscription, get_event_broker, publish_chat_event
+from ..core.logging import setup_logging
+from ..models.chat_message import ChatMessage
+from ..repository.chat import AsyncChatRepository
+from ..repository.chat_message import AsyncChatMessageRepository
+from .answer_cache import (
+    AnswerKey,
+    CachedAnswer,
+    answer_key,
+    get_answer_cache,
+    normalize_question,
+)
+from .llm import LLMChunk, LLMClient, Prompt, estimate_tokens
+from .prompt_builder import Passage, PromptBuilder, PromptReport
+
+logger = setup_logging()
+
+# Statuses of answers
+STREAMING = "streaming"
+COMPLETED = "completed"
+STOPPED = "stopped"
+ERROR = "error"
+
+# Chat event asking the process streaming an answer to stop it
+MESSAGE_STOP = "message_stop"
+
+SYSTEM_PROMPT = (
+    "You answer questions about a video using only its summary and the excerpts "
+    "of its transcript below. If they don't contain the answer, say that the "
+    "video doesn't cover it. Keep answers concise.\n\n{context}"
+)
+# Part of the answer cache key: bump it when the prompt changes, so that answers
+# generated with the old prompt aren't reused
+PROMPT_VERSION = "2"
+
+
+def _validate_id(value: str, message: str) -> None:
+    try:
+        UUID(value)
+    except ValueError:
+        raise ValueError(message)
+
+
+def build_prompt(
+    question: str,
+    passages: List[Passage],
+    history: List[ChatMessage],
+    summary: Optional[str] = None,
+) -> Tuple[Prompt, PromptReport]:
+    """
+    Build the prompt answering question from passages (most relevant first)
+    and the summary, after history, within PROMPT_TOKEN_BUDGET tokens.
+    """
+    return PromptBuilder(SYSTEM_PROMPT).build(
+        question,
+        passages,
+        [("human" if m.role == "user" else "ai", m.content) for m in history],
+        summary,
+    )
+
+
+@dataclass
+class Reply:
+    """An answer being generated, with its timings (perf_counter seconds)."""
+
+    chat_id: str
+    message_id: str
+    # When the question was received; time to first token is measured from it
+    started_at: float = field(default_factory=time.perf_counter)
+    status: str = STREAMING
+    error: Optional[str] = None
+    parts: List[str] = field(default_factory=list)
+    first_token_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    reported_tokens: Optional[int] = None
+    estimated_tokens: int = 0
+    # Where a completed answer is cached, if it may be; whether it came from there
+    cache_key: Optional[AnswerKey] = None
+    cached: bool = False
+
+    def add(self, chunk: LLMChunk) -> None:
+        if chunk.text and self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.parts.append(chunk.text)
+        self.estimated_tokens += estimate_tokens(chunk.text)
+        if chunk.output_tokens is not None:
+            self.reported_tokens = (self.reported_tokens or 0) + chunk.output_tokens
+
+    def finish(self, status: str, error: Optional[str] = None) -> None:
+        self.status = status
+        self.error = error
+        self.finished_at = time.perf_counter()
+
+    @property
+    def content(self) -> str:
+        return "".join(self.parts)
+
+    @property
+    def output_tokens(self) -> int:
+        # Usage reported by the model if any, else an estimate from the text
+        if self.reported_tokens is not None:
+            return self.reported_tokens
+        return self.estimated_tokens
+
+    @property
+    def time_to_first_token_ms(self) -> Optional[float]:
+        if self.first_token_at is None:
+            return None
+        return (self.first_token_at - self.started_at) * 1000
+
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Output tokens per second of generation, after the first token."""
+        if self.first_token_at is None or self.finished_at is None:
+            return None
+        seconds = self.finished_at - self.first_token_at
+        return self.output_tokens / seconds if seconds > 0 else None
+
+    def summary(self) -> dict:
+        return {
+            "message_id": self.message_id,
+            "status": self.status,
+            "output_tokens": self.output_tokens,
+            "time_to_first_token_ms": self.time_to_first_token_ms,
+            "tokens_per_second": self.tokens_per_second,
+            "cached": self.cached,
+        }
+
+
+@dataclass
+class Exchange:
+    """A saved question, its answer to generate, and how to generate it."""
+
+    question: ChatMessage
+    answer: ChatMessage
+    prompt: Prompt
+    # Tokens of the prompt and the context left out of it
+    prompt_report: Optional[PromptReport] = None
+    # Where to cache the answer, None if the question depends on the conversation
+    cache_key: Optional[AnswerKey] = None
+    # Answer to stream instead of calling the model
+    cached_answer: Optional[CachedAnswer] = None
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    return values[round(q * (len(values) - 1))]
+
+
+class MessageMetrics:
+    """Counts answers by outcome and keeps the timings of the recent ones."""
+
+    def __init__(self, samples: int = MESSAGE_METRICS_SAMPLES):
+        self._lock = threading.Lock()
+        self.streaming = 0
+        self.outcomes: Counter = Counter()
+        self._time_to_first_token_ms: deque = deque(maxlen=samples)
+        self._tokens_per_second: deque = deque(maxlen=samples)
+
+    def observe_start(self) -> None:
+        with self._lock:
+            self.streaming += 1
+
+    def observe(self, reply: Reply) -> None:
+        with self._lock:
+            self.streaming -= 1
+            self.outcomes[reply.status] += 1
+            if reply.cached:
+                # Timings of the model only; the answer cache reports its hits
+                return
+            if reply.time_to_first_token_ms is not None:
+                self._time_to_first_token_ms.append(reply.time_to_first_token_ms)
+            if reply.tokens_per_second is not None:
+                self._tokens_per_second.append(reply.tokens_per_second)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            ttft = list(self._time_to_first_token_ms)
+            tps = list(self._tokens_per_second)
+            stats = {
+                "streaming": self.streaming,
+                COMPLETED: self.outcomes[COMPLETED],
+                STOPPED: self.outcomes[STOPPED],
+                ERROR: self.outcomes[ERROR],
+            }
+        stats.update(
+            time_to_first_token_ms_p50=_percentile(ttft, 0.5),
+            time_to_first_token_ms_p95=_percentile(ttft, 0.95),
+            tokens_per_second_p50=_percentile(tps, 0.5),
+        )
+        return stats
+
+
+_message_metrics = MessageMetrics()
+
+
+def get_message_metrics() -> MessageMetrics:
+    """Return the answer metrics of this process."""
+    return _message_metrics
+
+
+class AsyncChatMessageService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.chat_repository = AsyncChatRepository(db)
+        self.message_repository = AsyncChatMessageRepository(db)
+
+    async def _get_chat_status(self, chat_id: str):
+        _validate_id(chat_id, "Invalid chat ID format")
+        chat_status = await self.chat_repository.get_chat_status(chat_id)
+        if not chat_status:
+            logger.error("Chat not found", extra={"chat_id": chat_id})
+            raise ValueError("Chat not found")
+        return chat_status
+
+    async def _context(self, chat_id: str, question: str) -> List[Passage]:
+        """Return the transcript passages to answer question from, best first."""
+        # Imported here so that NumPy is only loaded once a question is asked
+        from .retrieval import AsyncRetrievalService, chunk_pieces, record_pieces
+
+        try:
+            chunks = await AsyncRetrievalService(self.db).search(chat_id, question)
+            return [Passage(c.text, c.start_seconds, c.position) for c in chunks]
+        except ValueError as e:
+            if "Transcript index not found" not in str(e):
+                raise
+        # Not indexed yet: fall back to the start of the transcript, as much of
+        # it as fits in the budget
+        record = await self.chat_repository.get_transcript(chat_id)
+        return [
+            Passage(text, start, position)
+            for position, (text, start, _) in enumerate(
+                chunk_pieces(record_pieces(record), overlap_chars=0)
+            )
+        ]
+
+    async def start_exchange(self, chat_id: str, question: str) -> Exchange:
+        """
+        Save a question with an empty "streaming" answer, and look up a cached
+        answer or build the prompt generating one.
+        Raises ValueError if the chat doesn't exist or isn't processed yet.
+        """
+        _validate_id(chat_id, "Invalid chat ID format")
+        chat = await self.chat_repository.get_chat_by_id(
+            chat_id, ["status", "video_id", "generated_summary", "suggested_questions"]
+        )
+        if not chat:
+            logger.error("Chat not found", extra={"chat_id": chat_id})
+            raise ValueError("Chat not found")
+        if chat.status != "processed":
+            logger.error(
+                "Chat not ready", extra={"chat_id": chat_id, "status": chat.status}
+            )
+            raise ValueError("Chat not ready")
+
+        history = await self.message_repository.list_messages(
+            chat_id, MESSAGE_HISTORY_MESSAGES
+        )
+        cache_key = cached_answer = None
+        # Follow-up questions may refer to the conversation, so only answers to
+        # opening and suggested questions are shared
+        suggested = {normalize_question(q) for q in chat.suggested_questions or ()}
+        if ANSWER_CACHE_ENABLED and (
+            not history or normalize_question(question) in suggested
+        ):
+            cache_key = answer_key(chat.video_id, question, PROMPT_VERSION)
+            cached_answer = await get_answer_cache().get(cache_key)
+
+        passages = []
+        if cached_answer is None:
+            passages = await self._context(chat_id, question)
+        prompt, report = build_prompt(
+            question, passages, history, chat.generated_summary
+        )
+        db_question, db_answer = await self.message_repository.create_exchange(
+            chat_id, question
+        )
+        logger.info(
+            "Question received",
+            extra={
+                "chat_id": chat_id,
+                "message_id": str(db_answer.id),
+                "history": len(history),
+                "cached": cached_answer is not None,
+                "prompt": report.to_dict(),
+            },
+        )
+        return Exchange(
+            question=db_question,
+            answer=db_answer,
+            prompt=prompt,
+            prompt_report=report,
+            cache_key=cache_key,
+            cached_answer=cached_answer,
+        )
+
+    async def list_messages(self, chat_id: str) -> List[ChatMessage]:
+        """List the messages of a chat, oldest first."""
+        await self._get_chat_status(chat_id)
+        return await self.message_repository.list_messages(chat_id)
+
+    async def request_stop(self, chat_id: str, message_id: str) -> ChatMessage:
+        """
+        Ask the process streaming an answer to stop it. Answers that already
+        finished are left as they are.
+        """
+        _validate_id(chat_id, "Invalid chat ID format")
+        _validate_id(message_id, "Invalid message ID format")
+        message = await self.message_repository.get_message(chat_id, message_id)
+        if message is None or message.role != "ai":
+            logger.error(
+                "Message not found",
+                extra={"chat_id": chat_id, "message_id": message_id},
+            )
+            raise ValueError("Message not found")
+        if message.status == STREAMING:
+            publish_chat_event(
+                get_event_broker().backend, chat_id, MESSAGE_STOP, message_id=message_id
+            )
+            logger.info(
+                "Answer stop requested",
+                extra={"chat_id": chat_id, "message_id": message_id},
+            )
+        return message
+
+    async def save_reply(self, reply: Reply) -> None:
+        await self.message_repository.update_message(
+            reply.message_id,
+            content=reply.content,
+            status=reply.status,
+            output_tokens=reply.output_tokens,
+            time_to_first_token_ms=reply.time_to_first_token_ms,
+            tokens_per_second=reply.tokens_per_second,
+        )
+
+
+# Sentinels queued by the tasks of stream_reply
+_DONE = object()
+_STOP = object()
+
+
+async def stream_reply(
+    llm: LLMClient,
+    prompt: Prompt,
+    reply: Reply,
+    stop: Subscription,
+    idle_timeout: float = SSE_KEEPALIVE_SECONDS,
+) -> AsyncIterator[Optional[str]]:
+    """
+    Generate the answer of reply, yielding its text as it arrives, and None
+    after idle_timeout seconds without any. Returns early, cancelling the
+    generation, on a stop event for the reply from stop. Closing the iterator
+    cancels the generation too; reply is then "stopped".
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def generate():
+        try:
+            async for chunk in llm.stream(prompt):
+                queue.put_nowait(chunk)
+            queue.put_nowait(_DONE)
+        except Exception as e:
+            queue.put_nowait(e)
+
+    async def watch_stop():
+        while True:
+            event = await stop.get()
+            if event.type == MESSAGE_STOP and (
+                event.data.get("message_id") == reply.message_id
+            ):
+                queue.put_nowait(_STOP)
+                return
+
+    # Generation runs in its own task so that it can be cancelled while the
+    # model is still working on the next chunk
+    tasks = [asyncio.create_task(generate()), asyncio.create_task(watch_stop())]
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), idle_timeout)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if item is _DONE:
+                reply.finish(COMPLETED)
+                return
+            if item is _STOP:
+                reply.finish(STOPPED)
+                return
+            if isinstance(item, Exception):
+                logger.error(
+                    "Answer generation failed",
+                    extra={"message_id": reply.message_id, "error": str(item)},
+                )
+                reply.finish(ERROR, error=str(item))
+                return
+            reply.add(item)
+            if item.text:
+                yield item.text
+    finally:
+        for task in tasks:
+            task.cancel()
+        if reply.status == STREAMING:
+            # The client went away
+            reply.finish(STOPPED)
+
+
+async def _record_reply(reply: Reply) -> None:
+    if reply.status == STREAMING:
+        # The client went away before the answer was generated
+        reply.finish(STOPPED)
+    get_message_metrics().observe(reply)
+    if reply.status == COMPLETED and reply.cache_key and not reply.cached:
+        await get_answer_cache().set(
+            reply.cache_key, CachedAnswer(reply.content, reply.output_tokens)
+        )
+    logger.info(
+        "Answer finished",
+        extra={"chat_id": reply.chat_id, **reply.summary()},
+    )
+    try:
+        async with get_async_session_local()() as db:
+            await AsyncChatMessageService(db).save_reply(reply)
+    except Exception as e:
+        logger.error(
+            "Failed to save answer",
+            extra={"message_id": reply.message_id, "error": str(e)},
+            exc_info=True,
+        )
+
+
+_recording: set = set()
+
+
+def record_reply(reply: Reply) -> asyncio.Task:
+    """
+    Count a finished reply in the metrics, cache it and save it, with a session
+    of its own. Runs as a separate task, which completes even if the request that
+    streamed the reply is cancelled.
+    """
+    task = asyncio.create_task(_record_reply(reply))
+    # The event loop only keeps weak references to tasks
+    _recording.add(task)
+    task.add_done_callback(_recording.discard)
+    return task
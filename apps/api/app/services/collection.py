@@ -0,0 +1,179 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..core.config import JOB_MAX_ATTEMPTS
+from ..core.exceptions import TransientVideoError, VideoProcessingError
+from ..core.logging import setup_logging
+from ..repository.chat import ChatRepository
+from ..repository.collection import AsyncCollectionRepository, CollectionRepository
+from ..repository.job import AsyncJobRepository, JobRepository
+from .job_queue import EXPAND_COLLECTION_JOB, PROCESS_VIDEO_JOB, notify_new_jobs
+from .video import collection_source_type, get_youtube_collection
+from typing import Dict
+from uuid import UUID
+
+logger = setup_logging()
+
+
+def collection_concurrency_key(collection_id) -> str:
+    """Concurrency key of the processing jobs of a collection's videos."""
+    return f"collection:{collection_id}"
+
+
+def rollup_status(expansion_status: str, counts: Dict[str, int]) -> str:
+    """
+    Status of a collection from its expansion and the statuses of its chats:
+    "expanding" and "error" while its videos aren't listed (or couldn't be),
+    then "processing" until every chat is done, and "processed", "partial" or
+    "error" depending on how many of them failed.
+    """
+    if expansion_status != "expanded":
+        return expansion_status
+    if counts.get("processing", 0):
+        return "processing"
+    failed = counts.get("error", 0)
+    if not failed:
+        return "processed"
+    return "error" if failed == sum(counts.values()) else "partial"
+
+
+def _validate_collection_id(collection_id: str) -> None:
+    try:
+        UUID(collection_id)
+    except ValueError:
+        logger.error(
+            "Invalid collection ID format", extra={"collection_id": collection_id}
+        )
+        raise ValueError("Invalid collection ID format")
+
+
+class CollectionService:
+    """Expands collections into chats, in workers."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.collection_repository = CollectionRepository(db)
+        self.chat_repository = ChatRepository(db)
+        self.job_repository = JobRepository(db)
+
+    def expand_collection(self, collection_id: str) -> None:
+        """
+        List the videos of a collection and create a chat per video, queueing
+        their processing under the collection's concurrency key. The chats,
+        their jobs and the expanded collection are committed together, so a
+        retried expansion never creates the chats twice.
+
+        Transient listing errors are raised so that the job is retried; other
+        listing errors mark the collection as failed.
+        """
+        collection = self.collection_repository.get_collection_for_update(collection_id)
+        if collection is None or collection.status != "expanding":
+            logger.info(
+                "Collection already expanded",
+                extra={"collection_id": collection_id},
+            )
+            self.db.rollback()
+            return
+        try:
+            listing = get_youtube_collection(collection.source_url)
+            if not listing["video_ids"]:
+                raise VideoProcessingError("The playlist or channel has no videos")
+        except TransientVideoError as e:
+            # Failing the job retries it later; the worker fails the collection
+            # if its last attempt fails too
+            logger.warning(
+                "Transient collection expansion error, the job will be retried",
+                extra={"collection_id": collection_id, "error": str(e)},
+            )
+            self.db.rollback()
+            raise
+        except VideoProcessingError as e:
+            logger.error(
+                "Collection expansion failed",
+                extra={"collection_id": collection_id, "error": str(e)},
+            )
+            collection.status = "error"
+            collection.error = str(e)
+            self.db.commit()
+            return
+
+        sources = [
+            (f"https://www.youtube.com/watch?v={video_id}", "YOUTUBE", video_id)
+            for video_id in listing["video_ids"]
+        ]
+        try:
+            chat_ids = self.chat_repository.add_chats(sources)
+            self.collection_repository.add_items(collection.id, chat_ids)
+            self.job_repository.add_jobs(
+                PROCESS_VIDEO_JOB,
+                [
+                    ({"chat_id": str(chat_id), "source_url": source_url}, chat_id)
+                    for chat_id, (source_url, _, _) in zip(chat_ids, sources)
+                ],
+                max_attempts=JOB_MAX_ATTEMPTS,
+                concurrency_key=collection_concurrency_key(collection.id),
+            )
+            collection.status = "expanded"
+            collection.title = listing["title"]
+            collection.channel_name = listing["channel_name"]
+            collection.video_count = len(chat_ids)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        notify_new_jobs()
+        logger.info(
+            "Collection expanded",
+            extra={"collection_id": collection_id, "video_count": len(chat_ids)},
+        )
+
+
+class AsyncCollectionService:
+    """Request-facing side of collections."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.collection_repository = AsyncCollectionRepository(db)
+        self.job_repository = AsyncJobRepository(db)
+
+    async def start_collection(self, source_url: str) -> str:
+        """
+        Create a collection for a YouTube playlist or channel URL and enqueue
+        its expansion, in one transaction. Returns the collection ID as a
+        string. Raises VideoProcessingError for other URLs.
+        """
+        source_type = collection_source_type(source_url)
+        collection = self.collection_repository.add_collection(source_url, source_type)
+        collection_id = str(collection.id)
+        # Commits the collection along with its job
+        await self.job_repository.enqueue(
+            EXPAND_COLLECTION_JOB,
+            {"collection_id": collection_id},
+            max_attempts=JOB_MAX_ATTEMPTS,
+        )
+        notify_new_jobs()
+        logger.info(
+            "Collection expansion enqueued",
+            extra={"collection_id": collection_id, "source_type": source_type},
+        )
+        return collection_id
+
+    async def get_collection(self, collection_id: str) -> dict:
+        """
+        Retrieve a collection with its chats in order, the count of its chats
+        per status and its rolled up status.
+        """
+        _validate_collection_id(collection_id)
+        collection = await self.collection_repository.get_collection_by_id(
+            collection_id
+        )
+        if not collection:
+            logger.error("Collection not found", extra={"collection_id": collection_id})
+            raise ValueError("Collection not found")
+        counts = await self.collection_repository.count_chats_by_status(collection_id)
+        chats = await self.collection_repository.list_chats(collection_id)
+        return {
+            "collection": collection,
+            "status": rollup_status(collection.status, counts),
+            "counts": counts,
+            "chats": chats,
+        }
@@ -0,0 +1,122 @@
+"""
+Text embedders for transcript retrieval.
+
+Every embedder returns a float32 matrix with one L2-normalized row per text, so
+that the dot product of two rows is their cosine similarity.
+"""
+
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from ..core.config import (
+    EMBEDDER,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_DIMENSIONS,
+    GOOGLE_EMBEDDING_MODEL,
+)
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length, leaving all-zero rows as they are."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+class Embedder(ABC):
+    """Turns texts into vectors. Subclasses implement _embed_batch."""
+
+    # Stored with each index so that vectors of different embedders never mix
+    name: str = "embedder"
+    dimensions: int
+
+    @abstractmethod
+    def _embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts into a (len(texts), dimensions) matrix."""
+
+    def embed(
+        self, texts: Sequence[str], batch_size: int = EMBEDDING_BATCH_SIZE
+    ) -> np.ndarray:
+        """Embed texts batch_size at a time into one (len(texts), dimensions) matrix."""
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        batches = [
+            normalize_rows(self._embed_batch(texts[i : i + batch_size]))
+            for i in range(0, len(texts), batch_size)
+        ]
+        return np.vstack(batches)
+
+    def embed_query(self, text: str) -> np.ndarray:
+        return self.embed([text])[0]
+
+
+class HashingEmbedder(Embedder):
+    """
+    Deterministic bag-of-words embedder using the hashing trick: each word and
+    word pair adds +1 or -1 to a bucket picked by its hash. Needs no model or
+    network, which makes it suitable for tests and offline use.
+    """
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+        self.name = f"hashing-{dimensions}"
+
+    def _features(self, text: str) -> List[str]:
+        words = _TOKEN_PATTERN.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def _embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if not features:
+                continue
+            hashes = np.array(
+                [
+                    int.from_bytes(
+                        hashlib.blake2b(f.encode(), digest_size=8).digest(), "little"
+                    )
+                    for f in features
+                ],
+                dtype=np.uint64,
+            )
+            buckets = (hashes % np.uint64(self.dimensions)).astype(np.intp)
+            signs = np.where(hashes >> np.uint64(63), -1.0, 1.0).astype(np.float32)
+            np.add.at(vectors[row], buckets, signs)
+        return vectors
+
+
+class GoogleEmbedder(Embedder):
+    """Gemini embeddings through langchain-google-genai (needs GOOGLE_API_KEY)."""
+
+    def __init__(self, model: str = GOOGLE_EMBEDDING_MODEL):
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+        self._client = GoogleGenerativeAIEmbeddings(model=model)
+        self.name = f"google-{model}"
+        self.dimensions = len(self._client.embed_query("dimensions"))
+
+    def _embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        return np.asarray(self._client.embed_documents(list(texts)), np.float32)
+
+
+_embedder: Optional[Embedder] = None
+
+
+def get_embedder() -> Embedder:
+    """Return the process-wide embedder selected by the EMBEDDER setting."""
+    global _embedder
+    if _embedder is None:
+        if EMBEDDER == "hashing":
+            _embedder = HashingEmbedder()
+        elif EMBEDDER == "google":
+            _embedder = GoogleEmbedder()
+        else:
+            raise ValueError(f"Unknown embedder: {EMBEDDER}")
+    return _embedder
@@ -0,0 +1,22 @@
+import threading
+
+# Job kinds handled by workers
+PROCESS_VIDEO_JOB = "process_video"
+INDEX_TRANSCRIPT_JOB = "index_transcript"
+SUMMARIZE_CHAT_JOB = "summarize_chat"
+EXPAND_COLLECTION_JOB = "expand_collection"
+
+# Set when jobs are enqueued so an in-process worker can lease them right away
+_new_jobs = threading.Event()
+
+
+def notify_new_jobs() -> None:
+    """Wake up a worker running in this process to lease newly enqueued jobs."""
+    _new_jobs.set()
+
+
+def wait_for_new_jobs(timeout: float) -> bool:
+    """Wait until jobs are enqueued in this process or the timeout passes."""
+    notified = _new_jobs.wait(timeout)
+    _new_jobs.clear()
+    return notified
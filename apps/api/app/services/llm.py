@@ -0,0 +1,143 @@
+"""
+Chat model clients that stream their answers.
+
+A prompt is a list of (role, content) pairs with roles "system", "human" and
+"ai". Clients yield the answer as LLMChunks while it is generated; closing the
+stream (or cancelling the task consuming it) stops the generation upstream.
+"""
+
+import asyncio
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, List, Optional, Sequence, Tuple, Union
+
+from ..core.config import GOOGLE_CHAT_MODEL, LLM_PROVIDER, LLM_TEMPERATURE
+from ..core.rate_limit import LLM, get_rate_limiter
+
+Prompt = List[Tuple[str, str]]
+
+
+@dataclass(frozen=True)
+class LLMChunk:
+    text: str
+    # Output tokens in this chunk, when the model reports usage
+    output_tokens: Optional[int] = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of text, for models that don't report usage."""
+    return math.ceil(len(text) / 4)
+
+
+class LLMClient(ABC):
+    """Streams chat completions. Subclasses implement stream."""
+
+    name: str = "llm"
+
+    @abstractmethod
+    def stream(self, prompt: Prompt) -> AsyncIterator[LLMChunk]:
+        """Yield the answer to prompt as it is generated."""
+
+    async def complete(self, prompt: Prompt) -> str:
+        """Generate the whole answer to prompt."""
+        return "".join([chunk.text async for chunk in self.stream(prompt)])
+
+
+class GoogleLLMClient(LLMClient):
+    """
+    Gemini chat models through langchain-google-genai (needs GOOGLE_API_KEY).
+    Calls wait for the LLM rate limit.
+    """
+
+    def __init__(
+        self, model: str = GOOGLE_CHAT_MODEL, temperature: float = LLM_TEMPERATURE
+    ):
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        self._model = ChatGoogleGenerativeAI(model=model, temperature=temperature)
+        self.name = f"google-{model}"
+
+    async def stream(self, prompt: Prompt) -> AsyncIterator[LLMChunk]:
+        await get_rate_limiter(LLM).acquire_async()
+        async for chunk in self._model.astream(prompt):
+            text = chunk.content if isinstance(chunk.content, str) else ""
+            usage = getattr(chunk, "usage_metadata", None)
+            yield LLMChunk(
+                text=text, output_tokens=usage.get("output_tokens") if usage else None
+            )
+
+    async def complete(self, prompt: Prompt) -> str:
+        await get_rate_limiter(LLM).acquire_async()
+        message = await self._model.ainvoke(prompt)
+        return message.content if isinstance(message.content, str) else ""
+
+
+class FakeLLMClient(LLMClient):
+    """
+    Streams a scripted answer one chunk at a time, delay seconds apart, then
+    raises error if one is given. script is the chunks, or a function of the
+    prompt returning them. For tests and offline development.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        script: Union[Sequence[str], Callable[[Prompt], Sequence[str]]] = (
+            "This ",
+            "is ",
+            "a ",
+            "scripted ",
+            "answer.",
+        ),
+        delay: float = 0.0,
+        error: Optional[Exception] = None,
+    ):
+        self.script = script
+        self.delay = delay
+        self.error = error
+        # Prompts received and chunks sent, for assertions in tests
+        self.prompts: List[Prompt] = []
+        self.sent = 0
+        # Generations running now, and the most that ever ran at once
+        self.active = 0
+        self.max_active = 0
+
+    async def stream(self, prompt: Prompt) -> AsyncIterator[LLMChunk]:
+        self.prompts.append(prompt)
+        script = self.script(prompt) if callable(self.script) else self.script
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            for text in script:
+                await asyncio.sleep(self.delay)
+                self.sent += 1
+                yield LLMChunk(text=text, output_tokens=1)
+            if self.error is not None:
+                raise self.error
+        finally:
+            self.active -= 1
+
+
+def create_llm_client() -> LLMClient:
+    """Create a chat model client of the kind selected by LLM_PROVIDER."""
+    if LLM_PROVIDER == "google":
+        return GoogleLLMClient()
+    if LLM_PROVIDER == "fake":
+        return FakeLLMClient()
+    raise ValueError(f"Unknown LLM provider: {LLM_PROVIDER}")
+
+
+_llm_client: Optional[LLMClient] = None
+
+
+def get_llm_client() -> LLMClient:
+    """
+    Return the chat model client of the API process's event loop. Code running
+    its own event loop, such as jobs, creates clients with create_llm_client.
+    """
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = create_llm_client()
+    return _llm_client
@@ -0,0 +1,183 @@
+import multiprocessing
+import threading
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Callable, Optional
+from ..core.config import (
+    PROCESSING_POOL_KIND,
+    PROCESSING_POOL_MAX_QUEUE,
+    PROCESSING_POOL_MAX_WORKERS,
+)
+from ..core.database import get_session_local
+from ..core.exceptions import ProcessingQueueFullError
+from ..core.logging import setup_logging
+from .chat import ChatService
+from .collection import CollectionService
+from .search import KeywordIndexService
+from .summarization import SummarizationService
+
+logger = setup_logging()
+
+
+class ProcessingPool:
+    """
+    Bounded executor for video processing jobs.
+
+    At most max_workers jobs run at once and at most max_queue more wait for a
+    free worker; further submissions are rejected with ProcessingQueueFullError
+    instead of piling up in memory.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = PROCESSING_POOL_MAX_WORKERS,
+        max_queue: int = PROCESSING_POOL_MAX_QUEUE,
+        kind: str = PROCESSING_POOL_KIND,
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown processing pool kind: {kind}")
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.kind = kind
+        self._executor = self._create_executor()
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _create_executor(self) -> Executor:
+        if self.kind == "process":
+            # Spawn so that child processes never inherit the parent's DB engine
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="video-processing"
+        )
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Submit a job, raising ProcessingQueueFullError if the pool is full."""
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ProcessingQueueFullError()
+            self._in_flight += 1
+            self.submitted += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def stats(self) -> dict:
+        """Return the current load of the pool."""
+        with self._lock:
+            in_flight = self._in_flight
+            return {
+                "kind": self.kind,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": min(in_flight, self.max_workers),
+                "queued": max(0, in_flight - self.max_workers),
+                "saturation": in_flight / (self.max_workers + self.max_queue),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and release the workers."""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+_processing_pool: Optional[ProcessingPool] = None
+_processing_pool_lock = threading.Lock()
+
+
+def get_processing_pool() -> ProcessingPool:
+    """Return the process-wide video processing pool, creating it on first use."""
+    global _processing_pool
+    with _processing_pool_lock:
+        if _processing_pool is None:
+            _processing_pool = ProcessingPool()
+        return _processing_pool
+
+
+def shutdown_processing_pool(wait: bool = True) -> None:
+    """Shut down the process-wide video processing pool if it was created."""
+    global _processing_pool
+    with _processing_pool_lock:
+        if _processing_pool is not None:
+            _processing_pool.shutdown(wait=wait)
+            _processing_pool = None
+
+
+def run_video_processing_job(chat_id: str, source_url: str) -> None:
+    """
+    Process a video in a pool worker.
+    Each job opens its own database session instead of borrowing the
+    request-scoped one, which is closed as soon as the response is sent.
+    """
+    db = get_session_local()()
+    try:
+        ChatService(db).process_video(chat_id, source_url)
+    finally:
+        db.close()
+
+
+def run_transcript_indexing_job(chat_id: str) -> None:
+    """
+    Build the keyword and retrieval indexes of a processed chat in a pool
+    worker. The keyword index comes first since it needs no embedding model.
+    """
+    # Imported here so that NumPy is only loaded by processes that index
+    from .retrieval import RetrievalService
+
+    db = get_session_local()()
+    try:
+        KeywordIndexService(db).index_chat(chat_id)
+        RetrievalService(db).index_chat(chat_id)
+    finally:
+        db.close()
+
+
+def run_chat_summarization_job(chat_id: str) -> None:
+    """
+    Generate the summary, actionable items and suggested questions of a
+    processed chat in a pool worker.
+    """
+    db = get_session_local()()
+    try:
+        SummarizationService(db).summarize_chat(chat_id)
+    finally:
+        db.close()
+
+
+def run_collection_expansion_job(collection_id: str) -> None:
+    """
+    Create the chats of the videos of a playlist or channel in a pool worker.
+    """
+    db = get_session_local()()
+    try:
+        CollectionService(db).expand_collection(collection_id)
+    finally:
+        db.close()
@@ -0,0 +1,218 @@
+"""
+Token-budgeted prompts grounded in a chat's transcript.
+
+A prompt answering a question is made of the system instructions, context
+(passages of the transcript and the summary of the video), the recent
+conversation and the question. The instructions and the question are always
+included; everything else competes for the token budget, highest value first:
+
+1. the passage most relevant to the question,
+2. the last exchange of the conversation,
+3. the summary of the video,
+4. the other passages, most relevant first,
+5. older exchanges, newest first.
+
+Items that don't fit are left out whole, counting the section header and
+separators they bring into the context; the PromptReport lists how many of
+each kind were included and trimmed. Older exchanges are only included while
+every newer one is, so the conversation never has gaps.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..core.config import PROMPT_TOKEN_BUDGET, PROMPT_TOKENIZER
+from .llm import Prompt, estimate_tokens
+
+# Kinds of prompt items
+PASSAGE = "passage"
+HISTORY = "history"
+SUMMARY = "summary"
+
+# Layout of the context
+_HEADERS = {SUMMARY: "Summary of the video:\n", PASSAGE: "Transcript excerpts:\n"}
+_SEPARATOR = "\n\n"
+
+
+class Tokenizer(ABC):
+    """Counts the tokens of texts. Subclasses implement count."""
+
+    name: str = "tokenizer"
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """Return the number of tokens of text."""
+
+
+class HeuristicTokenizer(Tokenizer):
+    """
+    Estimates about four characters per token, which is close for English
+    text with Gemini and GPT tokenizers, without loading a vocabulary.
+    """
+
+    name = "heuristic"
+
+    def count(self, text: str) -> int:
+        return estimate_tokens(text)
+
+
+def get_tokenizer() -> Tokenizer:
+    """Return the tokenizer selected by PROMPT_TOKENIZER."""
+    if PROMPT_TOKENIZER == "heuristic":
+        return HeuristicTokenizer()
+    raise ValueError(f"Unknown tokenizer: {PROMPT_TOKENIZER}")
+
+
+@dataclass(frozen=True)
+class Passage:
+    text: str
+    start_seconds: Optional[float] = None
+    # Position in the transcript; included passages are laid out in this order
+    position: int = 0
+
+    def render(self) -> str:
+        if self.start_seconds is None:
+            return self.text
+        minutes, seconds = divmod(int(self.start_seconds), 60)
+        return f"[{minutes:02d}:{seconds:02d}] {self.text}"
+
+
+@dataclass
+class PromptReport:
+    """Tokens of a built prompt and what was left out of it."""
+
+    budget: int
+    tokens: int = 0
+    included: Dict[str, int] = field(default_factory=dict)
+    trimmed: Dict[str, int] = field(default_factory=dict)
+    trimmed_tokens: int = 0
+
+    @property
+    def over_budget(self) -> bool:
+        # Only when the instructions and question alone exceed the budget
+        return self.tokens > self.budget
+
+    def to_dict(self) -> dict:
+        return {
+            "budget": self.budget,
+            "tokens": self.tokens,
+            "included": dict(self.included),
+            "trimmed": dict(self.trimmed),
+            "trimmed_tokens": self.trimmed_tokens,
+        }
+
+
+def _exchanges(history: Sequence[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
+    """Group a conversation into exchanges, each starting with a question."""
+    exchanges: List[List[Tuple[str, str]]] = []
+    for role, content in history:
+        if not content:
+            continue
+        if role == "human" or not exchanges:
+            exchanges.append([])
+        exchanges[-1].append((role, content))
+    return exchanges
+
+
+class PromptBuilder:
+    """
+    Builds prompts from instructions, a format string with a {context} field
+    that receives the summary and the passages.
+    """
+
+    def __init__(
+        self,
+        instructions: str,
+        budget: int = PROMPT_TOKEN_BUDGET,
+        tokenizer: Optional[Tokenizer] = None,
+    ):
+        self.instructions = instructions
+        self.budget = budget
+        self.tokenizer = tokenizer if tokenizer is not None else get_tokenizer()
+
+    def _context(self, summary: Optional[str], passages: List[Passage]) -> str:
+        sections = []
+        if summary:
+            sections.append(_HEADERS[SUMMARY] + summary)
+        if passages:
+            sections.append(
+                _HEADERS[PASSAGE]
+                + _SEPARATOR.join(p.render() for p in sorted(passages, key=_position))
+            )
+        return _SEPARATOR.join(sections)
+
+    def _layout_tokens(self, kind: str, chosen: Dict[str, list]) -> int:
+        """Tokens of the header and separators an item of kind adds to the context."""
+        if kind == HISTORY:
+            return 0
+        if chosen[kind]:
+            # Between this passage and the previous one
+            return self.tokenizer.count(_SEPARATOR)
+        tokens = self.tokenizer.count(_HEADERS[kind])
+        if chosen[SUMMARY if kind == PASSAGE else PASSAGE]:
+            # Between the summary and passages sections
+            tokens += self.tokenizer.count(_SEPARATOR)
+        return tokens
+
+    def build(
+        self,
+        question: str,
+        passages: Sequence[Passage] = (),
+        history: Sequence[Tuple[str, str]] = (),
+        summary: Optional[str] = None,
+    ) -> Tuple[Prompt, PromptReport]:
+        """
+        Build the prompt answering question. passages are ordered most
+        relevant first, history is the (role, content) pairs of the
+        conversation, oldest first.
+        """
+        count = self.tokenizer.count
+        report = PromptReport(budget=self.budget)
+        report.tokens = count(self.instructions.format(context="")) + count(question)
+
+        exchanges = _exchanges(history)[::-1]
+        candidates = []
+        if passages:
+            candidates.append((PASSAGE, passages[0]))
+        if exchanges:
+            candidates.append((HISTORY, exchanges[0]))
+        if summary:
+            candidates.append((SUMMARY, summary))
+        candidates += [(PASSAGE, passage) for passage in passages[1:]]
+        candidates += [(HISTORY, exchange) for exchange in exchanges[1:]]
+
+        chosen: Dict[str, list] = {PASSAGE: [], HISTORY: [], SUMMARY: []}
+        history_complete = True
+        for kind, item in candidates:
+            if kind == PASSAGE:
+                tokens = count(item.render())
+            elif kind == HISTORY:
+                tokens = sum(count(content) for _, content in item)
+            else:
+                tokens = count(item)
+            layout_tokens = self._layout_tokens(kind, chosen)
+            fits = report.tokens + tokens + layout_tokens <= self.budget
+            if kind == HISTORY:
+                fits = fits and history_complete
+                history_complete = fits
+            if fits:
+                chosen[kind].append(item)
+                report.tokens += tokens + layout_tokens
+                report.included[kind] = report.included.get(kind, 0) + 1
+            else:
+                report.trimmed[kind] = report.trimmed.get(kind, 0) + 1
+                report.trimmed_tokens += tokens
+
+        context = self._context(
+            chosen[SUMMARY][0] if chosen[SUMMARY] else None, chosen[PASSAGE]
+        )
+        prompt = [("system", self.instructions.format(context=context))]
+        for exchange in reversed(chosen[HISTORY]):
+            prompt += exchange
+        prompt.append(("human", question))
+        return prompt, report
+
+
+def _position(passage: Passage) -> int:
+    return passage.position
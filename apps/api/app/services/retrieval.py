@@ -0,0 +1,209 @@
+"""
+Retrieval of the transcript passages relevant to a question.
+
+After a chat is processed its transcript is split into overlapping chunks,
+which are embedded in batches and stored as one vector index per chat. A
+search embeds the query and scores every chunk with one matrix product, so
+prompts can carry only the top passages instead of the whole transcript.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..core.cache import LRUCache
+from ..core.config import (
+    RETRIEVAL_CHUNK_CHARS,
+    RETRIEVAL_CHUNK_OVERLAP_CHARS,
+    RETRIEVAL_INDEX_CACHE_ENTRIES,
+    RETRIEVAL_TOP_K,
+)
+from ..core.logging import setup_logging
+from ..core.vector_index import VectorIndex
+from ..models.transcript_index import ChatVectorIndex
+from ..repository.chat import ChatRepository
+from ..repository.transcript_index import (
+    AsyncTranscriptIndexRepository,
+    TranscriptIndexRepository,
+)
+from .embeddings import Embedder, get_embedder
+
+logger = setup_logging()
+
+# (text, start_seconds, end_seconds); times are None without segment timings
+Piece = Tuple[str, Optional[float], Optional[float]]
+
+
+@dataclass(frozen=True)
+class RetrievedChunk:
+    """Transcript chunk returned by a search, with its similarity to the query."""
+
+    position: int
+    text: str
+    start_seconds: Optional[float]
+    end_seconds: Optional[float]
+    score: float
+
+
+def transcript_pieces(chat) -> List[Piece]:
+    """Split a chat's transcript into its timed segments, or lines if untimed."""
+    return record_pieces(chat.transcript_record)
+
+
+def record_pieces(record) -> List[Piece]:
+    """transcript_pieces of a stored transcript (a ChatTranscript or None)."""
+    segments = record.segments if record is not None else None
+    if segments is not None:
+        return [
+            (segment["text"], segment["start"], segment["start"] + segment["duration"])
+            for segment in map(segments.segment, range(len(segments)))
+        ]
+    text = record.text if record is not None else None
+    return [(line, None, None) for line in (text or "").splitlines()]
+
+
+def chunk_pieces(
+    pieces: Iterable[Piece],
+    chunk_chars: int = RETRIEVAL_CHUNK_CHARS,
+    overlap_chars: int = RETRIEVAL_CHUNK_OVERLAP_CHARS,
+) -> List[Piece]:
+    """
+    Group consecutive pieces into chunks of about chunk_chars characters.
+    Each chunk starts with the trailing pieces of the previous one, up to
+    overlap_chars characters, so passages cut at a boundary stay retrievable.
+    Pieces are never split, and every chunk adds at least one new piece.
+    """
+    pieces = [piece for piece in pieces if piece[0].strip()]
+    chunks: List[Piece] = []
+    first = 0
+    while first < len(pieces):
+        last, length = first, 0
+        while last < len(pieces) and (last == first or length < chunk_chars):
+            length += len(pieces[last][0]) + 1
+            last += 1
+        group = pieces[first:last]
+        chunks.append(
+            (" ".join(text for text, _, _ in group), group[0][1], group[-1][2])
+        )
+        if last == len(pieces):
+            break
+        # Step back over the pieces that fit in the overlap
+        next_first, overlap = last, 0
+        while next_first - 1 > first:
+            overlap += len(pieces[next_first - 1][0]) + 1
+            if overlap > overlap_chars:
+                break
+            next_first -= 1
+        first = next_first
+    return chunks
+
+
+# Loaded vector indexes, keyed by chat ID and the time the index was written
+_index_cache = LRUCache(max_entries=RETRIEVAL_INDEX_CACHE_ENTRIES)
+
+
+def get_index_cache() -> LRUCache:
+    """Return the process-wide cache of loaded vector indexes."""
+    return _index_cache
+
+
+def _load_index(db_index: ChatVectorIndex) -> VectorIndex:
+    key = (str(db_index.chat_id), db_index.updated_at, db_index.chunk_count)
+    index = _index_cache.get(key)
+    if index is None:
+        index = VectorIndex.from_bytes(db_index.vectors, db_index.dimensions)
+        _index_cache.set(key, index)
+    return index
+
+
+def _rank(
+    db_index: ChatVectorIndex, embedder: Embedder, query: str, k: int
+) -> List[Tuple[int, float]]:
+    if db_index.embedder != embedder.name:
+        raise ValueError(
+            f"Index was built with {db_index.embedder}, not {embedder.name}"
+        )
+    return _load_index(db_index).search(embedder.embed_query(query), k)
+
+
+def _retrieved(chunks, ranked: List[Tuple[int, float]]) -> List[RetrievedChunk]:
+    by_position = {chunk.position: chunk for chunk in chunks}
+    return [
+        RetrievedChunk(
+            position=position,
+            text=by_position[position].text,
+            start_seconds=by_position[position].start_seconds,
+            end_seconds=by_position[position].end_seconds,
+            score=score,
+        )
+        for position, score in ranked
+        if position in by_position
+    ]
+
+
+class RetrievalService:
+    """Builds and searches the vector indexes of chats (used by workers)."""
+
+    def __init__(self, db: Session, embedder: Optional[Embedder] = None):
+        self.chat_repository = ChatRepository(db)
+        self.index_repository = TranscriptIndexRepository(db)
+        self.embedder = embedder if embedder is not None else get_embedder()
+
+    def index_chat(self, chat_id: str) -> int:
+        """
+        Chunk, embed and store the transcript of a chat, replacing any previous
+        index. Returns the number of chunks.
+        """
+        chat = self.chat_repository.get_chat_by_id(chat_id)
+        if chat is None:
+            raise ValueError("Chat not found")
+        chunks = chunk_pieces(transcript_pieces(chat))
+        vectors = self.embedder.embed([text for text, _, _ in chunks])
+        self.index_repository.replace_index(
+            chat_id,
+            chunks,
+            VectorIndex(vectors).to_bytes(),
+            self.embedder.name,
+            self.embedder.dimensions,
+        )
+        logger.info(
+            "Transcript indexed",
+            extra={
+                "chat_id": chat_id,
+                "chunks": len(chunks),
+                "embedder": self.embedder.name,
+            },
+        )
+        return len(chunks)
+
+    def search(
+        self, chat_id: str, query: str, k: int = RETRIEVAL_TOP_K
+    ) -> List[RetrievedChunk]:
+        """Return the k chunks of a chat most similar to query, best first."""
+        db_index = self.index_repository.get_index(chat_id)
+        if db_index is None:
+            raise ValueError("Transcript index not found")
+        ranked = _rank(db_index, self.embedder, query, k)
+        chunks = self.index_repository.get_chunks(chat_id, [p for p, _ in ranked])
+        return _retrieved(chunks, ranked)
+
+
+class AsyncRetrievalService:
+    """Async variant of RetrievalService.search for request handlers."""
+
+    def __init__(self, db: AsyncSession, embedder: Optional[Embedder] = None):
+        self.index_repository = AsyncTranscriptIndexRepository(db)
+        self.embedder = embedder if embedder is not None else get_embedder()
+
+    async def search(
+        self, chat_id: str, query: str, k: int = RETRIEVAL_TOP_K
+    ) -> List[RetrievedChunk]:
+        """Return the k chunks of a chat most similar to query, best first."""
+        db_index = await self.index_repository.get_index(chat_id)
+        if db_index is None:
+            raise ValueError("Transcript index not found")
+        # Embedding may call a remote model and scoring is CPU-bound
+        ranked = await asyncio.to_thread(_rank, db_index, self.embedder, query, k)
+        chunks = await self.index_repository.get_chunks(chat_id, [p for p, _ in ranked])
+        return _retrieved(chunks, ranked)
@@ -0,0 +1,145 @@
+"""
+BM25 keyword search within the transcript of one chat.
+
+The inverted index is built once, by the indexing job of a processed chat, and
+stored compressed. Searches load it (with the transcript text the hits point
+into) into an in-process LRU on first use; after that a query only scores the
+postings of its own terms.
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..core.cache import LRUCache
+from ..core.compression import compress_bytes, decompress_bytes
+from ..core.config import SEARCH_INDEX_CACHE_ENTRIES
+from ..core.logging import setup_logging
+from ..repository.chat import AsyncChatRepository, ChatRepository
+from ..repository.transcript_index import (
+    AsyncTranscriptIndexRepository,
+    TranscriptIndexRepository,
+)
+
+logger = setup_logging()
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """Transcript passage matching a keyword search."""
+
+    score: float
+    start_seconds: Optional[float]
+    end_seconds: Optional[float]
+    text: str
+    # Character range of the passage in the transcript
+    offset: int
+    length: int
+    # [start, end) character ranges of the matched terms in the transcript
+    matches: List[Tuple[int, int]]
+
+
+# Loaded keyword indexes and transcripts, keyed by chat ID and index version
+_keyword_index_cache = LRUCache(max_entries=SEARCH_INDEX_CACHE_ENTRIES)
+
+
+def get_keyword_index_cache() -> LRUCache:
+    """Return the process-wide cache of loaded keyword indexes."""
+    return _keyword_index_cache
+
+
+class KeywordIndexService:
+    """Builds the keyword indexes of chats (used by workers)."""
+
+    def __init__(self, db: Session):
+        self.chat_repository = ChatRepository(db)
+        self.index_repository = TranscriptIndexRepository(db)
+
+    def index_chat(self, chat_id: str) -> int:
+        """
+        Build and store the keyword index of a chat's transcript, replacing
+        any previous one. Returns the number of documents indexed.
+        """
+        # Imported here so that NumPy is only loaded by processes that index
+        from ..core.keyword_index import KeywordIndex
+        from .retrieval import transcript_pieces
+
+        chat = self.chat_repository.get_chat_by_id(chat_id)
+        if chat is None:
+            raise ValueError("Chat not found")
+        index = KeywordIndex.build(transcript_pieces(chat))
+        codec, data = compress_bytes(index.to_bytes())
+        self.index_repository.replace_keyword_index(chat_id, codec, data, len(index))
+        logger.info(
+            "Keyword index built",
+            extra={"chat_id": chat_id, "documents": len(index)},
+        )
+        return len(index)
+
+
+def _search(index, text: str, query: str, limit: int) -> List[SearchHit]:
+    from ..core.keyword_index import tokenize
+
+    # Terms are matched the way they were indexed
+    terms = set(tokenize(query))
+    hits = []
+    for doc, score in index.search(query, limit):
+        offset, end = index.document_span(doc)
+        start_seconds, end_seconds = index.document_times(doc)
+        hits.append(
+            SearchHit(
+                score=score,
+                start_seconds=start_seconds,
+                end_seconds=end_seconds,
+                text=text[offset:end],
+                offset=offset,
+                length=end - offset,
+                matches=[
+                    (match.start(), match.end())
+                    for match in _WORD_PATTERN.finditer(text, offset, end)
+                    if match.group().casefold() in terms
+                ],
+            )
+        )
+    return hits
+
+
+def _decode(db_index, record) -> tuple:
+    from ..core.keyword_index import KeywordIndex
+
+    index = KeywordIndex.from_bytes(decompress_bytes(db_index.codec, db_index.data))
+    return index, record.text
+
+
+class AsyncKeywordSearchService:
+    """Searches the keyword indexes of chats from request handlers."""
+
+    def __init__(self, db: AsyncSession):
+        self.chat_repository = AsyncChatRepository(db)
+        self.index_repository = AsyncTranscriptIndexRepository(db)
+
+    async def _load(self, chat_id: str) -> tuple:
+        version = await self.index_repository.get_keyword_index_version(chat_id)
+        if version is None:
+            raise ValueError("Search index not found")
+        key = (chat_id, version)
+        loaded = _keyword_index_cache.get(key)
+        if loaded is None:
+            db_index = await self.index_repository.get_keyword_index(chat_id)
+            record = await self.chat_repository.get_transcript(chat_id)
+            if db_index is None or record is None:
+                raise ValueError("Search index not found")
+            # Decompressing and decoding a long transcript's index takes a
+            # while, so keep it off the event loop
+            loaded = await asyncio.to_thread(_decode, db_index, record)
+            _keyword_index_cache.set(key, loaded)
+        return loaded
+
+    async def search(self, chat_id: str, query: str, limit: int) -> List[SearchHit]:
+        """Return the passages of a chat's transcript best matching query."""
+        index, text = await self._load(chat_id)
+        return _search(index, text, query, limit)
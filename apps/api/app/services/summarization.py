@@ -0,0 +1,234 @@
+"""
+Summary, actionable items and suggested questions of processed chats.
+
+A multi-hour transcript doesn't fit in one prompt, and one call over all of it
+takes time proportional to its length. Instead the transcript is cut into
+chunks that are summarized concurrently, at most SUMMARY_CONCURRENCY at a time
+(map). The chunk summaries are then combined into the chat's fields (reduce);
+when they are too long to combine at once, they are first combined in groups,
+concurrently too, until they fit. Notes too long to share a group are cut in
+pieces first, so that no part of the video is dropped. Wall-clock time thus
+grows with the number of chunks divided by the concurrency, not with the
+length of the transcript.
+"""
+
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+from sqlalchemy.orm import Session
+from ..core.config import (
+    SUMMARY_CHUNK_CHARS,
+    SUMMARY_CONCURRENCY,
+    SUMMARY_MAX_ITEMS,
+    SUMMARY_REDUCE_MAX_CHARS,
+)
+from ..core.logging import setup_logging
+from ..repository.chat import ChatRepository
+from .llm import LLMClient, create_llm_client
+
+logger = setup_logging()
+
+MAP_PROMPT = (
+    "You take notes on a part of a video's transcript. Write concise notes on "
+    "its key points, any advice or steps the viewer could act on, and topics "
+    "worth asking about. Use only what the transcript says."
+)
+COLLAPSE_PROMPT = (
+    "You combine notes taken on consecutive parts of a video into one set of "
+    "concise notes, keeping the key points, actionable advice and topics worth "
+    "asking about."
+)
+REDUCE_PROMPT = (
+    "You summarize a video from its transcript or notes on it. Answer with a "
+    'JSON object with the keys "summary" (an insightful summary of a few '
+    'paragraphs), "actionable_items" (at most {max_items} things the viewer '
+    'can do, as strings) and "suggested_questions" (at most {max_items} '
+    "questions the video answers, as strings), and nothing else."
+)
+
+_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+@dataclass(frozen=True)
+class Summary:
+    summary: str
+    actionable_items: List[str] = field(default_factory=list)
+    suggested_questions: List[str] = field(default_factory=list)
+
+
+def _strings(value, max_items: int) -> List[str]:
+    if not isinstance(value, list):
+        return []
+    return [str(item).strip() for item in value if str(item).strip()][:max_items]
+
+
+def parse_summary(text: str, max_items: int = SUMMARY_MAX_ITEMS) -> Summary:
+    """
+    Parse the JSON answer of the reduce step. Anything else is kept as the
+    summary, with no items or questions.
+    """
+    text = _FENCE_PATTERN.sub("", text.strip())
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict) or not isinstance(data.get("summary"), str):
+        return Summary(summary=text)
+    return Summary(
+        summary=data["summary"].strip(),
+        actionable_items=_strings(data.get("actionable_items"), max_items),
+        suggested_questions=_strings(data.get("suggested_questions"), max_items),
+    )
+
+
+def group_texts(texts: List[str], max_chars: int) -> List[List[str]]:
+    """Pack consecutive texts into groups of at most max_chars characters."""
+    groups: List[List[str]] = []
+    length = 0
+    for text in texts:
+        if groups and length + len(text) + 2 <= max_chars:
+            groups[-1].append(text)
+            length += len(text) + 2
+        else:
+            groups.append([text])
+            length = len(text)
+    return groups
+
+
+def split_texts(texts: List[str], max_chars: int) -> List[str]:
+    """
+    Cut texts longer than max_chars into pieces of at most max_chars
+    characters, at the last whitespace of a piece where there is one.
+    """
+    pieces: List[str] = []
+    for text in texts:
+        while len(text) > max_chars:
+            cut = text.rfind(" ", 1, max_chars + 1)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(text[:cut])
+            text = text[cut:].lstrip()
+        if text:
+            pieces.append(text)
+    return pieces
+
+
+class Summarizer:
+    def __init__(
+        self,
+        llm: LLMClient,
+        concurrency: int = SUMMARY_CONCURRENCY,
+        chunk_chars: int = SUMMARY_CHUNK_CHARS,
+        reduce_max_chars: int = SUMMARY_REDUCE_MAX_CHARS,
+        max_items: int = SUMMARY_MAX_ITEMS,
+    ):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.llm = llm
+        self.concurrency = concurrency
+        self.chunk_chars = chunk_chars
+        self.reduce_max_chars = reduce_max_chars
+        self.max_items = max_items
+        # Model calls made by the last summarize, and its rounds of combining
+        self.calls = 0
+        self.rounds = 0
+
+    async def _generate(self, semaphore: asyncio.Semaphore, system: str, text: str):
+        async with semaphore:
+            self.calls += 1
+            return await self.llm.complete([("system", system), ("human", text)])
+
+    async def _generate_all(
+        self, semaphore: asyncio.Semaphore, system: str, texts: List[str]
+    ) -> List[str]:
+        return list(
+            await asyncio.gather(
+                *(self._generate(semaphore, system, text) for text in texts)
+            )
+        )
+
+    async def summarize(self, pieces: Iterable[tuple]) -> Summary:
+        """Summarize a transcript given as (text, start, end) pieces."""
+        # Imported here so that NumPy is only loaded by processes that summarize
+        from .retrieval import chunk_pieces
+
+        self.calls = self.rounds = 0
+        semaphore = asyncio.Semaphore(self.concurrency)
+        chunks = [text for text, _, _ in chunk_pieces(pieces, self.chunk_chars, 0)]
+        if not chunks:
+            raise ValueError("Transcript is empty")
+
+        # Short transcripts are summarized in one call
+        notes = chunks
+        if sum(len(chunk) + 2 for chunk in chunks) > self.reduce_max_chars:
+            notes = await self._generate_all(semaphore, MAP_PROMPT, chunks)
+        length = sum(len(note) + 2 for note in notes)
+        while length > self.reduce_max_chars:
+            # Notes over half the limit can't be paired up, so they are cut
+            # first; every group then combines at least two pieces
+            pieces = split_texts(notes, (self.reduce_max_chars - 2) // 2)
+            groups = group_texts(pieces, self.reduce_max_chars)
+            self.rounds += 1
+            notes = await self._generate_all(
+                semaphore, COLLAPSE_PROMPT, ["\n\n".join(group) for group in groups]
+            )
+            previous, length = length, sum(len(note) + 2 for note in notes)
+            if length >= previous:
+                # The model isn't condensing the notes any further
+                break
+
+        text = "\n\n".join(notes)
+        if len(text) > self.reduce_max_chars:
+            logger.warning(
+                "Summary notes truncated to fit the reduce prompt",
+                extra={"chars": len(text), "kept_chars": self.reduce_max_chars},
+            )
+        answer = await self._generate(
+            semaphore,
+            REDUCE_PROMPT.format(max_items=self.max_items),
+            text[: self.reduce_max_chars],
+        )
+        return parse_summary(answer, self.max_items)
+
+
+class SummarizationService:
+    """Summarizes processed chats (used by workers)."""
+
+    def __init__(self, db: Session, llm: Optional[LLMClient] = None):
+        self.chat_repository = ChatRepository(db)
+        self.llm = llm
+
+    def summarize_chat(self, chat_id: str) -> Summary:
+        """
+        Generate and store the summary, actionable items and suggested
+        questions of a chat.
+        """
+        from .retrieval import transcript_pieces
+
+        chat = self.chat_repository.get_chat_by_id(chat_id)
+        if chat is None:
+            raise ValueError("Chat not found")
+        # Jobs run their own event loop; clients are bound to the loop they use
+        summarizer = Summarizer(
+            self.llm if self.llm is not None else create_llm_client()
+        )
+        start_time = time.perf_counter()
+        summary = asyncio.run(summarizer.summarize(transcript_pieces(chat)))
+        self.chat_repository.update_chat(
+            chat_id=chat_id,
+            generated_summary=summary.summary,
+            actionable_items=summary.actionable_items,
+            suggested_questions=summary.suggested_questions,
+        )
+        logger.info(
+            "Chat summarized",
+            extra={
+                "chat_id": chat_id,
+                "calls": summarizer.calls,
+                "rounds": summarizer.rounds,
+                "summary_time": f"{time.perf_counter() - start_time:.4f}s",
+            },
+        )
+        return summary
@@ -1,20 +1,95 @@
+import importlib
 import re
 from datetime import datetime
-from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api.formatters import TextFormatter
-from youtube_transcript_api._errors import (
-    NoTranscriptFound,
-    VideoUnavailable,
-    TranscriptsDisabled,
-    CouldNotRetrieveTranscript,
-)
-import yt_dlp
-from yt_dlp.utils import DownloadError, ExtractorError
-from ..core.exceptions import VideoProcessingError
+from typing import Callable
+from urllib.parse import parse_qs, urlparse
+from ..core.config import COLLECTION_MAX_VIDEOS
+from ..core.exceptions import TransientVideoError, VideoProcessingError
 from ..core.logging import setup_logging
+from ..core.rate_limit import YOUTUBE_TRANSCRIPT, YT_DLP, get_rate_limiter
+from ..core.retry import CircuitOpenError, call_with_retry, get_circuit_breaker
+from ..core.segments import TranscriptSegments
 
 logger = setup_logging()
 
+# yt-dlp and youtube-transcript-api are slow to import and only needed by the
+# processes that fetch videos, so they are imported on first use.
+# Maps each module attribute to its (module, attribute) source.
+_LAZY_IMPORTS = {
+    "YouTubeTranscriptApi": ("youtube_transcript_api", "YouTubeTranscriptApi"),
+    "TextFormatter": ("youtube_transcript_api.formatters", "TextFormatter"),
+    "NoTranscriptFound": ("youtube_transcript_api._errors", "NoTranscriptFound"),
+    "VideoUnavailable": ("youtube_transcript_api._errors", "VideoUnavailable"),
+    "TranscriptsDisabled": ("youtube_transcript_api._errors", "TranscriptsDisabled"),
+    "RequestBlocked": ("youtube_transcript_api._errors", "RequestBlocked"),
+    "YouTubeRequestFailed": ("youtube_transcript_api._errors", "YouTubeRequestFailed"),
+    "CouldNotRetrieveTranscript": (
+        "youtube_transcript_api._errors",
+        "CouldNotRetrieveTranscript",
+    ),
+    "yt_dlp": ("yt_dlp", None),
+    "DownloadError": ("yt_dlp.utils", "DownloadError"),
+    "ExtractorError": ("yt_dlp.utils", "ExtractorError"),
+}
+
+
+def __getattr__(name: str):
+    try:
+        module_name, attribute = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(module_name)
+    value = module if attribute is None else getattr(module, attribute)
+    # Cache on the module so later lookups (and test patches) skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def _lazy(*names: str):
+    """Return the lazily imported attributes of this module by name."""
+    values = tuple(globals()[n] if n in globals() else __getattr__(n) for n in names)
+    return values if len(values) > 1 else values[0]
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """
+    Whether a fetch error may pass on a retry: network errors and throttling
+    do, while errors about the video itself (no transcripts, unavailable,
+    private) and unexpected errors don't.
+    """
+    module = type(error).__module__
+    if module.startswith("youtube_transcript_api"):
+        return isinstance(error, _lazy("RequestBlocked", "YouTubeRequestFailed"))
+    if module.startswith("yt_dlp"):
+        # yt-dlp flags the errors it expects, about the video, as expected
+        cause = getattr(error, "exc_info", None)
+        cause = cause[1] if cause else error
+        return not getattr(cause, "expected", False)
+    # requests errors, such as connection failures and timeouts, are IOErrors
+    return isinstance(error, OSError)
+
+
+def _fetch(upstream: str, fn: Callable, *args, **kwargs):
+    """
+    Call fn on an upstream within its rate limit, retrying transient errors
+    while its circuit is closed.
+    """
+
+    def attempt():
+        get_rate_limiter(upstream).acquire()
+        return fn(*args, **kwargs)
+
+    return call_with_retry(
+        attempt, is_retryable_error, breaker=get_circuit_breaker(upstream)
+    )
+
+
+def _fetch_error(message: str, error: Exception) -> VideoProcessingError:
+    """Wrap a fetch error, as transient if retrying the fetch later may help."""
+    if isinstance(error, CircuitOpenError) or is_retryable_error(error):
+        return TransientVideoError(message)
+    return VideoProcessingError(message)
+
 
 def extract_video_id(url: str) -> str:
     """Extract YouTube video ID from URL."""
@@ -31,12 +106,104 @@ def extract_video_id(url: str) -> str:
         raise VideoProcessingError("Invalid YouTube URL")
 
 
+# Source types of collections
+YOUTUBE_PLAYLIST = "YOUTUBE_PLAYLIST"
+YOUTUBE_CHANNEL = "YOUTUBE_CHANNEL"
+
+# Paths of channel pages: /@handle, /channel/<id>, /c/<name> and /user/<name>
+_CHANNEL_PATH = re.compile(r"^/(@[^/]+|(?:channel|c|user)/[^/]+)(/[^/]*)?/?$")
+
+_VIDEO_ID = re.compile(r"^[0-9A-Za-z_-]{11}$")
+
+
+def collection_source_type(url: str) -> str:
+    """
+    Return the source type of a YouTube playlist or channel URL.
+    Raises VideoProcessingError for other URLs.
+    """
+    parsed = urlparse(url if "://" in url else f"https://{url}")
+    host = (parsed.hostname or "").removeprefix("www.").removeprefix("m.")
+    if host == "youtube.com":
+        if parse_qs(parsed.query).get("list"):
+            return YOUTUBE_PLAYLIST
+        if _CHANNEL_PATH.match(parsed.path):
+            return YOUTUBE_CHANNEL
+    raise VideoProcessingError("Invalid YouTube playlist or channel URL")
+
+
+def _collection_url(url: str, source_type: str) -> str:
+    """URL listing the videos of a collection to yt-dlp."""
+    parsed = urlparse(url if "://" in url else f"https://{url}")
+    if source_type == YOUTUBE_PLAYLIST:
+        playlist_id = parse_qs(parsed.query)["list"][0]
+        return f"https://www.youtube.com/playlist?list={playlist_id}"
+    # A channel's home page lists its tabs; its videos tab lists the videos
+    channel = _CHANNEL_PATH.match(parsed.path).group(1)
+    return f"https://www.youtube.com/{channel}/videos"
+
+
+def get_youtube_collection(url: str) -> dict:
+    """
+    List the videos of a YouTube playlist or channel with a single flat
+    yt-dlp extraction, which reads the listing pages without visiting each
+    video. At most COLLECTION_MAX_VIDEOS videos are listed, in order.
+    """
+    source_type = collection_source_type(url)
+    listing_url = _collection_url(url, source_type)
+    logger.debug("Listing YouTube collection with yt-dlp", extra={"url": listing_url})
+    yt_dlp = _lazy("yt_dlp")
+    ydl_opts = {
+        "skip_download": True,
+        "quiet": True,
+        "no_warnings": True,
+        "extract_flat": "in_playlist",
+        "playlistend": COLLECTION_MAX_VIDEOS,
+    }
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = _fetch(YT_DLP, ydl.extract_info, listing_url, download=False)
+    except Exception as e:
+        logger.error(
+            "Failed to list YouTube collection with yt-dlp",
+            extra={"url": listing_url, "error": str(e)},
+            exc_info=True,
+        )
+        raise _fetch_error(f"Failed to list videos of {url}: {str(e)}", e)
+
+    video_ids = []
+    seen = set()
+    for entry in info.get("entries") or []:
+        video_id = (entry or {}).get("id")
+        # Channels may list other playlists or channels next to their videos
+        if video_id and _VIDEO_ID.match(video_id) and video_id not in seen:
+            seen.add(video_id)
+            video_ids.append(video_id)
+    collection = {
+        "source_type": source_type,
+        "title": info.get("title"),
+        "channel_name": info.get("uploader") or info.get("channel"),
+        "video_ids": video_ids[:COLLECTION_MAX_VIDEOS],
+    }
+    logger.debug(
+        "YouTube collection listed",
+        extra={"url": listing_url, "video_count": len(collection["video_ids"])},
+    )
+    return collection
+
+
 def get_youtube_transcript(video_id: str) -> str:
     """Retrieve and format YouTube video transcript."""
     logger.debug("Retrieving YouTube transcript", extra={"video_id": video_id})
+    YouTubeTranscriptApi, TextFormatter = _lazy("YouTubeTranscriptApi", "TextFormatter")
+    transcript_errors = _lazy(
+        "NoTranscriptFound",
+        "VideoUnavailable",
+        "TranscriptsDisabled",
+        "CouldNotRetrieveTranscript",
+    )
     try:
         ytt_api = YouTubeTranscriptApi()
-        transcript_list = ytt_api.fetch(video_id)
+        transcript_list = _fetch(YOUTUBE_TRANSCRIPT, ytt_api.fetch, video_id)
 
         formatter = TextFormatter()
         formatted_transcript = formatter.format_transcript(transcript_list)
@@ -49,19 +216,65 @@ def get_youtube_transcript(video_id: str) -> str:
             },
         )
         return formatted_transcript
-    except (
-        NoTranscriptFound,
-        VideoUnavailable,
-        TranscriptsDisabled,
-        CouldNotRetrieveTranscript,
-    ) as e:
+    except transcript_errors as e:
+        logger.error(
+            "Failed to retrieve transcript",
+            extra={"video_id": video_id, "error": str(e)},
+            exc_info=True,
+        )
+        raise _fetch_error(
+            f"Failed to retrieve transcript for video {video_id}: {str(e)}", e
+        )
+    except Exception as e:
+        logger.error(
+            "Unexpected error while retrieving transcript",
+            extra={"video_id": video_id, "error": str(e)},
+            exc_info=True,
+        )
+        raise _fetch_error(
+            f"Unexpected error while retrieving transcript for video {video_id}: {str(e)}",
+            e,
+        )
+
+
+def get_youtube_transcript_segments(video_id: str) -> TranscriptSegments:
+    """
+    Retrieve the YouTube video transcript with the timing of each segment.
+    The text of the segments is the same as get_youtube_transcript() returns.
+    """
+    logger.debug("Retrieving YouTube transcript segments", extra={"video_id": video_id})
+    YouTubeTranscriptApi = _lazy("YouTubeTranscriptApi")
+    transcript_errors = _lazy(
+        "NoTranscriptFound",
+        "VideoUnavailable",
+        "TranscriptsDisabled",
+        "CouldNotRetrieveTranscript",
+    )
+    try:
+        ytt_api = YouTubeTranscriptApi()
+        fetched_transcript = _fetch(YOUTUBE_TRANSCRIPT, ytt_api.fetch, video_id)
+        segments = TranscriptSegments.from_snippets(
+            (snippet.text, snippet.start, snippet.duration)
+            for snippet in fetched_transcript
+        )
+
+        logger.debug(
+            "YouTube transcript segments retrieved successfully",
+            extra={
+                "video_id": video_id,
+                "segment_count": len(segments),
+                "transcript_length": len(segments.text),
+            },
+        )
+        return segments
+    except transcript_errors as e:
         logger.error(
             "Failed to retrieve transcript",
             extra={"video_id": video_id, "error": str(e)},
             exc_info=True,
         )
-        raise VideoProcessingError(
-            f"Failed to retrieve transcript for video {video_id}: {str(e)}"
+        raise _fetch_error(
+            f"Failed to retrieve transcript for video {video_id}: {str(e)}", e
         )
     except Exception as e:
         logger.error(
@@ -69,8 +282,9 @@ def get_youtube_transcript(video_id: str) -> str:
             extra={"video_id": video_id, "error": str(e)},
             exc_info=True,
         )
-        raise VideoProcessingError(
-            f"Unexpected error while retrieving transcript for video {video_id}: {str(e)}"
+        raise _fetch_error(
+            f"Unexpected error while retrieving transcript for video {video_id}: {str(e)}",
+            e,
         )
 
 
@@ -79,6 +293,8 @@ def get_youtube_metadata(video_id: str) -> dict:
     logger.debug(
         "Retrieving YouTube metadata with yt-dlp", extra={"video_id": video_id}
     )
+    yt_dlp = _lazy("yt_dlp")
+    download_errors = _lazy("DownloadError", "ExtractorError")
     try:
         # Configure yt-dlp options for metadata extraction
         ydl_opts = {
@@ -91,7 +307,7 @@ def get_youtube_metadata(video_id: str) -> dict:
         # Extract metadata using yt-dlp
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             video_url = f"https://www.youtube.com/watch?v={video_id}"
-            info = ydl.extract_info(video_url, download=False)
+            info = _fetch(YT_DLP, ydl.extract_info, video_url, download=False)
 
             metadata = {
                 "title": info.get("title", "Unknown Title"),
@@ -114,14 +330,14 @@ def get_youtube_metadata(video_id: str) -> dict:
         )
         return metadata
 
-    except (DownloadError, ExtractorError) as e:
+    except download_errors as e:
         logger.error(
             "Failed to retrieve metadata with yt-dlp",
             extra={"video_id": video_id, "error": str(e)},
             exc_info=True,
         )
-        raise VideoProcessingError(
-            f"Failed to retrieve metadata for video {video_id}: {str(e)}"
+        raise _fetch_error(
+            f"Failed to retrieve metadata for video {video_id}: {str(e)}", e
         )
     except Exception as e:
         logger.error(
@@ -129,6 +345,7 @@ def get_youtube_metadata(video_id: str) -> dict:
             extra={"video_id": video_id, "error": str(e)},
             exc_info=True,
         )
-        raise VideoProcessingError(
-            f"Unexpected error while retrieving metadata for video {video_id}: {str(e)}"
+        raise _fetch_error(
+            f"Unexpected error while retrieving metadata for video {video_id}: {str(e)}",
+            e,
         )
@@ -0,0 +1,147 @@
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from ..core.cache import LRUCache
+from ..core.clock import utcnow
+from ..core.config import VIDEO_CACHE_MAX_ENTRIES, VIDEO_CACHE_METADATA_TTL_SECONDS
+from ..core.logging import setup_logging
+from ..core.segments import TranscriptSegments
+from ..models.video_cache import VideoCache
+from ..repository.video_cache import VideoCacheRepository
+
+logger = setup_logging()
+
+
+@dataclass(frozen=True)
+class CachedVideo:
+    """Snapshot of the cached transcript and metadata of a video."""
+
+    video_id: str
+    transcript: Optional[TranscriptSegments] = None
+    metadata: Optional[dict] = None
+    metadata_fetched_at: Optional[datetime] = None
+
+
+# Shared by every ChatService in the process so hot videos skip the database too
+_video_lru = LRUCache(max_entries=VIDEO_CACHE_MAX_ENTRIES)
+
+
+def get_video_lru() -> LRUCache:
+    """Return the process-wide LRU in front of the video cache table."""
+    return _video_lru
+
+
+class VideoCacheService:
+    """
+    Video ID keyed cache of transcripts and metadata.
+
+    Lookups go through an in-process LRU first and then the video_cache table.
+    Transcripts never expire; metadata such as view_count is only returned
+    while it is younger than the metadata TTL. Transcripts cached without
+    segment timings are treated as missing so that they are fetched again.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        metadata_ttl_seconds: int = VIDEO_CACHE_METADATA_TTL_SECONDS,
+        lru: Optional[LRUCache] = None,
+    ):
+        self.repository = VideoCacheRepository(db)
+        self.metadata_ttl = timedelta(seconds=metadata_ttl_seconds)
+        self.lru = lru if lru is not None else get_video_lru()
+
+    def get(self, video_id: str, refresh: bool = False) -> Optional[CachedVideo]:
+        """
+        Return the cached entry for a video, or None if nothing is cached.
+        Stale metadata is dropped from the returned entry. With refresh=True the
+        LRU is bypassed to pick up entries written by other processes.
+        """
+        cached = None if refresh else self.lru.get(video_id)
+        if cached is None:
+            try:
+                db_entry = self.repository.get_by_video_id(video_id)
+            except SQLAlchemyError as e:
+                logger.warning(
+                    "Video cache lookup failed",
+                    extra={"video_id": video_id, "error": str(e)},
+                )
+                self.repository.db.rollback()
+                return None
+            if db_entry is None:
+                logger.debug("Video cache miss", extra={"video_id": video_id})
+                return None
+            cached = self._to_cached_video(db_entry)
+            self.lru.set(video_id, cached)
+
+        if cached.metadata is not None and not self._is_fresh(
+            cached.metadata_fetched_at
+        ):
+            logger.debug("Cached video metadata expired", extra={"video_id": video_id})
+            cached = replace(cached, metadata=None, metadata_fetched_at=None)
+        logger.debug(
+            "Video cache hit",
+            extra={
+                "video_id": video_id,
+                "has_transcript": cached.transcript is not None,
+                "has_metadata": cached.metadata is not None,
+            },
+        )
+        return cached
+
+    def store_transcript(self, video_id: str, transcript: TranscriptSegments) -> None:
+        """Cache the transcript segments of a video."""
+        try:
+            db_entry = self.repository.upsert_transcript(
+                video_id, transcript.text, utcnow(), transcript.timings_to_bytes()
+            )
+        except SQLAlchemyError as e:
+            self._log_store_failure(video_id, e)
+            return
+        self.lru.set(video_id, self._to_cached_video(db_entry))
+
+    def store_metadata(self, video_id: str, metadata: dict) -> None:
+        """Cache the metadata of a video."""
+        try:
+            db_entry = self.repository.upsert_metadata(video_id, metadata, utcnow())
+        except SQLAlchemyError as e:
+            self._log_store_failure(video_id, e)
+            return
+        self.lru.set(video_id, self._to_cached_video(db_entry))
+
+    def _is_fresh(self, fetched_at: Optional[datetime]) -> bool:
+        return fetched_at is not None and utcnow() - fetched_at < self.metadata_ttl
+
+    def _log_store_failure(self, video_id: str, error: SQLAlchemyError) -> None:
+        # A failed cache write must not fail the chat being processed
+        logger.warning(
+            "Failed to store video in cache",
+            extra={"video_id": video_id, "error": str(error)},
+        )
+        self.repository.db.rollback()
+        self.lru.pop(video_id)
+
+    @staticmethod
+    def _to_cached_video(db_entry: VideoCache) -> CachedVideo:
+        metadata = None
+        if db_entry.metadata_fetched_at is not None:
+            metadata = {
+                "title": db_entry.title,
+                "channel_name": db_entry.channel_name,
+                "publication_date": db_entry.publication_date,
+                "view_count": db_entry.view_count,
+                "thumbnail_url": db_entry.thumbnail_url,
+            }
+        transcript = None
+        if db_entry.transcript is not None and db_entry.transcript_timings is not None:
+            transcript = TranscriptSegments.from_bytes(
+                db_entry.transcript_timings, db_entry.transcript
+            )
+        return CachedVideo(
+            video_id=db_entry.video_id,
+            transcript=transcript,
+            metadata=metadata,
+            metadata_fetched_at=db_entry.metadata_fetched_at,
+        )
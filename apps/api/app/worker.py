@@ -0,0 +1,306 @@
+"""
+Background worker that leases jobs from the durable job queue.
+
+Run it with `python -m app.worker --concurrency 4`. Any number of workers can
+run next to the API processes; each job is leased by a single worker and is
+picked up again by another one if its worker stops heartbeating.
+"""
+
+import argparse
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import Future, wait
+from functools import partial
+from typing import Callable, Dict, Optional
+from uuid import uuid4
+
+from .core.config import (
+    COLLECTION_CONCURRENCY,
+    JOB_LEASE_SECONDS,
+    JOB_RETRY_DELAY_SECONDS,
+    PROCESSING_POOL_MAX_WORKERS,
+    WORKER_POLL_INTERVAL_SECONDS,
+)
+from .core.database import get_session_local, init_db
+from .core.events import ERROR, get_event_backend, publish_chat_event
+from .core.logging import setup_logging
+from .repository.chat import ChatRepository
+from .repository.collection import CollectionRepository
+from .repository.job import JobRepository
+from .services.job_queue import (
+    EXPAND_COLLECTION_JOB,
+    INDEX_TRANSCRIPT_JOB,
+    PROCESS_VIDEO_JOB,
+    SUMMARIZE_CHAT_JOB,
+    notify_new_jobs,
+    wait_for_new_jobs,
+)
+from .services.processing import (
+    ProcessingPool,
+    run_chat_summarization_job,
+    run_collection_expansion_job,
+    run_transcript_indexing_job,
+    run_video_processing_job,
+)
+
+logger = setup_logging()
+
+# Maps job kinds to the functions that run them, called with the job payload
+JOB_HANDLERS: Dict[str, Callable] = {
+    PROCESS_VIDEO_JOB: run_video_processing_job,
+    INDEX_TRANSCRIPT_JOB: run_transcript_indexing_job,
+    SUMMARIZE_CHAT_JOB: run_chat_summarization_job,
+    EXPAND_COLLECTION_JOB: run_collection_expansion_job,
+}
+
+
+def _call_handler(handler: Callable, payload: dict) -> None:
+    handler(**payload)
+
+
+class Worker:
+    """Leases jobs and runs them on a bounded processing pool."""
+
+    def __init__(
+        self,
+        pool: Optional[ProcessingPool] = None,
+        session_factory: Optional[Callable] = None,
+        handlers: Optional[Dict[str, Callable]] = None,
+        worker_id: Optional[str] = None,
+        poll_interval: float = WORKER_POLL_INTERVAL_SECONDS,
+        lease_seconds: int = JOB_LEASE_SECONDS,
+        retry_delay_seconds: int = JOB_RETRY_DELAY_SECONDS,
+        key_limit: Optional[int] = COLLECTION_CONCURRENCY,
+    ):
+        self.pool = pool if pool is not None else ProcessingPool(max_queue=0)
+        self.concurrency = self.pool.max_workers
+        self.handlers = handlers if handlers is not None else JOB_HANDLERS
+        self.worker_id = (
+            worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        )
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.retry_delay_seconds = retry_delay_seconds
+        self.key_limit = key_limit
+        self._session_factory = session_factory
+        self._active: Dict[str, Future] = {}
+        self._active_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _session(self):
+        session_factory = self._session_factory or get_session_local()
+        return session_factory()
+
+    def active_job_ids(self) -> list:
+        """Return the IDs of the jobs currently running on this worker."""
+        with self._active_lock:
+            return list(self._active)
+
+    def run_once(self) -> int:
+        """Lease as many jobs as there are free slots and start them."""
+        free_slots = self.concurrency - len(self.active_job_ids())
+        if free_slots <= 0:
+            return 0
+
+        db = self._session()
+        try:
+            jobs = [
+                (str(job.id), job.kind, job.payload)
+                for job in JobRepository(db).lease(
+                    self.worker_id, free_slots, self.lease_seconds, self.key_limit
+                )
+            ]
+        finally:
+            db.close()
+
+        for job_id, kind, payload in jobs:
+            logger.info(
+                "Job leased",
+                extra={"job_id": job_id, "kind": kind, "worker_id": self.worker_id},
+            )
+            handler = self.handlers.get(kind)
+            if handler is None:
+                self._finish_job(job_id, f"Unknown job kind: {kind}")
+                continue
+            with self._active_lock:
+                future = self.pool.submit(_call_handler, handler, payload)
+                self._active[job_id] = future
+            future.add_done_callback(partial(self._on_job_done, job_id))
+        return len(jobs)
+
+    def _on_job_done(self, job_id: str, future: Future) -> None:
+        error = future.exception() if not future.cancelled() else "Job cancelled"
+        try:
+            self._finish_job(job_id, str(error) if error is not None else None)
+        finally:
+            with self._active_lock:
+                self._active.pop(job_id, None)
+            # A slot is free again, lease the next job without waiting to poll
+            notify_new_jobs()
+
+    def _finish_job(self, job_id: str, error: Optional[str]) -> None:
+        db = self._session()
+        try:
+            job_repository = JobRepository(db)
+            if error is None:
+                if not job_repository.complete(job_id, self.worker_id):
+                    logger.warning(
+                        "Lease lost before job completed",
+                        extra={"job_id": job_id, "worker_id": self.worker_id},
+                    )
+                else:
+                    logger.info("Job completed", extra={"job_id": job_id})
+                return
+
+            logger.error("Job failed", extra={"job_id": job_id, "error": error})
+            db_job = job_repository.fail(
+                job_id, self.worker_id, error, self.retry_delay_seconds
+            )
+            if db_job is not None and db_job.status == "failed":
+                self._fail_job_target(db, db_job, error)
+        except Exception as e:
+            logger.error(
+                "Failed to record job result",
+                extra={"job_id": job_id, "error": str(e)},
+                exc_info=True,
+            )
+        finally:
+            db.close()
+
+    @classmethod
+    def _fail_job_target(cls, db, db_job, error: str) -> None:
+        cls._fail_chat(db, db_job.chat_id, error)
+        # The collection would otherwise stay in "expanding" forever
+        if db_job.kind == EXPAND_COLLECTION_JOB:
+            CollectionRepository(db).fail_expansion(
+                db_job.payload["collection_id"], error
+            )
+
+    @staticmethod
+    def _fail_chat(db, chat_id, error: str) -> None:
+        # The chat would otherwise stay in "processing" forever
+        if chat_id is not None:
+            ChatRepository(db).update_chat(
+                chat_id=chat_id,
+                status="error",
+                transcript=f"Unexpected error: {error}",
+            )
+            publish_chat_event(
+                get_event_backend(db.get_bind()),
+                chat_id,
+                ERROR,
+                status="error",
+                message=f"Unexpected error: {error}",
+            )
+
+    def heartbeat(self) -> None:
+        """Extend the leases of the jobs running on this worker."""
+        job_ids = self.active_job_ids()
+        if not job_ids:
+            return
+        db = self._session()
+        try:
+            JobRepository(db).heartbeat(job_ids, self.worker_id, self.lease_seconds)
+        finally:
+            db.close()
+
+    def reap(self) -> None:
+        """Fail jobs and chats whose worker died during their final attempt."""
+        db = self._session()
+        try:
+            for db_job in JobRepository(db).reap_expired():
+                logger.error("Job lease expired", extra={"job_id": str(db_job.id)})
+                self._fail_job_target(db, db_job, db_job.last_error)
+        finally:
+            db.close()
+
+    def run_forever(self) -> None:
+        """Lease and run jobs until stop() is called, then drain running jobs."""
+        logger.info(
+            "Worker started",
+            extra={"worker_id": self.worker_id, "concurrency": self.concurrency},
+        )
+        housekeeping_interval = self.lease_seconds / 3
+        last_housekeeping = 0.0
+        while not self._stop.is_set():
+            leased = 0
+            try:
+                leased = self.run_once()
+                if time.monotonic() - last_housekeeping >= housekeeping_interval:
+                    self.heartbeat()
+                    self.reap()
+                    last_housekeeping = time.monotonic()
+            except Exception as e:
+                logger.error(
+                    "Worker loop error",
+                    extra={"worker_id": self.worker_id, "error": str(e)},
+                    exc_info=True,
+                )
+            if not leased:
+                wait_for_new_jobs(self.poll_interval)
+
+        # Keep the leases of running jobs alive until they finish
+        while True:
+            with self._active_lock:
+                running = list(self._active.values())
+            if not running:
+                break
+            self.heartbeat()
+            wait(running, timeout=housekeeping_interval)
+        logger.info("Worker stopped", extra={"worker_id": self.worker_id})
+
+    def start(self) -> None:
+        """Run the worker on a background thread of the current process."""
+        self._thread = threading.Thread(
+            target=self.run_forever, name="job-worker", daemon=True
+        )
+        self._thread.start()
+
+    def request_stop(self) -> None:
+        """Ask the worker to stop leasing jobs."""
+        self._stop.set()
+        notify_new_jobs()
+
+    def stop(self) -> None:
+        """Stop leasing jobs and wait for running jobs to finish."""
+        self.request_stop()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a Chat with Vid job worker.")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=PROCESSING_POOL_MAX_WORKERS,
+        help="number of jobs to run at the same time",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=WORKER_POLL_INTERVAL_SECONDS,
+        help="seconds to wait between polls when the queue is empty",
+    )
+    args = parser.parse_args(argv)
+
+    init_db()
+    worker = Worker(
+        pool=ProcessingPool(max_workers=args.concurrency, max_queue=0),
+        poll_interval=args.poll_interval,
+    )
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: worker.request_stop())
+    try:
+        worker.run_forever()
+    finally:
+        worker.pool.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Measure how long it takes to import the API, using `python -X importtime`.
+
+Run from apps/api:
+
+    python benchmarks/import_time.py [--module app.main] [--runs 5] [--top 15]
+
+Each run imports the module in a fresh interpreter. The report gives the
+median cumulative import time of the module, the slowest imports of the
+median run, and whether the heavy extractor libraries were loaded.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional
+
+API_DIR = Path(__file__).resolve().parent.parent
+
+# Libraries that only the video processing path should load
+HEAVY_MODULES = ("yt_dlp", "youtube_transcript_api")
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Return {module: (self_us, cumulative_us)} from `-X importtime` output."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure(module: str) -> dict:
+    """Import the module in a fresh interpreter and return its import timings."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=API_DIR,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="app.main", help="module to import")
+    parser.add_argument("--runs", type=int, default=5, help="number of runs")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports shown")
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    runs.sort(key=lambda timings: timings[args.module][1])
+    median_run = runs[len(runs) // 2]
+    total_ms = [timings[args.module][1] / 1000 for timings in runs]
+    slowest = sorted(median_run.items(), key=lambda item: item[1][0], reverse=True)
+
+    report = {
+        "module": args.module,
+        "runs": args.runs,
+        "median_ms": round(statistics.median(total_ms), 1),
+        "min_ms": round(min(total_ms), 1),
+        "max_ms": round(max(total_ms), 1),
+        "modules_imported": len(median_run),
+        "heavy_modules_loaded": [m for m in HEAVY_MODULES if m in median_run],
+        "slowest": [
+            {"module": name, "self_ms": self_us / 1000, "cumulative_ms": cum / 1000}
+            for name, (self_us, cum) in slowest[: args.top]
+        ],
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(
+        f"import {report['module']}: median {report['median_ms']} ms "
+        f"(min {report['min_ms']}, max {report['max_ms']}, {args.runs} runs, "
+        f"{report['modules_imported']} modules)"
+    )
+    print(
+        f"heavy modules loaded: {', '.join(report['heavy_modules_loaded']) or 'none'}"
+    )
+    print(f"\n{'self ms':>9} {'cumul ms':>9}  module")
+    for entry in report["slowest"]:
+        print(
+            f"{entry['self_ms']:9.1f} {entry['cumulative_ms']:9.1f}  {entry['module']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Measure token-budgeted prompts against sending the whole transcript.
+
+Run from apps/api:
+
+    python benchmarks/prompt_budget.py [--hours 1 5] [--budget 8000]
+
+Transcripts are synthetic: segments of random words, about one segment every
+3 seconds of video, cut into retrieval chunks that are all offered to the
+builder in random order (as if ranked by a search), along with a summary and
+a ten message conversation. For each length the report gives the prompt tokens
+with and without the budget, the estimated input cost per question at
+--usd-per-million-tokens, what was trimmed, and the median and p95 latency of
+building the prompt.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.chat_message import SYSTEM_PROMPT  # noqa: E402
+from app.services.prompt_builder import Passage, PromptBuilder  # noqa: E402
+from app.services.retrieval import chunk_pieces  # noqa: E402
+
+SEGMENT_SECONDS = 3.0
+
+
+def make_segments(rng: random.Random, vocabulary: list, hours: float) -> list:
+    """Build (text, start, end) segments of random words."""
+    count = int(hours * 3600 / SEGMENT_SECONDS)
+    return [
+        (
+            " ".join(rng.choices(vocabulary, k=rng.randint(6, 14))),
+            i * SEGMENT_SECONDS,
+            (i + 1) * SEGMENT_SECONDS,
+        )
+        for i in range(count)
+    ]
+
+
+def make_history(rng: random.Random, vocabulary: list, messages: int) -> list:
+    return [
+        (
+            "human" if i % 2 == 0 else "ai",
+            " ".join(rng.choices(vocabulary, k=15 if i % 2 == 0 else 80)),
+        )
+        for i in range(messages)
+    ]
+
+
+def timed(fn, runs: int) -> dict:
+    """Run fn runs times; return its median and p95 latency in milliseconds."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[max(int(len(samples) * 0.95) - 1, 0)], 3),
+    }
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--hours", type=float, nargs="+", default=[1, 5])
+    parser.add_argument("--budget", type=int, default=8000)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--usd-per-million-tokens", type=float, default=0.075)
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(42)
+    vocabulary = [f"word{i}" for i in range(5_000)]
+    summary = " ".join(rng.choices(vocabulary, k=300))
+    history = make_history(rng, vocabulary, 10)
+    question = "What does the speaker recommend doing first?"
+    budgeted = PromptBuilder(SYSTEM_PROMPT, budget=args.budget)
+    unbounded = PromptBuilder(SYSTEM_PROMPT, budget=sys.maxsize)
+    report = []
+    for hours in args.hours:
+        chunks = chunk_pieces(make_segments(rng, vocabulary, hours), overlap_chars=0)
+        passages = [
+            Passage(text, start, position)
+            for position, (text, start, _) in enumerate(chunks)
+        ]
+        rng.shuffle(passages)
+
+        def build(builder: PromptBuilder):
+            return builder.build(question, passages, history, summary)
+
+        _, prompt_report = build(budgeted)
+        _, whole = build(unbounded)
+        usd = args.usd_per_million_tokens / 1_000_000
+        report.append(
+            {
+                "hours": hours,
+                "passages": len(passages),
+                "whole_tokens": whole.tokens,
+                "budgeted_tokens": prompt_report.tokens,
+                "whole_usd": round(whole.tokens * usd, 6),
+                "budgeted_usd": round(prompt_report.tokens * usd, 6),
+                "included": prompt_report.included,
+                "trimmed": prompt_report.trimmed,
+                "build": timed(lambda: build(budgeted), args.runs),
+            }
+        )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(
+        f"{'hours':>6} {'passages':>9} {'whole':>9} {'budgeted':>9} "
+        f"{'whole $':>9} {'budget $':>9} {'kept':>5} {'trimmed':>8} {'build':>20}"
+    )
+    for row in report:
+        build_ = row["build"]
+        print(
+            f"{row['hours']:>6} {row['passages']:>9} {row['whole_tokens']:>9} "
+            f"{row['budgeted_tokens']:>9} {row['whole_usd']:>9} "
+            f"{row['budgeted_usd']:>9} {row['included'].get('passage', 0):>5} "
+            f"{row['trimmed'].get('passage', 0):>8} "
+            f"{build_['median_ms']:>8}ms p95 {build_['p95_ms']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Measure keyword search over a chat's transcript with the BM25 inverted index,
+against scanning the transcript text on every query.
+
+Run from apps/api:
+
+    python benchmarks/transcript_search.py [--hours 1 3 10] [--queries 500]
+
+Transcripts are synthetic: segments of Zipf distributed words, about one
+segment every 3 seconds of video. For each length the report gives the size of
+the compressed index and the median and p95 latency of both approaches, for
+queries mixing rare and common words.
+"""
+
+import argparse
+import json
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.compression import compress_bytes  # noqa: E402
+from app.core.keyword_index import KeywordIndex  # noqa: E402
+
+SEGMENT_SECONDS = 3.0
+
+
+def make_segments(rng: random.Random, vocabulary: list, hours: float) -> list:
+    """Build (text, start, end) segments of Zipf distributed words."""
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    count = int(hours * 3600 / SEGMENT_SECONDS)
+    return [
+        (
+            " ".join(rng.choices(vocabulary, weights, k=rng.randint(6, 14))),
+            i * SEGMENT_SECONDS,
+            (i + 1) * SEGMENT_SECONDS,
+        )
+        for i in range(count)
+    ]
+
+
+def timed(fn, queries: list) -> dict:
+    """Run fn on every query; return its median and p95 latency in microseconds."""
+    samples = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return {
+        "median_us": round(statistics.median(samples), 1),
+        "p95_us": round(samples[int(len(samples) * 0.95) - 1], 1),
+    }
+
+
+def scan(text: str, query: str) -> list:
+    """Baseline: find the lines mentioning any query word by scanning the text."""
+    pattern = re.compile(
+        r"\b(" + "|".join(map(re.escape, query.split())) + r")\b", re.IGNORECASE
+    )
+    return [line for line in text.splitlines() if pattern.search(line)][:10]
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--hours", type=float, nargs="+", default=[0.5, 3, 10])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(42)
+    vocabulary = [f"word{i}" for i in range(20_000)]
+    report = []
+    for hours in args.hours:
+        segments = make_segments(rng, vocabulary, hours)
+        text = "\n".join(segment[0] for segment in segments)
+        index = KeywordIndex.build(segments)
+        _, data = compress_bytes(index.to_bytes())
+        queries = [
+            f"{rng.choice(vocabulary[:50])} {rng.choice(vocabulary[1000:])}"
+            for _ in range(args.queries)
+        ]
+        report.append(
+            {
+                "hours": hours,
+                "segments": len(segments),
+                "transcript_chars": len(text),
+                "index_bytes": len(data),
+                "bm25": timed(lambda q: index.search(q, 10), queries),
+                "scan": timed(lambda q: scan(text, q), queries),
+            }
+        )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(
+        f"{'hours':>6} {'segments':>9} {'chars':>10} {'index':>9} "
+        f"{'bm25':>20} {'scan':>22}"
+    )
+    for row in report:
+        bm25, scan_ = row["bm25"], row["scan"]
+        print(
+            f"{row['hours']:>6} {row['segments']:>9} {row['transcript_chars']:>10} "
+            f"{row['index_bytes']:>9} "
+            f"{bm25['median_us']:>8}us p95 {bm25['p95_us']:>6} "
+            f"{scan_['median_us']:>9}us p95 {scan_['p95_us']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Compare storing transcripts inline on the chats rows with the compressed
+chat_transcripts side table.
+
+Run from apps/api:
+
+    python benchmarks/transcript_storage.py [--chats 1000] [--transcript-chars 60000]
+        [--database-url postgresql://...]
+
+Both layouts are created in scratch tables of the same database (a temporary
+SQLite file by default) and filled with the same synthetic transcripts. The
+report gives, for each layout:
+
+- the on-disk size of the chats table per row and in total, transcripts included;
+- the latency of a status read (the polling hot path) and of a full read with
+  the transcript decompressed;
+- how much the tables grow (bloat) after every chat's status is updated a few
+  times, as processing does.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+from uuid import uuid4
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    Text,
+    create_engine,
+    func,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.compression import compress_text, decompress_text  # noqa: E402
+
+metadata = MetaData()
+
+inline_chats = Table(
+    "bench_inline_chats",
+    metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("status", String(50), nullable=False),
+    Column("title", Text),
+    Column("transcript", Text),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+split_chats = Table(
+    "bench_split_chats",
+    metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("status", String(50), nullable=False),
+    Column("title", Text),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+split_transcripts = Table(
+    "bench_split_transcripts",
+    metadata,
+    Column(
+        "chat_id", UUID(as_uuid=True), ForeignKey(split_chats.c.id), primary_key=True
+    ),
+    Column("codec", String(16), nullable=False),
+    Column("data", LargeBinary, nullable=False),
+    Column("size", Integer, nullable=False),
+)
+
+LAYOUTS = {
+    "inline": [inline_chats],
+    "split": [split_chats, split_transcripts],
+}
+
+
+def make_transcript(rng: random.Random, vocabulary: list, chars: int) -> str:
+    """Build a transcript-like text: short lines of Zipf distributed words."""
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    lines, length = [], 0
+    while length < chars:
+        line = " ".join(rng.choices(vocabulary, weights, k=rng.randint(6, 14)))
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)[:chars]
+
+
+def table_size(connection, table: Table) -> int:
+    """Return the bytes used by a table, its indexes and out-of-line values."""
+    if connection.dialect.name == "postgresql":
+        return connection.execute(
+            text("SELECT pg_total_relation_size(:name)"), {"name": table.name}
+        ).scalar()
+    return connection.execute(
+        text(
+            "SELECT COALESCE(SUM(pgsize), 0) FROM dbstat"
+            " WHERE name = :name OR name LIKE :indexes"
+        ),
+        {"name": table.name, "indexes": f"sqlite_autoindex_{table.name}_%"},
+    ).scalar()
+
+
+def layout_size(engine, layout: str) -> int:
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            connection.execute(text("ANALYZE"))
+        return sum(table_size(connection, table) for table in LAYOUTS[layout])
+
+
+def timed(fn, repeat: int) -> dict:
+    """Run fn repeat times; return its median and p95 latency in microseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return {
+        "median_us": round(statistics.median(samples), 1),
+        "p95_us": round(samples[int(len(samples) * 0.95) - 1], 1),
+    }
+
+
+def fill(engine, transcripts: list, now) -> list:
+    ids = [uuid4() for _ in transcripts]
+    with engine.begin() as connection:
+        connection.execute(
+            inline_chats.insert(),
+            [
+                {
+                    "id": chat_id,
+                    "status": "processed",
+                    "title": "Video",
+                    "transcript": transcript,
+                    "updated_at": now,
+                }
+                for chat_id, transcript in zip(ids, transcripts)
+            ],
+        )
+        connection.execute(
+            split_chats.insert(),
+            [
+                {"id": i, "status": "processed", "title": "Video", "updated_at": now}
+                for i in ids
+            ],
+        )
+        rows = []
+        for chat_id, transcript in zip(ids, transcripts):
+            codec, data = compress_text(transcript)
+            rows.append(
+                {
+                    "chat_id": chat_id,
+                    "codec": codec,
+                    "data": data,
+                    "size": len(transcript.encode("utf-8")),
+                }
+            )
+        connection.execute(split_transcripts.insert(), rows)
+    return ids
+
+
+def measure_reads(engine, ids: list, reads: int) -> dict:
+    rng = random.Random(1)
+    results = {}
+    with engine.connect() as connection:
+
+        def status_read(table):
+            return lambda: connection.execute(
+                select(table.c.id, table.c.status, table.c.updated_at).where(
+                    table.c.id == rng.choice(ids)
+                )
+            ).one()
+
+        def inline_full_read():
+            connection.execute(
+                select(inline_chats).where(inline_chats.c.id == rng.choice(ids))
+            ).one()
+
+        def split_full_read():
+            row = connection.execute(
+                select(split_chats, split_transcripts.c.codec, split_transcripts.c.data)
+                .join(split_transcripts)
+                .where(split_chats.c.id == rng.choice(ids))
+            ).one()
+            decompress_text(row.codec, row.data)
+
+        results["inline"] = {
+            "status_read": timed(status_read(inline_chats), reads),
+            "full_read": timed(inline_full_read, reads),
+        }
+        results["split"] = {
+            "status_read": timed(status_read(split_chats), reads),
+            "full_read": timed(split_full_read, reads),
+        }
+    return results
+
+
+def update_statuses(engine, rounds: int) -> None:
+    """Update every chat's status like processing does, without vacuuming."""
+    for round_number in range(rounds):
+        with engine.begin() as connection:
+            for table in (inline_chats, split_chats):
+                connection.execute(
+                    update(table).values(
+                        status=f"processing-{round_number}", updated_at=func.now()
+                    )
+                )
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chats", type=int, default=1000, help="number of chats")
+    parser.add_argument(
+        "--transcript-chars", type=int, default=60000, help="transcript length"
+    )
+    parser.add_argument("--reads", type=int, default=2000, help="reads per test")
+    parser.add_argument("--update-rounds", type=int, default=3, help="status updates")
+    parser.add_argument("--database-url", help="database to use instead of SQLite")
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        database_url = args.database_url or f"sqlite:///{Path(scratch) / 'bench.db'}"
+        engine = create_engine(database_url)
+        metadata.drop_all(bind=engine)
+        metadata.create_all(bind=engine)
+        try:
+            rng = random.Random(0)
+            vocabulary = [
+                "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(2, 9)))
+                for _ in range(3000)
+            ]
+            transcripts = [
+                make_transcript(rng, vocabulary, args.transcript_chars)
+                for _ in range(args.chats)
+            ]
+            with engine.connect() as connection:
+                now = connection.execute(select(func.now())).scalar()
+            ids = fill(engine, transcripts, now)
+
+            sizes = {layout: layout_size(engine, layout) for layout in LAYOUTS}
+            reads = measure_reads(engine, ids, args.reads)
+            update_statuses(engine, args.update_rounds)
+            sizes_after = {layout: layout_size(engine, layout) for layout in LAYOUTS}
+            with engine.connect() as connection:
+                hot_row_sizes = {
+                    "inline": table_size(connection, inline_chats),
+                    "split": table_size(connection, split_chats),
+                }
+        finally:
+            metadata.drop_all(bind=engine)
+            engine.dispose()
+
+    report = {
+        "database": engine.dialect.name,
+        "chats": args.chats,
+        "transcript_chars": args.transcript_chars,
+        "layouts": {
+            layout: {
+                "total_bytes": sizes[layout],
+                "bytes_per_chat": round(sizes[layout] / args.chats),
+                "chats_table_bytes_per_row": round(hot_row_sizes[layout] / args.chats),
+                "bloat_bytes": sizes_after[layout] - sizes[layout],
+                **reads[layout],
+            }
+            for layout in LAYOUTS
+        },
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(
+        f"{report['database']}: {args.chats} chats, "
+        f"{args.transcript_chars} character transcripts"
+    )
+    print(
+        f"\n{'layout':<8} {'bytes/chat':>11} {'chats row':>10} {'bloat':>11} "
+        f"{'status read':>17} {'full read':>19}"
+    )
+    for layout, stats in report["layouts"].items():
+        status_read, full_read = stats["status_read"], stats["full_read"]
+        print(
+            f"{layout:<8} {stats['bytes_per_chat']:>11} "
+            f"{stats['chats_table_bytes_per_row']:>10} {stats['bloat_bytes']:>11} "
+            f"{status_read['median_us']:>8}us p95 {status_read['p95_us']:>5} "
+            f"{full_read['median_us']:>8}us p95 {full_read['p95_us']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
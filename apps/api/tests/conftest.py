@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+import app.models.chat  # noqa: F401
+import app.models.chat_message  # noqa: F401
+import app.models.chat_search  # noqa: F401
+import app.models.chat_transcript  # noqa: F401
+import app.models.collection  # noqa: F401
+import app.models.job  # noqa: F401
+import app.models.rate_limit  # noqa: F401
+import app.models.transcript_index  # noqa: F401
+import app.models.video_cache  # noqa: F401
+
+
+@pytest.fixture
+def sqlite_engine():
+    """Create an in-memory SQLite engine with all tables created."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sqlite_session(sqlite_engine):
+    """Create a database session bound to the in-memory SQLite engine."""
+    session = sessionmaker(autocommit=False, autoflush=False, bind=sqlite_engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def run_with_async_session():
+    """
+    Return a helper that runs an async function with an AsyncSession bound to a
+    fresh in-memory SQLite database, inside its own event loop.
+    """
+
+    async def _run(fn):
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                return await fn(db)
+        finally:
+            await engine.dispose()
+
+    return lambda fn: asyncio.run(_run(fn))
@@ -0,0 +1,104 @@
+import asyncio
+from unittest.mock import patch
+from app.models.chat import Chat
+from app.services.answer_cache import (
+    AnswerCache,
+    CachedAnswer,
+    answer_key,
+    normalize_question,
+)
+from app.services.chat_message import PROMPT_VERSION, AsyncChatMessageService
+from app.services.embeddings import HashingEmbedder
+
+
+def test_normalize_question():
+    """Test that case, spacing and punctuation don't change the key."""
+    assert normalize_question("  What's a Sourdough   STARTER?! ") == (
+        "what s a sourdough starter"
+    )
+    assert answer_key("vid", "Why?", "1") == answer_key("vid", "why", "1")
+    assert answer_key("vid", "Why?", "1") != answer_key("vid", "Why?", "2")
+
+
+def test_exact_tier_hits_and_evicts():
+    """Test exact lookups, LRU eviction and the hit rate."""
+    cache = AnswerCache(max_entries=1, ttl=None)
+
+    async def scenario():
+        await cache.set(answer_key("vid", "Why?", "1"), CachedAnswer("Because.", 2))
+        hit = await cache.get(answer_key("vid", "why", "1"))
+        other_video = await cache.get(answer_key("other", "why", "1"))
+        await cache.set(answer_key("vid", "How?", "1"), CachedAnswer("Like so.", 2))
+        evicted = await cache.get(answer_key("vid", "why", "1"))
+        return hit, other_video, evicted
+
+    hit, other_video, evicted = asyncio.run(scenario())
+
+    assert hit == CachedAnswer("Because.", 2)
+    assert other_video is None and evicted is None
+    stats = cache.stats()
+    assert (stats["exact_hits"], stats["misses"], stats["evictions"]) == (1, 2, 1)
+    assert stats["hit_rate"] == 1 / 3
+
+
+def test_similarity_tier():
+    """Test that similar questions about the same video share an answer."""
+    cache = AnswerCache(
+        ttl=None, similarity_threshold=0.6, embedder=HashingEmbedder(1024)
+    )
+    answer = CachedAnswer("Flour and water.", 4)
+
+    async def scenario():
+        await cache.set(answer_key("vid", "What is a sourdough starter?", "1"), answer)
+        return (
+            await cache.get(answer_key("vid", "what is the sourdough starter", "1")),
+            await cache.get(answer_key("vid", "How long do I bake the bread?", "1")),
+            await cache.get(answer_key("other", "What is a sourdough starter?", "1")),
+        )
+
+    similar, unrelated, other_video = asyncio.run(scenario())
+
+    assert similar == answer
+    assert unrelated is None and other_video is None
+    assert (cache.stats()["similar_hits"], cache.stats()["misses"]) == (1, 2)
+
+
+async def _create_chat(db, suggested_questions=None) -> str:
+    chat = Chat(
+        source_url="https://youtu.be/dQw4w9WgXcQ",
+        source_type="YOUTUBE",
+        video_id="dQw4w9WgXcQ",
+        status="processed",
+        suggested_questions=suggested_questions,
+    )
+    chat.transcript = "Sourdough needs a starter."
+    db.add(chat)
+    await db.commit()
+    return str(chat.id)
+
+
+@patch("app.services.chat_message.get_answer_cache")
+def test_start_exchange_uses_cached_answers(mock_get_cache, run_with_async_session):
+    """Test that opening and suggested questions are answered from the cache."""
+    cache = AnswerCache(ttl=None)
+    mock_get_cache.return_value = cache
+    answer = CachedAnswer("Flour and water.", 4)
+
+    async def scenario(db):
+        key = answer_key("dQw4w9WgXcQ", "What is a starter?", PROMPT_VERSION)
+        await cache.set(key, answer)
+        await cache.set(answer_key("dQw4w9WgXcQ", "And then?", PROMPT_VERSION), answer)
+        chat_id = await _create_chat(db, ["What is a starter?"])
+        service = AsyncChatMessageService(db)
+        opening = await service.start_exchange(chat_id, "what is a starter")
+        # Follow-ups depend on the conversation, unless they are suggested
+        follow_up = await service.start_exchange(chat_id, "And then?")
+        suggested = await service.start_exchange(chat_id, "What is a starter?")
+        return opening, follow_up, suggested
+
+    opening, follow_up, suggested = run_with_async_session(scenario)
+
+    assert opening.cached_answer == answer
+    assert opening.cache_key == ("dQw4w9WgXcQ", "what is a starter", PROMPT_VERSION)
+    assert (follow_up.cached_answer, follow_up.cache_key) == (None, None)
+    assert suggested.cached_answer == answer
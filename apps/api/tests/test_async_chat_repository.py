@@ -0,0 +1,227 @@
+import pytest
+from datetime import datetime, timedelta
+from uuid import uuid4
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.segments import TranscriptSegments
+from app.models.chat import Chat
+from app.models.job import Job
+from app.repository.chat import AsyncChatRepository
+from app.repository.job import AsyncJobRepository
+from app.services.chat import AsyncChatService
+from sqlalchemy import inspect, select
+
+
+def test_create_and_get_chat(run_with_async_session):
+    """Test creating and retrieving a chat through the async repository."""
+
+    async def scenario(db):
+        repository = AsyncChatRepository(db)
+        chat = await repository.create_chat(
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ", video_id="dQw4w9WgXcQ"
+        )
+        found = await repository.get_chat_by_id(str(chat.id))
+        return chat, found
+
+    chat, found = run_with_async_session(scenario)
+
+    assert found.id == chat.id
+    assert found.status == "processing"
+    assert found.video_id == "dQw4w9WgXcQ"
+    assert found.created_at is not None
+
+
+def test_get_chat_by_id_not_found(run_with_async_session):
+    """Test that unknown chat IDs return None."""
+
+    async def scenario(db):
+        return await AsyncChatRepository(db).get_chat_by_id(str(uuid4()))
+
+    assert run_with_async_session(scenario) is None
+
+
+def test_get_chat_by_id_loads_only_requested_fields(run_with_async_session):
+    """Test that sparse reads leave the other columns unloaded."""
+
+    async def scenario(db):
+        repository = AsyncChatRepository(db)
+        chat = await repository.create_chat("https://youtu.be/dQw4w9WgXcQ")
+        chat_id = str(chat.id)
+        db.expunge_all()
+        return await repository.get_chat_by_id(chat_id, ["status"])
+
+    chat = run_with_async_session(scenario)
+
+    assert chat.status == "processing"
+    assert chat.updated_at is not None
+    assert {"transcript_record", "source_url"} <= inspect(chat).unloaded
+
+
+def test_get_chat_status(run_with_async_session):
+    """Test reading only the status columns of a chat."""
+
+    async def scenario(db):
+        repository = AsyncChatRepository(db)
+        chat = await repository.create_chat("https://youtu.be/dQw4w9WgXcQ")
+        return chat, await repository.get_chat_status(str(chat.id))
+
+    chat, chat_status = run_with_async_session(scenario)
+
+    assert chat_status.id == chat.id
+    assert chat_status.status == "processing"
+    assert chat_status.updated_at == chat.updated_at
+
+
+def test_async_job_enqueue(run_with_async_session):
+    """Test that the async job repository enqueues durable jobs."""
+
+    async def scenario(db):
+        chat_id = uuid4()
+        await AsyncJobRepository(db).enqueue("process_video", {"n": 1}, chat_id)
+        return chat_id, (await db.execute(select(Job))).scalars().one()
+
+    chat_id, job = run_with_async_session(scenario)
+
+    assert job.chat_id == chat_id
+    assert job.status == "queued"
+    assert job.payload == {"n": 1}
+
+
+def test_async_chat_service_flow(run_with_async_session):
+    """Test starting a chat and enqueueing its processing with the async service."""
+
+    async def scenario(db):
+        service = AsyncChatService(db)
+        chat_id = await service.start_new_chat("https://youtu.be/dQw4w9WgXcQ")
+        job_id = await service.enqueue_processing(
+            chat_id, "https://youtu.be/dQw4w9WgXcQ"
+        )
+        chat = await service.get_chat_by_id(chat_id)
+        job = (await db.execute(select(Job))).scalars().one()
+        return chat_id, job_id, chat, job
+
+    chat_id, job_id, chat, job = run_with_async_session(scenario)
+
+    assert str(chat.id) == chat_id
+    assert chat.video_id == "dQw4w9WgXcQ"
+    assert str(job.id) == job_id
+    assert job.payload == {
+        "chat_id": chat_id,
+        "source_url": "https://youtu.be/dQw4w9WgXcQ",
+    }
+
+
+def test_async_chat_service_invalid_id(run_with_async_session):
+    """Test that the async service validates chat IDs."""
+
+    async def scenario(db):
+        with pytest.raises(ValueError, match="Invalid chat ID format"):
+            await AsyncChatService(db).get_chat_by_id("invalid-uuid")
+
+    run_with_async_session(scenario)
+
+
+def _add_chats(db, count):
+    """Add chats created one minute apart, two of them at the same time."""
+    start = datetime(2024, 1, 1)
+    for index in range(count):
+        db.add(
+            Chat(
+                id=uuid4(),
+                source_url="https://youtu.be/dQw4w9WgXcQ",
+                source_type="YOUTUBE",
+                video_id="dQw4w9WgXcQ",
+                status="processed",
+                transcript="long transcript",
+                created_at=start + timedelta(minutes=min(index, count - 2)),
+            )
+        )
+
+
+def test_list_chats_pages_through_all_chats(run_with_async_session):
+    """Test that following cursors returns every chat once, newest first."""
+
+    async def scenario(db):
+        _add_chats(db, 7)
+        await db.commit()
+        service = AsyncChatService(db)
+        pages, cursor = [], None
+        while True:
+            chats, cursor = await service.list_chats(3, cursor)
+            pages.append(chats)
+            if cursor is None:
+                return pages, (await db.execute(select(Chat))).scalars().all()
+
+    pages, all_chats = run_with_async_session(scenario)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    listed = [chat for page in pages for chat in page]
+    expected = sorted(all_chats, key=lambda c: (c.created_at, c.id), reverse=True)
+    assert [chat.id for chat in listed] == [chat.id for chat in expected]
+    assert "transcript" not in listed[0]._fields
+
+
+def test_list_chats_invalid_cursor(run_with_async_session):
+    """Test that the service rejects malformed cursors."""
+
+    async def scenario(db):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            await AsyncChatService(db).list_chats(10, "garbage")
+
+    run_with_async_session(scenario)
+
+
+def test_cursor_round_trip():
+    """Test that cursors decode to the position they encode."""
+    chat_id = uuid4()
+    created_at = datetime(2024, 1, 1, 12, 30, 15, 123456)
+
+    assert decode_cursor(encode_cursor(created_at, chat_id)) == (created_at, chat_id)
+
+
+def test_get_transcript_segments(run_with_async_session):
+    """Test reading the timed transcript of a chat, and its missing cases."""
+    segments = TranscriptSegments.from_snippets([("Hello", 0.0, 1.0)])
+
+    async def scenario(db):
+        service = AsyncChatService(db)
+        chat_id = await service.start_new_chat("https://youtu.be/dQw4w9WgXcQ")
+        with pytest.raises(ValueError, match="Transcript segments not found"):
+            await service.get_transcript_segments(chat_id)
+        with pytest.raises(ValueError, match="Chat not found"):
+            await service.get_transcript_segments(str(uuid4()))
+
+        chat = await service.get_chat_by_id(chat_id)
+        chat.transcript_segments = segments
+        await db.commit()
+        db.expunge_all()
+        return await service.get_transcript_segments(chat_id)
+
+    assert run_with_async_session(scenario) == segments
+
+
+def test_start_new_chats_in_bulk(run_with_async_session):
+    """Test that chats and their processing jobs are created in one go."""
+    sources = [
+        ("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "YOUTUBE"),
+        ("https://youtu.be/9bZkp7q19f0", "YOUTUBE"),
+    ]
+
+    async def scenario(db):
+        chat_ids = await AsyncChatService(db).start_new_chats(sources)
+        chats = (await db.execute(select(Chat))).scalars().all()
+        jobs = (await db.execute(select(Job))).scalars().all()
+        return chat_ids, chats, jobs
+
+    chat_ids, chats, jobs = run_with_async_session(scenario)
+
+    videos = {str(chat.id): (chat.video_id, chat.status) for chat in chats}
+    assert [videos[chat_id] for chat_id in chat_ids] == [
+        ("dQw4w9WgXcQ", "processing"),
+        ("9bZkp7q19f0", "processing"),
+    ]
+    payloads = {str(job.chat_id): job.payload for job in jobs}
+    assert [payloads[chat_id] for chat_id in chat_ids] == [
+        {"chat_id": chat_id, "source_url": source_url}
+        for chat_id, (source_url, _) in zip(chat_ids, sources)
+    ]
+    assert {job.kind for job in jobs} == {"process_video"}
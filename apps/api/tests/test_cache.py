@@ -0,0 +1,80 @@
+import pytest
+from app.core.cache import LRUCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_and_set():
+    """Test storing and retrieving values."""
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+    assert cache.get("missing", "default") == "default"
+
+
+def test_evicts_least_recently_used():
+    """Test that the least recently used entry is evicted when full."""
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now the least recently used entry
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl():
+    """Test that entries are dropped once their TTL has passed."""
+    clock = FakeClock()
+    cache = LRUCache(max_entries=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60)
+
+    clock.now = 10
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.stats()["expirations"] == 1
+
+
+def test_stats_track_hit_rate():
+    """Test hit and miss counters."""
+    cache = LRUCache(max_entries=10)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["size"] == 1
+
+
+def test_pop_and_clear():
+    """Test removing entries."""
+    cache = LRUCache(max_entries=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_invalid_max_entries():
+    """Test that a cache must hold at least one entry."""
+    with pytest.raises(ValueError):
+        LRUCache(max_entries=0)
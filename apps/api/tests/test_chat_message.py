@@ -0,0 +1,236 @@
+import asyncio
+import pytest
+from contextlib import aclosing
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+from app.core.events import EventBroker, MemoryEventBackend, publish_chat_event
+from app.models.chat import Chat
+from app.services.chat_message import (
+    COMPLETED,
+    ERROR,
+    MESSAGE_STOP,
+    STOPPED,
+    AsyncChatMessageService,
+    MessageMetrics,
+    Reply,
+    stream_reply,
+)
+from app.services.llm import FakeLLMClient, LLMChunk
+
+
+async def _create_chat(db, status="processed", transcript="Sourdough needs a starter."):
+    chat = Chat(
+        source_url="https://youtu.be/dQw4w9WgXcQ",
+        source_type="YOUTUBE",
+        video_id="dQw4w9WgXcQ",
+        status=status,
+    )
+    chat.transcript = transcript
+    db.add(chat)
+    await db.commit()
+    return str(chat.id)
+
+
+async def _collect(llm, reply, subscription, on_text=None) -> list:
+    texts = []
+    async with aclosing(stream_reply(llm, [], reply, subscription)) as stream:
+        async for text in stream:
+            texts.append(text)
+            if on_text is not None and on_text(texts):
+                break
+    return texts
+
+
+def test_stream_reply_completes():
+    """Test streaming a whole answer and measuring its timings."""
+    llm = FakeLLMClient(["Hello", ", ", "world"])
+    reply = Reply(chat_id="chat-1", message_id="message-1")
+
+    async def scenario():
+        with EventBroker(MemoryEventBackend()).subscribe("chat-1") as subscription:
+            return await _collect(llm, reply, subscription)
+
+    assert asyncio.run(scenario()) == ["Hello", ", ", "world"]
+    assert reply.status == COMPLETED
+    assert reply.content == "Hello, world"
+    assert reply.output_tokens == 3
+    assert reply.time_to_first_token_ms >= 0
+    assert reply.finished_at >= reply.first_token_at
+
+
+def test_stream_reply_stop_event_cancels_generation():
+    """Test that a stop event for the answer ends the stream and the upstream."""
+    llm = FakeLLMClient([f"token{i} " for i in range(50)], delay=0.01)
+    backend = MemoryEventBackend()
+    broker = EventBroker(backend)
+    reply = Reply(chat_id="chat-1", message_id="message-1")
+
+    def stop_after_two(texts):
+        if len(texts) == 2:
+            # A stop for another answer is ignored
+            publish_chat_event(backend, "chat-1", MESSAGE_STOP, message_id="other")
+            publish_chat_event(backend, "chat-1", MESSAGE_STOP, message_id="message-1")
+        return False
+
+    async def scenario():
+        with broker.subscribe("chat-1") as subscription:
+            texts = await _collect(llm, reply, subscription, stop_after_two)
+        sent = llm.sent
+        await asyncio.sleep(0.05)
+        return texts, sent
+
+    texts, sent = asyncio.run(scenario())
+
+    assert reply.status == STOPPED
+    assert 2 <= len(texts) < 50
+    assert reply.content == "".join(texts)
+    # Nothing more is generated once the stream is stopped
+    assert llm.sent == sent < 50
+
+
+def test_stream_reply_closed_by_client_cancels_generation():
+    """Test that closing the stream, as on a disconnect, stops the upstream."""
+    llm = FakeLLMClient([f"token{i} " for i in range(50)], delay=0.01)
+    reply = Reply(chat_id="chat-1", message_id="message-1")
+
+    async def scenario():
+        with EventBroker(MemoryEventBackend()).subscribe("chat-1") as subscription:
+            await _collect(llm, reply, subscription, lambda texts: len(texts) == 3)
+        sent = llm.sent
+        await asyncio.sleep(0.05)
+        return sent
+
+    sent = asyncio.run(scenario())
+
+    assert reply.status == STOPPED
+    assert llm.sent == sent < 50
+
+
+def test_stream_reply_error():
+    """Test that a failing model ends the answer with an error."""
+    llm = FakeLLMClient(["Partial"], error=RuntimeError("quota exceeded"))
+    reply = Reply(chat_id="chat-1", message_id="message-1")
+
+    async def scenario():
+        with EventBroker(MemoryEventBackend()).subscribe("chat-1") as subscription:
+            return await _collect(llm, reply, subscription)
+
+    assert asyncio.run(scenario()) == ["Partial"]
+    assert reply.status == ERROR
+    assert reply.error == "quota exceeded"
+
+
+def test_reply_prefers_reported_usage():
+    """Test that token counts reported by the model replace the estimate."""
+    reply = Reply(chat_id="chat-1", message_id="message-1")
+    reply.add(LLMChunk(text="A fairly long piece of text"))
+    assert reply.output_tokens == 7
+
+    reply.add(LLMChunk(text="", output_tokens=4))
+    assert reply.output_tokens == 4
+
+
+def test_message_metrics():
+    """Test counting answers by outcome with their timing percentiles."""
+    metrics = MessageMetrics(samples=10)
+    for ttft, status in [(100.0, COMPLETED), (300.0, COMPLETED), (None, STOPPED)]:
+        metrics.observe_start()
+        reply = MagicMock(status=status, time_to_first_token_ms=ttft, cached=False)
+        reply.tokens_per_second = 20.0 if ttft else None
+        metrics.observe(reply)
+    metrics.observe_start()
+
+    stats = metrics.snapshot()
+
+    assert stats["streaming"] == 1
+    assert (stats["completed"], stats["stopped"], stats["error"]) == (2, 1, 0)
+    assert stats["time_to_first_token_ms_p95"] == 300.0
+    assert stats["tokens_per_second_p50"] == 20.0
+
+
+def test_start_exchange_saves_messages_and_builds_prompt(run_with_async_session):
+    """Test that questions are answered from the transcript and the history."""
+
+    async def scenario(db):
+        chat_id = await _create_chat(db)
+        service = AsyncChatMessageService(db)
+        first = await service.start_exchange(chat_id, "First?")
+        answer_status = first.answer.status
+        await service.message_repository.update_message(
+            str(first.answer.id), content="First answer.", status=COMPLETED
+        )
+        second = await service.start_exchange(chat_id, "Second?")
+        messages = await service.list_messages(chat_id)
+        return first.question, answer_status, second.prompt, messages
+
+    question, answer_status, prompt, messages = run_with_async_session(scenario)
+
+    assert (question.role, question.content) == ("user", "First?")
+    assert answer_status == "streaming"
+    # The chat isn't indexed, so the start of its transcript is the context
+    assert prompt[0][0] == "system"
+    assert "Sourdough needs a starter." in prompt[0][1]
+    assert prompt[1:] == [
+        ("human", "First?"),
+        ("ai", "First answer."),
+        ("human", "Second?"),
+    ]
+    assert [(m.role, m.content) for m in messages] == [
+        ("user", "First?"),
+        ("ai", "First answer."),
+        ("user", "Second?"),
+        ("ai", ""),
+    ]
+
+
+def test_start_exchange_chat_not_ready(run_with_async_session):
+    """Test that questions about chats still processing are refused."""
+
+    async def scenario(db):
+        chat_id = await _create_chat(db, status="processing")
+        await AsyncChatMessageService(db).start_exchange(chat_id, "Too early?")
+
+    with pytest.raises(ValueError, match="Chat not ready"):
+        run_with_async_session(scenario)
+
+
+def test_save_reply(run_with_async_session):
+    """Test saving a finished answer with its timings."""
+
+    async def scenario(db):
+        chat_id = await _create_chat(db)
+        service = AsyncChatMessageService(db)
+        answer = (await service.start_exchange(chat_id, "Why?")).answer
+        reply = Reply(chat_id=chat_id, message_id=str(answer.id), started_at=0.0)
+        reply.add(LLMChunk(text="Because.", output_tokens=2))
+        reply.finish(STOPPED)
+        await service.save_reply(reply)
+        db.expunge_all()
+        return await service.message_repository.get_message(chat_id, str(answer.id))
+
+    message = run_with_async_session(scenario)
+
+    assert (message.content, message.status) == ("Because.", STOPPED)
+    assert message.output_tokens == 2
+    assert message.time_to_first_token_ms > 0
+
+
+@patch("app.services.chat_message.get_event_broker")
+def test_request_stop_publishes_event(mock_get_event_broker, run_with_async_session):
+    """Test that stopping a streaming answer publishes a stop event."""
+    backend = MagicMock()
+    mock_get_event_broker.return_value.backend = backend
+
+    async def scenario(db):
+        chat_id = await _create_chat(db)
+        service = AsyncChatMessageService(db)
+        answer = (await service.start_exchange(chat_id, "Why?")).answer
+        await service.request_stop(chat_id, str(answer.id))
+        with pytest.raises(ValueError, match="Message not found"):
+            await service.request_stop(chat_id, str(uuid4()))
+        return str(answer.id)
+
+    message_id = run_with_async_session(scenario)
+
+    event = backend.publish.call_args.args[0]
+    assert (event.type, event.data) == (MESSAGE_STOP, {"message_id": message_id})
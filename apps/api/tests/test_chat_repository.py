@@ -116,3 +116,17 @@ def test_update_chat_not_found(chat_repository):
     assert result is None
     chat_repository.db.commit.assert_not_called()
     chat_repository.db.refresh.assert_not_called()
+
+
+def test_every_update_bumps_version(sqlite_session):
+    """Test that updates within the same second still change the version."""
+    repository = ChatRepository(sqlite_session)
+    chat = repository.create_chat(
+        "https://youtu.be/dQw4w9WgXcQ", "YOUTUBE", "dQw4w9WgXcQ"
+    )
+    assert chat.version == 1
+
+    repository.update_chat(chat.id, status="processed")
+    repository.update_chat(chat.id, transcript="Never gonna give you up")
+
+    assert repository.get_chat_status(str(chat.id)).version == 3
@@ -1,15 +1,25 @@
 import pytest
 import asyncio
-from unittest.mock import patch, MagicMock
+import threading
+import time
+from unittest.mock import ANY, call, patch, MagicMock
 from sqlalchemy.orm import Session
 from app.services.chat import ChatService
 from app.repository.chat import ChatRepository
+from app.repository.job import JobRepository
+from app.services.video_cache import CachedVideo, VideoCacheService
 from app.models.chat import Chat
-from app.core.exceptions import VideoProcessingError
+from app.core.exceptions import TransientVideoError, VideoProcessingError
+from app.core.segments import TranscriptSegments
 from uuid import uuid4, UUID
 from datetime import datetime
 
 
+def _segments(text):
+    """Build transcript segments with a single segment of text."""
+    return TranscriptSegments.from_snippets([(text, 0.0, 2.5)])
+
+
 @pytest.fixture
 def mock_db():
     """Create a mock database session."""
@@ -23,15 +33,25 @@ def mock_chat_repository(mock_db):
 
 
 @pytest.fixture
-def chat_service(mock_db, mock_chat_repository):
+def mock_video_cache():
+    """Create a mock VideoCacheService with nothing cached."""
+    video_cache = MagicMock(spec=VideoCacheService)
+    video_cache.get.return_value = None
+    return video_cache
+
+
+@pytest.fixture
+def chat_service(mock_db, mock_chat_repository, mock_video_cache):
     """Create a ChatService instance with a mock database and repository."""
     service = ChatService(mock_db)
     service.chat_repository = mock_chat_repository
+    service.job_repository = MagicMock(spec=JobRepository)
+    service.video_cache = mock_video_cache
     return service
 
 
 @patch("app.services.chat.extract_video_id")
-@patch("app.services.chat.get_youtube_transcript")
+@patch("app.services.chat.get_youtube_transcript_segments")
 @patch("app.services.chat.get_youtube_metadata")
 def test_process_video_async_success(
     mock_get_metadata, mock_get_transcript, mock_extract_id, chat_service
@@ -43,7 +63,7 @@ def test_process_video_async_success(
     video_id = "dQw4w9WgXcQ"
 
     mock_extract_id.return_value = video_id
-    mock_get_transcript.return_value = "This is a test transcript."
+    mock_get_transcript.return_value = _segments("This is a test transcript.")
     mock_get_metadata.return_value = {
         "title": "Test Video",
         "channel_name": "Test Channel",
@@ -60,17 +80,163 @@ def test_process_video_async_success(
     mock_get_transcript.assert_called_once_with(video_id)
     mock_get_metadata.assert_called_once_with(video_id)
 
-    # Verify that update_chat was called with the correct parameters
-    chat_service.chat_repository.update_chat.assert_called_once_with(
+    # Verify that each stage was written and the chat marked processed
+    update_chat = chat_service.chat_repository.update_chat
+    assert update_chat.call_count == 3
+    update_chat.assert_any_call(
+        chat_id=chat_id, transcript_segments=_segments("This is a test transcript.")
+    )
+    update_chat.assert_any_call(
         chat_id=chat_id,
-        status="processed",
-        transcript="This is a test transcript.",
         title="Test Video",
         channel_name="Test Channel",
         publication_date=datetime(2023, 1, 1),
         view_count=1000,
         thumbnail_url="https://example.com/thumbnail.jpg",
     )
+    assert update_chat.call_args == call(chat_id=chat_id, status="processed")
+    assert chat_service.job_repository.enqueue.call_args_list == [
+        call("index_transcript", {"chat_id": chat_id}, max_attempts=ANY),
+        call("summarize_chat", {"chat_id": chat_id}, max_attempts=ANY),
+    ]
+    chat_service.video_cache.store_transcript.assert_called_once_with(
+        video_id, _segments("This is a test transcript.")
+    )
+    chat_service.video_cache.store_metadata.assert_called_once_with(
+        video_id, mock_get_metadata.return_value
+    )
+
+
+@patch("app.services.chat.get_youtube_transcript_segments")
+@patch("app.services.chat.get_youtube_metadata")
+def test_process_video_async_uses_cache(
+    mock_get_metadata, mock_get_transcript, chat_service
+):
+    """Test that cached transcripts and metadata are not fetched again."""
+    chat_id = str(uuid4())
+    source_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    metadata = {
+        "title": "Test Video",
+        "channel_name": "Test Channel",
+        "publication_date": datetime(2023, 1, 1),
+        "view_count": 1000,
+        "thumbnail_url": "https://example.com/thumbnail.jpg",
+    }
+    chat_service.video_cache.get.return_value = CachedVideo(
+        video_id="dQw4w9WgXcQ",
+        transcript=_segments("This is a cached transcript."),
+        metadata=metadata,
+    )
+
+    asyncio.run(chat_service.process_video_async(chat_id, source_url))
+
+    mock_get_transcript.assert_not_called()
+    mock_get_metadata.assert_not_called()
+    chat_service.video_cache.store_transcript.assert_not_called()
+    assert chat_service.chat_repository.update_chat.call_args_list == [
+        call(
+            chat_id=chat_id,
+            transcript_segments=_segments("This is a cached transcript."),
+        ),
+        call(chat_id=chat_id, **metadata),
+        call(chat_id=chat_id, status="processed"),
+    ]
+
+
+@patch("app.services.chat.get_youtube_transcript_segments")
+@patch("app.services.chat.get_youtube_metadata")
+def test_process_video_async_refreshes_stale_metadata(
+    mock_get_metadata, mock_get_transcript, chat_service
+):
+    """Test that only metadata is fetched when the cached metadata expired."""
+    chat_id = str(uuid4())
+    source_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    chat_service.video_cache.get.return_value = CachedVideo(
+        video_id="dQw4w9WgXcQ", transcript=_segments("This is a cached transcript.")
+    )
+    mock_get_metadata.return_value = {
+        "title": "Test Video",
+        "channel_name": "Test Channel",
+        "publication_date": None,
+        "view_count": 2000,
+        "thumbnail_url": "https://example.com/thumbnail.jpg",
+    }
+
+    asyncio.run(chat_service.process_video_async(chat_id, source_url))
+
+    mock_get_transcript.assert_not_called()
+    mock_get_metadata.assert_called_once_with("dQw4w9WgXcQ")
+    chat_service.video_cache.store_metadata.assert_called_once_with(
+        "dQw4w9WgXcQ", mock_get_metadata.return_value
+    )
+
+
+class FakeVideoCache:
+    """In-memory stand-in for VideoCacheService shared between services."""
+
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, video_id, refresh=False):
+        entry = self.entries.get(video_id)
+        return CachedVideo(video_id=video_id, **entry) if entry else None
+
+    def store_transcript(self, video_id, transcript):
+        self.entries.setdefault(video_id, {})["transcript"] = transcript
+
+    def store_metadata(self, video_id, metadata):
+        self.entries.setdefault(video_id, {})["metadata"] = metadata
+
+
+@patch("app.services.chat.get_youtube_transcript_segments")
+@patch("app.services.chat.get_youtube_metadata")
+def test_process_video_async_coalesces_concurrent_jobs(
+    mock_get_metadata, mock_get_transcript, mock_db
+):
+    """Test that concurrent jobs for the same video fetch it only once."""
+    source_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    video_cache = FakeVideoCache()
+
+    def slow_transcript(video_id):
+        time.sleep(0.05)
+        return _segments("This is a test transcript.")
+
+    mock_get_transcript.side_effect = slow_transcript
+    mock_get_metadata.return_value = {
+        "title": "Test Video",
+        "channel_name": "Test Channel",
+        "publication_date": None,
+        "view_count": 1000,
+        "thumbnail_url": "https://example.com/thumbnail.jpg",
+    }
+
+    services = []
+    for _ in range(5):
+        service = ChatService(mock_db)
+        service.chat_repository = MagicMock(spec=ChatRepository)
+        service.video_cache = video_cache
+        services.append(service)
+
+    threads = [
+        threading.Thread(
+            target=asyncio.run,
+            args=(service.process_video_async(str(uuid4()), source_url),),
+        )
+        for service in services
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    mock_get_transcript.assert_called_once_with("dQw4w9WgXcQ")
+    mock_get_metadata.assert_called_once_with("dQw4w9WgXcQ")
+    for service in services:
+        update_chat = service.chat_repository.update_chat
+        update_chat.assert_any_call(
+            chat_id=ANY, transcript_segments=_segments("This is a test transcript.")
+        )
+        assert update_chat.call_args.kwargs["status"] == "processed"
 
 
 @patch("app.services.chat.extract_video_id")
@@ -94,12 +260,14 @@ def test_process_video_async_video_processing_error(mock_extract_id, chat_servic
         status="error",
         transcript="Error processing video: Invalid YouTube URL",
     )
+    chat_service.job_repository.enqueue.assert_not_called()
 
 
 @patch("app.services.chat.extract_video_id")
-@patch("app.services.chat.get_youtube_transcript")
+@patch("app.services.chat.get_youtube_transcript_segments")
+@patch("app.services.chat.get_youtube_metadata")
 def test_process_video_async_unexpected_error(
-    mock_get_transcript, mock_extract_id, chat_service
+    mock_get_metadata, mock_get_transcript, mock_extract_id, chat_service
 ):
     """Test handling unexpected errors during video processing."""
     # Setup mocks
@@ -109,6 +277,7 @@ def test_process_video_async_unexpected_error(
 
     mock_extract_id.return_value = video_id
     mock_get_transcript.side_effect = Exception("Unexpected error")
+    mock_get_metadata.side_effect = VideoProcessingError("Metadata unavailable")
 
     # Run the async function
     asyncio.run(chat_service.process_video_async(chat_id, source_url))
@@ -123,6 +292,141 @@ def test_process_video_async_unexpected_error(
     )
 
 
+@patch("app.services.chat.get_youtube_transcript_segments")
+@patch("app.services.chat.get_youtube_metadata")
+def test_process_video_async_transcript_fails_metadata_kept(
+    mock_get_metadata, mock_get_transcript, chat_service
+):
+    """Test that metadata is kept when only the transcript fails."""
+    chat_id = str(uuid4())
+    source_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    mock_get_transcript.side_effect = VideoProcessingError("Transcripts disabled")
+    mock_get_metadata.return_value = {
+        "title": "Test Video",
+        "channel_name": "Test Channel",
+        "publication_date": None,
+        "view_count": 1000,
+        "thumbnail_url": "https://example.com/thumbnail.jpg",
+    }
+
+    asyncio.run(chat_service.process_video_async(chat_id, source_url))
+
+    update_chat = chat_service.chat_repository.update_chat
+    update_chat.assert_any_call(chat_id=chat_id, **mock_get_metadata.return_value)
+    assert update_chat.call_args == call(
+        chat_id=chat_id,
+        status="error",
+        transcript="Error processing video: Transcripts disabled",
+    )
+    chat_service.video_cache.store_metadata.assert_called_once()
+    chat_service.video_cache.store_transcript.assert_not_called()
+
+
+@patch("app.services.chat.get_youtube_transcript_segments")
+@patch("app.services.chat.get_youtube_metadata")
+def test_process_video_async_metadata_fails_still_processed(
+    mock_get_metadata, mock_get_transcript, chat_service
+):
+    """Test that a chat is processed without metadata when only metadata fails."""
+    chat_id = str(uuid4())
+    source_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    mock_get_transcript.return_value = _segments("This is a test transcript.")
+    mock_get_metadata.side_effect = VideoProcessingError("Metadata unavailable")
+
+    asyncio.run(chat_service.process_video_async(chat_id, source_url))
+
+    assert chat_service.chat_repository.update_chat.call_args_list == [
+        call(
+            chat_id=chat_id, transcript_segments=_segments("This is a test transcript.")
+        ),
+        call(chat_id=chat_id, status="processed"),
+    ]
+    chat_service.video_cache.store_metadata.assert_not_called()
+
+
+@patch("app.services.chat.publish_chat_event")
+@patch("app.services.chat.get_youtube_transcript_segments")
+@patch("app.services.chat.get_youtube_metadata")
+def test_process_video_publishes_progress_events(
+    mock_get_metadata, mock_get_transcript, mock_publish, chat_service
+):
+    """Test that each processing stage publishes a chat event."""
+    chat_id = str(uuid4())
+    mock_get_transcript.return_value = _segments("This is a test transcript.")
+    mock_get_metadata.return_value = {
+        "title": "Test Video",
+        "channel_name": "Test Channel",
+        "publication_date": None,
+        "view_count": 1000,
+        "thumbnail_url": "https://example.com/thumbnail.jpg",
+    }
+
+    chat_service.process_video(chat_id, "https://youtu.be/dQw4w9WgXcQ")
+
+    published = [c.args[2] for c in mock_publish.call_args_list]
+    assert sorted(published[:2]) == ["metadata_fetched", "transcript_fetched"]
+    assert published[2:] == ["processed"]
+    assert mock_publish.call_args == call(
+        chat_service.events, chat_id, "processed", status="processed"
+    )
+
+
+@patch("app.services.chat.publish_chat_event")
+@patch("app.services.chat.extract_video_id")
+def test_process_video_publishes_error_event(
+    mock_extract_id, mock_publish, chat_service
+):
+    """Test that a failed chat publishes an error event."""
+    chat_id = str(uuid4())
+    mock_extract_id.side_effect = VideoProcessingError("Invalid YouTube URL")
+
+    chat_service.process_video(chat_id, "https://www.youtube.com/watch?v=invalid")
+
+    mock_publish.assert_called_once_with(
+        chat_service.events,
+        chat_id,
+        "error",
+        status="error",
+        message="Error processing video: Invalid YouTube URL",
+    )
+
+
+@patch("app.services.chat.get_youtube_transcript_segments")
+@patch("app.services.chat.get_youtube_metadata")
+def test_process_video_async_fetches_stages_concurrently(
+    mock_get_metadata, mock_get_transcript, chat_service
+):
+    """Test that latency is the slowest stage rather than the sum of stages."""
+    chat_id = str(uuid4())
+    source_url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    both_started = threading.Barrier(2, timeout=1)
+
+    def transcript(video_id):
+        both_started.wait()
+        return _segments("This is a test transcript.")
+
+    def metadata(video_id):
+        both_started.wait()
+        return {
+            "title": "Test Video",
+            "channel_name": "Test Channel",
+            "publication_date": None,
+            "view_count": 1000,
+            "thumbnail_url": "https://example.com/thumbnail.jpg",
+        }
+
+    # Each stage waits for the other to start, so this only completes when
+    # both stages run at the same time.
+    mock_get_transcript.side_effect = transcript
+    mock_get_metadata.side_effect = metadata
+
+    asyncio.run(chat_service.process_video_async(chat_id, source_url))
+
+    assert chat_service.chat_repository.update_chat.call_args == call(
+        chat_id=chat_id, status="processed"
+    )
+
+
 def test_start_new_chat(chat_service):
     """Test starting a new chat."""
     # Setup mocks
@@ -205,3 +509,23 @@ def test_get_chat_by_id_not_found(chat_service):
 
     # Verify repository method was called
     chat_service.chat_repository.get_chat_by_id.assert_called_once_with(chat_id)
+
+
+@patch("app.services.chat.get_youtube_transcript_segments")
+@patch("app.services.chat.get_youtube_metadata")
+def test_process_video_transient_error_is_left_to_the_job_queue(
+    mock_get_metadata, mock_get_transcript, chat_service
+):
+    """Test that transient transcript errors fail the job, not the chat."""
+    chat_id = str(uuid4())
+    mock_get_transcript.side_effect = TransientVideoError("Request blocked")
+    mock_get_metadata.side_effect = VideoProcessingError("Metadata unavailable")
+
+    with pytest.raises(TransientVideoError):
+        chat_service.process_video(
+            chat_id, "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        )
+
+    assert call(chat_id=chat_id, status="error", transcript=ANY) not in (
+        chat_service.chat_repository.update_chat.call_args_list
+    )
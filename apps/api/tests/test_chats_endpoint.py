@@ -1,21 +1,32 @@
-from unittest.mock import patch, MagicMock
+import asyncio
+import json
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
+from sqlalchemy import select
 from app.main import app
-from app.core.database import Base
+from app.api.v1.chats import create_message
+from app.models.chat import Chat
+from app.models.chat_message import ChatMessage
+from app.core.events import EventBroker, MemoryEventBackend, publish_chat_event
+from app.core.segments import TranscriptSegments
+from app.services.answer_cache import CachedAnswer
+from app.schemas.chat import MessageCreateRequest
+from app.services.chat_message import Exchange, MessageMetrics
+from app.services.llm import FakeLLMClient
+from app.services.search import SearchHit
 from uuid import uuid4, UUID
 from datetime import datetime
 
-
-# Use an in-memory SQLite database for testing
-Base.metadata.create_all = MagicMock()
-
 client = TestClient(app)
 
 
-@patch("app.api.v1.chats.ChatService")
+@patch("app.api.v1.chats.AsyncChatService")
 def test_create_chat_valid_url(mock_chat_service):
     """Test creating a chat with a valid YouTube URL."""
     # Mock the service to return a fake chat ID
+    mock_chat_service.return_value = AsyncMock()
     mock_chat_service.return_value.start_new_chat.return_value = str(uuid4())
 
     response = client.post(
@@ -53,17 +64,17 @@ def test_create_chat_invalid_payload():
     assert response.status_code == 422  # Validation error from FastAPI
 
 
-@patch("app.api.v1.chats.ChatService")
+@patch("app.api.v1.chats.AsyncChatService")
 def test_create_chat_async_processing(mock_chat_service):
     """Test that creating a chat starts asynchronous processing."""
     # Mock the service
-    mock_service_instance = MagicMock()
+    mock_service_instance = AsyncMock()
     mock_chat_service.return_value = mock_service_instance
-    mock_chat_service.return_value.start_new_chat.return_value = str(uuid4())
+    chat_id = str(uuid4())
+    mock_chat_service.return_value.start_new_chat.return_value = chat_id
 
-    # We won't directly test the asyncio.create_task call here as it's challenging to mock
-    # and the main goal is to ensure the endpoint returns the correct status code.
-    # The actual async processing is tested in the service tests.
+    # The actual processing is tested in the service and worker tests; here we
+    # only check that a processing job is enqueued.
     response = client.post(
         "/api/v1/chats",
         json={"source_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"},
@@ -71,17 +82,82 @@ def test_create_chat_async_processing(mock_chat_service):
 
     # Assertions
     assert response.status_code == 202
+    mock_service_instance.enqueue_processing.assert_called_once_with(
+        chat_id, "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+    )
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_get_chats(mock_chat_service):
+    """Test listing one page of chats."""
+    chat_id = uuid4()
+    mock_service_instance = AsyncMock()
+    mock_service_instance.list_chats.return_value = (
+        [
+            MagicMock(
+                id=chat_id,
+                video_id="dQw4w9WgXcQ",
+                status="processed",
+                title="Test Video",
+                channel_name="Test Channel",
+                view_count=1000,
+                thumbnail_url="https://example.com/thumbnail.jpg",
+                created_at=datetime(2023, 1, 1, 12),
+            )
+        ],
+        "next-page",
+    )
+    mock_chat_service.return_value = mock_service_instance
 
+    response = client.get("/api/v1/chats?cursor=this-page")
 
-def test_get_chats():
-    """Test getting chats (existing endpoint)."""
-    response = client.get("/api/v1/chats")
+    assert response.status_code == 200
+    assert response.json() == {
+        "chats": [
+            {
+                "id": str(chat_id),
+                "video_id": "dQw4w9WgXcQ",
+                "status": "processed",
+                "title": "Test Video",
+                "channel_name": "Test Channel",
+                "view_count": 1000,
+                "thumbnail_url": "https://example.com/thumbnail.jpg",
+                "created_at": "2023-01-01T12:00:00",
+            }
+        ],
+        "next_cursor": "next-page",
+    }
+    mock_service_instance.list_chats.assert_awaited_once_with(20, "this-page")
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_get_chats_caps_page_size(mock_chat_service):
+    """Test that page sizes above the cap are clamped."""
+    mock_service_instance = AsyncMock()
+    mock_service_instance.list_chats.return_value = ([], None)
+    mock_chat_service.return_value = mock_service_instance
+
+    response = client.get("/api/v1/chats?limit=5000")
 
     assert response.status_code == 200
-    assert response.json() == {"chats": []}
+    assert response.json() == {"chats": [], "next_cursor": None}
+    mock_service_instance.list_chats.assert_awaited_once_with(100, None)
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_get_chats_invalid_cursor(mock_chat_service):
+    """Test that malformed cursors are rejected."""
+    mock_service_instance = AsyncMock()
+    mock_service_instance.list_chats.side_effect = ValueError("Invalid cursor")
+    mock_chat_service.return_value = mock_service_instance
+
+    response = client.get("/api/v1/chats?cursor=garbage")
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_code"] == "INVALID_CURSOR"
 
 
-@patch("app.api.v1.chats.ChatService")
+@patch("app.api.v1.chats.AsyncChatService")
 def test_read_chat_success(mock_chat_service):
     """Test successful retrieval of a chat by ID."""
     # Setup mocks
@@ -103,8 +179,9 @@ def test_read_chat_success(mock_chat_service):
     mock_chat.suggested_questions = None
     mock_chat.created_at = datetime(2023, 1, 1, 12, 0, 0)
     mock_chat.updated_at = datetime(2023, 1, 1, 12, 5, 0)
+    mock_chat.version = 3
 
-    mock_service_instance = MagicMock()
+    mock_service_instance = AsyncMock()
     mock_service_instance.get_chat_by_id.return_value = mock_chat
     mock_chat_service.return_value = mock_service_instance
 
@@ -129,12 +206,12 @@ def test_read_chat_success(mock_chat_service):
     assert response_data["suggested_questions"] is None
 
 
-@patch("app.api.v1.chats.ChatService")
+@patch("app.api.v1.chats.AsyncChatService")
 def test_read_chat_invalid_uuid(mock_chat_service):
     """Test handling of invalid UUID format."""
     # Setup
     invalid_chat_id = "invalid-uuid"
-    mock_service_instance = MagicMock()
+    mock_service_instance = AsyncMock()
     mock_service_instance.get_chat_by_id.side_effect = ValueError(
         "Invalid chat ID format"
     )
@@ -150,12 +227,12 @@ def test_read_chat_invalid_uuid(mock_chat_service):
     assert response_data["detail"]["message"] == "Invalid chat ID format"
 
 
-@patch("app.api.v1.chats.ChatService")
+@patch("app.api.v1.chats.AsyncChatService")
 def test_read_chat_not_found(mock_chat_service):
     """Test handling of non-existent chat ID."""
     # Setup
     chat_id = str(uuid4())
-    mock_service_instance = MagicMock()
+    mock_service_instance = AsyncMock()
     mock_service_instance.get_chat_by_id.side_effect = ValueError("Chat not found")
     mock_chat_service.return_value = mock_service_instance
 
@@ -169,10 +246,11 @@ def test_read_chat_not_found(mock_chat_service):
     assert response_data["detail"]["message"] == "Chat not found"
 
 
-@patch("app.api.v1.chats.ChatService")
+@patch("app.api.v1.chats.AsyncChatService")
 def test_create_chat_youtube_url_validation(mock_chat_service):
     """Test YouTube URL validation."""
     # Mock the service to return a fake chat ID
+    mock_chat_service.return_value = AsyncMock()
     mock_chat_service.return_value.start_new_chat.return_value = str(uuid4())
 
     # Test various valid YouTube URLs
@@ -202,3 +280,695 @@ def test_create_chat_youtube_url_validation(mock_chat_service):
         # But if they are valid URLs but not YouTube URLs, they would be rejected by our validation
         # Since we're mocking the service, we're just checking the request gets to the service
         # The actual validation is tested in test_chat_schema.py
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_read_chat_status(mock_chat_service):
+    """Test polling only the status of a chat."""
+    chat_id = str(uuid4())
+    mock_service_instance = AsyncMock()
+    mock_service_instance.get_chat_status.return_value = MagicMock(
+        id=UUID(chat_id),
+        status="processing",
+        updated_at=datetime(2023, 1, 1, 12),
+        version=1,
+    )
+    mock_chat_service.return_value = mock_service_instance
+
+    response = client.get(f"/api/v1/chats/{chat_id}/status")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": chat_id,
+        "status": "processing",
+        "updated_at": "2023-01-01T12:00:00",
+    }
+    mock_service_instance.get_chat_by_id.assert_not_called()
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_read_chat_status_not_found(mock_chat_service):
+    """Test polling the status of a non-existent chat."""
+    mock_service_instance = AsyncMock()
+    mock_service_instance.get_chat_status.side_effect = ValueError("Chat not found")
+    mock_chat_service.return_value = mock_service_instance
+
+    response = client.get(f"/api/v1/chats/{uuid4()}/status")
+
+    assert response.status_code == 404
+    assert response.json()["detail"]["error_code"] == "CHAT_NOT_FOUND"
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_read_chat_sparse_fields(mock_chat_service):
+    """Test that `fields` loads and returns only the requested fields."""
+    chat_id = str(uuid4())
+    mock_chat = MagicMock(id=UUID(chat_id), status="processed", title=None)
+    mock_service_instance = AsyncMock()
+    mock_service_instance.get_chat_by_id.return_value = mock_chat
+    mock_chat_service.return_value = mock_service_instance
+
+    response = client.get(f"/api/v1/chats/{chat_id}?fields=status, title")
+
+    assert response.status_code == 200
+    assert response.json() == {"id": chat_id, "status": "processed", "title": None}
+    mock_service_instance.get_chat_by_id.assert_awaited_once_with(
+        chat_id, ["id", "status", "title"]
+    )
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_read_chat_unknown_fields(mock_chat_service):
+    """Test that unknown fields are rejected before touching the database."""
+    response = client.get(f"/api/v1/chats/{uuid4()}?fields=status,secret")
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_code"] == "INVALID_FIELDS"
+    mock_chat_service.assert_not_called()
+
+
+def _mock_chat_status(chat_id, updated_at=datetime(2023, 1, 1, 12), version=1):
+    return MagicMock(
+        id=UUID(chat_id), status="processed", updated_at=updated_at, version=version
+    )
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_read_chat_not_modified(mock_chat_service):
+    """Test that a matching If-None-Match returns 304 without loading the chat."""
+    chat_id = str(uuid4())
+    mock_service_instance = AsyncMock()
+    mock_service_instance.get_chat_status.return_value = _mock_chat_status(chat_id)
+    mock_service_instance.get_chat_by_id.return_value = MagicMock(
+        id=UUID(chat_id),
+        status="processed",
+        updated_at=datetime(2023, 1, 1, 12),
+        version=1,
+    )
+    mock_chat_service.return_value = mock_service_instance
+
+    response = client.get(f"/api/v1/chats/{chat_id}?fields=status")
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "no-cache"
+    mock_service_instance.get_chat_by_id.reset_mock()
+
+    response = client.get(
+        f"/api/v1/chats/{chat_id}?fields=status", headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+    mock_service_instance.get_chat_by_id.assert_not_called()
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_read_chat_modified(mock_chat_service):
+    """Test that a stale If-None-Match returns the chat with a new ETag."""
+    chat_id = str(uuid4())
+    updated_at = datetime(2023, 1, 1, 12, 5)
+    mock_service_instance = AsyncMock()
+    mock_service_instance.get_chat_status.return_value = _mock_chat_status(
+        chat_id, updated_at, version=2
+    )
+    mock_service_instance.get_chat_by_id.return_value = MagicMock(
+        id=UUID(chat_id), status="processed", updated_at=updated_at, version=2
+    )
+    mock_chat_service.return_value = mock_service_instance
+
+    response = client.get(
+        f"/api/v1/chats/{chat_id}?fields=status",
+        headers={"If-None-Match": '"stale"'},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"id": chat_id, "status": "processed"}
+    assert response.headers["ETag"] != '"stale"'
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_read_chat_etag_depends_on_fields(mock_chat_service):
+    """Test that full and sparse representations get different ETags."""
+    chat_id = str(uuid4())
+    mock_service_instance = AsyncMock()
+    mock_service_instance.get_chat_by_id.return_value = MagicMock(
+        id=UUID(chat_id),
+        status="processed",
+        title="Test Video",
+        updated_at=datetime(2023, 1, 1, 12),
+        version=1,
+    )
+    mock_chat_service.return_value = mock_service_instance
+
+    status_etag = client.get(f"/api/v1/chats/{chat_id}?fields=status").headers["ETag"]
+    title_etag = client.get(f"/api/v1/chats/{chat_id}?fields=title").headers["ETag"]
+
+    assert status_etag != title_etag
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_read_chat_status_not_modified(mock_chat_service):
+    """Test conditional polling of the status endpoint."""
+    chat_id = str(uuid4())
+    mock_service_instance = AsyncMock()
+    mock_service_instance.get_chat_status.return_value = _mock_chat_status(chat_id)
+    mock_chat_service.return_value = mock_service_instance
+
+    etag = client.get(f"/api/v1/chats/{chat_id}/status").headers["ETag"]
+    response = client.get(
+        f"/api/v1/chats/{chat_id}/status",
+        headers={"If-None-Match": f'W/"other", {etag}'},
+    )
+
+    assert response.status_code == 304
+
+
+def _read_sse(response) -> list:
+    """Parse the events of a Server-Sent Events response."""
+    events = []
+    for message in response.text.split("\n\n"):
+        lines = dict(
+            line.split(": ", 1) for line in message.splitlines() if ": " in line
+        )
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@patch("app.api.v1.chats.get_event_broker")
+@patch("app.api.v1.chats.AsyncChatService")
+def test_stream_chat_events(mock_chat_service, mock_get_event_broker):
+    """Test streaming progress events until the chat is processed."""
+    chat_id = str(uuid4())
+    backend = MemoryEventBackend()
+    mock_get_event_broker.return_value = EventBroker(backend)
+
+    async def get_chat_status(requested_chat_id):
+        # Published by a worker once the client is subscribed
+        publish_chat_event(backend, chat_id, "transcript_fetched")
+        publish_chat_event(backend, str(uuid4()), "processed")
+        publish_chat_event(backend, chat_id, "processed", status="processed")
+        return MagicMock(id=UUID(chat_id), status="processing")
+
+    mock_chat_service.return_value.get_chat_status = get_chat_status
+
+    response = client.get(f"/api/v1/chats/{chat_id}/events")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _read_sse(response)
+    assert [event_type for event_type, _ in events] == [
+        "status",
+        "transcript_fetched",
+        "processed",
+    ]
+    assert events[0][1]["data"] == {"status": "processing"}
+    assert events[2][1]["data"] == {"status": "processed"}
+    assert mock_get_event_broker.return_value.stats()["subscribers"] == 0
+
+
+@patch("app.api.v1.chats.get_event_broker")
+@patch("app.api.v1.chats.AsyncChatService")
+def test_stream_chat_events_already_processed(mock_chat_service, mock_get_event_broker):
+    """Test that the stream of a finished chat only sends its status."""
+    chat_id = str(uuid4())
+    mock_get_event_broker.return_value = EventBroker(MemoryEventBackend())
+    mock_service_instance = AsyncMock()
+    mock_service_instance.get_chat_status.return_value = _mock_chat_status(chat_id)
+    mock_chat_service.return_value = mock_service_instance
+
+    response = client.get(f"/api/v1/chats/{chat_id}/events")
+
+    events = _read_sse(response)
+    assert [(event_type, event["data"]) for event_type, event in events] == [
+        ("status", {"status": "processed"})
+    ]
+
+
+@patch("app.api.v1.chats.get_event_broker")
+@patch("app.api.v1.chats.AsyncChatService")
+def test_stream_chat_events_not_found(mock_chat_service, mock_get_event_broker):
+    """Test that streaming events of an unknown chat returns 404."""
+    mock_get_event_broker.return_value = EventBroker(MemoryEventBackend())
+    mock_service_instance = AsyncMock()
+    mock_service_instance.get_chat_status.side_effect = ValueError("Chat not found")
+    mock_chat_service.return_value = mock_service_instance
+
+    response = client.get(f"/api/v1/chats/{uuid4()}/events")
+
+    assert response.status_code == 404
+    assert mock_get_event_broker.return_value.stats()["subscribers"] == 0
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_read_chat_transcript_time_range(mock_chat_service):
+    """Test streaming the transcript segments of a time range as NDJSON."""
+    mock_chat_service.return_value = AsyncMock()
+    mock_chat_service.return_value.get_transcript_segments.return_value = (
+        TranscriptSegments.from_snippets(
+            [("Hello", 0.0, 2.0), ("there", 2.0, 3.0), ("World", 5.0, 2.0)]
+        )
+    )
+    chat_id = str(uuid4())
+
+    response = client.get(f"/api/v1/chats/{chat_id}/transcript?start=3&end=5")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [{"start": 2.0, "duration": 3.0, "text": "there"}]
+
+
+def test_read_chat_transcript_invalid_time_range():
+    """Test that empty or negative time ranges are rejected."""
+    chat_id = str(uuid4())
+
+    for query in ("start=-1", "start=5&end=5", "start=5&end=2"):
+        response = client.get(f"/api/v1/chats/{chat_id}/transcript?{query}")
+        assert response.status_code == 400
+        assert response.json()["detail"]["error_code"] == "INVALID_TIME_RANGE"
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_read_chat_transcript_without_segments(mock_chat_service):
+    """Test that chats without a timed transcript return 404."""
+    mock_chat_service.return_value = AsyncMock()
+    mock_chat_service.return_value.get_transcript_segments.side_effect = ValueError(
+        "Transcript segments not found"
+    )
+
+    response = client.get(f"/api/v1/chats/{uuid4()}/transcript")
+
+    assert response.status_code == 404
+    assert response.json()["detail"]["error_code"] == "TRANSCRIPT_SEGMENTS_NOT_FOUND"
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_read_chat_transcript_chat_not_found(mock_chat_service):
+    """Test that unknown chats return 404 from the transcript endpoint."""
+    mock_chat_service.return_value = AsyncMock()
+    mock_chat_service.return_value.get_transcript_segments.side_effect = ValueError(
+        "Chat not found"
+    )
+
+    response = client.get(f"/api/v1/chats/{uuid4()}/transcript")
+
+    assert response.status_code == 404
+    assert response.json()["detail"]["error_code"] == "CHAT_NOT_FOUND"
+
+
+@patch("app.api.v1.chats.AsyncKeywordSearchService")
+@patch("app.api.v1.chats.AsyncChatService")
+def test_search_chat_transcript(mock_chat_service, mock_search_service):
+    """Test searching a chat's transcript for keywords."""
+    mock_chat_service.return_value = AsyncMock()
+    mock_search_service.return_value = AsyncMock()
+    mock_search_service.return_value.search.return_value = [
+        SearchHit(
+            score=1.5,
+            start_seconds=3.0,
+            end_seconds=5.5,
+            text="Today we talk about rockets",
+            offset=28,
+            length=27,
+            matches=[(48, 55)],
+        )
+    ]
+    chat_id = str(uuid4())
+
+    response = client.get(f"/api/v1/chats/{chat_id}/search?q=rockets&limit=500")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "query": "rockets",
+        "results": [
+            {
+                "score": 1.5,
+                "start_seconds": 3.0,
+                "end_seconds": 5.5,
+                "text": "Today we talk about rockets",
+                "offset": 28,
+                "length": 27,
+                "matches": [[48, 55]],
+            }
+        ],
+    }
+    mock_search_service.return_value.search.assert_called_once_with(
+        chat_id, "rockets", 50
+    )
+
+
+@patch("app.api.v1.chats.AsyncKeywordSearchService")
+@patch("app.api.v1.chats.AsyncChatService")
+def test_search_chat_transcript_not_indexed(mock_chat_service, mock_search_service):
+    """Test that searching a chat without an index returns 404."""
+    mock_chat_service.return_value = AsyncMock()
+    mock_search_service.return_value = AsyncMock()
+    mock_search_service.return_value.search.side_effect = ValueError(
+        "Search index not found"
+    )
+
+    response = client.get(f"/api/v1/chats/{uuid4()}/search?q=rockets")
+
+    assert response.status_code == 404
+    assert response.json()["detail"]["error_code"] == "SEARCH_INDEX_NOT_FOUND"
+
+
+def test_search_chat_transcript_empty_query():
+    """Test that blank queries are rejected."""
+    response = client.get(f"/api/v1/chats/{uuid4()}/search?q=%20")
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_code"] == "INVALID_QUERY"
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_search_chats(mock_chat_service):
+    """Test full-text search across chats, with paging."""
+    mock_chat_service.return_value = AsyncMock()
+    chat_id = uuid4()
+    mock_chat_service.return_value.search_chats.return_value = (
+        [
+            MagicMock(
+                id=chat_id,
+                video_id="dQw4w9WgXcQ",
+                status="processed",
+                title="Rocket launch",
+                channel_name="Space",
+                view_count=10,
+                thumbnail_url=None,
+                created_at=datetime(2024, 1, 1),
+                score=0.75,
+            )
+        ],
+        "next-page",
+    )
+
+    response = client.get("/api/v1/chats/search?q=rocket&limit=500&cursor=abc")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["next_cursor"] == "next-page"
+    assert body["chats"][0]["id"] == str(chat_id)
+    assert body["chats"][0]["score"] == 0.75
+    mock_chat_service.return_value.search_chats.assert_called_once_with(
+        "rocket", 100, "abc"
+    )
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_search_chats_invalid_cursor(mock_chat_service):
+    """Test that malformed search cursors are rejected."""
+    mock_chat_service.return_value = AsyncMock()
+    mock_chat_service.return_value.search_chats.side_effect = ValueError(
+        "Invalid cursor"
+    )
+
+    response = client.get("/api/v1/chats/search?q=rocket&cursor=garbage")
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_code"] == "INVALID_CURSOR"
+
+
+def test_search_chats_empty_query():
+    """Test that blank search queries are rejected."""
+    response = client.get("/api/v1/chats/search?q=")
+
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_code"] == "INVALID_QUERY"
+
+
+def _mock_exchange(cached_answer=None) -> Exchange:
+    return Exchange(
+        question=MagicMock(id=uuid4()),
+        answer=MagicMock(id=uuid4()),
+        prompt=[("human", "What is it about?")],
+        cached_answer=cached_answer,
+    )
+
+
+@patch("app.api.v1.chats.record_reply", new_callable=AsyncMock)
+@patch("app.api.v1.chats.get_llm_client")
+@patch("app.api.v1.chats.get_event_broker")
+@patch("app.api.v1.chats.AsyncChatMessageService")
+def test_create_message_streams_answer(
+    mock_message_service, mock_get_event_broker, mock_get_llm_client, mock_record
+):
+    """Test streaming an answer token by token, then its timings."""
+    chat_id = str(uuid4())
+    exchange = _mock_exchange()
+    question, answer = exchange.question, exchange.answer
+    mock_message_service.return_value.start_exchange = AsyncMock(return_value=exchange)
+    mock_get_event_broker.return_value = EventBroker(MemoryEventBackend())
+    mock_get_llm_client.return_value = FakeLLMClient(["Bread", " and ", "starters."])
+
+    response = client.post(
+        f"/api/v1/chats/{chat_id}/messages", json={"message": " What is it about? "}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _read_sse(response)
+    assert [event_type for event_type, _ in events] == [
+        "message",
+        "token",
+        "token",
+        "token",
+        "completed",
+    ]
+    assert events[0][1]["data"] == {
+        "question_id": str(question.id),
+        "message_id": str(answer.id),
+    }
+    assert "".join(event["data"]["text"] for _, event in events[1:4]) == (
+        "Bread and starters."
+    )
+    assert events[4][1]["data"]["output_tokens"] == 3
+    assert events[4][1]["data"]["time_to_first_token_ms"] is not None
+    mock_message_service.return_value.start_exchange.assert_awaited_once_with(
+        chat_id, "What is it about?"
+    )
+    reply = mock_record.call_args.args[0]
+    assert (reply.status, reply.content) == ("completed", "Bread and starters.")
+    assert mock_get_event_broker.return_value.stats()["subscribers"] == 0
+
+
+@patch("app.api.v1.chats.record_reply", new_callable=AsyncMock)
+@patch("app.api.v1.chats.get_llm_client")
+@patch("app.api.v1.chats.get_event_broker")
+@patch("app.api.v1.chats.AsyncChatMessageService")
+def test_create_message_cached_answer(
+    mock_message_service, mock_get_event_broker, mock_get_llm_client, mock_record
+):
+    """Test that cached answers are streamed without calling the model."""
+    mock_message_service.return_value.start_exchange = AsyncMock(
+        return_value=_mock_exchange(CachedAnswer("Bread.", output_tokens=2))
+    )
+    mock_get_event_broker.return_value = EventBroker(MemoryEventBackend())
+
+    response = client.post(
+        f"/api/v1/chats/{uuid4()}/messages", json={"message": "What is it about?"}
+    )
+
+    events = _read_sse(response)
+    assert [(event_type, event["data"].get("text")) for event_type, event in events][
+        1:
+    ] == [("token", "Bread."), ("completed", None)]
+    assert events[-1][1]["data"]["cached"] is True
+    assert events[-1][1]["data"]["output_tokens"] == 2
+    mock_get_llm_client.return_value.stream.assert_not_called()
+    assert mock_record.call_args.args[0].cached
+
+
+@patch("app.api.v1.chats.get_message_metrics")
+@patch("app.api.v1.chats.record_reply", new_callable=AsyncMock)
+@patch("app.api.v1.chats.get_llm_client")
+@patch("app.api.v1.chats.get_event_broker")
+@patch("app.api.v1.chats.AsyncChatMessageService")
+def test_create_message_disconnect_before_stream(
+    mock_message_service,
+    mock_get_event_broker,
+    mock_get_llm_client,
+    mock_record,
+    mock_get_message_metrics,
+):
+    """Test that an answer is recorded when its stream is never started."""
+    mock_message_service.return_value.start_exchange = AsyncMock(
+        return_value=_mock_exchange()
+    )
+    mock_get_event_broker.return_value = EventBroker(MemoryEventBackend())
+    mock_get_message_metrics.return_value = MessageMetrics()
+
+    async def scenario():
+        response = await create_message(
+            str(uuid4()), MessageCreateRequest(message="Hello?"), db=AsyncMock()
+        )
+        # The client went away before the first chunk was pulled
+        await response.background()
+
+    asyncio.run(scenario())
+
+    mock_record.assert_awaited_once()
+    assert mock_get_event_broker.return_value.stats()["subscribers"] == 0
+    # Counted as started, so that recording the reply counts it as finished
+    assert mock_get_message_metrics.return_value.streaming == 1
+    mock_get_llm_client.return_value.stream.assert_not_called()
+
+
+@patch("app.services.llm._llm_client", None)
+@patch("app.services.llm.create_llm_client")
+def test_create_message_llm_unavailable(mock_create_llm_client, run_with_async_session):
+    """Test that a model that can't be created saves nothing and returns 503."""
+    mock_create_llm_client.side_effect = ValueError("GOOGLE_API_KEY is not set")
+
+    async def scenario(db):
+        chat = Chat(
+            source_url="https://youtu.be/dQw4w9WgXcQ",
+            source_type="YOUTUBE",
+            video_id="dQw4w9WgXcQ",
+            status="processed",
+        )
+        chat.transcript = "Sourdough needs a starter."
+        db.add(chat)
+        await db.commit()
+        with pytest.raises(HTTPException) as raised:
+            await create_message(
+                str(chat.id), MessageCreateRequest(message="Why?"), db=db
+            )
+        messages = (await db.execute(select(ChatMessage))).scalars().all()
+        return raised.value, messages
+
+    error, messages = run_with_async_session(scenario)
+
+    assert error.status_code == 503
+    assert error.detail["error_code"] == "LLM_UNAVAILABLE"
+    assert not [message for message in messages if message.status == "streaming"]
+
+
+@patch("app.api.v1.chats.get_llm_client")
+@patch("app.api.v1.chats.AsyncChatMessageService")
+def test_create_message_chat_not_ready(mock_message_service, mock_get_llm_client):
+    """Test that asking about a chat still processing returns 409."""
+    mock_message_service.return_value.start_exchange = AsyncMock(
+        side_effect=ValueError("Chat not ready")
+    )
+
+    response = client.post(
+        f"/api/v1/chats/{uuid4()}/messages", json={"message": "Too early?"}
+    )
+
+    assert response.status_code == 409
+    assert response.json()["detail"]["error_code"] == "CHAT_NOT_READY"
+
+
+def test_create_message_empty():
+    """Test that blank questions are rejected."""
+    response = client.post(f"/api/v1/chats/{uuid4()}/messages", json={"message": " "})
+
+    assert response.status_code == 422
+
+
+@patch("app.api.v1.chats.AsyncChatMessageService")
+def test_read_messages(mock_message_service):
+    """Test listing the conversation of a chat."""
+    chat_id = str(uuid4())
+    message = MagicMock(
+        id=uuid4(),
+        role="ai",
+        content="Bread.",
+        status="stopped",
+        time_to_first_token_ms=120.5,
+        tokens_per_second=42.0,
+        output_tokens=2,
+        created_at=datetime(2026, 1, 1),
+    )
+    mock_message_service.return_value.list_messages = AsyncMock(return_value=[message])
+
+    response = client.get(f"/api/v1/chats/{chat_id}/messages")
+
+    assert response.status_code == 200
+    item = response.json()["messages"][0]
+    assert (item["id"], item["status"]) == (str(message.id), "stopped")
+    assert item["time_to_first_token_ms"] == 120.5
+
+
+@patch("app.api.v1.chats.AsyncChatMessageService")
+def test_stop_message(mock_message_service):
+    """Test asking for an answer to stop."""
+    chat_id, message_id = str(uuid4()), str(uuid4())
+    mock_message_service.return_value.request_stop = AsyncMock(
+        return_value=MagicMock(status="streaming")
+    )
+
+    response = client.post(f"/api/v1/chats/{chat_id}/messages/{message_id}/stop")
+
+    assert response.status_code == 202
+    assert response.json() == {"message_id": message_id, "status": "streaming"}
+    mock_message_service.return_value.request_stop.assert_awaited_once_with(
+        chat_id, message_id
+    )
+
+
+@patch("app.api.v1.chats.AsyncChatMessageService")
+def test_stop_message_not_found(mock_message_service):
+    """Test that stopping an unknown answer returns 404."""
+    mock_message_service.return_value.request_stop = AsyncMock(
+        side_effect=ValueError("Message not found")
+    )
+
+    response = client.post(f"/api/v1/chats/{uuid4()}/messages/{uuid4()}/stop")
+
+    assert response.status_code == 404
+    assert response.json()["detail"]["error_code"] == "MESSAGE_NOT_FOUND"
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_create_chats_batch(mock_chat_service):
+    """Test that valid items get chats and invalid ones get their own errors."""
+    chat_ids = [str(uuid4()), str(uuid4())]
+    mock_chat_service.return_value.start_new_chats = AsyncMock(return_value=chat_ids)
+
+    response = client.post(
+        "/api/v1/chats:batch",
+        json={
+            "chats": [
+                "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+                {"source_url": "https://www.google.com"},
+                {
+                    "source_url": "https://youtu.be/9bZkp7q19f0",
+                    "source_type": "YOUTUBE",
+                },
+                42,
+            ]
+        },
+    )
+
+    assert response.status_code == 202
+    body = response.json()
+    assert (body["created"], body["failed"]) == (2, 2)
+    assert [r["chat_id"] for r in body["results"]] == [
+        chat_ids[0],
+        None,
+        chat_ids[1],
+        None,
+    ]
+    assert body["results"][1]["error"]["error_code"] == "VALIDATION_ERROR"
+    assert "Invalid YouTube URL" in body["results"][1]["error"]["message"]
+    mock_chat_service.return_value.start_new_chats.assert_awaited_once_with(
+        [
+            ("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "YOUTUBE"),
+            ("https://youtu.be/9bZkp7q19f0", "YOUTUBE"),
+        ]
+    )
+
+
+@patch("app.api.v1.chats.AsyncChatService")
+def test_create_chats_batch_limits(mock_chat_service):
+    """Test that empty and oversized batches are rejected as a whole."""
+    assert client.post("/api/v1/chats:batch", json={"chats": []}).status_code == 422
+    response = client.post(
+        "/api/v1/chats:batch",
+        json={"chats": ["https://youtu.be/dQw4w9WgXcQ"] * 1001},
+    )
+    assert response.status_code == 422
+    mock_chat_service.return_value.start_new_chats.assert_not_called()
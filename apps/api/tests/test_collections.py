@@ -0,0 +1,266 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+from fastapi.testclient import TestClient
+from app.core.exceptions import TransientVideoError, VideoProcessingError
+from app.main import app
+from app.models.chat import Chat
+from app.models.collection import ChatCollection
+from app.models.job import Job
+from app.repository.chat import ChatRepository
+from app.repository.collection import CollectionRepository
+from app.services.collection import (
+    AsyncCollectionService,
+    CollectionService,
+    rollup_status,
+)
+from app.services.video import (
+    YOUTUBE_CHANNEL,
+    YOUTUBE_PLAYLIST,
+    collection_source_type,
+    get_youtube_collection,
+)
+
+client = TestClient(app)
+
+
+def test_collection_source_type():
+    """Test telling playlist and channel URLs apart from other URLs."""
+    playlists = [
+        "https://www.youtube.com/playlist?list=PL123",
+        "https://youtube.com/watch?v=dQw4w9WgXcQ&list=PL123",
+    ]
+    channels = [
+        "https://www.youtube.com/@veritasium",
+        "https://www.youtube.com/channel/UCHnyfMqiRRG1u-2MsSQLbXA/videos",
+    ]
+    for url in playlists:
+        assert collection_source_type(url) == YOUTUBE_PLAYLIST
+    for url in channels:
+        assert collection_source_type(url) == YOUTUBE_CHANNEL
+    for url in (
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        "https://youtu.be/dQw4w9WgXcQ",
+        "https://www.google.com/@veritasium",
+    ):
+        with pytest.raises(VideoProcessingError):
+            collection_source_type(url)
+
+
+@patch("app.services.video.yt_dlp.YoutubeDL")
+def test_get_youtube_collection(mock_youtube_dl):
+    """Test listing the videos of a channel with one flat extraction."""
+    mock_ydl_instance = MagicMock()
+    mock_youtube_dl.return_value.__enter__.return_value = mock_ydl_instance
+    mock_ydl_instance.extract_info.return_value = {
+        "title": "Veritasium - Videos",
+        "channel": "Veritasium",
+        "entries": [
+            {"id": "dQw4w9WgXcQ", "title": "First"},
+            {"id": "UCHnyfMqiRRG1u-2MsSQLbXA", "title": "A channel"},
+            None,
+            {"id": "9bZkp7q19f0", "title": "Second"},
+            {"id": "dQw4w9WgXcQ", "title": "First again"},
+        ],
+    }
+
+    collection = get_youtube_collection("https://www.youtube.com/@veritasium")
+
+    assert collection == {
+        "source_type": YOUTUBE_CHANNEL,
+        "title": "Veritasium - Videos",
+        "channel_name": "Veritasium",
+        "video_ids": ["dQw4w9WgXcQ", "9bZkp7q19f0"],
+    }
+    mock_ydl_instance.extract_info.assert_called_once_with(
+        "https://www.youtube.com/@veritasium/videos", download=False
+    )
+    assert mock_youtube_dl.call_args[0][0]["extract_flat"] == "in_playlist"
+
+
+def test_rollup_status():
+    """Test rolling the statuses of a collection's chats up into one."""
+    assert rollup_status("expanding", {}) == "expanding"
+    assert rollup_status("error", {}) == "error"
+    assert rollup_status("expanded", {"processing": 1, "processed": 3}) == (
+        "processing"
+    )
+    assert rollup_status("expanded", {"processed": 4}) == "processed"
+    assert rollup_status("expanded", {"processed": 3, "error": 1}) == "partial"
+    assert rollup_status("expanded", {"error": 4}) == "error"
+
+
+def _add_collection(db, url="https://www.youtube.com/playlist?list=PL123"):
+    collection = ChatCollection(
+        id=uuid4(), source_url=url, source_type=YOUTUBE_PLAYLIST
+    )
+    db.add(collection)
+    db.commit()
+    return collection
+
+
+@patch("app.services.collection.get_youtube_collection")
+def test_expand_collection(mock_get_collection, sqlite_session):
+    """Test that a chat and a processing job are created per video, once."""
+    collection = _add_collection(sqlite_session)
+    mock_get_collection.return_value = {
+        "source_type": YOUTUBE_PLAYLIST,
+        "title": "Course",
+        "channel_name": "Teacher",
+        "video_ids": ["dQw4w9WgXcQ", "9bZkp7q19f0"],
+    }
+
+    CollectionService(sqlite_session).expand_collection(str(collection.id))
+    # A retried job doesn't list the videos again
+    CollectionService(sqlite_session).expand_collection(str(collection.id))
+
+    sqlite_session.refresh(collection)
+    assert (collection.status, collection.title, collection.video_count) == (
+        "expanded",
+        "Course",
+        2,
+    )
+    chats = sqlite_session.query(Chat).all()
+    assert sorted(chat.video_id for chat in chats) == ["9bZkp7q19f0", "dQw4w9WgXcQ"]
+    jobs = sqlite_session.query(Job).all()
+    assert {job.chat_id for job in jobs} == {chat.id for chat in chats}
+    assert {job.concurrency_key for job in jobs} == {f"collection:{collection.id}"}
+    mock_get_collection.assert_called_once()
+
+
+@patch("app.services.collection.get_youtube_collection")
+def test_expand_collection_error(mock_get_collection, sqlite_session):
+    """Test that a collection whose videos can't be listed is marked as failed."""
+    collection = _add_collection(sqlite_session)
+    mock_get_collection.side_effect = VideoProcessingError("Playlist is private")
+
+    CollectionService(sqlite_session).expand_collection(str(collection.id))
+
+    sqlite_session.refresh(collection)
+    assert (collection.status, collection.error) == ("error", "Playlist is private")
+    assert sqlite_session.query(Chat).count() == 0
+
+
+def test_expand_collection_transient_error_is_retried(sqlite_session):
+    """Test that a retryable listing error leaves the collection to a retry."""
+    collection = _add_collection(sqlite_session)
+    listings = [
+        TransientVideoError("YouTube is throttling requests"),
+        {
+            "source_type": YOUTUBE_PLAYLIST,
+            "title": "Course",
+            "channel_name": "Teacher",
+            "video_ids": ["dQw4w9WgXcQ"],
+        },
+    ]
+
+    def fake_listing(source_url):
+        listing = listings.pop(0)
+        if isinstance(listing, Exception):
+            raise listing
+        return listing
+
+    with patch(
+        "app.services.collection.get_youtube_collection", side_effect=fake_listing
+    ):
+        with pytest.raises(TransientVideoError):
+            CollectionService(sqlite_session).expand_collection(str(collection.id))
+        sqlite_session.refresh(collection)
+        assert (collection.status, collection.error) == ("expanding", None)
+
+        CollectionService(sqlite_session).expand_collection(str(collection.id))
+
+    sqlite_session.refresh(collection)
+    assert (collection.status, collection.video_count) == ("expanded", 1)
+
+
+def test_get_collection_rolls_up_chats(run_with_async_session):
+    """Test reading a collection with its chats in order and their counts."""
+
+    async def scenario(db):
+        collection = ChatCollection(
+            id=uuid4(),
+            source_url="https://www.youtube.com/@teacher",
+            source_type=YOUTUBE_CHANNEL,
+            status="expanded",
+        )
+        db.add(collection)
+        await db.commit()
+
+        def add_chats(sync_db):
+            chat_ids = ChatRepository(sync_db).add_chats(
+                [(f"url {n}", "YOUTUBE", f"video{n:06}") for n in range(3)]
+            )
+            CollectionRepository(sync_db).add_items(collection.id, chat_ids)
+            sync_db.query(Chat).filter(Chat.id == chat_ids[1]).update(
+                {"status": "processed"}
+            )
+            sync_db.commit()
+
+        await db.run_sync(add_chats)
+        return await AsyncCollectionService(db).get_collection(str(collection.id))
+
+    result = run_with_async_session(scenario)
+
+    assert result["status"] == "processing"
+    assert result["counts"] == {"processing": 2, "processed": 1}
+    assert [chat.video_id for chat in result["chats"]] == [
+        "video000000",
+        "video000001",
+        "video000002",
+    ]
+
+
+def test_get_collection_not_found(run_with_async_session):
+    """Test that unknown and malformed collection IDs are rejected."""
+
+    async def scenario(db):
+        service = AsyncCollectionService(db)
+        with pytest.raises(ValueError, match="Collection not found"):
+            await service.get_collection(str(uuid4()))
+        with pytest.raises(ValueError, match="Invalid collection ID format"):
+            await service.get_collection("not-a-uuid")
+
+    run_with_async_session(scenario)
+
+
+@patch("app.api.v1.collections.AsyncCollectionService")
+def test_create_collection_endpoint(mock_collection_service):
+    """Test creating a collection from a playlist URL."""
+    collection_id = str(uuid4())
+    mock_collection_service.return_value.start_collection = AsyncMock(
+        return_value=collection_id
+    )
+
+    response = client.post(
+        "/api/v1/collections",
+        json={"source_url": "https://www.youtube.com/playlist?list=PL123"},
+    )
+
+    assert response.status_code == 202
+    assert response.json() == {"collection_id": collection_id}
+
+
+@patch("app.api.v1.collections.AsyncCollectionService")
+def test_create_collection_rejects_video_urls(mock_collection_service):
+    """Test that single video URLs are not accepted as collections."""
+    response = client.post(
+        "/api/v1/collections",
+        json={"source_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ"},
+    )
+
+    assert response.status_code == 422
+    mock_collection_service.return_value.start_collection.assert_not_called()
+
+
+@patch("app.api.v1.collections.AsyncCollectionService")
+def test_read_collection_not_found(mock_collection_service):
+    """Test that an unknown collection returns 404."""
+    mock_collection_service.return_value.get_collection = AsyncMock(
+        side_effect=ValueError("Collection not found")
+    )
+
+    response = client.get(f"/api/v1/collections/{uuid4()}")
+
+    assert response.status_code == 404
+    assert response.json()["detail"]["error_code"] == "COLLECTION_NOT_FOUND"
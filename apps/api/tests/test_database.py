@@ -0,0 +1,49 @@
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.pool import QueuePool
+from app.core.database import Base, init_db, warm_pool
+
+
+def test_init_db_creates_tables(tmp_path):
+    """Test that init_db creates every table and can run again safely."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'init.db'}")
+
+    init_db(engine)
+    init_db(engine)
+
+    assert {
+        *Base.metadata.tables,
+        "schema_migrations",
+        "chat_search_documents",
+        "chat_search_fts",
+    } <= set(inspect(engine).get_table_names())
+    indexes = {index["name"] for index in inspect(engine).get_indexes("chats")}
+    assert "ix_chats_created_at_id" in indexes
+    engine.dispose()
+
+
+def test_warm_pool_opens_pool_size_connections(tmp_path):
+    """Test that warming leaves the pool's connections open and idle."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'warm.db'}", poolclass=QueuePool, pool_size=3
+    )
+
+    warm_pool(engine)
+
+    assert engine.pool.checkedin() == 3
+    assert engine.pool.checkedout() == 0
+    engine.dispose()
+
+
+def test_init_db_adds_indexes_to_existing_tables(tmp_path):
+    """Test that indexes declared after a table was created are added."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'upgrade.db'}")
+    chats = Base.metadata.tables["chats"]
+    chats.create(bind=engine)
+    for index in chats.indexes:
+        index.drop(bind=engine)
+
+    init_db(engine)
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("chats")}
+    assert indexes == {index.name for index in chats.indexes}
+    engine.dispose()
@@ -0,0 +1,178 @@
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+from uuid import uuid4
+from app.core.clock import utcnow
+from app.repository.job import JobRepository
+
+
+@pytest.fixture
+def job_repository(sqlite_session):
+    """Create a JobRepository backed by SQLite."""
+    return JobRepository(sqlite_session)
+
+
+def _later(seconds):
+    return patch(
+        "app.repository.job.utcnow", return_value=utcnow() + timedelta(seconds=seconds)
+    )
+
+
+def test_enqueue(job_repository):
+    """Test adding a job to the queue."""
+    chat_id = uuid4()
+    job = job_repository.enqueue("process_video", {"chat_id": str(chat_id)}, chat_id)
+
+    assert job.status == "queued"
+    assert job.attempts == 0
+    assert job.chat_id == chat_id
+    assert job.payload == {"chat_id": str(chat_id)}
+
+
+def test_lease_claims_queued_jobs(job_repository):
+    """Test that leasing claims jobs and increments attempts."""
+    first = job_repository.enqueue("process_video", {"n": 1})
+    job_repository.enqueue("process_video", {"n": 2})
+
+    leased = job_repository.lease("worker-1", limit=1, lease_seconds=60)
+
+    assert [job.id for job in leased] == [first.id]
+    assert leased[0].status == "leased"
+    assert leased[0].lease_owner == "worker-1"
+    assert leased[0].attempts == 1
+
+
+def test_leased_jobs_are_not_leased_twice(job_repository):
+    """Test that a job held by one worker is not handed to another."""
+    job_repository.enqueue("process_video", {})
+    job_repository.lease("worker-1", limit=10, lease_seconds=60)
+
+    assert job_repository.lease("worker-2", limit=10, lease_seconds=60) == []
+
+
+def test_expired_lease_is_leased_again(job_repository):
+    """Test that a job is recovered when its worker stops heartbeating."""
+    job = job_repository.enqueue("process_video", {})
+    job_repository.lease("worker-1", limit=1, lease_seconds=60)
+
+    with _later(120):
+        leased = job_repository.lease("worker-2", limit=1, lease_seconds=60)
+
+    assert [j.id for j in leased] == [job.id]
+    assert leased[0].lease_owner == "worker-2"
+    assert leased[0].attempts == 2
+
+
+def test_heartbeat_extends_lease(job_repository):
+    """Test that heartbeats keep a lease alive."""
+    job = job_repository.enqueue("process_video", {})
+    job_repository.lease("worker-1", limit=1, lease_seconds=60)
+
+    with _later(50):
+        assert job_repository.heartbeat([job.id], "worker-1", lease_seconds=60) == 1
+    with _later(100):
+        assert job_repository.lease("worker-2", limit=1, lease_seconds=60) == []
+    assert job_repository.heartbeat([job.id], "worker-2", lease_seconds=60) == 0
+
+
+def test_complete(job_repository):
+    """Test completing a leased job."""
+    job = job_repository.enqueue("process_video", {})
+    job_repository.lease("worker-1", limit=1, lease_seconds=60)
+
+    assert job_repository.complete(job.id, "worker-2") is False
+    assert job_repository.complete(job.id, "worker-1") is True
+    job_repository.db.expire_all()
+    assert job_repository.get_job_by_id(job.id).status == "completed"
+
+
+def test_fail_retries_then_gives_up(job_repository):
+    """Test that failed jobs are retried until they run out of attempts."""
+    job = job_repository.enqueue("process_video", {}, max_attempts=2)
+
+    job_repository.lease("worker-1", limit=1, lease_seconds=60)
+    failed = job_repository.fail(job.id, "worker-1", "boom", retry_delay_seconds=30)
+    assert failed.status == "queued"
+    assert failed.last_error == "boom"
+    assert job_repository.lease("worker-1", limit=1, lease_seconds=60) == []
+
+    with _later(60):
+        job_repository.lease("worker-1", limit=1, lease_seconds=60)
+    failed = job_repository.fail(job.id, "worker-1", "boom again")
+    assert failed.status == "failed"
+    assert failed.attempts == 2
+
+
+def test_reap_expired_final_attempt(job_repository):
+    """Test that a job whose worker died on its last attempt is failed."""
+    job = job_repository.enqueue("process_video", {}, max_attempts=1)
+    job_repository.lease("worker-1", limit=1, lease_seconds=60)
+
+    with _later(120):
+        assert job_repository.lease("worker-2", limit=1, lease_seconds=60) == []
+        reaped = job_repository.reap_expired()
+
+    assert [j.id for j in reaped] == [job.id]
+    assert reaped[0].status == "failed"
+
+
+def test_lease_caps_jobs_per_concurrency_key(job_repository):
+    """Test that jobs sharing a key are leased at most key_limit at a time."""
+    job_repository.add_jobs(
+        "process_video", [({"n": n}, None) for n in range(5)], concurrency_key="a"
+    )
+    job_repository.db.commit()
+    other = job_repository.enqueue("process_video", {"n": 5})
+
+    first = job_repository.lease("worker-1", limit=10, lease_seconds=60, key_limit=2)
+    assert sorted(job.payload["n"] for job in first) == [0, 1, 5]
+    # The key is full until one of its jobs finishes
+    assert job_repository.lease("worker-2", 10, 60, key_limit=2) == []
+
+    keyed = next(job for job in first if job.concurrency_key == "a")
+    job_repository.complete(keyed.id, "worker-1")
+    second = job_repository.lease("worker-2", limit=10, lease_seconds=60, key_limit=2)
+    assert [job.payload["n"] for job in second] == [2]
+    assert other.id in {job.id for job in first}
+
+
+def test_lease_returns_bulk_jobs_in_queue_order(job_repository):
+    """Test that bulk-inserted jobs are leased and returned in insertion order."""
+    job_repository.add_jobs("process_video", [({"n": n}, None) for n in range(20)])
+    job_repository.db.commit()
+
+    leased = job_repository.lease("worker-1", limit=20, lease_seconds=60)
+
+    assert [job.payload["n"] for job in leased] == list(range(20))
+
+
+def test_full_key_does_not_crowd_out_other_jobs(job_repository):
+    """Test that a batch skipped for a full key is refilled with other jobs."""
+    job_repository.add_jobs(
+        "process_video", [({"n": n}, None) for n in range(5)], concurrency_key="a"
+    )
+    job_repository.db.commit()
+    job_repository.add_jobs(
+        "process_video", [({"n": n}, None) for n in range(5, 7)], concurrency_key="b"
+    )
+    job_repository.db.commit()
+    job_repository.enqueue("process_video", {"n": 7})
+
+    leased = job_repository.lease("worker-1", limit=3, lease_seconds=60, key_limit=1)
+
+    assert [job.payload["n"] for job in leased] == [0, 5, 7]
+
+
+def test_expired_leases_free_their_key(job_repository):
+    """Test that jobs whose worker died don't hold a slot of their key."""
+    job_repository.add_jobs(
+        "process_video", [({"n": n}, None) for n in range(2)], concurrency_key="a"
+    )
+    job_repository.db.commit()
+    job_repository.lease("worker-1", limit=10, lease_seconds=60, key_limit=1)
+
+    with _later(120):
+        leased = job_repository.lease("worker-2", 10, 60, key_limit=1)
+
+    # The expired job is leased again, alone
+    assert [job.payload["n"] for job in leased] == [0]
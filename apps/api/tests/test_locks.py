@@ -0,0 +1,88 @@
+import threading
+import time
+from unittest.mock import MagicMock
+from app.core.locks import (
+    AdvisoryLock,
+    KeyedLock,
+    advisory_key,
+    get_keyed_lock,
+)
+
+
+def test_advisory_key_is_stable_and_signed_64_bit():
+    """Test that advisory lock keys are deterministic 64-bit integers."""
+    key = advisory_key("video:dQw4w9WgXcQ")
+
+    assert key == advisory_key("video:dQw4w9WgXcQ")
+    assert key != advisory_key("video:aaaaaaaaaaa")
+    assert -(2**63) <= key < 2**63
+
+
+def test_keyed_lock_serializes_same_key():
+    """Test that holders of the same key run one at a time."""
+    lock = KeyedLock()
+    active = []
+    overlaps = []
+
+    def work():
+        with lock.hold("video"):
+            active.append(1)
+            if len(active) > 1:
+                overlaps.append(1)
+            time.sleep(0.01)
+            active.pop()
+
+    threads = [threading.Thread(target=work) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == []
+    assert lock._locks == {}
+
+
+def test_keyed_lock_times_out():
+    """Test that a waiter gives up after the timeout."""
+    lock = KeyedLock()
+
+    with lock.hold("video"):
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(lock.hold("video", 0.01).__enter__())
+        )
+        thread.start()
+        thread.join()
+
+    assert result == [False]
+
+
+def test_get_keyed_lock_falls_back_without_postgres(sqlite_engine):
+    """Test that SQLite uses the in-process lock."""
+    lock = get_keyed_lock(sqlite_engine, "video")
+
+    assert not isinstance(lock, AdvisoryLock)
+    with lock.hold("dQw4w9WgXcQ") as acquired:
+        assert acquired
+
+
+def test_advisory_lock_uses_postgres_functions():
+    """Test that the Postgres lock takes and releases an advisory lock."""
+    engine = MagicMock()
+    engine.dialect.name = "postgresql"
+    conn = engine.connect.return_value.__enter__.return_value
+
+    lock = get_keyed_lock(engine, "video")
+    assert isinstance(lock, AdvisoryLock)
+
+    with lock.hold("dQw4w9WgXcQ", timeout=5) as acquired:
+        assert acquired
+
+    statements = [str(call.args[0]) for call in conn.execute.call_args_list]
+    assert statements == [
+        "SELECT pg_advisory_lock(:key)",
+        "SELECT pg_advisory_unlock(:key)",
+    ]
+    key = advisory_key("video:dQw4w9WgXcQ")
+    assert conn.execute.call_args_list[0].args[1] == {"key": key}
+    conn.exec_driver_sql.assert_called_once_with("SET LOCAL lock_timeout = '5000ms'")
@@ -1,3 +1,4 @@
+from unittest.mock import AsyncMock, patch
 from fastapi.testclient import TestClient
 from app.main import app
 
@@ -8,3 +9,14 @@ def test_read_root():
     response = client.get("/")
     assert response.status_code == 200
     assert response.json() == {"Hello": "World"}
+
+
+@patch("app.main.EMBEDDED_WORKER_ENABLED", False)
+@patch("app.main.warm_async_pool", new_callable=AsyncMock)
+@patch("app.main.init_db")
+def test_lifespan_initializes_database(mock_init_db, mock_warm_async_pool):
+    """Test that the schema is checked and the pools are warmed at startup."""
+    with TestClient(app) as lifespan_client:
+        mock_init_db.assert_called_once_with()
+        mock_warm_async_pool.assert_awaited_once_with()
+        assert lifespan_client.get("/").status_code == 200
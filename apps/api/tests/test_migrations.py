@@ -0,0 +1,154 @@
+from uuid import uuid4
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from app.core.compression import ZLIB, compress_text, decompress_text
+from app.core.database import Base, init_db
+from app.migrations import run_migrations
+from app.models.chat import Chat
+from app.models.chat_transcript import ChatTranscript
+
+
+def _legacy_engine(tmp_path):
+    """Create a database with transcripts still stored on the chats rows."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.tables["chats"].create(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE chats ADD COLUMN transcript TEXT"))
+    return engine
+
+
+def _insert_legacy_chat(connection, chat_id, transcript):
+    connection.execute(
+        text(
+            "INSERT INTO chats (id, source_url, source_type, video_id, status,"
+            " transcript, created_at, updated_at) VALUES (:id, 'url', 'YOUTUBE',"
+            " 'dQw4w9WgXcQ', 'processed', :transcript, CURRENT_TIMESTAMP,"
+            " CURRENT_TIMESTAMP)"
+        ),
+        {"id": chat_id.hex, "transcript": transcript},
+    )
+
+
+def test_transcripts_move_to_compressed_side_table(tmp_path, monkeypatch):
+    """Test that existing transcripts are compressed into chat_transcripts."""
+    monkeypatch.setattr("app.migrations.transcripts_side_table.BATCH_SIZE", 2)
+    engine = _legacy_engine(tmp_path)
+    transcripts = {uuid4(): f"transcript {i} " * 200 for i in range(5)}
+    without_transcript = uuid4()
+    with engine.begin() as connection:
+        for chat_id, transcript in transcripts.items():
+            _insert_legacy_chat(connection, chat_id, transcript)
+        _insert_legacy_chat(connection, without_transcript, None)
+
+    init_db(engine)
+
+    columns = {column["name"] for column in inspect(engine).get_columns("chats")}
+    assert "transcript" not in columns
+    db = sessionmaker(bind=engine)()
+    for chat_id, transcript in transcripts.items():
+        assert db.get(Chat, chat_id).transcript == transcript
+        assert db.get(ChatTranscript, chat_id).size == len(transcript)
+    assert db.get(Chat, without_transcript).transcript is None
+    # Processed chats are indexed for full-text search
+    matches = db.execute(
+        text("SELECT count(*) FROM chat_search_fts WHERE chat_search_fts MATCH '3'")
+    ).scalar()
+    assert matches == 1
+    db.close()
+    # Already applied migrations are skipped
+    assert run_migrations(engine) == []
+    engine.dispose()
+
+
+def test_fresh_database_records_migrations(tmp_path):
+    """Test that a new database only records the migrations as applied."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+
+    Base.metadata.create_all(bind=engine)
+    assert run_migrations(engine) == [
+        "0001_transcripts_side_table",
+        "0002_transcript_timings",
+        "0003_chat_search",
+        "0004_job_concurrency_keys",
+        "0005_chat_versions",
+    ]
+    assert run_migrations(engine) == []
+    engine.dispose()
+
+
+def test_chat_transcript_is_compressed(sqlite_session):
+    """Test that transcripts are stored compressed and read back transparently."""
+    transcript = "never gonna give you up " * 1000
+    chat = Chat(
+        source_url="https://youtu.be/dQw4w9WgXcQ",
+        source_type="YOUTUBE",
+        video_id="dQw4w9WgXcQ",
+        transcript=transcript,
+    )
+    sqlite_session.add(chat)
+    sqlite_session.commit()
+
+    record = sqlite_session.get(ChatTranscript, chat.id)
+    assert len(record.data) < len(transcript) / 10
+    assert chat.transcript == transcript
+
+    chat.transcript = "updated"
+    sqlite_session.commit()
+    assert sqlite_session.get(Chat, chat.id).transcript == "updated"
+
+
+def test_compression_codecs_round_trip():
+    """Test that zlib is always readable, whatever the default codec is."""
+    codec, data = compress_text("héllo " * 100, ZLIB)
+
+    assert codec == ZLIB
+    assert decompress_text(codec, data) == "héllo " * 100
+    assert decompress_text(*compress_text("héllo")) == "héllo"
+
+
+def test_timing_columns_are_added(tmp_path):
+    """Test that tables created before timings were stored get the new columns."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'timings.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE chat_transcripts DROP COLUMN timings"))
+        connection.execute(
+            text("ALTER TABLE video_cache DROP COLUMN transcript_timings")
+        )
+
+    run_migrations(engine)
+
+    inspector = inspect(engine)
+    assert "timings" in {c["name"] for c in inspector.get_columns("chat_transcripts")}
+    assert "transcript_timings" in {
+        c["name"] for c in inspector.get_columns("video_cache")
+    }
+    engine.dispose()
+
+
+def test_concurrency_key_column_is_added(tmp_path):
+    """Test that jobs tables created before concurrency keys get the column."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE jobs DROP COLUMN concurrency_key"))
+
+    run_migrations(engine)
+
+    columns = {c["name"] for c in inspect(engine).get_columns("jobs")}
+    assert "concurrency_key" in columns
+    engine.dispose()
+
+
+def test_chat_version_column_is_added(tmp_path):
+    """Test that chats tables created before versions get the column."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'chats.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(text("ALTER TABLE chats DROP COLUMN version"))
+
+    run_migrations(engine)
+
+    columns = {c["name"] for c in inspect(engine).get_columns("chats")}
+    assert "version" in columns
+    engine.dispose()
@@ -0,0 +1,89 @@
+import threading
+import pytest
+from unittest.mock import patch, MagicMock
+from fastapi.testclient import TestClient
+from app.core.exceptions import ProcessingQueueFullError
+from app.main import app
+from app.services.processing import ProcessingPool, run_video_processing_job
+
+
+@pytest.fixture
+def pool():
+    """Create a small thread pool and shut it down after the test."""
+    pool = ProcessingPool(max_workers=1, max_queue=1, kind="thread")
+    yield pool
+    pool.shutdown(wait=False)
+
+
+def test_submit_runs_job(pool):
+    """Test that submitted jobs run and are counted as completed."""
+    future = pool.submit(lambda x: x * 2, 21)
+
+    assert future.result(timeout=1) == 42
+    stats = pool.stats()
+    assert stats["completed"] == 1
+    assert stats["active"] == 0
+
+
+def test_submit_rejects_when_full(pool):
+    """Test that the pool rejects jobs beyond workers plus queue."""
+    release = threading.Event()
+    pool.submit(release.wait)
+    pool.submit(release.wait)
+
+    stats = pool.stats()
+    assert stats["active"] == 1
+    assert stats["queued"] == 1
+    assert stats["saturation"] == 1.0
+
+    with pytest.raises(ProcessingQueueFullError):
+        pool.submit(release.wait)
+    assert pool.stats()["rejected"] == 1
+
+    release.set()
+
+
+def test_failed_jobs_are_counted(pool):
+    """Test that jobs raising exceptions are counted as failed."""
+
+    def fail():
+        raise RuntimeError("boom")
+
+    future = pool.submit(fail)
+
+    with pytest.raises(RuntimeError):
+        future.result(timeout=1)
+    assert pool.stats()["failed"] == 1
+
+
+def test_invalid_pool_kind():
+    """Test that unknown executor kinds are rejected."""
+    with pytest.raises(ValueError):
+        ProcessingPool(kind="fiber")
+
+
+@patch("app.services.processing.ChatService")
+@patch("app.services.processing.get_session_local")
+def test_run_video_processing_job_uses_own_session(
+    mock_get_session_local, mock_chat_service
+):
+    """Test that each job opens and closes its own database session."""
+    mock_session = MagicMock()
+    mock_get_session_local.return_value.return_value = mock_session
+
+    run_video_processing_job("chat-id", "https://youtu.be/dQw4w9WgXcQ")
+
+    mock_chat_service.assert_called_once_with(mock_session)
+    mock_chat_service.return_value.process_video.assert_called_once_with(
+        "chat-id", "https://youtu.be/dQw4w9WgXcQ"
+    )
+    mock_session.close.assert_called_once()
+
+
+def test_metrics_endpoint_reports_pool_saturation():
+    """Test that the metrics endpoint exposes processing pool stats."""
+    response = TestClient(app).get("/api/v1/metrics")
+
+    assert response.status_code == 200
+    pool_stats = response.json()["processing_pool"]
+    assert {"active", "queued", "saturation", "max_workers"} <= set(pool_stats)
@@ -0,0 +1,131 @@
+import pytest
+from app.services.prompt_builder import (
+    HeuristicTokenizer,
+    Passage,
+    PromptBuilder,
+    Tokenizer,
+)
+
+INSTRUCTIONS = "Answer from the context.\n\n{context}"
+
+
+class WordTokenizer(Tokenizer):
+    """One token per word, so that budgets in tests are easy to follow."""
+
+    name = "words"
+
+    def count(self, text: str) -> int:
+        return len(text.split())
+
+
+def _builder(budget: int) -> PromptBuilder:
+    return PromptBuilder(INSTRUCTIONS, budget=budget, tokenizer=WordTokenizer())
+
+
+def _passage(words: int, position: int) -> Passage:
+    return Passage(" ".join([f"p{position}"] * words), position=position)
+
+
+def _prompt_tokens(prompt) -> int:
+    return sum(WordTokenizer().count(content) for _, content in prompt)
+
+
+HISTORY = [
+    ("human", "first question"),
+    ("ai", "first answer"),
+    ("human", "second question"),
+    ("ai", "second answer"),
+]
+
+
+def test_everything_fits():
+    """Test the layout of a prompt with room for all the context."""
+    passages = [_passage(2, 5), _passage(2, 1)]
+
+    prompt, report = _builder(100).build(
+        "why?", passages, HISTORY, summary="About bread."
+    )
+
+    assert prompt[0] == (
+        "system",
+        "Answer from the context.\n\nSummary of the video:\nAbout bread.\n\n"
+        "Transcript excerpts:\np1 p1\n\np5 p5",
+    )
+    assert prompt[1:] == HISTORY + [("human", "why?")]
+    assert report.included == {"passage": 2, "history": 2, "summary": 1}
+    assert report.trimmed == {}
+    # Instructions 4, question 1, passages 4 with their header 2, exchanges 8,
+    # summary 2 with its header 4
+    assert report.tokens == 25
+    assert report.tokens == _prompt_tokens(prompt)
+    assert not report.over_budget
+
+
+def test_highest_value_context_is_kept():
+    """Test that the top passage, last exchange and summary come first."""
+    passages = [_passage(3, 0), _passage(3, 1), _passage(1, 2)]
+
+    # Instructions and question take 5, leaving room for the top passage (3)
+    # with its header (2), last exchange (4), summary (2) with its header (4)
+    # and the last passage (1)
+    prompt, report = _builder(21).build(
+        "why?", passages, HISTORY, summary="About bread."
+    )
+
+    system = prompt[0][1]
+    assert "p0" in system and "p2" in system and "p1" not in system
+    assert prompt[1:] == HISTORY[2:] + [("human", "why?")]
+    assert report.included == {"passage": 2, "history": 1, "summary": 1}
+    assert report.trimmed == {"passage": 1, "history": 1}
+    assert report.trimmed_tokens == 7
+    assert report.tokens == _prompt_tokens(prompt) == 21
+
+
+def test_section_headers_count_against_the_budget():
+    """Test that a summary whose header doesn't fit is left out."""
+    # Instructions and question take 5 and the summary 2, but its header 4 more
+    prompt, report = _builder(10).build("why?", summary="About bread.")
+
+    assert "About bread." not in prompt[0][1]
+    assert report.trimmed == {"summary": 1}
+    assert report.tokens == _prompt_tokens(prompt) == 5
+
+
+def test_history_has_no_gaps():
+    """Test that an exchange is left out once a newer one didn't fit."""
+    history = [
+        ("human", "short"),
+        ("ai", "one"),
+        ("human", "a much longer question"),
+        ("ai", "and its rather long answer"),
+        ("human", "last"),
+        ("ai", "one"),
+    ]
+
+    prompt, report = _builder(13).build("why?", history=history)
+
+    assert prompt[1:] == history[4:] + [("human", "why?")]
+    assert report.trimmed == {"history": 2}
+
+
+def test_over_budget_instructions_and_question_are_kept():
+    """Test that the question is sent even when it alone exceeds the budget."""
+    prompt, report = _builder(3).build("why " * 10, [_passage(1, 0)])
+
+    assert prompt[-1] == ("human", "why " * 10)
+    assert report.over_budget
+    assert report.trimmed == {"passage": 1}
+
+
+def test_heuristic_tokenizer():
+    """Test the four characters per token estimate."""
+    assert HeuristicTokenizer().count("") == 0
+    assert HeuristicTokenizer().count("abcde") == 2
+
+
+def test_unknown_tokenizer(monkeypatch):
+    """Test that a misconfigured tokenizer is reported."""
+    monkeypatch.setattr("app.services.prompt_builder.PROMPT_TOKENIZER", "nope")
+
+    with pytest.raises(ValueError, match="Unknown tokenizer"):
+        PromptBuilder(INSTRUCTIONS)
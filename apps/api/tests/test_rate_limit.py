@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+from sqlalchemy.orm import sessionmaker
+from app.core.rate_limit import DatabaseTokenBucket, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_reserves_in_order():
+    """Test that callers past the burst are told to wait for their own token."""
+    clock = FakeClock()
+    bucket = TokenBucket("upstream", rate=2, burst=2, clock=clock)
+
+    assert [bucket.reserve(1) for _ in range(4)] == [0, 0, 0.5, 1.0]
+    clock.now += 1.0
+    # The two reserved tokens were refilled; the next one takes half a second
+    assert bucket.reserve(1) == 0.5
+    clock.now += 60
+    # Idle time refills the bucket up to the burst only
+    assert [bucket.reserve(1) for _ in range(3)] == [0, 0, 0.5]
+
+
+def test_acquire_paces_concurrent_callers():
+    """Test that threads sharing a bucket wait instead of exceeding the rate."""
+    bucket = TokenBucket("upstream", rate=50, burst=1)
+    start = time.perf_counter()
+
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # One token at once, then one every 20ms
+    assert time.perf_counter() - start >= 0.09
+    stats = bucket.stats()
+    assert (stats["acquired"], stats["waits"]) == (6, 5)
+
+
+def test_disabled_limit_never_waits():
+    """Test that a rate of 0 lets every call through."""
+    bucket = TokenBucket("upstream", rate=0, burst=1)
+
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+    assert asyncio.run(bucket.acquire_async()) == 0
+
+
+def test_acquire_async_waits_without_blocking():
+    """Test that coroutines wait for tokens on the event loop."""
+    bucket = TokenBucket("upstream", rate=20, burst=1)
+
+    async def scenario():
+        return await asyncio.gather(*(bucket.acquire_async() for _ in range(3)))
+
+    waits = asyncio.run(scenario())
+
+    assert waits[0] == 0 and waits[1] > 0 and waits[2] > waits[1]
+
+
+def test_database_buckets_are_shared(sqlite_engine):
+    """Test that limiters of different processes draw from one bucket."""
+    clock = FakeClock()
+    session_factory = sessionmaker(bind=sqlite_engine)
+    first = DatabaseTokenBucket("upstream", 1, 2, session_factory, clock=clock)
+    second = DatabaseTokenBucket("upstream", 1, 2, session_factory, clock=clock)
+    other = DatabaseTokenBucket("other", 1, 2, session_factory, clock=clock)
+
+    assert first.reserve(1) == 0
+    assert second.reserve(1) == 0
+    assert first.reserve(1) == 1.0
+    assert other.reserve(1) == 0
+    clock.now += 2
+    assert second.reserve(1) == 0
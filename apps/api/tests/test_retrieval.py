@@ -0,0 +1,149 @@
+import numpy as np
+import pytest
+from app.core.segments import TranscriptSegments
+from app.core.vector_index import VectorIndex
+from app.models.chat import Chat
+from app.models.transcript_index import ChatVectorIndex, TranscriptChunk
+from app.services.embeddings import HashingEmbedder
+from app.services.processing import run_transcript_indexing_job
+from app.services.retrieval import (
+    AsyncRetrievalService,
+    RetrievalService,
+    chunk_pieces,
+)
+from app.worker import JOB_HANDLERS
+from uuid import uuid4
+
+
+TOPICS = [
+    "The recipe starts with flour, butter and sugar mixed in a bowl.",
+    "Bake the cake in the oven at one hundred eighty degrees.",
+    "Our rocket engine burns liquid oxygen and kerosene at launch.",
+    "The telescope mirror is polished for months before assembly.",
+    "Stock markets fell as interest rates rose again this quarter.",
+]
+
+
+def _add_chat(db, snippets):
+    chat = Chat(
+        id=uuid4(),
+        source_url="https://youtu.be/dQw4w9WgXcQ",
+        source_type="YOUTUBE",
+        video_id="dQw4w9WgXcQ",
+        status="processed",
+    )
+    chat.transcript_segments = TranscriptSegments.from_snippets(snippets)
+    db.add(chat)
+    db.commit()
+    return str(chat.id)
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    """Test that the hashing embedder gives the same unit vectors every time."""
+    embedder = HashingEmbedder(dimensions=64)
+
+    first = embedder.embed(TOPICS, batch_size=2)
+    second = HashingEmbedder(dimensions=64).embed(TOPICS)
+
+    assert first.shape == (len(TOPICS), 64)
+    assert first.dtype == np.float32
+    np.testing.assert_array_equal(first, second)
+    np.testing.assert_allclose(np.linalg.norm(first, axis=1), 1.0, rtol=1e-5)
+    assert embedder.embed([]).shape == (0, 64)
+
+
+def test_chunk_pieces_overlap_and_times():
+    """Test that chunks repeat the tail of the previous chunk and keep times."""
+    pieces = [(f"piece{i:02d}", float(i), float(i + 1)) for i in range(10)]
+
+    chunks = chunk_pieces(pieces, chunk_chars=30, overlap_chars=8)
+
+    assert chunks[0] == ("piece00 piece01 piece02 piece03", 0.0, 4.0)
+    assert chunks[1][0].startswith("piece03 ")
+    assert chunks[-1][0].endswith("piece09") and chunks[-1][2] == 10.0
+    covered = " ".join(text for text, _, _ in chunks).split()
+    assert set(covered) == {text for text, _, _ in pieces}
+
+
+def test_chunk_pieces_always_advance():
+    """Test that pieces longer than a chunk still make progress."""
+    pieces = [("x" * 50, None, None), ("y" * 50, None, None)]
+
+    assert chunk_pieces(pieces, chunk_chars=10, overlap_chars=100) == [
+        ("x" * 50, None, None),
+        ("y" * 50, None, None),
+    ]
+
+
+def test_vector_index_search_top_k():
+    """Test that search returns the k most similar rows, best first."""
+    vectors = np.eye(4, dtype=np.float32)
+    index = VectorIndex.from_bytes(VectorIndex(vectors).to_bytes(), 4)
+    query = np.array([0.1, 0.0, 0.9, 0.5], dtype=np.float32)
+
+    assert [row for row, _ in index.search(query, 2)] == [2, 3]
+    assert [row for row, _ in index.search(query, 10)] == [2, 3, 0, 1]
+    assert index.search(query, 0) == []
+
+
+def test_index_and_search_chat(sqlite_session):
+    """Test indexing a chat and retrieving the passage about a question."""
+    snippets = [(text, i * 5.0, 5.0) for i, text in enumerate(TOPICS)]
+    chat_id = _add_chat(sqlite_session, snippets)
+    service = RetrievalService(sqlite_session, HashingEmbedder(dimensions=1024))
+
+    # Small chunks so that every topic lands in its own chunk
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(
+            "app.services.retrieval.chunk_pieces",
+            lambda pieces: chunk_pieces(pieces, chunk_chars=1, overlap_chars=0),
+        )
+        assert service.index_chat(chat_id) == len(TOPICS)
+
+    results = service.search(chat_id, "rocket engine burns which liquid fuel?", k=2)
+
+    assert len(results) == 2
+    assert results[0].text == TOPICS[2]
+    assert (results[0].start_seconds, results[0].end_seconds) == (10.0, 15.0)
+    assert results[0].score > results[1].score
+
+
+def test_reindexing_replaces_chunks(sqlite_session):
+    """Test that indexing a chat again replaces its previous chunks."""
+    chat_id = _add_chat(sqlite_session, [(text, 0.0, 1.0) for text in TOPICS])
+    service = RetrievalService(sqlite_session, HashingEmbedder(dimensions=32))
+
+    service.index_chat(chat_id)
+    service.index_chat(chat_id)
+
+    assert sqlite_session.query(TranscriptChunk).count() == 1
+    db_index = sqlite_session.query(ChatVectorIndex).one()
+    assert db_index.chunk_count == 1
+    assert len(db_index.vectors) == 32 * 4
+
+
+def test_search_with_other_embedder_is_rejected(sqlite_session):
+    """Test that vectors of different embedders are never compared."""
+    chat_id = _add_chat(sqlite_session, [("Hello", 0.0, 1.0)])
+    RetrievalService(sqlite_session, HashingEmbedder(dimensions=32)).index_chat(chat_id)
+
+    other = RetrievalService(sqlite_session, HashingEmbedder(dimensions=64))
+    with pytest.raises(ValueError, match="Index was built with"):
+        other.search(chat_id, "Hello")
+
+
+def test_async_search_without_index(run_with_async_session):
+    """Test that searching a chat that isn't indexed yet raises ValueError."""
+
+    async def scenario(db):
+        with pytest.raises(ValueError, match="Transcript index not found"):
+            await AsyncRetrievalService(db, HashingEmbedder(dimensions=32)).search(
+                str(uuid4()), "Hello"
+            )
+
+    run_with_async_session(scenario)
+
+
+def test_index_transcript_job_is_registered():
+    """Test that workers know how to run transcript indexing jobs."""
+    assert JOB_HANDLERS["index_transcript"] is run_transcript_indexing_job
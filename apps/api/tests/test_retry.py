@@ -0,0 +1,131 @@
+import random
+import pytest
+from app.core.retry import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    call_with_retry,
+)
+
+
+class Transient(Exception):
+    pass
+
+
+class Permanent(Exception):
+    pass
+
+
+def _is_retryable(error: Exception) -> bool:
+    return isinstance(error, Transient)
+
+
+class FakeFetcher:
+    """Raises the scripted errors in turn, then returns "ok"."""
+
+    def __init__(self, *errors: Exception):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_transient_errors_are_retried_with_jittered_backoff():
+    """Test that delays grow exponentially, capped, with full jitter."""
+    fetcher = FakeFetcher(Transient(), Transient(), Transient())
+    delays = []
+    policy = RetryPolicy(attempts=4, base_delay=1, max_delay=3)
+
+    result = call_with_retry(
+        fetcher, _is_retryable, policy, sleep=delays.append, rng=random.Random(7)
+    )
+
+    assert (result, fetcher.calls) == ("ok", 4)
+    assert [0 <= d <= bound for d, bound in zip(delays, [1, 2, 3])] == [True] * 3
+    # Seeded jitter makes the delays reproducible
+    rng = random.Random(7)
+    assert delays == [policy.delay(retry, rng) for retry in range(3)]
+
+
+def test_permanent_errors_and_exhausted_retries_are_raised():
+    """Test that permanent errors aren't retried, and transient ones are bounded."""
+    delays = []
+    permanent = FakeFetcher(Permanent())
+    with pytest.raises(Permanent):
+        call_with_retry(permanent, _is_retryable, sleep=delays.append)
+    assert (permanent.calls, delays) == (1, [])
+
+    transient = FakeFetcher(*[Transient()] * 5)
+    with pytest.raises(Transient):
+        call_with_retry(
+            transient, _is_retryable, RetryPolicy(attempts=3), sleep=delays.append
+        )
+    assert (transient.calls, len(delays)) == (3, 2)
+
+
+def test_circuit_breaker_fails_fast_then_recovers():
+    """Test that an open circuit rejects calls until a trial call succeeds."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "upstream", failure_threshold=2, reset_seconds=30, clock=clock
+    )
+    policy = RetryPolicy(attempts=5)
+    fetcher = FakeFetcher(*[Transient()] * 3)
+
+    with pytest.raises(CircuitOpenError):
+        call_with_retry(fetcher, _is_retryable, policy, breaker, sleep=lambda _: None)
+    # The third attempt was rejected without calling the upstream
+    assert (fetcher.calls, breaker.state) == (2, OPEN)
+
+    clock.now += 10
+    with pytest.raises(CircuitOpenError) as exc_info:
+        call_with_retry(fetcher, _is_retryable, policy, breaker)
+    assert exc_info.value.retry_after == 20
+    assert fetcher.calls == 2
+
+    # After the reset period, a failed trial opens the circuit again
+    clock.now += 20
+    with pytest.raises(CircuitOpenError):
+        call_with_retry(fetcher, _is_retryable, policy, breaker, sleep=lambda _: None)
+    assert (fetcher.calls, breaker.state) == (3, OPEN)
+
+    clock.now += 30
+    assert call_with_retry(fetcher, _is_retryable, policy, breaker) == "ok"
+    assert breaker.state == CLOSED
+    assert breaker.stats()["opened"] == 2
+
+
+def test_half_open_circuit_lets_one_trial_through():
+    """Test that calls made during the trial call are rejected."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "upstream", failure_threshold=1, reset_seconds=5, clock=clock
+    )
+    breaker.record_failure()
+    clock.now += 5
+
+    def trial():
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+        raise Permanent()
+
+    with pytest.raises(Permanent):
+        call_with_retry(trial, _is_retryable, breaker=breaker)
+    # Permanent errors come from an upstream that is up
+    assert breaker.state == CLOSED
@@ -0,0 +1,84 @@
+import pytest
+from app.core.keyword_index import KeywordIndex
+from app.models.chat import Chat
+from app.core.segments import TranscriptSegments
+from app.services.search import AsyncKeywordSearchService, KeywordIndexService
+from uuid import uuid4
+
+
+DOCUMENTS = [
+    ("Welcome back to the channel", 0.0, 3.0),
+    ("Today we talk about rockets", 3.0, 5.5),
+    ("Rockets burn fuel, rockets need oxygen", 5.5, 9.5),
+    ("The weather was nice today", 9.5, 11.5),
+]
+
+
+def test_bm25_ranks_by_term_frequency_and_rarity():
+    """Test that documents repeating rare query terms rank first."""
+    index = KeywordIndex.build(DOCUMENTS)
+
+    results = index.search("rockets oxygen", 10)
+
+    assert [doc for doc, _ in results] == [2, 1]
+    assert results[0][1] > results[1][1] > 0
+    assert index.search("submarine", 10) == []
+    assert len(index.search("today rockets", 1)) == 1
+
+
+def test_keyword_index_round_trip():
+    """Test that a serialized index answers queries like the original."""
+    index = KeywordIndex.build(DOCUMENTS + [("untimed line", None, None)])
+
+    loaded = KeywordIndex.from_bytes(index.to_bytes())
+
+    assert loaded.search("rockets today", 10) == index.search("rockets today", 10)
+    assert loaded.document_span(1) == (28, 55)
+    assert loaded.document_times(1) == (3.0, 5.5)
+    assert loaded.document_times(4) == (None, None)
+    with pytest.raises(ValueError):
+        KeywordIndex.from_bytes(b"XXXX" + bytes(8))
+
+
+def test_empty_index():
+    """Test that an index without documents returns no results."""
+    index = KeywordIndex.from_bytes(KeywordIndex.build([]).to_bytes())
+
+    assert len(index) == 0
+    assert index.search("anything", 10) == []
+
+
+def test_search_chat_transcript(run_with_async_session):
+    """Test building a chat's keyword index and searching it with offsets."""
+
+    async def scenario(db):
+        chat = Chat(
+            id=uuid4(),
+            source_url="https://youtu.be/dQw4w9WgXcQ",
+            source_type="YOUTUBE",
+            video_id="dQw4w9WgXcQ",
+            status="processed",
+        )
+        chat.transcript_segments = TranscriptSegments.from_snippets(
+            (text, start, end - start) for text, start, end in DOCUMENTS
+        )
+        db.add(chat)
+        await db.commit()
+        chat_id = str(chat.id)
+        service = AsyncKeywordSearchService(db)
+        with pytest.raises(ValueError, match="Search index not found"):
+            await service.search(chat_id, "rockets", 5)
+
+        await db.run_sync(
+            lambda session: KeywordIndexService(session).index_chat(chat_id)
+        )
+        return chat.transcript, await service.search(chat_id, "Oxygen", 5)
+
+    transcript, hits = run_with_async_session(scenario)
+
+    assert len(hits) == 1
+    hit = hits[0]
+    assert hit.text == "Rockets burn fuel, rockets need oxygen"
+    assert transcript[hit.offset : hit.offset + hit.length] == hit.text
+    assert [transcript[start:end] for start, end in hit.matches] == ["oxygen"]
+    assert (hit.start_seconds, hit.end_seconds) == (5.5, 9.5)
@@ -0,0 +1,48 @@
+import pytest
+from app.core.segments import TranscriptSegments
+
+
+@pytest.fixture
+def segments():
+    return TranscriptSegments.from_snippets(
+        [
+            ("Intro", 0.0, 10.0),
+            ("Hello", 2.0, 2.0),
+            ("World", 4.0, 3.0),
+            ("Outro", 9.0, 1.0),
+        ]
+    )
+
+
+def test_text_is_the_plain_transcript(segments):
+    """Test that the joined text is the transcript and each segment slices it."""
+    assert segments.text == "Intro\nHello\nWorld\nOutro"
+    assert len(segments) == 4
+    assert segments.segment(2) == {"start": 4.0, "duration": 3.0, "text": "World"}
+
+
+def test_timings_round_trip(segments):
+    """Test that serialized timings rebuild the same segments."""
+    data = segments.timings_to_bytes()
+
+    assert TranscriptSegments.from_bytes(data, segments.text) == segments
+
+
+def test_from_bytes_rejects_other_data(segments):
+    """Test that data that isn't serialized timings is rejected."""
+    with pytest.raises(ValueError):
+        TranscriptSegments.from_bytes(b"XXXX" + b"\0" * 4, "")
+    with pytest.raises(ValueError):
+        TranscriptSegments.from_bytes(segments.timings_to_bytes()[:-4], "")
+
+
+def test_window_includes_segments_running_at_start(segments):
+    """Test that segments which started earlier but overlap the range are kept."""
+    assert segments.window(5.0, 9.0) == [0, 2]
+    assert [s["text"] for s in segments.iter_window(9.5, 20.0)] == ["Intro", "Outro"]
+
+
+def test_window_excludes_segments_starting_at_end(segments):
+    """Test that the end of the range is exclusive."""
+    assert segments.window(0.0, 4.0) == [0, 1]
+    assert segments.window(20.0, 30.0) == []
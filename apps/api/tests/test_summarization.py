@@ -0,0 +1,183 @@
+import asyncio
+import json
+import time
+from app.models.chat import Chat
+from app.services.llm import FakeLLMClient
+from app.services.summarization import (
+    MAP_PROMPT,
+    REDUCE_PROMPT,
+    SummarizationService,
+    Summarizer,
+    group_texts,
+    parse_summary,
+    split_texts,
+)
+
+SUMMARY_JSON = json.dumps(
+    {
+        "summary": "How to bake sourdough.",
+        "actionable_items": ["Feed the starter", " ", "Preheat the oven"],
+        "suggested_questions": ["How long does it proof?"],
+    }
+)
+
+
+def _respond(prompt) -> list:
+    """Answer reduce prompts with the summary and the others with short notes."""
+    system = prompt[0][1]
+    if system.startswith(REDUCE_PROMPT[:40]):
+        return [SUMMARY_JSON]
+    return ["notes"]
+
+
+def _pieces(count: int, chars: int) -> list:
+    return [("x" * chars, i * 10.0, i * 10.0 + 10) for i in range(count)]
+
+
+def test_parse_summary():
+    """Test parsing the reduce answer, with or without a code fence."""
+    summary = parse_summary(f"```json\n{SUMMARY_JSON}\n```", max_items=5)
+
+    assert summary.summary == "How to bake sourdough."
+    assert summary.actionable_items == ["Feed the starter", "Preheat the oven"]
+    assert summary.suggested_questions == ["How long does it proof?"]
+    assert parse_summary("Just prose.").summary == "Just prose."
+    assert parse_summary("Just prose.").actionable_items == []
+
+
+def test_group_texts():
+    """Test packing texts into groups that fit in the limit."""
+    assert group_texts(["aaa", "bbb", "cccccc", "d"], 8) == [
+        ["aaa", "bbb"],
+        ["cccccc"],
+        ["d"],
+    ]
+
+
+def test_split_texts():
+    """Test cutting long texts into pieces, at whitespace where possible."""
+    assert split_texts(["aaa bbb ccc", "dd", "eeeeeee"], 5) == [
+        "aaa",
+        "bbb",
+        "ccc",
+        "dd",
+        "eeeee",
+        "ee",
+    ]
+
+
+def test_short_transcript_is_summarized_in_one_call():
+    """Test that transcripts that fit in the reduce prompt skip the map step."""
+    llm = FakeLLMClient(_respond)
+    summarizer = Summarizer(llm, chunk_chars=100, reduce_max_chars=1000)
+
+    summary = asyncio.run(summarizer.summarize(_pieces(3, 50)))
+
+    assert summary.summary == "How to bake sourdough."
+    assert summarizer.calls == 1
+
+
+def test_long_transcript_is_mapped_concurrently():
+    """Test that chunks are summarized concurrently, up to the cap."""
+
+    def run(concurrency: int) -> tuple:
+        llm = FakeLLMClient(_respond, delay=0.05)
+        summarizer = Summarizer(
+            llm, concurrency=concurrency, chunk_chars=100, reduce_max_chars=500
+        )
+        start = time.perf_counter()
+        summary = asyncio.run(summarizer.summarize(_pieces(8, 100)))
+        return summary, summarizer, llm, time.perf_counter() - start
+
+    summary, summarizer, llm, sequential = run(1)
+    assert summary.actionable_items == ["Feed the starter", "Preheat the oven"]
+    # Eight chunks, then the reduce
+    assert summarizer.calls == 9
+    assert llm.max_active == 1
+    assert sum(p[0][1] == MAP_PROMPT for p in llm.prompts) == 8
+
+    _, summarizer, llm, concurrent = run(4)
+    assert summarizer.calls == 9
+    assert llm.max_active == 4
+    # Wall-clock time follows the number of rounds of concurrent calls
+    assert concurrent < sequential / 2
+
+
+def test_long_notes_are_combined_in_rounds():
+    """Test that notes too long to reduce at once are combined first."""
+
+    def respond(prompt) -> list:
+        if prompt[0][1].startswith(REDUCE_PROMPT[:40]):
+            return [SUMMARY_JSON]
+        return ["n" * 40]
+
+    llm = FakeLLMClient(respond)
+    summarizer = Summarizer(llm, concurrency=3, chunk_chars=100, reduce_max_chars=100)
+
+    summary = asyncio.run(summarizer.summarize(_pieces(6, 100)))
+
+    assert summary.summary == "How to bake sourdough."
+    # Six chunks, three groups of two notes, two groups, one group, the reduce
+    assert summarizer.rounds == 2
+    assert summarizer.calls == 6 + 3 + 2 + 1
+
+
+def test_oversized_notes_are_cut_before_combining():
+    """Test that notes too long to pair up are cut rather than truncated."""
+
+    def respond(prompt) -> list:
+        system = prompt[0][1]
+        if system.startswith(REDUCE_PROMPT[:40]):
+            return [SUMMARY_JSON]
+        return ["m" * 80] if system == MAP_PROMPT else ["c" * 30]
+
+    llm = FakeLLMClient(respond)
+    summarizer = Summarizer(llm, chunk_chars=100, reduce_max_chars=100)
+
+    summary = asyncio.run(summarizer.summarize(_pieces(3, 100)))
+
+    assert summary.summary == "How to bake sourdough."
+    # Three notes cut in two pieces each, combined in pairs, then reduced
+    assert summarizer.rounds == 1
+    assert summarizer.calls == 3 + 3 + 1
+    assert llm.prompts[-1][1][1] == "\n\n".join(["c" * 30] * 3)
+
+
+def test_notes_that_dont_shrink_stop_combining():
+    """Test that combining stops once the model no longer condenses the notes."""
+    llm = FakeLLMClient(
+        lambda prompt: (
+            [SUMMARY_JSON]
+            if prompt[0][1].startswith(REDUCE_PROMPT[:40])
+            else ["n" * 200]
+        )
+    )
+    summarizer = Summarizer(llm, chunk_chars=100, reduce_max_chars=100)
+
+    summary = asyncio.run(summarizer.summarize(_pieces(3, 100)))
+
+    assert summary.summary == "How to bake sourdough."
+    assert summarizer.rounds == 1
+    assert len(llm.prompts[-1][1][1]) == 100
+
+
+def test_summarize_chat_stores_fields(sqlite_session):
+    """Test that the summary, items and questions are written to the chat."""
+    chat = Chat(
+        source_url="https://youtu.be/dQw4w9WgXcQ",
+        source_type="YOUTUBE",
+        video_id="dQw4w9WgXcQ",
+        status="processed",
+    )
+    chat.transcript = "Feed the starter.\nBake at 250 degrees."
+    sqlite_session.add(chat)
+    sqlite_session.commit()
+
+    SummarizationService(sqlite_session, FakeLLMClient([SUMMARY_JSON])).summarize_chat(
+        str(chat.id)
+    )
+
+    sqlite_session.refresh(chat)
+    assert chat.generated_summary == "How to bake sourdough."
+    assert chat.actionable_items == ["Feed the starter", "Preheat the oven"]
+    assert chat.suggested_questions == ["How long does it proof?"]
@@ -0,0 +1,92 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from app.core.cache import LRUCache
+from app.models.video_cache import VideoCache
+from app.core.clock import utcnow
+from app.core.segments import TranscriptSegments
+from app.services.video_cache import VideoCacheService
+
+METADATA = {
+    "title": "Test Video",
+    "channel_name": "Test Channel",
+    "publication_date": datetime(2023, 1, 1),
+    "view_count": 1000,
+    "thumbnail_url": "https://example.com/thumbnail.jpg",
+}
+
+TRANSCRIPT = TranscriptSegments.from_snippets(
+    [("Hello", 0.0, 1.5), ("World", 1.5, 2.0)]
+)
+
+
+@pytest.fixture
+def video_cache(sqlite_session):
+    """Create a VideoCacheService backed by SQLite and a private LRU."""
+    return VideoCacheService(sqlite_session, lru=LRUCache(max_entries=10))
+
+
+def test_get_miss(video_cache):
+    """Test that an unknown video is a cache miss."""
+    assert video_cache.get("dQw4w9WgXcQ") is None
+
+
+def test_store_and_get(video_cache, sqlite_session):
+    """Test that stored transcripts and metadata are persisted and returned."""
+    video_cache.store_transcript("dQw4w9WgXcQ", TRANSCRIPT)
+    video_cache.store_metadata("dQw4w9WgXcQ", METADATA)
+
+    cached = video_cache.get("dQw4w9WgXcQ")
+    assert cached.transcript == TRANSCRIPT
+    assert cached.metadata == METADATA
+
+    db_entry = sqlite_session.get(VideoCache, "dQw4w9WgXcQ")
+    assert db_entry.transcript == "Hello\nWorld"
+    assert db_entry.view_count == 1000
+
+
+def test_get_reads_through_to_database(video_cache, sqlite_session):
+    """Test that entries missing from the LRU are loaded from the table."""
+    video_cache.store_transcript("dQw4w9WgXcQ", TRANSCRIPT)
+    other_process = VideoCacheService(sqlite_session, lru=LRUCache(max_entries=10))
+
+    cached = other_process.get("dQw4w9WgXcQ")
+
+    assert cached.transcript == TRANSCRIPT
+    assert cached.metadata is None
+    assert len(other_process.lru) == 1
+
+
+def test_get_serves_lru_without_database(video_cache):
+    """Test that LRU hits do not query the database."""
+    video_cache.store_transcript("dQw4w9WgXcQ", TRANSCRIPT)
+
+    with patch.object(video_cache.repository, "get_by_video_id") as mock_get:
+        cached = video_cache.get("dQw4w9WgXcQ")
+
+    assert cached.transcript == TRANSCRIPT
+    mock_get.assert_not_called()
+
+
+def test_stale_metadata_is_not_returned(sqlite_session):
+    """Test that metadata older than the TTL is dropped but the transcript is kept."""
+    video_cache = VideoCacheService(
+        sqlite_session, metadata_ttl_seconds=60, lru=LRUCache(max_entries=10)
+    )
+    video_cache.store_transcript("dQw4w9WgXcQ", TRANSCRIPT)
+    video_cache.store_metadata("dQw4w9WgXcQ", METADATA)
+
+    later = utcnow() + timedelta(minutes=5)
+    with patch("app.services.video_cache.utcnow", return_value=later):
+        cached = video_cache.get("dQw4w9WgXcQ")
+
+    assert cached.transcript == TRANSCRIPT
+    assert cached.metadata is None
+
+
+def test_transcript_without_timings_is_a_miss(video_cache, sqlite_session):
+    """Test that transcripts cached before timings were stored get refetched."""
+    sqlite_session.add(VideoCache(video_id="dQw4w9WgXcQ", transcript="Hello World"))
+    sqlite_session.commit()
+
+    assert video_cache.get("dQw4w9WgXcQ").transcript is None
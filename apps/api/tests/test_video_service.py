@@ -1,8 +1,15 @@
+import subprocess
+import sys
 import pytest
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
+from app.core.exceptions import TransientVideoError
+from app.core.retry import CircuitBreaker
 from app.services.video import (
     extract_video_id,
+    is_retryable_error,
     get_youtube_transcript,
+    get_youtube_transcript_segments,
     get_youtube_metadata,
     VideoProcessingError,
 )
@@ -124,3 +131,92 @@ def test_get_youtube_metadata_error(mock_youtube_dl):
 
     with pytest.raises(VideoProcessingError):
         get_youtube_metadata(video_id)
+
+
+def test_importing_app_does_not_import_extractors():
+    """Test that yt-dlp and youtube-transcript-api are only imported when used."""
+    code = (
+        "import sys, app.main; "
+        "print(any(m in sys.modules for m in ('yt_dlp', 'youtube_transcript_api')))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+@patch("app.services.video.YouTubeTranscriptApi")
+def test_get_youtube_transcript_segments(mock_youtube_transcript_api):
+    """Test retrieving the timed segments of a YouTube transcript."""
+    mock_ytt_api_instance = MagicMock()
+    mock_ytt_api_instance.fetch.return_value = [
+        SimpleNamespace(text="Hello", start=0.0, duration=1.5),
+        SimpleNamespace(text="World", start=1.5, duration=2.0),
+    ]
+    mock_youtube_transcript_api.return_value = mock_ytt_api_instance
+
+    segments = get_youtube_transcript_segments("dQw4w9WgXcQ")
+
+    assert segments.text == "Hello\nWorld"
+    assert segments.segment(1) == {"start": 1.5, "duration": 2.0, "text": "World"}
+    mock_ytt_api_instance.fetch.assert_called_once_with("dQw4w9WgXcQ")
+
+
+@patch("app.services.video.YouTubeTranscriptApi")
+def test_get_youtube_transcript_segments_error(mock_youtube_transcript_api):
+    """Test handling errors when retrieving timed transcript segments."""
+    mock_youtube_transcript_api.return_value.fetch.side_effect = Exception("API")
+
+    with pytest.raises(VideoProcessingError):
+        get_youtube_transcript_segments("dQw4w9WgXcQ")
+
+
+def test_is_retryable_error():
+    """Test which fetch errors are worth retrying."""
+    from youtube_transcript_api._errors import RequestBlocked, TranscriptsDisabled
+    from yt_dlp.utils import DownloadError, ExtractorError
+
+    assert not is_retryable_error(TranscriptsDisabled("dQw4w9WgXcQ"))
+    assert is_retryable_error(RequestBlocked("dQw4w9WgXcQ"))
+    assert is_retryable_error(ConnectionError("reset by peer"))
+    assert not is_retryable_error(ValueError("bug"))
+    unavailable = ExtractorError("Video unavailable", expected=True)
+    assert not is_retryable_error(DownloadError("ERROR", (None, unavailable, None)))
+    throttled = ExtractorError("HTTP Error 429: Too Many Requests")
+    assert is_retryable_error(DownloadError("ERROR", (None, throttled, None)))
+
+
+@patch("app.core.retry.time.sleep")
+@patch("app.services.video.get_circuit_breaker")
+@patch("app.services.video.YouTubeTranscriptApi")
+def test_transient_transcript_errors_are_retried(
+    mock_youtube_transcript_api, mock_get_breaker, mock_sleep
+):
+    """Test that network errors are retried, and raised as transient at last."""
+    mock_get_breaker.return_value = CircuitBreaker("test", failure_threshold=10)
+    fetch = mock_youtube_transcript_api.return_value.fetch
+    fetch.side_effect = [
+        ConnectionError("reset by peer"),
+        [SimpleNamespace(text="Hello", start=0.0, duration=1.5)],
+    ]
+
+    assert get_youtube_transcript_segments("dQw4w9WgXcQ").text == "Hello"
+    assert mock_sleep.call_count == 1
+
+    fetch.side_effect = ConnectionError("reset by peer")
+    with pytest.raises(TransientVideoError):
+        get_youtube_transcript_segments("dQw4w9WgXcQ")
+    assert fetch.call_count == 2 + 3
+
+
+@patch("app.services.video.get_circuit_breaker")
+@patch("app.services.video.YouTubeTranscriptApi")
+def test_open_circuit_fails_fast(mock_youtube_transcript_api, mock_get_breaker):
+    """Test that fetches aren't attempted while the upstream's circuit is open."""
+    breaker = CircuitBreaker("test", failure_threshold=1)
+    breaker.record_failure()
+    mock_get_breaker.return_value = breaker
+
+    with pytest.raises(TransientVideoError):
+        get_youtube_transcript_segments("dQw4w9WgXcQ")
+    mock_youtube_transcript_api.return_value.fetch.assert_not_called()
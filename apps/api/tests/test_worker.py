@@ -0,0 +1,193 @@
+import threading
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.chat import Chat
+from app.models.collection import ChatCollection
+from app.models.job import Job
+from app.repository.job import JobRepository
+from app.services.job_queue import EXPAND_COLLECTION_JOB
+from app.services.processing import ProcessingPool
+from app.worker import Worker, main
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Create a file-backed SQLite database that worker threads can share."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'worker.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+def _make_worker(session_factory, handlers, concurrency=2):
+    return Worker(
+        pool=ProcessingPool(max_workers=concurrency, max_queue=0),
+        session_factory=session_factory,
+        handlers=handlers,
+        worker_id="worker-1",
+        poll_interval=0.01,
+        retry_delay_seconds=0,
+    )
+
+
+def _enqueue(session_factory, payload, **kwargs):
+    db = session_factory()
+    try:
+        return str(JobRepository(db).enqueue("test", payload, **kwargs).id)
+    finally:
+        db.close()
+
+
+def _job(session_factory, job_id):
+    db = session_factory()
+    try:
+        return JobRepository(db).get_job_by_id(job_id)
+    finally:
+        db.close()
+
+
+def test_run_once_executes_and_completes_jobs(session_factory):
+    """Test that leased jobs run with their payload and are completed."""
+    calls = []
+    worker = _make_worker(session_factory, {"test": lambda n: calls.append(n)})
+    job_ids = [_enqueue(session_factory, {"n": n}) for n in range(2)]
+
+    assert worker.run_once() == 2
+    worker.stop()
+    worker.pool.shutdown(wait=True)
+
+    assert sorted(calls) == [0, 1]
+    assert [_job(session_factory, job_id).status for job_id in job_ids] == [
+        "completed",
+        "completed",
+    ]
+
+
+def test_run_once_respects_concurrency(session_factory):
+    """Test that a worker never leases more jobs than it has slots."""
+    release = threading.Event()
+    worker = _make_worker(session_factory, {"test": lambda: release.wait()}, 1)
+    for _ in range(3):
+        _enqueue(session_factory, {})
+
+    assert worker.run_once() == 1
+    assert worker.run_once() == 0
+
+    release.set()
+    worker.pool.shutdown(wait=True)
+
+
+def test_failed_job_is_retried_and_fails_chat(session_factory):
+    """Test that a job failing on its last attempt marks the chat as error."""
+    db = session_factory()
+    chat = Chat(
+        source_url="https://youtu.be/dQw4w9WgXcQ",
+        source_type="YOUTUBE",
+        video_id="dQw4w9WgXcQ",
+    )
+    db.add(chat)
+    db.commit()
+    chat_id = chat.id
+    db.close()
+
+    def boom():
+        raise RuntimeError("database unavailable")
+
+    worker = _make_worker(session_factory, {"test": boom})
+    job_id = _enqueue(session_factory, {}, chat_id=str(chat_id), max_attempts=2)
+
+    worker.run_once()
+    worker.pool.shutdown(wait=True)
+    assert _job(session_factory, job_id).status == "queued"
+
+    worker.pool = ProcessingPool(max_workers=2, max_queue=0)
+    worker.run_once()
+    worker.pool.shutdown(wait=True)
+
+    assert _job(session_factory, job_id).status == "failed"
+    db = session_factory()
+    failed_chat = db.get(Chat, chat_id)
+    assert failed_chat.status == "error"
+    assert failed_chat.transcript == "Unexpected error: database unavailable"
+    db.close()
+
+
+def test_failed_expansion_job_fails_collection(session_factory):
+    """Test that an expansion failing on its last attempt fails the collection."""
+    db = session_factory()
+    collection = ChatCollection(
+        source_url="https://www.youtube.com/playlist?list=PL123",
+        source_type="YOUTUBE_PLAYLIST",
+        status="expanding",
+    )
+    db.add(collection)
+    db.commit()
+    collection_id = collection.id
+    JobRepository(db).enqueue(
+        EXPAND_COLLECTION_JOB, {"collection_id": str(collection_id)}, max_attempts=1
+    )
+    db.close()
+
+    def throttled(collection_id):
+        raise RuntimeError("YouTube is throttling requests")
+
+    worker = _make_worker(session_factory, {EXPAND_COLLECTION_JOB: throttled})
+    worker.run_once()
+    worker.pool.shutdown(wait=True)
+
+    db = session_factory()
+    failed_collection = db.get(ChatCollection, collection_id)
+    assert (failed_collection.status, failed_collection.error) == (
+        "error",
+        "YouTube is throttling requests",
+    )
+    db.close()
+
+
+def test_run_forever_until_stopped(session_factory):
+    """Test that a started worker processes new jobs until stopped."""
+    done = threading.Event()
+    worker = _make_worker(session_factory, {"test": lambda: done.set()})
+    worker.start()
+
+    _enqueue(session_factory, {})
+
+    assert done.wait(timeout=5)
+    worker.stop()
+    worker.pool.shutdown(wait=True)
+    db = session_factory()
+    assert db.query(Job).one().status == "completed"
+    db.close()
+
+
+def test_main_parses_arguments(monkeypatch):
+    """Test the `python -m app.worker` entry point."""
+    created = {}
+
+    class FakeWorker:
+        def __init__(self, pool, poll_interval):
+            created["concurrency"] = pool.max_workers
+            created["poll_interval"] = poll_interval
+            self.pool = pool
+
+        def request_stop(self):
+            pass
+
+        def run_forever(self):
+            created["ran"] = True
+
+    monkeypatch.setattr("app.worker.Worker", FakeWorker)
+    monkeypatch.setattr("app.worker.init_db", lambda: created.update(init_db=True))
+    main(["--concurrency", "3", "--poll-interval", "0.5"])
+
+    assert created == {
+        "init_db": True,
+        "concurrency": 3,
+        "poll_interval": 0.5,
+        "ran": True,
+    }